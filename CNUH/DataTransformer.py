@@ -6,13 +6,53 @@ from datetime import datetime
 import logging
 import warnings
 import inspect
+from functools import lru_cache
 
-def convert_to_datetime(row):
-    try :
-        return datetime.strptime(row.replace("오전", "AM").replace("오후", "PM"), "%Y-%m-%d %I:%M:%S %p")
-    except ValueError:
+# 구분기호 없이 숫자로만 된 날짜 형식(예: %Y%m%d%H%M)의 지시자별 (구성요소, 자릿수)
+COMPACT_DATETIME_FIELDS = {"%Y": ("year", 4), "%m": ("month", 2), "%d": ("day", 2), "%H": ("hour", 2), "%M": ("minute", 2), "%S": ("second", 2)}
+
+@lru_cache(maxsize = None)
+def compact_datetime_layout(format):
+    """
+    숫자로만 된 날짜 형식의 전체 자릿수와 구성요소별 (이름, 나눌 값, 자릿수)를 반환합니다. 형식마다 한 번만 계산합니다.
+    COMPACT_DATETIME_FIELDS에 없는 지시자나 구분기호가 있는 형식이면 None을 반환합니다.
+    """
+    tokens = [format[i:i + 2] for i in range(0, len(format), 2)]
+    if len(format) % 2 or any(token not in COMPACT_DATETIME_FIELDS for token in tokens):
         return None
- 
+    width = sum(COMPACT_DATETIME_FIELDS[token][1] for token in tokens)
+    fields, end = [], 0
+    for token in tokens:
+        name, digits = COMPACT_DATETIME_FIELDS[token]
+        end += digits
+        fields.append((name, 10 ** (width - end), 10 ** digits))
+    return width, tuple(fields)
+
+# 원천 데이터의 날짜 문자열을 한 번에 datetime으로 변환하는 함수 정의
+def parse_datetime(values, format = "%Y%m%d%H%M%S"):
+    """
+    날짜 문자열 Series를 format에 따라 datetime Series로 반환합니다. 형식에 맞지 않거나 존재하지 않는 날짜는 NaT가 됩니다.
+    201903081045와 같이 숫자로만 된 형식은 행마다 문자열을 자르지 않고 숫자로 한 번에 변환한 뒤 연, 월, 일, 시, 분, 초를 계산하며,
+    NaN이 있어 float로 읽힌 값(201903081045.0)도 변환합니다.
+    구분기호가 있는 형식은 오전/오후를 AM/PM으로 바꾼 뒤 pd.to_datetime으로 변환합니다.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    text = values.astype(str).str.strip().where(values.notna())
+    layout = compact_datetime_layout(format)
+    if layout is None:
+        text = text.str.replace("오전", "AM", regex = False).str.replace("오후", "PM", regex = False)
+        return pd.to_datetime(text, format = format, errors = "coerce", cache = True)
+
+    width, fields = layout
+    text = text.str.replace(r"\.0$", "", regex = True)
+    number = pd.to_numeric(text.where(text.str.len() == width), errors = "coerce")
+    components = pd.DataFrame({"year": 1970, "month": 1, "day": 1}, index = values.index)
+    for name, divisor, modulus in fields:
+        components[name] = (number // divisor) % modulus
+    return pd.to_datetime(components, errors = "coerce")
+
 class DataTransformer:
     """
     기본 데이터 변환 클래스.
@@ -970,7 +1010,7 @@ class MeasurementDiagTransformer(DataTransformer):
                              self.measurement_source_value, self.visit_source_key]]
 
             source[self.orddate] = pd.to_datetime(source[self.orddate])
-            source[self.measurement_datetime] = pd.to_datetime(source[self.measurement_datetime], format='%Y-%m-%d %p %I:%M:%S')
+            source[self.measurement_datetime] = parse_datetime(source[self.measurement_datetime], '%Y-%m-%d %p %I:%M:%S')
             source = source[(source[self.orddate] <= self.data_range)]
 
             # value_as_number float형태로 저장되게 값 변경
@@ -8,14 +8,37 @@ import warnings
 import inspect
 import csv
 
-# 숫자 값을 유지하고, 문자가 포함된 값을 NaN으로 대체하는 함수 정의
-def convert_to_numeric(value):
-    try:
-        # pd.to_numeric을 사용하여 숫자로 변환 시도
-        return pd.to_numeric(value)
-    except ValueError:
-        # 변환이 불가능한 경우 NaN 반환
-        return np.nan
+# 결과값 앞에 붙는 비교 연산자별 operator_concept_id
+OPERATOR_CONCEPT_ID = {">": 4172704, ">=": 4171755, "=": 4172703, "<=": 4171754, "<": 4171756}
+
+# 결과값을 숫자, 비교 연산자, 숫자가 아닌 텍스트로 한 번에 나누는 함수 정의
+def parse_numeric_value(values):
+    """
+    결과값 Series를 value_as_number, operator_concept_id, value_text 컬럼의 DataFrame으로 반환합니다.
+    "<0.5", ">=100"과 같이 비교 연산자가 붙은 값, 천 단위 구분기호(,)와 전각 숫자가 포함된 값도 숫자로 변환합니다.
+    비교 연산자가 없거나 숫자로 변환되지 않으면 operator_concept_id는 0이며,
+    숫자로 변환되지 않는 값은 앞뒤 공백을 제거하여 value_text에 남깁니다.
+    기존 변환과 같이 결과값이 "=", ">"처럼 비교 연산자만 있으면 operator_concept_id는 해당 연산자의 concept입니다.
+    """
+    text = values.astype(str).where(values.notna())
+    # 전각 숫자, 기호를 반각으로 변환
+    text = text.str.normalize("NFKC").str.strip()
+    text = text.str.replace("≥", ">=", regex = False).str.replace("≤", "<=", regex = False)
+
+    parts = text.str.extract(r"^(?P<operator>[<>]=?|=)?\s*(?P<number>.*)$")
+    number = parts["number"]
+    thousands = number.str.fullmatch(r"[-+]?\d{1,3}(?:,\d{3})+(?:\.\d+)?", na = False)
+    number = number.where(~thousands, number.str.replace(",", "", regex = False))
+    value_as_number = pd.to_numeric(number, errors = "coerce").astype(float)
+
+    operator_only = parts["number"].eq("")
+    operator_concept_id = parts["operator"].map(OPERATOR_CONCEPT_ID).where(value_as_number.notna() | operator_only).fillna(0).astype(int)
+
+    return pd.DataFrame({
+        "value_as_number": value_as_number,
+        "operator_concept_id": operator_concept_id,
+        "value_text": text.where(value_as_number.isna())
+    }, index = values.index)
     
 class DataTransformer:
     """
@@ -814,6 +837,29 @@ class LocalKCDTransformer(DataTransformer):
             logging.error(f"{self.table} 테이블 변환 중 오류:\n {e}", exc_info=True)
             raise
     
+    def match_diagcode(self, diagcode, concept_kcd):
+        """
+        진단코드별로 앞에서부터 가장 길게 일치하는 KCD7 concept_code의 concept 행을 반환합니다.
+        concept_code로 인덱스를 한 번 만든 뒤 진단코드 길이별로 앞부분을 잘라 한 번에 조회하므로
+        진단코드마다 concept 테이블 전체를 검색하지 않습니다.
+        일치하는 코드가 없으면 모든 컬럼이 빈 값인 행을 반환하며, 결과의 순서는 diagcode와 같습니다.
+        """
+        # 같은 concept_code가 여러 개면 첫 번째 행을 사용
+        concept_kcd = concept_kcd[concept_kcd[self.concept_code].notna()].drop_duplicates(subset = self.concept_code).reset_index(drop = True)
+        code_index = pd.Index(concept_kcd[self.concept_code])
+
+        matched_position = np.full(len(diagcode), -1)
+        max_length = diagcode.str.len().max()
+        max_length = 0 if pd.isna(max_length) else int(max_length)
+
+        # 긴 앞부분부터 조회하여 아직 매칭되지 않은 코드에만 결과 반영
+        for length in range(max_length, 0, -1):
+            position = code_index.get_indexer(diagcode.str[:length])
+            unmatched = (matched_position == -1) & (position != -1)
+            matched_position[unmatched] = position[unmatched]
+
+        return concept_kcd.reindex(matched_position)
+
     def process_source(self):
         """
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
@@ -831,24 +877,15 @@ class LocalKCDTransformer(DataTransformer):
             concept_kcd[self.concept_code] = concept_kcd[self.concept_code].str.replace('.', '')
             concept_kcd = concept_kcd[concept_kcd[self.vocabulary_id] == 'KCD7']
 
-            # 3. 매칭 함수 정의
-            def match_diagcode(diagcode, concept_kcd):
-                for i in range(len(diagcode), 0, -1):
-                    sub_diagcode = diagcode[:i]
-                    match = concept_kcd[concept_kcd[self.concept_code] == sub_diagcode]
-                    if not match.empty:
-                        return match.iloc[0]
-                return pd.Series([None]*len(concept_kcd.columns), index=concept_kcd.columns)
-
-            # 4. 매칭 수행
-            matched_df = source.apply(lambda row: match_diagcode(row['changed_diagcode'], concept_kcd), axis=1)
+            # 3. 매칭 수행
+            matched_df = self.match_diagcode(source['changed_diagcode'], concept_kcd)
             logging.debug(f'matched_df row수: {len(matched_df)}')
 
-            # 5. 원래 source 매칭 결과 합치기
+            # 4. 원래 source 매칭 결과 합치기
             local_kcd = pd.concat([source.reset_index(drop=True), matched_df.reset_index(drop=True)], axis=1)
             logging.debug(f'원천 데이터와 합친 후 row수: {len(matched_df)}')
 
-            # 6. 필요한 컬럼 선택 및 기본값 설정
+            # 5. 필요한 컬럼 선택 및 기본값 설정
             local_kcd = local_kcd[[self.diagcode, 'changed_diagcode', self.fromdate, self.todate, self.korname,
                                 self.concept_id, self.concept_name, self.domain_id, self.vocabulary_id, self.concept_class_id, 
                                 self.standard_concept, self.concept_code, self.valid_start_date, self.valid_end_date, self.invalid_reason]]
@@ -1410,10 +1447,9 @@ class MeasurementTransformer(DataTransformer):
             # visit_source_key 생성
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.source_key] + ';' + source[self.hospital]
            
-            # value_as_number float형태로 저장되게 값 변경
+            # value_as_number float형태로 저장되게 값 변경하고 비교 연산자, 숫자가 아닌 결과값 분리
             # source["value_as_number"] = source[self.value_source_value].str.extract('(-?\d+\.\d+|\d+)')
-            source["value_as_number"] = source[self.value_source_value].apply(convert_to_numeric)
-            source["value_as_number"] = source["value_as_number"].astype(float)
+            source = pd.concat([source, parse_numeric_value(source[self.value_source_value])], axis = 1)
             # source[self.range_low] = source[self.range_low].str.extract('(-?\d+\.\d+|\d+)')
             # source[self.range_high] = source[self.range_high].str.extract('(-?\d+\.\d+|\d+)')
             source["range_low"] = source[self.result_range].apply(lambda x: str(x).split('~')[0] if isinstance(x, str) and '~' in x else None)
@@ -1487,39 +1523,18 @@ class MeasurementTransformer(DataTransformer):
             source = pd.merge(source, concept_etc, left_on = "measurement_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_measurement_type'))
             logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
 
-            # operator_concept_id 만들고 operator_concept_id_name 기반 만들기
-            operator_condition = [
-                source[self.value_source_value].isin([">"])
-                , source[self.value_source_value].isin([">="])
-                , source[self.value_source_value].isin(["="])
-                , source[self.value_source_value].isin(["<="])
-                , source[self.value_source_value].isin(["<"])
-                    # source[self.value_source_value].str.contains(">", case = False, na = False)
-                    # , source[self.value_source_value].str.contains(">=", case = False, na = False)
-                    # , source[self.value_source_value].str.contains("=", case = False, na = False)
-                    # , source[self.value_source_value].str.contains("<=", case = False, na = False)
-                    # , source[self.value_source_value].str.contains("<", case = False, na = False)
-            ]
-            operator_value = [
-                    4172704
-                    , 4171755
-                    , 4172703
-                    , 4171754
-                    , 4171756
-            ]
-
-            source["operator_concept_id"] = np.select(operator_condition, operator_value)
+            # operator_concept_id_name 기반 만들기(operator_concept_id는 결과값 변환 시 생성)
             source = pd.merge(source, concept_etc, left_on = "operator_concept_id", right_on="concept_id", how="left", suffixes=('', '_operator'))
             logging.debug(f'concept_etc: operator_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
 
             # value_as_concept_id 만들고 value_as_concept_id_name 기반 만들기
             value_concept_condition = [
-                source[self.value_source_value] == "+",
-                source[self.value_source_value] == "++",
-                source[self.value_source_value] == "+++",
-                source[self.value_source_value] == "++++",
-                source[self.value_source_value].str.lower().str.strip() == "negative",
-                source[self.value_source_value].str.lower().str.strip() == "positive"
+                source["value_text"] == "+",
+                source["value_text"] == "++",
+                source["value_text"] == "+++",
+                source["value_text"] == "++++",
+                source["value_text"].str.lower() == "negative",
+                source["value_text"].str.lower() == "positive"
             ]
             value_concept_value = [
                 4123508
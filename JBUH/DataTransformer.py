@@ -6,15 +6,84 @@ from datetime import datetime
 import logging
 import warnings
 import inspect
+from functools import lru_cache
 
-# 숫자 값을 유지하고, 문자가 포함된 값을 NaN으로 대체하는 함수 정의
-def convert_to_numeric(value):
-    try:
-        # pd.to_numeric을 사용하여 숫자로 변환 시도
-        return pd.to_numeric(value)
-    except ValueError:
-        # 변환이 불가능한 경우 NaN 반환
-        return np.nan
+# 결과값 앞에 붙는 비교 연산자별 operator_concept_id
+OPERATOR_CONCEPT_ID = {">": 4172704, ">=": 4171755, "=": 4172703, "<=": 4171754, "<": 4171756}
+
+# 결과값을 숫자, 비교 연산자, 숫자가 아닌 텍스트로 한 번에 나누는 함수 정의
+def parse_numeric_value(values):
+    """
+    결과값 Series를 value_as_number, operator_concept_id, value_text 컬럼의 DataFrame으로 반환합니다.
+    "<0.5", ">=100"과 같이 비교 연산자가 붙은 값, 천 단위 구분기호(,)와 전각 숫자가 포함된 값도 숫자로 변환합니다.
+    비교 연산자가 없거나 숫자로 변환되지 않으면 operator_concept_id는 0이며,
+    숫자로 변환되지 않는 값은 앞뒤 공백을 제거하여 value_text에 남깁니다.
+    기존 변환과 같이 결과값이 "=", ">"처럼 비교 연산자만 있으면 operator_concept_id는 해당 연산자의 concept입니다.
+    """
+    text = values.astype(str).where(values.notna())
+    # 전각 숫자, 기호를 반각으로 변환
+    text = text.str.normalize("NFKC").str.strip()
+    text = text.str.replace("≥", ">=", regex = False).str.replace("≤", "<=", regex = False)
+
+    parts = text.str.extract(r"^(?P<operator>[<>]=?|=)?\s*(?P<number>.*)$")
+    number = parts["number"]
+    thousands = number.str.fullmatch(r"[-+]?\d{1,3}(?:,\d{3})+(?:\.\d+)?", na = False)
+    number = number.where(~thousands, number.str.replace(",", "", regex = False))
+    value_as_number = pd.to_numeric(number, errors = "coerce").astype(float)
+
+    operator_only = parts["number"].eq("")
+    operator_concept_id = parts["operator"].map(OPERATOR_CONCEPT_ID).where(value_as_number.notna() | operator_only).fillna(0).astype(int)
+
+    return pd.DataFrame({
+        "value_as_number": value_as_number,
+        "operator_concept_id": operator_concept_id,
+        "value_text": text.where(value_as_number.isna())
+    }, index = values.index)
+
+# 구분기호 없이 숫자로만 된 날짜 형식(예: %Y%m%d%H%M)의 지시자별 (구성요소, 자릿수)
+COMPACT_DATETIME_FIELDS = {"%Y": ("year", 4), "%m": ("month", 2), "%d": ("day", 2), "%H": ("hour", 2), "%M": ("minute", 2), "%S": ("second", 2)}
+
+@lru_cache(maxsize = None)
+def compact_datetime_layout(format):
+    """
+    숫자로만 된 날짜 형식의 전체 자릿수와 구성요소별 (이름, 나눌 값, 자릿수)를 반환합니다. 형식마다 한 번만 계산합니다.
+    COMPACT_DATETIME_FIELDS에 없는 지시자나 구분기호가 있는 형식이면 None을 반환합니다.
+    """
+    tokens = [format[i:i + 2] for i in range(0, len(format), 2)]
+    if len(format) % 2 or any(token not in COMPACT_DATETIME_FIELDS for token in tokens):
+        return None
+    width = sum(COMPACT_DATETIME_FIELDS[token][1] for token in tokens)
+    fields, end = [], 0
+    for token in tokens:
+        name, digits = COMPACT_DATETIME_FIELDS[token]
+        end += digits
+        fields.append((name, 10 ** (width - end), 10 ** digits))
+    return width, tuple(fields)
+
+# 원천 데이터의 날짜 문자열을 한 번에 datetime으로 변환하는 함수 정의
+def parse_datetime(values, format = "%Y%m%d%H%M%S"):
+    """
+    날짜 문자열 Series를 format에 따라 datetime Series로 반환합니다. 형식에 맞지 않거나 존재하지 않는 날짜는 NaT가 됩니다.
+    201903081045와 같이 숫자로만 된 형식은 행마다 문자열을 자르지 않고 숫자로 한 번에 변환한 뒤 연, 월, 일, 시, 분, 초를 계산하며,
+    NaN이 있어 float로 읽힌 값(201903081045.0)도 변환합니다.
+    구분기호가 있는 형식은 오전/오후를 AM/PM으로 바꾼 뒤 pd.to_datetime으로 변환합니다.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    text = values.astype(str).str.strip().where(values.notna())
+    layout = compact_datetime_layout(format)
+    if layout is None:
+        text = text.str.replace("오전", "AM", regex = False).str.replace("오후", "PM", regex = False)
+        return pd.to_datetime(text, format = format, errors = "coerce", cache = True)
+
+    width, fields = layout
+    text = text.str.replace(r"\.0$", "", regex = True)
+    number = pd.to_numeric(text.where(text.str.len() == width), errors = "coerce")
+    components = pd.DataFrame({"year": 1970, "month": 1, "day": 1}, index = values.index)
+    for name, divisor, modulus in fields:
+        components[name] = (number // divisor) % modulus
+    return pd.to_datetime(components, errors = "coerce")
 
 class DataTransformer:
     """
@@ -506,9 +575,8 @@ class VisitOccurrenceTransformer(DataTransformer):
 
             # 원천 데이터 범위 설정
             # 201903081045같은 데이터가 2019-03-08 10:04:05로 바뀌는 문제 발견 
-            source[self.medtime] = source[self.medtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source["visit_source_key"] = source[self.person_source_value] + source[self.medtime] + 'O' + source[self.meddept]
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
+            source["visit_source_key"] = source[self.person_source_value] + source[self.medtime].dt.strftime("%Y-%m-%d %H:%M") + 'O' + source[self.meddept]
             source = source[source[self.medtime] <= self.data_range]
             logging.debug(f"데이터 범위 조건 적용 후 원천 데이터 row수: {len(source)}")
 
@@ -531,9 +599,8 @@ class VisitOccurrenceTransformer(DataTransformer):
             
 
             # 원천 데이터2 범위 설정
-            source2[self.admtime] = source2[self.admtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source2["visit_source_key"] = source2[self.person_source_value] + source2[self.admtime] + source2[self.visit_source_value] + source2[self.meddept]
-            source2[self.admtime] = pd.to_datetime(source2[self.admtime], errors = "coerce")
+            source2[self.admtime] = parse_datetime(source2[self.admtime], "%Y%m%d%H%M")
+            source2["visit_source_key"] = source2[self.person_source_value] + source2[self.admtime].dt.strftime("%Y-%m-%d %H:%M") + source2[self.visit_source_value] + source2[self.meddept]
             source2 = source2[source2[self.admtime] <= self.data_range]
             logging.debug(f"데이터 범위 조건 적용 후 원천 데이터2 row수: {len(source2)}")
 
@@ -619,8 +686,8 @@ class VisitOccurrenceTransformer(DataTransformer):
                 "visit_concept_id": np.select(visit_condition, visit_concept_id, default = self.no_matching_concept[0]),
                 "visit_start_date": source2[self.admtime].dt.date ,
                 "visit_start_datetime": source2[self.admtime],
-                "visit_end_date": source2[self.dschtime].apply(lambda x: datetime.strptime(x, '%Y%m%d%H%M%S').strftime('%Y-%m-%d')),
-                "visit_end_datetime": source2[self.dschtime].apply(lambda x: datetime.strptime(x, '%Y%m%d%H%M%S')), #pd.to_datetime(source2[dschtime], format="%Y%m%d%H%M%S"),
+                "visit_end_date": parse_datetime(source2[self.dschtime]).dt.strftime('%Y-%m-%d'),
+                "visit_end_datetime": parse_datetime(source2[self.dschtime]),
                 "visit_type_concept_id": np.select([source2["visit_type_concept_id"].notna()], [source2["visit_type_concept_id"]], default = self.no_matching_concept[0]),
                 "visit_type_concept_id_name": np.select([source2["concept_name"].notna()], [source2["concept_name"]], default=self.no_matching_concept[1]),
                 "provider_id": source2["provider_id"],
@@ -722,13 +789,8 @@ class VisitDetailTransformer(DataTransformer):
             logging.debug(f"조건 적용 후 원천 데이터 row수: {len(source)}")
 
             # 201903081045같은 데이터가 2019-03-08 10:04:05로 바뀌는 문제 발견 
-            def convert_datetime_format(x):
-                if pd.isna(x):  # x가 NaN인지 확인
-                    return x
-                else:
-                    return x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:]
-            source[self.visit_detail_start_datetime] = source[self.visit_detail_start_datetime].apply(convert_datetime_format)
-            source[self.visit_detail_end_datetime] = source[self.visit_detail_end_datetime].apply(convert_datetime_format)
+            source[self.visit_detail_start_datetime] = parse_datetime(source[self.visit_detail_start_datetime], "%Y%m%d%H%M")
+            source[self.visit_detail_end_datetime] = parse_datetime(source[self.visit_detail_end_datetime], "%Y%m%d%H%M")
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
@@ -758,9 +820,6 @@ class VisitDetailTransformer(DataTransformer):
             source = pd.merge(source, concept_etc, left_on="visit_detail_type_concept_id", right_on='concept_id')
             logging.debug(f"CDM 테이블과 결합 후 원천 데이터 row수: {len(source)}")
 
-            # 컬럼을 datetime형태로 변경
-            source[self.visit_detail_start_datetime] = pd.to_datetime(source[self.visit_detail_start_datetime])
-            source[self.visit_detail_end_datetime] = pd.to_datetime(source[self.visit_detail_end_datetime], errors="coerce")
             source["visit_start_datetime"] = pd.to_datetime(source["visit_start_datetime"])
             source["visit_end_datetime"] = pd.to_datetime(source["visit_end_datetime"])
             
@@ -879,6 +938,29 @@ class LocalKCDTransformer(DataTransformer):
             logging.error(f"{self.table} 테이블 변환 중 오류:\n {e}", exc_info=True)
             raise
     
+    def match_diagcode(self, diagcode, concept_kcd):
+        """
+        진단코드별로 앞에서부터 가장 길게 일치하는 KCD7 concept_code의 concept 행을 반환합니다.
+        concept_code로 인덱스를 한 번 만든 뒤 진단코드 길이별로 앞부분을 잘라 한 번에 조회하므로
+        진단코드마다 concept 테이블 전체를 검색하지 않습니다.
+        일치하는 코드가 없으면 모든 컬럼이 빈 값인 행을 반환하며, 결과의 순서는 diagcode와 같습니다.
+        """
+        # 같은 concept_code가 여러 개면 첫 번째 행을 사용
+        concept_kcd = concept_kcd[concept_kcd[self.concept_code].notna()].drop_duplicates(subset = self.concept_code).reset_index(drop = True)
+        code_index = pd.Index(concept_kcd[self.concept_code])
+
+        matched_position = np.full(len(diagcode), -1)
+        max_length = diagcode.str.len().max()
+        max_length = 0 if pd.isna(max_length) else int(max_length)
+
+        # 긴 앞부분부터 조회하여 아직 매칭되지 않은 코드에만 결과 반영
+        for length in range(max_length, 0, -1):
+            position = code_index.get_indexer(diagcode.str[:length])
+            unmatched = (matched_position == -1) & (position != -1)
+            matched_position[unmatched] = position[unmatched]
+
+        return concept_kcd.reindex(matched_position)
+
     def process_source(self):
         """
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
@@ -897,24 +979,15 @@ class LocalKCDTransformer(DataTransformer):
             concept_kcd[self.concept_code] = concept_kcd[self.concept_code].str.replace('.', '')
             concept_kcd = concept_kcd[concept_kcd[self.vocabulary_id] == 'KCD7']
 
-            # 3. 매칭 함수 정의
-            def match_diagcode(diagcode, concept_kcd):
-                for i in range(len(diagcode), 0, -1):
-                    sub_diagcode = diagcode[:i]
-                    match = concept_kcd[concept_kcd[self.concept_code] == sub_diagcode]
-                    if not match.empty:
-                        return match.iloc[0]
-                return pd.Series([None]*len(concept_kcd.columns), index=concept_kcd.columns)
-
-            # 4. 매칭 수행
-            matched_df = source.apply(lambda row: match_diagcode(row['changed_diagcode'], concept_kcd), axis=1)
+            # 3. 매칭 수행
+            matched_df = self.match_diagcode(source['changed_diagcode'], concept_kcd)
             logging.debug(f'matched_df row수: {len(matched_df)}')
 
-            # 5. 원래 source 매칭 결과 합치기
+            # 4. 원래 source 매칭 결과 합치기
             local_kcd = pd.concat([source.reset_index(drop=True), matched_df.reset_index(drop=True)], axis=1)
             logging.debug(f'원천 데이터와 합친 후 row수: {len(matched_df)}')
 
-            # 6. 필요한 컬럼 선택 및 기본값 설정
+            # 5. 필요한 컬럼 선택 및 기본값 설정
             local_kcd = local_kcd[[self.diagcode, 'changed_diagcode', self.fromdate, self.todate, self.engname, self.korname, self.stdiagcd, self.kcdversion,
                                 self.concept_id, self.concept_name, self.domain_id, self.vocabulary_id, self.concept_class_id, 
                                 self.standard_concept, self.concept_code, self.valid_start_date, self.valid_end_date, self.invalid_reason]]
@@ -995,8 +1068,7 @@ class ConditionOccurrenceTransformer(DataTransformer):
             source["visit_source_key"] = source[self.person_source_value] + source[self.condition_start_datetime].astype(str) + source[self.patfg] + source[self.meddept].apply(lambda x: '' if pd.isna(x) else x)
 
             # 원천에서 조건걸기
-            source[self.condition_start_datetime] = source[self.condition_start_datetime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.condition_start_datetime] = pd.to_datetime(source[self.condition_start_datetime], errors = "coerce")
+            source[self.condition_start_datetime] = parse_datetime(source[self.condition_start_datetime], "%Y%m%d%H%M")
             source = source[source[self.condition_start_datetime] <= self.data_range]
             source = source[source[self.condition_start_datetime].notna()]
             logging.debug(f"조건 적용후 원천 데이터 row수: {len(source)}")
@@ -1328,8 +1400,7 @@ class DrugexposureTransformer(DataTransformer):
                              self.qty, self.cnt, self.dose_unit_source_value, self.drug_source_value_name,
                              self.methodcd, self.age, self.ordseqno, self.dcyn]]
             source["진료일시"] = source[self.medtime]
-            source[self.medtime] = source[self.medtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             source = source[source[self.medtime].notna()]
             logging.info(f"조건 적용후 원천 데이터 row수:, {len(source)}")
 
@@ -1549,19 +1620,15 @@ class MeasurementStexmrstTransformer(DataTransformer):
             # 201903081045같은 데이터가 2019-03-08 10:04:05로 바뀌는 문제 발견하여 분리해서 연결 후 datetime형태로 변경
             # NaN값이 있어 float형 NaN으로 읽는 경우가 있어 .astype(str) 추가
             source["진료일시"] = source[self.medtime]
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
 
-            # value_as_number float형태로 저장되게 값 변경
+            # value_as_number float형태로 저장되게 값 변경하고 비교 연산자, 숫자가 아닌 결과값 분리
             # source["value_as_number"] = source[self.value_source_value].str.extract('(-?\d+\.\d+|\d+)')
-            source["value_as_number"] = source[self.value_source_value].apply(convert_to_numeric)
-            source["value_as_number"] = source["value_as_number"].astype(float)
+            source = pd.concat([source, parse_numeric_value(source[self.value_source_value])], axis = 1)
             # source[self.range_low] = source[self.range_low].str.extract('(-?\d+\.\d+|\d+)')
-            source[self.range_low] = source[self.range_low].apply(convert_to_numeric)
-            source[self.range_low] = source[self.range_low].astype(float)
+            source[self.range_low] = parse_numeric_value(source[self.range_low])["value_as_number"]
             # source[self.range_high] = source[self.range_high].str.extract('(-?\d+\.\d+|\d+)')
-            source[self.range_high] = source[self.range_high].apply(convert_to_numeric)
-            source[self.range_high] = source[self.range_high].astype(float)
+            source[self.range_high] = parse_numeric_value(source[self.range_high])["value_as_number"]
 
             logging.debug(f'조건적용 후 원천 데이터 row수: {len(source)}')
             
@@ -1638,39 +1705,18 @@ class MeasurementStexmrstTransformer(DataTransformer):
             source = pd.merge(source, concept_etc, left_on = "measurement_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_measurement_type'))
             logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
 
-            # operator_concept_id 만들고 operator_concept_id_name 기반 만들기
-            operator_condition = [
-                source[self.value_source_value].isin([">"])
-                , source[self.value_source_value].isin([">="])
-                , source[self.value_source_value].isin(["="])
-                , source[self.value_source_value].isin(["<="])
-                , source[self.value_source_value].isin(["<"])
-                    # source[self.value_source_value].str.contains(">", case = False, na = False)
-                    # , source[self.value_source_value].str.contains(">=", case = False, na = False)
-                    # , source[self.value_source_value].str.contains("=", case = False, na = False)
-                    # , source[self.value_source_value].str.contains("<=", case = False, na = False)
-                    # , source[self.value_source_value].str.contains("<", case = False, na = False)
-            ]
-            operator_value = [
-                    4172704
-                    , 4171755
-                    , 4172703
-                    , 4171754
-                    , 4171756
-            ]
-
-            source["operator_concept_id"] = np.select(operator_condition, operator_value)
+            # operator_concept_id_name 기반 만들기(operator_concept_id는 결과값 변환 시 생성)
             source = pd.merge(source, concept_etc, left_on = "operator_concept_id", right_on="concept_id", how="left", suffixes=('', '_operator'))
             logging.debug(f'concept_etc: operator_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
 
             # value_as_concept_id 만들고 value_as_concept_id_name 기반 만들기
             value_concept_condition = [
-                source[self.value_source_value] == "+",
-                source[self.value_source_value] == "++",
-                source[self.value_source_value] == "+++",
-                source[self.value_source_value] == "++++",
-                source[self.value_source_value].str.lower().str.strip() == "negative",
-                source[self.value_source_value].str.lower().str.strip() == "positive"
+                source["value_text"] == "+",
+                source["value_text"] == "++",
+                source["value_text"] == "+++",
+                source["value_text"] == "++++",
+                source["value_text"].str.lower() == "negative",
+                source["value_text"].str.lower() == "positive"
             ]
             value_concept_value = [
                 4123508
@@ -2054,10 +2100,8 @@ class MeasurementVSTransformer(DataTransformer):
 
             # 원천에서 조건걸기
             source["진료일시"] = source[self.admtime]
-            source[self.admtime] = source[self.admtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.admtime] = pd.to_datetime(source[self.admtime], errors = "coerce")
-            source[self.measurement_datetime] = source[self.measurement_datetime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.measurement_datetime] = pd.to_datetime(source[self.measurement_datetime], errors = "coerce")
+            source[self.admtime] = parse_datetime(source[self.admtime], "%Y%m%d%H%M")
+            source[self.measurement_datetime] = parse_datetime(source[self.measurement_datetime], "%Y%m%d%H%M")
             source = source[(source[self.admtime] <= pd.to_datetime(self.data_range))]
             logging.debug(f'조건 적용후 원천 데이터 row수: {len(source)}')
 
@@ -2768,11 +2812,9 @@ class ProcedureOrderTransformer(DataTransformer):
             source["실시일시"] = source[self.exectime]
 
             source[self.orddate] = pd.to_datetime(source[self.orddate], format="%Y%m%d")
-            source[self.exectime] = source[self.exectime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
+            source[self.exectime] = parse_datetime(source[self.exectime], "%Y%m%d%H%M")
             # source[self.exectime] = pd.to_datetime(source[self.exectime], format="%Y%m%d%H%M%S", errors = "coerce")
-            source[self.exectime] = pd.to_datetime(source[self.exectime], errors = "coerce")
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             source[self.opdate] = pd.to_datetime(source[self.opdate], format = "%Y%m%d")
             source = source[(source[self.orddate] <= pd.to_datetime(self.data_range)) & (source[self.ordclstyp] != "D2")]
 
@@ -2997,10 +3039,8 @@ class ProcedureStexmrstTransformer(DataTransformer):
             
             source[self.orddate] = pd.to_datetime(source[self.orddate])
             source = source[(source[self.orddate] <= pd.to_datetime(self.data_range)) & (~source[self.procedure_source_value].str[:1].isin(["L", "P"])) ]
-            source[self.exectime] = source[self.exectime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.exectime] = pd.to_datetime(source[self.exectime], errors = "coerce")
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.exectime] = parse_datetime(source[self.exectime], "%Y%m%d%H%M")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             
             # value_as_number float형태로 저장되게 값 변경
             source[self.value_source_value] = source[self.value_source_value].str.extract('(\d+\.\d+|\d+)')
@@ -6,12 +6,58 @@ from datetime import datetime
 import logging
 import warnings
 import inspect
+from functools import lru_cache
 
 # 현재 프로세스의 PID를 얻습니다.
 pid = os.getpid()
 # 현재 프로세스 객체를 얻습니다.
 ps = psutil.Process(pid)
 
+# 구분기호 없이 숫자로만 된 날짜 형식(예: %Y%m%d%H%M)의 지시자별 (구성요소, 자릿수)
+COMPACT_DATETIME_FIELDS = {"%Y": ("year", 4), "%m": ("month", 2), "%d": ("day", 2), "%H": ("hour", 2), "%M": ("minute", 2), "%S": ("second", 2)}
+
+@lru_cache(maxsize = None)
+def compact_datetime_layout(format):
+    """
+    숫자로만 된 날짜 형식의 전체 자릿수와 구성요소별 (이름, 나눌 값, 자릿수)를 반환합니다. 형식마다 한 번만 계산합니다.
+    COMPACT_DATETIME_FIELDS에 없는 지시자나 구분기호가 있는 형식이면 None을 반환합니다.
+    """
+    tokens = [format[i:i + 2] for i in range(0, len(format), 2)]
+    if len(format) % 2 or any(token not in COMPACT_DATETIME_FIELDS for token in tokens):
+        return None
+    width = sum(COMPACT_DATETIME_FIELDS[token][1] for token in tokens)
+    fields, end = [], 0
+    for token in tokens:
+        name, digits = COMPACT_DATETIME_FIELDS[token]
+        end += digits
+        fields.append((name, 10 ** (width - end), 10 ** digits))
+    return width, tuple(fields)
+
+# 원천 데이터의 날짜 문자열을 한 번에 datetime으로 변환하는 함수 정의
+def parse_datetime(values, format = "%Y%m%d%H%M%S"):
+    """
+    날짜 문자열 Series를 format에 따라 datetime Series로 반환합니다. 형식에 맞지 않거나 존재하지 않는 날짜는 NaT가 됩니다.
+    201903081045와 같이 숫자로만 된 형식은 행마다 문자열을 자르지 않고 숫자로 한 번에 변환한 뒤 연, 월, 일, 시, 분, 초를 계산하며,
+    NaN이 있어 float로 읽힌 값(201903081045.0)도 변환합니다.
+    구분기호가 있는 형식은 오전/오후를 AM/PM으로 바꾼 뒤 pd.to_datetime으로 변환합니다.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    text = values.astype(str).str.strip().where(values.notna())
+    layout = compact_datetime_layout(format)
+    if layout is None:
+        text = text.str.replace("오전", "AM", regex = False).str.replace("오후", "PM", regex = False)
+        return pd.to_datetime(text, format = format, errors = "coerce", cache = True)
+
+    width, fields = layout
+    text = text.str.replace(r"\.0$", "", regex = True)
+    number = pd.to_numeric(text.where(text.str.len() == width), errors = "coerce")
+    components = pd.DataFrame({"year": 1970, "month": 1, "day": 1}, index = values.index)
+    for name, divisor, modulus in fields:
+        components[name] = (number // divisor) % modulus
+    return pd.to_datetime(components, errors = "coerce")
+
 class DataTransformer:
     """
     기본 데이터 변환 클래스.
@@ -474,9 +520,8 @@ class VisitOccurrenceTransformer(DataTransformer):
 
             # 원천 데이터 범위 설정
             # 201903081045같은 데이터가 2019-03-08 10:04:05로 바뀌는 문제 발견 
-            source[self.medtime] = source[self.medtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source["visit_source_key"] = source[self.person_source_value] + source[self.medtime] + 'O' + source[self.meddept]
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
+            source["visit_source_key"] = source[self.person_source_value] + source[self.medtime].dt.strftime("%Y-%m-%d %H:%M") + 'O' + source[self.meddept]
             source = source[source[self.medtime] <= self.data_range]
             logging.debug(f"데이터 범위 조건 적용 후 원천 데이터 row수: {len(source)}, {self.memory_usage}")
 
@@ -499,9 +544,8 @@ class VisitOccurrenceTransformer(DataTransformer):
             
 
             # 원천 데이터2 범위 설정
-            source2[self.admtime] = source2[self.admtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source2["visit_source_key"] = source2[self.person_source_value] + source2[self.admtime] + source2[self.visit_source_value] + source2[self.meddept]
-            source2[self.admtime] = pd.to_datetime(source2[self.admtime], errors = "coerce")
+            source2[self.admtime] = parse_datetime(source2[self.admtime], "%Y%m%d%H%M")
+            source2["visit_source_key"] = source2[self.person_source_value] + source2[self.admtime].dt.strftime("%Y-%m-%d %H:%M") + source2[self.visit_source_value] + source2[self.meddept]
             source2 = source2[source2[self.admtime] <= self.data_range]
             logging.debug(f"데이터 범위 조건 적용 후 원천 데이터2 row수: {len(source2)}, {self.memory_usage}")
 
@@ -587,8 +631,8 @@ class VisitOccurrenceTransformer(DataTransformer):
                 "visit_concept_id": np.select(visit_condition, visit_concept_id, default = 0),
                 "visit_start_date": source2[self.admtime].dt.date ,
                 "visit_start_datetime": source2[self.admtime],
-                "visit_end_date": source2[self.dschtime].apply(lambda x: datetime.strptime(x, '%Y%m%d%H%M%S').strftime('%Y-%m-%d')),
-                "visit_end_datetime": source2[self.dschtime].apply(lambda x: datetime.strptime(x, '%Y%m%d%H%M%S')), #pd.to_datetime(source2[dschtime], format="%Y%m%d%H%M%S"),
+                "visit_end_date": parse_datetime(source2[self.dschtime]).dt.strftime('%Y-%m-%d'),
+                "visit_end_datetime": parse_datetime(source2[self.dschtime]),
                 "visit_type_concept_id": np.select([source2[self.meddept] == "CTC"], [44818519], default = 44818518),
                 "visit_type_concept_id_name": source2["concept_name"],
                 "provider_id": source2["provider_id"],
@@ -842,8 +886,7 @@ class ConditionOccurrenceTransformer(DataTransformer):
             source["visit_source_key"] = source[self.person_source_value] + source[self.condition_start_datetime].astype(str) + source[self.patfg] + source[self.meddept]
 
             # 원천에서 조건걸기
-            source[self.condition_start_datetime] = source[self.condition_start_datetime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.condition_start_datetime] = pd.to_datetime(source[self.condition_start_datetime], errors = "coerce")
+            source[self.condition_start_datetime] = parse_datetime(source[self.condition_start_datetime], "%Y%m%d%H%M")
             source = source[source[self.condition_start_datetime] <= pd.to_datetime(self.data_range)]
             source = source[source[self.condition_start_datetime].notna()]
             logging.debug(f"조건 적용후 원천 데이터 row수: {len(source)}, {self.memory_usage}")
@@ -1135,8 +1178,7 @@ class DrugexposureTransformer(DataTransformer):
                              self.meddept, self.provider, self.patfg, self.medtime, self.days_supply,
                              self.qty, self.cnt, self.dose_unit_source_value, self.drug_source_value_name,
                              self.methodcd, self.age, self.ordseqno]]
-            source[self.medtime] = source[self.medtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             source = source[source[self.medtime].notna()]
             logging.info(f"조건 적용후 원천 데이터 row수:, {len(source)}, {self.memory_usage}")
 
@@ -1331,8 +1373,7 @@ class DrugexposureChunkTransformer(DataTransformer):
                              self.meddept, self.provider, self.patfg, self.medtime, self.days_supply,
                              self.qty, self.cnt, self.dose_unit_source_value, self.drug_source_value_name,
                              self.methodcd, self.age, self.ordseqno]]
-            source[self.medtime] = source[self.medtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             source = source[source[self.medtime].notna()]
             logging.info(f"조건 적용후 원천 데이터 row수:, {len(source)}, {self.memory_usage}")
 
@@ -1528,8 +1569,7 @@ class MeasurementStexmrstTransformer(DataTransformer):
             
             # 201903081045같은 데이터가 2019-03-08 10:04:05로 바뀌는 문제 발견하여 분리해서 연결 후 datetime형태로 변경
             # NaN값이 있어 float형 NaN으로 읽는 경우가 있어 .astype(str) 추가
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
 
             # value_as_number float형태로 저장되게 값 변경
             source["value_as_number"] = source[self.value_source_value].str.extract('(-?\d+\.\d+|\d+)')
@@ -1820,8 +1860,7 @@ class MeasurementStexmrstChunkTransformer(DataTransformer):
             
             # 201903081045같은 데이터가 2019-03-08 10:04:05로 바뀌는 문제 발견하여 분리해서 연결 후 datetime형태로 변경
             # NaN값이 있어 float형 NaN으로 읽는 경우가 있어 .astype(str) 추가
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
 
             # value_as_number float형태로 저장되게 값 변경
             source["value_as_number"] = source[self.value_source_value].str.extract('(-?\d+\.\d+|\d+)')
@@ -2300,10 +2339,8 @@ class MeasurementVSTransformer(DataTransformer):
             source["visit_source_key"] = source[self.person_source_value] + source[self.admtime].astype(str) + source[self.patfg] + source[self.meddept]
 
             # 원천에서 조건걸기
-            source[self.admtime] = source[self.admtime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.admtime] = pd.to_datetime(source[self.admtime], errors = "coerce")
-            source[self.measurement_datetime] = source[self.measurement_datetime].apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.measurement_datetime] = pd.to_datetime(source[self.measurement_datetime], errors = "coerce")
+            source[self.admtime] = parse_datetime(source[self.admtime], "%Y%m%d%H%M")
+            source[self.measurement_datetime] = parse_datetime(source[self.measurement_datetime], "%Y%m%d%H%M")
             source = source[(source[self.admtime] <= pd.to_datetime(self.data_range))]
             logging.debug(f'조건 적용후 원천 데이터 row수: {len(source)}, {self.memory_usage}')
 
@@ -2932,10 +2969,8 @@ class ProcedureOrderChunkTransformer(DataTransformer):
 
             # 원천에서 조건걸기
             source[self.orddate] = pd.to_datetime(source[self.orddate], format="%Y%m%d")
-            source[self.exectime] = source[self.exectime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.exectime] = pd.to_datetime(source[self.exectime], format="%Y%m%d%H%M%S", errors = "coerce")
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.exectime] = parse_datetime(source[self.exectime], "%Y%m%d%H%M")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             source[self.opdate] = pd.to_datetime(source[self.opdate], format = "%Y%m%d")
             source = source[(source[self.orddate] <= pd.to_datetime(self.data_range)) & (source[self.ordclstyp] != "D2")]
 
@@ -3123,10 +3158,8 @@ class ProcedureOrderTransformer(DataTransformer):
 
             # 원천에서 조건걸기
             source[self.orddate] = pd.to_datetime(source[self.orddate], format="%Y%m%d")
-            source[self.exectime] = source[self.exectime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.exectime] = pd.to_datetime(source[self.exectime], format="%Y%m%d%H%M%S", errors = "coerce")
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], errors = "coerce")
+            source[self.exectime] = parse_datetime(source[self.exectime], "%Y%m%d%H%M")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             source[self.opdate] = pd.to_datetime(source[self.opdate], format = "%Y%m%d")
             source = source[(source[self.orddate] <= pd.to_datetime(self.data_range)) & (source[self.ordclstyp] != "D2")]
 
@@ -3330,10 +3363,8 @@ class ProcedureStexmrstChunkTransformer(DataTransformer):
 
             source[self.orddate] = pd.to_datetime(source[self.orddate])
             source = source[(source[self.orddate] <= pd.to_datetime(self.data_range)) & (~source[self.procedure_source_value].str[:1].isin(["L", "P"])) ]
-            source[self.exectime] = source[self.exectime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.exectime] = pd.to_datetime(source[self.exectime], format="%Y%m%d%H%M%S", errors = "coerce")
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], format="%Y%m%d%H%M%S", errors = "coerce")
+            source[self.exectime] = parse_datetime(source[self.exectime], "%Y%m%d%H%M")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             
             # value_as_number float형태로 저장되게 값 변경
             source[self.value_source_value] = source[self.value_source_value].str.extract('(\d+\.\d+|\d+)')
@@ -3530,10 +3561,8 @@ class ProcedureStexmrstTransformer(DataTransformer):
 
             source[self.orddate] = pd.to_datetime(source[self.orddate])
             source = source[(source[self.orddate] <= pd.to_datetime(self.data_range)) & (~source[self.procedure_source_value].str[:1].isin(["L", "P"])) ]
-            source[self.exectime] = source[self.exectime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.exectime] = pd.to_datetime(source[self.exectime], format="%Y%m%d%H%M%S", errors = "coerce")
-            source[self.medtime] = source[self.medtime].astype(str).apply(lambda x : x[:4] + "-" + x[4:6] + "-" + x[6:8] + " " + x[8:10] + ":" + x[10:])
-            source[self.medtime] = pd.to_datetime(source[self.medtime], format="%Y%m%d%H%M%S", errors = "coerce")
+            source[self.exectime] = parse_datetime(source[self.exectime], "%Y%m%d%H%M")
+            source[self.medtime] = parse_datetime(source[self.medtime], "%Y%m%d%H%M")
             
             # value_as_number float형태로 저장되게 값 변경
             source[self.value_source_value] = source[self.value_source_value].str.extract('(\d+\.\d+|\d+)')
@@ -1,26 +1,222 @@
 import pandas as pd
 import numpy as np
 import yaml
-import os
+import os, psutil
+import time
 from datetime import datetime
 import logging
 import warnings
 import inspect
-
-# 숫자 값을 유지하고, 문자가 포함된 값을 NaN으로 대체하는 함수 정의
-def convert_to_numeric(value):
+import json
+import io
+import operator
+from functools import reduce, lru_cache, wraps
+from collections import OrderedDict
+from contextlib import contextmanager
+from cdm_schema import get_schema, apply_schema, validate_schema, build_frame, format_dates
+
+# 결과값 앞에 붙는 비교 연산자별 operator_concept_id
+OPERATOR_CONCEPT_ID = {">": 4172704, ">=": 4171755, "=": 4172703, "<=": 4171754, "<": 4171756}
+
+# 원천 데이터를 읽을 때 적용하는 조건의 연산자
+FILTER_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda values, value: values.isin(value),
+    "not in": lambda values, value: ~values.isin(value)
+}
+
+# 결과값을 숫자, 비교 연산자, 숫자가 아닌 텍스트로 한 번에 나누는 함수 정의
+def parse_numeric_value(values):
+    """
+    결과값 Series를 value_as_number, operator_concept_id, value_text 컬럼의 DataFrame으로 반환합니다.
+    "<0.5", ">=100"과 같이 비교 연산자가 붙은 값, 천 단위 구분기호(,)와 전각 숫자가 포함된 값도 숫자로 변환합니다.
+    비교 연산자가 없거나 숫자로 변환되지 않으면 operator_concept_id는 0이며,
+    숫자로 변환되지 않는 값은 앞뒤 공백을 제거하여 value_text에 남깁니다.
+    기존 변환과 같이 결과값이 "=", ">"처럼 비교 연산자만 있으면 operator_concept_id는 해당 연산자의 concept입니다.
+    """
+    text = values.astype(str).where(values.notna())
+    # 전각 숫자, 기호를 반각으로 변환
+    text = text.str.normalize("NFKC").str.strip()
+    text = text.str.replace("≥", ">=", regex = False).str.replace("≤", "<=", regex = False)
+
+    parts = text.str.extract(r"^(?P<operator>[<>]=?|=)?\s*(?P<number>.*)$")
+    number = parts["number"]
+    thousands = number.str.fullmatch(r"[-+]?\d{1,3}(?:,\d{3})+(?:\.\d+)?", na = False)
+    number = number.where(~thousands, number.str.replace(",", "", regex = False))
+    value_as_number = pd.to_numeric(number, errors = "coerce").astype(float)
+
+    operator_only = parts["number"].eq("")
+    operator_concept_id = parts["operator"].map(OPERATOR_CONCEPT_ID).where(value_as_number.notna() | operator_only).fillna(0).astype(int)
+
+    return pd.DataFrame({
+        "value_as_number": value_as_number,
+        "operator_concept_id": operator_concept_id,
+        "value_text": text.where(value_as_number.isna())
+    }, index = values.index)
+
+# 구분기호 없이 숫자로만 된 날짜 형식(예: %Y%m%d%H%M)의 지시자별 (구성요소, 자릿수)
+COMPACT_DATETIME_FIELDS = {"%Y": ("year", 4), "%m": ("month", 2), "%d": ("day", 2), "%H": ("hour", 2), "%M": ("minute", 2), "%S": ("second", 2)}
+
+@lru_cache(maxsize = None)
+def compact_datetime_layout(format):
+    """
+    숫자로만 된 날짜 형식의 전체 자릿수와 구성요소별 (이름, 나눌 값, 자릿수)를 반환합니다. 형식마다 한 번만 계산합니다.
+    COMPACT_DATETIME_FIELDS에 없는 지시자나 구분기호가 있는 형식이면 None을 반환합니다.
+    """
+    tokens = [format[i:i + 2] for i in range(0, len(format), 2)]
+    if len(format) % 2 or any(token not in COMPACT_DATETIME_FIELDS for token in tokens):
+        return None
+    width = sum(COMPACT_DATETIME_FIELDS[token][1] for token in tokens)
+    fields, end = [], 0
+    for token in tokens:
+        name, digits = COMPACT_DATETIME_FIELDS[token]
+        end += digits
+        fields.append((name, 10 ** (width - end), 10 ** digits))
+    return width, tuple(fields)
+
+# 원천 데이터의 날짜 문자열을 한 번에 datetime으로 변환하는 함수 정의
+def parse_datetime(values, format = "%Y%m%d%H%M%S"):
+    """
+    날짜 문자열 Series를 format에 따라 datetime Series로 반환합니다. 형식에 맞지 않거나 존재하지 않는 날짜는 NaT가 됩니다.
+    201903081045와 같이 숫자로만 된 형식은 행마다 문자열을 자르지 않고 숫자로 한 번에 변환한 뒤 연, 월, 일, 시, 분, 초를 계산하며,
+    NaN이 있어 float로 읽힌 값(201903081045.0)도 변환합니다.
+    구분기호가 있는 형식은 오전/오후를 AM/PM으로 바꾼 뒤 pd.to_datetime으로 변환합니다.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    text = values.astype(str).str.strip().where(values.notna())
+    layout = compact_datetime_layout(format)
+    if layout is None:
+        text = text.str.replace("오전", "AM", regex = False).str.replace("오후", "PM", regex = False)
+        return pd.to_datetime(text, format = format, errors = "coerce", cache = True)
+
+    width, fields = layout
+    text = text.str.replace(r"\.0$", "", regex = True)
+    number = pd.to_numeric(text.where(text.str.len() == width), errors = "coerce")
+    components = pd.DataFrame({"year": 1970, "month": 1, "day": 1}, index = values.index)
+    for name, divisor, modulus in fields:
+        components[name] = (number // divisor) % modulus
+    return pd.to_datetime(components, errors = "coerce")
+
+# 현재 프로세스의 최대 메모리 사용량(MB)을 반환하는 함수 정의
+def peak_rss_mb():
+    """
+    현재 프로세스의 최대 메모리 사용량(MB)을 반환합니다.
+    Windows는 peak_wset, Linux/macOS는 resource 모듈의 ru_maxrss를 사용하며, 둘 다 없으면 현재 사용량을 반환합니다.
+    """
+    memory = psutil.Process().memory_info()
+    peak = getattr(memory, "peak_wset", None)
+    if peak is not None:
+        return peak / 1024**2
     try:
-        # pd.to_numeric을 사용하여 숫자로 변환 시도
-        return pd.to_numeric(value)
-    except ValueError:
-        # 변환이 불가능한 경우 NaN 반환
-        return np.nan
+        import resource
+    except ImportError:
+        return memory.rss / 1024**2
+    # ru_maxrss 단위: Linux는 KB, macOS는 byte
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024**2 if psutil.MACOS else maxrss / 1024
+
+# DataTransformer 메소드의 실행 시간, 메모리 사용량, row수를 실행 보고서에 기록하는 decorator 정의
+def timed(detail = None):
+    """
+    메소드 실행을 DataTransformer.stage로 감싸 실행 보고서에 기록합니다.
+    detail은 보고서에 함께 기록할 인자명(파일명 등)이며, row수는 반환값이 DataFrame이면 반환값, 아니면 첫 번째 DataFrame 인자의 행 수입니다.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            arguments = signature.bind(self, *args, **kwargs).arguments
+            with self.stage(method.__name__, arguments.get(detail) if detail else None) as record:
+                result = method(self, *args, **kwargs)
+                frame = result if isinstance(result, pd.DataFrame) else next((value for value in arguments.values() if isinstance(value, pd.DataFrame)), None)
+                if frame is not None:
+                    record["rows"] = len(frame)
+            return result
+        wrapper.timed = True
+        return wrapper
+    return decorator
+
+class ChunkWriter:
+    """
+    chunk 단위로 변환된 CDM 데이터를 순서대로 하나의 파일에 이어 씁니다.
+    임시 파일에 쓴 뒤 close에서 최종 파일로 바꾸므로 변환 도중 실패하면 기존 파일은 그대로 남습니다.
+    """
+    def __init__(self, path, file_format = "csv", encoding = "utf-8"):
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.file_format = file_format
+        self.encoding = encoding
+        self.parquet_writer = None
+        self.rows = 0
+        self.chunks = 0
+
+    def write(self, df):
+        """
+        DataFrame을 임시 파일 끝에 추가합니다. CSV는 첫 chunk에만 header를 씁니다.
+        """
+        if self.file_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self.parquet_writer is None:
+                table = pa.Table.from_pandas(df, preserve_index = False)
+                self.parquet_writer = pq.ParquetWriter(self.temp_path, table.schema)
+            else:
+                schema = self.parquet_writer.schema
+                # 첫 chunk에서 문자열인 컬럼이 이번 chunk에서 모두 결측이면 float이 되므로 문자열로 맞춤
+                for field in schema:
+                    if pa.types.is_string(field.type) and df[field.name].dtype != object:
+                        df[field.name] = df[field.name].astype(str).where(df[field.name].notna(), None)
+                table = pa.Table.from_pandas(df, schema = schema, preserve_index = False)
+            self.parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.temp_path, mode = 'w' if self.chunks == 0 else 'a', header = self.chunks == 0, index = False, encoding = self.encoding)
+
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self):
+        """
+        임시 파일을 닫고 최종 파일로 바꿉니다.
+        """
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        if self.chunks == 0:
+            logging.warning(f"{self.path}에 저장할 데이터가 없습니다.")
+            return
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """
+        변환 중 오류가 발생한 경우 임시 파일을 삭제합니다.
+        """
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        if os.path.isfile(self.temp_path):
+            os.remove(self.temp_path)
     
 class DataTransformer:
     """
     기본 데이터 변환 클래스.
     설정 파일을 로드하고, CSV 파일 읽기 및 쓰기를 담당합니다.
     """
+    # 한 번의 실행(프로세스) 동안 모든 transformer가 공유하는 CDM 차원 테이블 캐시
+    _dimension_cache = OrderedDict()
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        하위 클래스의 transform, process_source, transform_cdm은 실행 보고서에 기록되도록 timed로 감쌉니다.
+        """
+        super().__init_subclass__(**kwargs)
+        for name in ("transform", "process_source", "transform_cdm"):
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "timed", False):
+                setattr(cls, name, timed()(method))
+
     def __init__(self, config_path):
         self.config = self.load_config(config_path)
         self.setup_logging()
@@ -62,6 +258,71 @@ class DataTransformer:
         self.hospital_code = self.config["hospital_code"]
         self.care_site_fromdate = self.config["care_site_fromdate"]
         self.care_site_todate = self.config["care_site_todate"]
+        self.dimension_cache_mb = self.config.get("dimension_cache_mb", 2048)
+        self.intermediate_format = self.config.get("intermediate_format", "csv")
+        if self.intermediate_format not in ("csv", "parquet"):
+            raise ValueError(f"Invalid intermediate format: {self.intermediate_format}")
+        self.incremental = self.config.get("incremental", False)
+        self.watermark_columns = self.config.get("watermark_columns", [self.frstrgstdt, "LASTUPDTDT"])
+        self.new_watermark = None
+        # chunksize 단위 변환 시 chunk로 나누어 읽을 원천 데이터 파일명(하위 클래스에서 지정)
+        self.stream_source = None
+        # chunksize 단위 변환 중 현재 처리 중인 원천 데이터 chunk(번호)와 한 번만 읽어 두는 나머지 테이블
+        self.current_chunk = None
+        self.chunk_number = None
+        self.broadcast_tables = {}
+        # 원천 데이터를 조건을 적용하며 나누어 읽을 때의 행 수
+        self.read_chunksize = self.config.get("read_chunksize", 1000000)
+        # 테이블 요약 통계 수준(off, basic, full)과 describe를 계산할 표본 행 수, 이번 실행에서 계산한 요약 통계
+        self.summary_level = self.config.get("summary_level", "off")
+        if self.summary_level not in ("off", "basic", "full"):
+            raise ValueError(f"Invalid summary level: {self.summary_level}")
+        self.summary_sample_rows = self.config.get("summary_sample_rows")
+        self.summary = {}
+        # 단계(stage)별 실행 시간, CPU 시간, 메모리 사용량, row수 기록과 현재 실행 중인 단계
+        self.run_report = []
+        self.stage_stack = []
+        # 단계별 row수, 환자수 기록({(단계, 연월): 값}, 연월이 None이면 단계 전체)
+        self.lineage = {}
+        # lineage에 기록할 변환 방식. 증분 변환으로 원천 데이터 일부만 처리하면 incremental
+        self.run_mode = "full"
+
+        # 차원 테이블별 읽기 설정: 파일명, 경로, 인코딩, 사용할 컬럼, 컬럼 타입을 정의한 CDM 테이블(cdm_schema), 추가로 datetime으로 변환할 컬럼
+        # 차원 테이블의 이름, 구분값 컬럼은 병합 후 원천 데이터 행 수만큼 반복되므로 category로, id 컬럼은 Int64로 읽어 메모리를 줄임
+        # 원천 데이터와 병합하는 키 컬럼(*_source_value 등)은 문자열 연산에 사용되므로 문자열로 유지
+        self.dimension_specs = {
+            "person": {
+                "file_name": self.person_data, "path_type": self.cdm_flag, "encoding": None,
+                "columns": ["person_id", "person_source_value", "환자명"],
+                "schema": "person", "datetime_columns": []
+            },
+            "provider": {
+                "file_name": self.provider_data, "path_type": self.cdm_flag, "encoding": None,
+                "columns": ["provider_id", "provider_source_value", "provider_name"],
+                "schema": "provider", "datetime_columns": []
+            },
+            "care_site": {
+                "file_name": self.care_site_data, "path_type": self.cdm_flag, "encoding": None,
+                "columns": ["care_site_id", "care_site_source_value", "place_of_service_source_value", "care_site_name", self.care_site_fromdate, self.care_site_todate],
+                "schema": "care_site", "datetime_columns": [self.care_site_fromdate, self.care_site_todate]
+            },
+            "visit_occurrence": {
+                "file_name": self.visit_data, "path_type": self.cdm_flag, "encoding": None,
+                "columns": ["visit_occurrence_id", "person_id", "visit_start_date", "visit_start_datetime", "visit_end_datetime",
+                            "care_site_id", "visit_source_value", "visit_source_key"],
+                "schema": "visit_occurrence", "datetime_columns": []
+            },
+            "visit_detail": {
+                "file_name": self.visit_detail, "path_type": self.cdm_flag, "encoding": None,
+                "columns": ["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"],
+                "schema": "visit_detail", "datetime_columns": []
+            },
+            "concept_etc": {
+                "file_name": self.concept_etc, "path_type": self.source_flag, "encoding": self.cdm_encoding,
+                "columns": ["concept_id", "concept_name"],
+                "schema": "concept_etc", "datetime_columns": []
+            }
+        }
 
         # 의료기관이 여러개인 경우 의료기관 코드 폴더 생성
         os.makedirs(os.path.join(self.cdm_path, self.hospital_code), exist_ok = True)
@@ -75,41 +336,710 @@ class DataTransformer:
         with open(config_path, 'r', encoding="utf-8") as file:
             return yaml.safe_load(file)
         
-    def read_csv(self, file_name, path_type = 'source', encoding = None, dtype = None):
+    def read_csv(self, file_name, path_type = 'source', encoding = None, dtype = None, chunksize = None, usecols = None, filters = None, schema = None,
+                 optional_columns = None):
         """
         CSV 파일을 읽어 DataFrame으로 반환합니다.
         path_type에 따라 'source' 또는 'CDM' 경로에서 파일을 읽습니다.
+        intermediate_format이 parquet이면 CDM 경로의 파일은 parquet 파일을 읽습니다.
+        chunksize가 있으면 원천 데이터를 chunksize 행씩 읽는 iterator를 반환합니다.
+        usecols가 있으면 해당 컬럼만 읽고, filters가 있으면 read_chunksize 행씩 읽으면서 조건을 적용하므로
+        전체 컬럼, 전체 행의 원천 데이터를 한 번에 메모리에 올리지 않습니다. filters 형식은 apply_filters를 참고합니다.
+        usecols나 filters의 컬럼이 파일에 없으면 오류를 발생시키며, optional_columns는 파일에 있는 경우에만 usecols와 함께 읽습니다.
+        chunksize 단위 변환 중에는 stream_source 대신 현재 chunk를 반환하고,
+        나머지 테이블은 처음 한 번만 읽은 뒤 복사본을 반환합니다.
+        schema(CDM 테이블명)가 있으면 읽은 컬럼을 cdm_schema에 정의된 타입으로 변환합니다.
         """
-        hospital_code = self.hospital_code
+        if schema is not None:
+            df = self.read_csv(file_name, path_type, encoding, dtype, chunksize, usecols, filters, optional_columns = optional_columns)
+            if chunksize:
+                return (apply_schema(chunk, schema) for chunk in df)
+            return apply_schema(df, schema)
+
+        if self.current_chunk is not None:
+            if path_type == self.source_flag and file_name == self.stream_source:
+                if usecols is not None:
+                    self.check_columns(file_name, self.current_chunk.columns, usecols, filters)
+                chunk = self.select_rows(self.current_chunk, usecols, filters, optional_columns)
+                return iter([chunk]) if chunksize else chunk
+            if chunksize is None:
+                key = (file_name, path_type, encoding, str(dtype), str(usecols), str(filters), str(optional_columns))
+                if key not in self.broadcast_tables:
+                    self.broadcast_tables[key] = self.read_file(file_name, path_type, encoding, dtype, usecols = usecols, filters = filters,
+                                                                optional_columns = optional_columns)
+                return self.broadcast_tables[key].copy()
+
+        return self.read_file(file_name, path_type, encoding, dtype, chunksize, usecols, filters, optional_columns)
+
+    @timed("file_name")
+    def read_file(self, file_name, path_type = 'source', encoding = None, dtype = None, chunksize = None, usecols = None, filters = None,
+                  optional_columns = None):
+        """
+        path_type에 따른 경로에서 파일을 읽습니다. read_csv에서 호출됩니다.
+        """
+        read_columns = None
+
         if path_type == "source":
             full_path = os.path.join(self.config["source_path"], file_name + ".csv")
             default_encoding = self.source_encoding
             
         elif path_type == "CDM":
-            if hospital_code :
-                full_path = os.path.join(self.config["CDM_path"], hospital_code, self.diag_condition, file_name + ".csv")
-            elif self.diag_condition:
-                full_path = os.path.join(self.config["CDM_path"], self.diag_condition, file_name + ".csv")
-            else :
-                full_path = os.path.join(self.config["CDM_path"], file_name + ".csv")
+            if self.intermediate_format == "parquet":
+                if chunksize:
+                    raise ValueError("parquet 형식의 CDM 파일은 chunksize 단위로 읽을 수 없습니다.")
+                if usecols is not None:
+                    import pyarrow.parquet as pq
+                    available = pq.read_schema(os.path.join(self.get_cdm_dir(), file_name + ".parquet")).names
+                    read_columns = self.check_columns(file_name, available, usecols, filters, optional_columns)
+                return self.select_rows(self.read_parquet(file_name, dtype = dtype, columns = read_columns), usecols, filters, optional_columns)
+            full_path = os.path.join(self.get_cdm_dir(), file_name + ".csv")
             default_encoding = self.cdm_encoding
         else :
             raise ValueError(f"Invalid path type: {path_type}")
         
         encoding = encoding if encoding else default_encoding
+        if usecols is not None:
+            header = pd.read_csv(full_path, encoding = encoding, nrows = 0).columns
+            read_columns = self.check_columns(file_name, header, usecols, filters, optional_columns)
+
+        if not filters:
+            return pd.read_csv(full_path, dtype = dtype, encoding = encoding, chunksize = chunksize, usecols = read_columns)
+
+        chunks = pd.read_csv(full_path, dtype = dtype, encoding = encoding, chunksize = chunksize if chunksize else self.read_chunksize, usecols = read_columns)
+        chunks = (self.select_rows(chunk, usecols, filters, optional_columns) for chunk in chunks)
+        if chunksize:
+            return chunks
+        chunks = list(chunks)
+        if not chunks:
+            return pd.DataFrame(columns = read_columns)
+        return pd.concat(chunks, ignore_index = True)
+
+    def apply_filters(self, df, filters):
+        """
+        filters의 조건을 모두 만족하는 행만 반환합니다.
+        조건은 (컬럼, 연산자, 값) 형식이며 연산자는 "==", "!=", "in", "not in"과
+        날짜로 변환하여 비교하는 "<", "<=", ">", ">="(예: (orddate, "<=", data_range))입니다.
+        """
+        mask = pd.Series(True, index = df.index)
+        for column, op, value in filters:
+            values = df[column]
+            if op in ("<", "<=", ">", ">="):
+                values = pd.to_datetime(values)
+                value = pd.to_datetime(value)
+            mask &= FILTER_OPERATORS[op](values, value)
+        return df[mask]
+
+    def check_columns(self, file_name, available, usecols, filters = None, optional_columns = None):
+        """
+        usecols와 filters의 컬럼 중 available(파일의 컬럼)에 없는 컬럼이 있으면 오류를 발생시키고,
+        available에 있는 optional_columns를 더한 읽을 컬럼 목록을 반환합니다.
+        """
+        columns = list(dict.fromkeys(list(usecols) + [column for column, _, _ in filters or []]))
+        missing = [column for column in columns if column not in available]
+        if missing:
+            raise ValueError(f"{file_name} 파일에 없는 컬럼입니다: {missing}")
+        return columns + [column for column in dict.fromkeys(optional_columns or []) if column in available and column not in columns]
+
+    def select_rows(self, df, usecols = None, filters = None, optional_columns = None):
+        """
+        filters의 조건을 적용한 뒤 usecols 컬럼과 optional_columns 중 df에 있는 컬럼만 남깁니다.
+        """
+        if filters:
+            df = self.apply_filters(df, filters)
+        if usecols is not None:
+            df = df[[column for column in dict.fromkeys(list(usecols) + list(optional_columns or [])) if column in df.columns]]
+        return df
+
+    def read_parquet(self, file_name, dtype = None, columns = None):
+        """
+        CDM 경로의 parquet 파일을 읽어 DataFrame으로 반환합니다.
+        dtype이 str이면 CSV로 읽을 때와 같도록 datetime 컬럼을 제외한 컬럼을 문자열로 변환하며, 결측값은 그대로 유지합니다.
+        """
+        df = pd.read_parquet(os.path.join(self.get_cdm_dir(), file_name + ".parquet"), columns = columns)
+
+        if dtype == "str" or dtype is str:
+            for col in df.columns:
+                if pd.api.types.is_datetime64_any_dtype(df[col]) or df[col].dtype == object:
+                    continue
+                # 결측값이 있는 정수 컬럼이 float로 저장된 경우 CSV와 같이 소수점이 붙은 문자열이 되지 않도록 정수로 변환
+                if pd.api.types.is_float_dtype(df[col]) and (df[col].dropna() % 1 == 0).all():
+                    df[col] = df[col].astype("Int64")
+                df[col] = df[col].astype(str).where(df[col].notna(), np.nan)
+        elif dtype is not None:
+            df = df.astype(dtype)
+
+        return df
+
+    def get_file_path(self, file_name, path_type):
+        """
+        path_type('source' 또는 'CDM')에 따른 파일의 절대 경로를 반환합니다.
+        """
+        if path_type == self.source_flag:
+            return os.path.abspath(os.path.join(self.config["source_path"], file_name + ".csv"))
+        return os.path.abspath(self.get_cdm_file(file_name))
 
-        return pd.read_csv(full_path, dtype = dtype, encoding = encoding)
+    def get_cdm_dir(self):
+        """
+        의료기관 코드와 상병조건에 따른 CDM 데이터 저장 경로를 반환합니다.
+        """
+        if self.hospital_code :
+            return os.path.join(self.config["CDM_path"], self.hospital_code, self.diag_condition)
+        elif self.diag_condition:
+            return os.path.join(self.config["CDM_path"], self.diag_condition)
+        else :
+            return self.config["CDM_path"]
+
+    @timed("name")
+    def read_dimension(self, name, columns = None):
+        """
+        person, provider, care_site, visit_occurrence, visit_detail, concept_etc 테이블을 반환합니다.
+        처음 요청될 때 한 번만 필요한 컬럼만 읽어 CDM 테이블 정의(cdm_schema)에 따라 타입을 변환하여 캐시에 저장하며,
+        이후 요청에는 캐시된 테이블의 복사본을 반환하므로 호출한 쪽에서 수정해도 캐시에는 영향이 없습니다.
+        캐시는 파일의 절대 경로와 수정 시각으로 구분하므로 설정(경로)이 다르거나 파일이 다시 저장되면 새로 읽습니다.
+        """
+        spec = self.dimension_specs[name]
+        path = self.get_file_path(spec["file_name"], spec["path_type"])
+        key = (name, path, os.stat(path).st_mtime_ns if os.path.exists(path) else None)
+        cache = DataTransformer._dimension_cache
+
+        if key in cache:
+            cache.move_to_end(key)
+            df = cache[key]
+            logging.debug(f"{name} 테이블 캐시 사용")
+        else:
+            df = self.read_csv(spec["file_name"], path_type = spec["path_type"], dtype = self.source_dtype, encoding = spec["encoding"],
+                               usecols = spec["columns"], schema = spec["schema"])
+            df = df[spec["columns"]].copy()
+            for col in spec["datetime_columns"]:
+                df[col] = pd.to_datetime(df[col], errors = "coerce")
+            self.cache_dimension(key, df)
+
+        columns = columns if columns else spec["columns"]
+        return df[columns].copy()
 
+    def cache_dimension(self, key, df):
+        """
+        차원 테이블을 캐시에 저장합니다.
+        캐시 전체 크기가 dimension_cache_mb를 넘으면 가장 오래 사용되지 않은 테이블부터 제거합니다.
+        """
+        budget = self.dimension_cache_mb * 1024 * 1024
+        df_size = df.memory_usage(deep = True).sum()
+        if df_size > budget:
+            logging.debug(f"{key[0]} 테이블 크기({df_size / 1024**2:.1f}MB)가 캐시 한도를 넘어 캐시하지 않습니다.")
+            return
+
+        cache = DataTransformer._dimension_cache
+        cache[key] = df
+        cache_size = sum(cached.memory_usage(deep = True).sum() for cached in cache.values())
+        while cache_size > budget:
+            evicted_key, evicted = cache.popitem(last = False)
+            cache_size -= evicted.memory_usage(deep = True).sum()
+            logging.debug(f"{evicted_key[0]} 테이블 캐시에서 제거")
+
+    def evict_dimension(self, file_name):
+        """
+        CDM 경로의 파일명이 같은 차원 테이블을 캐시에서 제거합니다. CDM 테이블을 새로 저장할 때 호출됩니다.
+        """
+        path = self.get_file_path(file_name, self.cdm_flag)
+        cache = DataTransformer._dimension_cache
+        for key in [key for key in cache if key[1] == path]:
+            del cache[key]
+
+    @classmethod
+    def clear_dimension_cache(cls):
+        """
+        차원 테이블 캐시를 비웁니다.
+        """
+        cls._dimension_cache.clear()
+
+    @timed("date_column")
+    def merge_valid_period(self, source, mapping, left_on, right_on, date_column, fromdate = None, todate = None, suffixes = ('', '_y')):
+        """
+        코드 매핑 테이블을 사용기간(fromdate ~ todate)을 고려하여 원천 데이터와 병합합니다.
+        코드(left_on/right_on)별로 date_column 시점 이전에 시작된 가장 최근 버전 하나만 merge_asof로 찾으므로 코드의 과거 버전 수만큼 행이 늘어나지 않습니다.
+        찾은 버전의 종료일이 date_column 이전이면 사용기간이 겹치는 이전 버전 중 date_column을 포함하는 가장 최근 버전을 사용합니다.
+        기존 merge 후 날짜 필터와 같이 매핑 테이블에 없는 코드는 그대로 남기고,
+        코드는 있으나 사용기간에 해당하는 버전이 없는 행은 제외합니다.
+        사용기간이 없는 경우 1900-01-01 ~ 2099-12-31로 간주합니다.
+        """
+        fromdate = fromdate if fromdate else self.fromdate
+        todate = todate if todate else self.todate
+        left_on = [left_on] if isinstance(left_on, str) else list(left_on)
+        right_on = [right_on] if isinstance(right_on, str) else list(right_on)
+
+        mapping = mapping.copy()
+        mapping[fromdate] = mapping[fromdate].fillna(pd.to_datetime('1900-01-01'))
+        mapping[todate] = mapping[todate].fillna(pd.to_datetime('2099-12-31'))
+        mapping = mapping.dropna(subset = right_on).sort_values(fromdate)
+
+        # 병합 후 원천 데이터의 순서를 유지하기 위한 행 번호
+        source = source.reset_index(drop = True)
+        source["_row_order"] = np.arange(len(source))
+
+        # nullable 정수(Int64) 키는 merge_asof의 by 컬럼으로 사용할 수 있도록 int64로 변환
+        # 매핑 테이블의 키 결측값은 위에서 제외하고, 원천 데이터의 키 결측값은 매핑 테이블에 없는 코드로 처리한 뒤 변환
+        for left, right in zip(left_on, right_on):
+            if pd.api.types.is_extension_array_dtype(mapping[right]) and pd.api.types.is_integer_dtype(mapping[right]):
+                mapping[right] = mapping[right].astype(np.int64)
+
+        if len(left_on) == 1:
+            has_code = source[left_on[0]].isin(mapping[right_on[0]])
+        else:
+            has_code = pd.MultiIndex.from_frame(source[left_on]).isin(pd.MultiIndex.from_frame(mapping[right_on]))
+        has_code = has_code & source[left_on].notna().all(axis = 1).to_numpy()
+
+        # 매핑 테이블에 없는 코드는 사용기간 조건 없이 유지
+        unmatched = source[~has_code]
+        # 코드는 있으나 기준일이 없는 행은 사용기간 조건을 만족할 수 없으므로 제외
+        matched = source[has_code & source[date_column].notna()].sort_values(date_column)
+        for left, right in zip(left_on, right_on):
+            if pd.api.types.is_extension_array_dtype(matched[left]) and pd.api.types.is_integer_dtype(matched[left]):
+                matched[left] = matched[left].astype(np.int64)
+
+        merged = pd.merge_asof(matched, mapping, left_on = date_column, right_on = fromdate, left_by = left_on, right_by = right_on,
+                               direction = "backward", suffixes = suffixes)
+        covered = merged[date_column] <= merged[todate]
+
+        # 사용기간이 겹치는 버전이 있으면 가장 최근에 시작된 버전이 끝난 뒤에도 이전 버전이 기준일을 포함할 수 있으므로
+        # 종료일 조건을 만족하지 않는 행은 기존과 같이 merge 후 날짜 필터로 다시 찾아 기준일을 포함하는 가장 최근 버전을 사용
+        retry = matched[matched["_row_order"].isin(merged.loc[~covered, "_row_order"])]
+        fallback = pd.merge(retry, mapping, left_on = left_on, right_on = right_on, how = "inner", suffixes = suffixes)
+        fallback = fallback[(fallback[date_column] >= fallback[fromdate]) & (fallback[date_column] <= fallback[todate])]
+        fallback = fallback.sort_values(fromdate).drop_duplicates("_row_order", keep = "last")
+        merged = pd.concat([merged[covered], fallback.reindex(columns = merged.columns)])
+
+        unmatched = unmatched.reindex(columns = merged.columns)
+        unmatched[fromdate] = pd.to_datetime('1900-01-01')
+        unmatched[todate] = pd.to_datetime('2099-12-31')
+
+        result = pd.concat([merged, unmatched]).sort_values("_row_order")
+        return result.drop(columns = "_row_order").reset_index(drop = True)
+
+    def merge_visit_detail(self, source, visit_detail, date_column):
+        """
+        발생 시점(date_column)이 visit_detail 기간에 포함되는 visit_detail_id를 원천 데이터에 부여합니다.
+        visit_occurrence_id별로 시작일 순으로 정렬된 visit_detail에서 merge_asof로 한 건만 찾으므로
+        visit_detail 수만큼 행이 늘어나지 않습니다.
+        나중에 시작된 짧은 기간(응급실, 전실 등)이 발생 시점 전에 끝났으면 발생 시점을 포함하는 이전의 긴 기간을 부여합니다.
+        visit_detail이 없는 방문의 데이터는 visit_detail_id 없이 유지하고,
+        visit_detail이 있으나 어느 기간에도 포함되지 않는 데이터는 기존과 같이 제외합니다.
+        """
+        source = self.merge_valid_period(source, visit_detail, left_on = "visit_occurrence_id", right_on = "visit_occurrence_id", date_column = date_column,
+                                         fromdate = "visit_detail_start_datetime", todate = "visit_detail_end_datetime", suffixes = ('', '_y'))
+        return source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
+
+    def convert_join_source(self, df, spec):
+        """
+        join_sources에서 사용할 원천 데이터의 datetime_columns를 datetime으로 변환합니다.
+        """
+        df = df.copy()
+        for col in spec.get("datetime_columns", []):
+            df[col] = pd.to_datetime(df[col])
+        return df
+
+    @timed()
+    def join_sources(self, plan):
+        """
+        plan의 원천 데이터를 순서대로 inner join한 결과를 반환합니다.
+        마지막 테이블(fact 테이블, 가장 큰 테이블)을 제외한 테이블을 먼저 join한 뒤 fact 테이블의 join 컬럼으로 index를 만들고,
+        fact 테이블은 chunk 단위로 읽어 index와 join하므로 fact 테이블 전체를 메모리에 올리지 않습니다.
+        chunksize 단위 변환 중에는 index를 처음 한 번만 만들고 stream_source인 fact 테이블은 현재 chunk만 join합니다.
+        각 원천 데이터는 read_csv에서 필요한 컬럼(columns)만 조건(filters)을 적용하며 읽습니다.
+        plan 항목: file_name, columns, datetime_columns, filters, 두 번째 항목부터 left_on, right_on(앞의 결과와 join할 컬럼), suffix
+        """
+        *dimensions, fact = plan
+        index_key = ("join_index", fact["file_name"])
+        index = self.broadcast_tables.get(index_key)
+
+        if index is None:
+            for number, spec in enumerate(dimensions):
+                table = self.read_csv(spec["file_name"], path_type = self.source_flag, dtype = self.source_dtype,
+                                      usecols = spec["columns"], filters = spec.get("filters"))
+                table = self.convert_join_source(table, spec)
+                logging.debug(f'{spec["file_name"]} 조건적용 후 원천 데이터 row수: {len(table)}')
+                if number == 0:
+                    index = table
+                else:
+                    index = pd.merge(index, table, left_on = spec["left_on"], right_on = spec["right_on"], how = "inner", suffixes = ("", spec["suffix"]))
+                    logging.debug(f'{spec["file_name"]} 병합 후 데이터 개수: {len(index)}')
+            index = index.set_index(fact["left_on"])
+            if self.current_chunk is not None:
+                self.broadcast_tables[index_key] = index
+
+        chunks = self.read_csv(fact["file_name"], path_type = self.source_flag, dtype = self.source_dtype,
+                               chunksize = self.read_chunksize, usecols = fact["columns"], filters = fact.get("filters"))
+        joined = [self.convert_join_source(chunk, fact).join(index, on = fact["right_on"], how = "inner", lsuffix = fact["suffix"], rsuffix = "")
+                  for chunk in chunks]
+        source = pd.concat(joined, ignore_index = True)
+
+        # index로 사용한 join 컬럼은 fact 테이블의 컬럼 값으로 채움
+        for left, right in zip(fact["left_on"], fact["right_on"]):
+            if left != right:
+                source[left] = source[right]
+        logging.debug(f'{fact["file_name"]} 병합 후 데이터 개수: {len(source)}')
+        return source
+
+    @timed("filename")
     def write_csv(self, df, file_path, filename, encoding = 'utf-8', hospital_code = None):
         """
         DataFrame을 CSV 파일로 저장합니다.
+        intermediate_format이 parquet이면 datetime, 정수 등 타입을 유지한 parquet 파일로 저장하며,
+        CSV 파일은 모든 변환이 끝난 뒤 publish_csv에서 생성합니다.
         """
         encoding = self.cdm_encoding
         hospital_code = self.hospital_code
+        self.evict_dimension(filename)
         if self.diag_condition:
-            df.to_csv(os.path.join(file_path, hospital_code, self.diag_condition, filename + ".csv"), encoding = encoding, index = False)
+            output_path = os.path.join(file_path, hospital_code, self.diag_condition, filename)
+        else:
+            output_path = os.path.join(file_path, hospital_code, filename)
+
+        df = self.conform_schema(df)
+        if self.intermediate_format == "parquet":
+            self.prepare_parquet(df).to_parquet(output_path + ".parquet", index = False)
+        else:
+            format_dates(df, self.table).to_csv(output_path + ".csv", encoding = encoding, index = False)
+
+    def conform_schema(self, df):
+        """
+        저장할 CDM 데이터를 cdm_schema의 테이블 정의와 비교하여 결측값이 없어야 하는 컬럼을 확인하고,
+        id, concept_id는 Int64, 숫자 컬럼은 float, 날짜 컬럼은 datetime으로 변환한 복사본을 반환합니다.
+        정의가 없는 테이블(local_kcd 등)은 그대로 반환합니다.
+        """
+        unknown = validate_schema(df, self.table)
+        if unknown:
+            logging.debug(f"{self.table} 테이블 정의에 없는 컬럼: {unknown}")
+        return apply_schema(df, self.table, strict = False)
+
+    def log_summary(self, df, name = "cdm"):
+        """
+        summary_level에 따라 df의 요약 통계를 계산하여 CDM 경로의 summary/테이블명.json에 name별로 저장합니다.
+        basic은 행 수와 컬럼별 null 개수, full은 describe 결과까지 저장하며, summary_sample_rows가 있으면 describe는 표본으로 계산합니다.
+        off(기본값)이면 아무것도 계산하지 않습니다. chunksize 단위 변환 중에는 chunk별로 저장합니다.
+        """
+        if self.summary_level == "off":
+            return
+
+        stats = {"rows": len(df), "null_counts": {col: int(count) for col, count in df.isnull().sum().items()}}
+        if self.summary_level == "full" and len(df.columns):
+            sample = df
+            if self.summary_sample_rows and len(df) > self.summary_sample_rows:
+                sample = df.sample(n = self.summary_sample_rows, random_state = 0)
+                stats["sample_rows"] = len(sample)
+            describe = sample.describe(include = "all").T
+            stats["describe"] = json.loads(describe.to_json(orient = "index", date_format = "iso", default_handler = str))
+
+        if self.chunk_number is not None:
+            name = f"{name}_chunk{self.chunk_number}"
+        self.summary[name] = stats
+
+        summary_dir = os.path.join(self.get_cdm_dir(), "summary")
+        os.makedirs(summary_dir, exist_ok = True)
+        summary_path = os.path.join(summary_dir, f"{self.table}.json")
+        with open(summary_path, 'w', encoding="utf-8") as file:
+            json.dump(self.summary, file, ensure_ascii = False, indent = 2, default = str)
+        logging.debug(f"{self.table} 테이블 {name} 요약 통계 저장: {summary_path}")
+
+    def prepare_parquet(self, df):
+        """
+        문자열과 숫자가 섞인 object 컬럼은 parquet로 저장할 수 없으므로 문자열로 통일한 복사본을 반환합니다.
+        """
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return df
+
+    @contextmanager
+    def stage(self, name, detail = None):
+        """
+        with 블록의 실행 시간(wall_seconds), 프로세스 CPU 시간(cpu_seconds), 종료 시점 메모리(rss_mb), 최대 메모리(peak_rss_mb)를
+        run_report에 기록합니다. with 블록에서 반환받은 dict에 rows 등 추가 항목을 기록할 수 있습니다.
+        가장 바깥 단계(transform)가 끝나면 CDM 경로의 report/테이블명.json, csv로 실행 보고서를 저장합니다.
+        """
+        record = {
+            "table": getattr(self, "table", None), "stage": name, "detail": detail,
+            "parent": self.stage_stack[-1] if self.stage_stack else None, "chunk": self.chunk_number,
+            "started_at": datetime.now().isoformat(timespec = "seconds"), "rows": None
+        }
+        self.stage_stack.append(name)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = round(time.perf_counter() - start_wall, 3)
+            record["cpu_seconds"] = round(time.process_time() - start_cpu, 3)
+            record["rss_mb"] = round(psutil.Process().memory_info().rss / 1024**2, 1)
+            record["peak_rss_mb"] = round(peak_rss_mb(), 1)
+            self.stage_stack.pop()
+            self.run_report.append(record)
+            if not self.stage_stack:
+                self.write_run_report()
+                self.write_lineage()
+
+    def write_run_report(self):
+        """
+        run_report를 CDM 경로의 report 폴더에 테이블명.json, 테이블명.csv로 저장합니다.
+        """
+        report_dir = os.path.join(self.get_cdm_dir(), "report")
+        os.makedirs(report_dir, exist_ok = True)
+        report_name = getattr(self, "table", None) or "common"
+        with open(os.path.join(report_dir, f"{report_name}.json"), 'w', encoding="utf-8") as file:
+            json.dump(self.run_report, file, ensure_ascii = False, indent = 2, default = str)
+        pd.DataFrame(self.run_report).to_csv(os.path.join(report_dir, f"{report_name}.csv"), encoding = "utf-8", index = False)
+
+    def record_lineage(self, df, step, date_column = None):
+        """
+        변환 단계(step)별 데이터의 row수와 환자수를 lineage에 기록합니다.
+        환자수는 환자등록번호(person_source_value) 컬럼, 없으면 person_id 컬럼의 고유값 수이며 두 컬럼이 모두 없으면 기록하지 않습니다.
+        date_column이 있으면 해당 날짜의 연월(year_month)별 row수와 환자수도 기록합니다.
+        chunksize 단위 변환 중에는 chunk별 값을 단계별로 합산하며, 환자수는 chunk 간 중복을 제외하여 계산합니다.
+        """
+        person_column = next((col for col in (self.person_source_value, "person_id") if col in df.columns), None)
+        persons = df[person_column] if person_column else pd.Series(index = df.index, dtype = object)
+        groups = [(None, persons)]
+        if date_column:
+            months = pd.to_datetime(df[date_column], errors = "coerce").dt.strftime("%Y-%m")
+            groups += list(persons.groupby(months))
+
+        for month, values in groups:
+            entry = self.lineage.setdefault((step, month), {"rows": 0, "patients": None, "persons": set()})
+            if self.chunk_number is None:
+                entry["rows"] = len(values)
+                entry["patients"] = values.nunique() if person_column else None
+            else:
+                entry["rows"] += len(values)
+                if person_column:
+                    entry["persons"].update(values.dropna().unique())
+                    entry["patients"] = len(entry["persons"])
+
+        total = self.lineage[(step, None)]
+        logging.debug(f"{step} row수: {total['rows']}, 환자수: {total['patients']}")
+
+    def write_lineage(self):
+        """
+        lineage를 CDM 경로의 lineage/테이블명.csv로 저장합니다. QC에서 원천 데이터를 다시 처리하지 않고 row수, 환자수를 확인할 때 사용합니다.
+        """
+        if not self.lineage:
+            return
+        lineage_dir = os.path.join(self.get_cdm_dir(), "lineage")
+        os.makedirs(lineage_dir, exist_ok = True)
+        lineage = pd.DataFrame([{"table": self.table, "run_mode": self.run_mode, "step": step, "year_month": month,
+                                 "rows": entry["rows"], "patients": entry["patients"]}
+                                for (step, month), entry in self.lineage.items()])
+        lineage.to_csv(os.path.join(lineage_dir, f"{self.table}.csv"), encoding = "utf-8", index = False)
+
+    def read_lineage(self, step = "process_source"):
+        """
+        이전 변환에서 저장한 lineage 중 step 단계의 연월(year_month, Period)별 row수(rows), 환자수(patients)를 반환합니다.
+        저장된 lineage가 없거나, 전체 변환(run_mode가 full)의 기록이 아니거나, CDM 파일이 lineage 이후에 다시 저장되었거나,
+        step 단계의 연월별 기록이 없으면 None을 반환합니다.
+        """
+        lineage_path = os.path.join(self.get_cdm_dir(), "lineage", f"{self.table}.csv")
+        if not os.path.isfile(lineage_path):
+            return None
+        cdm_file = self.get_cdm_file(self.output_filename)
+        if os.path.isfile(cdm_file) and os.path.getmtime(cdm_file) > os.path.getmtime(lineage_path):
+            logging.debug(f"{self.table} CDM 파일이 lineage 이후에 저장되어 lineage를 사용하지 않습니다.")
+            return None
+        lineage = pd.read_csv(lineage_path, dtype = {"year_month": str})
+        if "run_mode" not in lineage.columns or (lineage["run_mode"] != "full").any():
+            logging.debug(f"{self.table} lineage가 전체 변환의 기록이 아니어서 사용하지 않습니다.")
+            return None
+        lineage = lineage[(lineage["step"] == step) & lineage["year_month"].notna()]
+        if lineage.empty:
+            return None
+        lineage["year_month"] = pd.PeriodIndex(lineage["year_month"], freq = "M")
+        return lineage[["year_month", "rows", "patients"]].reset_index(drop = True)
+
+    def get_chunksize(self):
+        """
+        테이블 설정의 chunksize, 없으면 공통 설정의 chunksize를 반환합니다.
+        chunk로 나누어 읽을 원천 데이터(stream_source)가 없는 테이블은 항상 전체 데이터를 한 번에 변환합니다.
+        """
+        chunksize = self.cdm_config.get("chunksize", self.config.get("chunksize"))
+        if chunksize and self.stream_source is None:
+            logging.debug(f"{self.table} 테이블은 chunksize 단위 변환을 지원하지 않아 전체 데이터를 변환합니다.")
+            return None
+        return chunksize
+
+    def transform_chunks(self, id_column):
+        """
+        stream_source를 chunksize 행씩 읽어 chunk마다 process_source, transform_cdm을 실행하고 결과를 순서대로 이어 저장합니다.
+        나머지 원천, CDM 테이블은 처음 한 번만 읽으므로 메모리 사용량은 chunk 크기와 나머지 테이블 크기로 제한됩니다.
+        id는 원천 행을 구분하는 자연키로 만든 고정 id이므로 이전 chunk에서 저장한 id가 다시 나오면 같은 원천 행이 여러 chunk에 있는 경우입니다.
+        전체 변환의 중복 제거(drop_duplicates)와 결과가 같도록 처음 저장한 행만 남기고, 제외한 행 수는 경고로 기록합니다.
+        """
+        if self.incremental:
+            raise ValueError(f"{self.table} 테이블은 incremental과 chunksize 단위 변환을 함께 사용할 수 없습니다.")
+
+        chunksize = self.get_chunksize()
+        writer = ChunkWriter(self.get_cdm_file(self.output_filename), self.intermediate_format, self.cdm_encoding)
+        written_ids = np.array([], dtype = np.int64)
+        try:
+            chunks = self.read_csv(self.stream_source, path_type = self.source_flag, dtype = self.source_dtype, chunksize = chunksize)
+            for number, chunk in enumerate(chunks, start = 1):
+                logging.info(f"{self.table} {number}번째 chunk 원천 데이터 row수: {len(chunk)}")
+                self.current_chunk = chunk
+                self.chunk_number = number
+                transformed_data = self.transform_cdm(self.process_source())
+
+                repeated = transformed_data[id_column].isin(written_ids)
+                if repeated.any():
+                    logging.warning(f"{self.table} {number}번째 chunk에서 이전 chunk와 자연키가 같은 {repeated.sum()}행을 중복으로 제외합니다.")
+                    transformed_data = transformed_data[~repeated]
+                written_ids = np.concatenate([written_ids, transformed_data[id_column].to_numpy(dtype = np.int64)])
+
+                transformed_data = self.conform_schema(transformed_data)
+                if self.intermediate_format == "parquet":
+                    transformed_data = self.prepare_parquet(transformed_data)
+                else:
+                    transformed_data = format_dates(transformed_data, self.table)
+                writer.write(transformed_data)
+            writer.close()
+        except Exception:
+            writer.abort()
+            raise
+        finally:
+            self.current_chunk = None
+            self.chunk_number = None
+            self.broadcast_tables.clear()
+
+        self.evict_dimension(self.output_filename)
+        logging.info(f"{self.table} chunk 단위 변환 결과 row수: {writer.rows}")
+
+    def get_cdm_file(self, file_name):
+        """
+        intermediate_format에 따른 CDM 파일 경로를 반환합니다.
+        """
+        extension = ".parquet" if self.intermediate_format == "parquet" else ".csv"
+        return os.path.join(self.get_cdm_dir(), file_name + extension)
+
+    def load_watermarks(self):
+        """
+        테이블별 마지막 변환 시점(원천 데이터의 최종 등록/수정일시)을 반환합니다.
+        """
+        watermark_path = os.path.join(self.get_cdm_dir(), "watermark.json")
+        if not os.path.isfile(watermark_path):
+            return {}
+        with open(watermark_path, 'r', encoding="utf-8") as file:
+            return json.load(file)
+
+    def save_watermark(self):
+        """
+        filter_incremental에서 확인한 원천 데이터의 최종 등록/수정일시를 테이블의 마지막 변환 시점으로 저장합니다.
+        """
+        if self.new_watermark is None or pd.isna(self.new_watermark):
+            return
+        watermarks = self.load_watermarks()
+        watermarks[self.table] = str(self.new_watermark)
+        with open(os.path.join(self.get_cdm_dir(), "watermark.json"), 'w', encoding="utf-8") as file:
+            json.dump(watermarks, file, ensure_ascii = False, indent = 2)
+
+    def filter_incremental(self, source):
+        """
+        incremental이 true이면 마지막 변환 시점 이후(마지막 변환 시점 포함) 등록되거나 수정된 원천 데이터만 반환합니다.
+        등록/수정일시는 watermark_columns 중 원천 데이터에 있는 컬럼의 가장 늦은 값이며,
+        이전 변환 결과가 없으면 전체 데이터를 반환합니다.
+        """
+        columns = [col for col in self.watermark_columns if col in source.columns]
+        if not columns:
+            logging.warning(f"{self.table} 원천 데이터에 등록/수정일시 컬럼({self.watermark_columns})이 없어 증분 변환을 적용하지 않습니다.")
+            return source
+
+        changed_at = pd.concat([pd.to_datetime(source[col], errors = "coerce") for col in columns], axis = 1).max(axis = 1)
+        # chunksize 단위 변환 시에도 전체 chunk 중 가장 늦은 값을 기록
+        self.new_watermark = pd.Series([self.new_watermark, changed_at.max()], dtype = "datetime64[ns]").max()
+
+        previous = self.load_watermarks().get(self.table)
+        if not self.incremental or previous is None or not os.path.isfile(self.get_cdm_file(self.output_filename)):
+            return source
+
+        # 마지막 변환 시점과 같은 초에 등록/수정되었지만 이전 추출에 포함되지 않은 행이 있을 수 있으므로 같은 시점도 다시 읽음
+        # (다시 읽은 행 중 이미 저장된 행과 같은 행은 write_incremental에서 제외하므로 중복되지 않음)
+        source = source[changed_at >= pd.to_datetime(previous)]
+        self.run_mode = "incremental"
+        logging.info(f"{self.table} 마지막 변환 시점({previous}) 이후 등록/수정된 원천 데이터 row수: {len(source)}")
+        return source
+
+    def write_incremental(self, cdm, id_column):
+        """
+        CDM 테이블을 저장하고 마지막 변환 시점을 기록합니다.
+        incremental이 true이고 이전 변환 결과가 있으면, id는 자연키로 만든 고정 id이므로
+        id가 같은 기존 행은 새로 변환한 행으로 바꾸고 나머지 기존 행은 유지하여 합칩니다.
+        마지막 변환 시점과 같은 시점의 원천 데이터를 다시 읽으므로 이미 저장된 행과 값이 같은 행은 제외하며,
+        추가되거나 바뀐 행이 없으면 기존 테이블을 다시 저장하지 않습니다.
+        """
+        if self.incremental and os.path.isfile(self.get_cdm_file(self.output_filename)):
+            existing = self.read_csv(self.output_filename, path_type = self.cdm_flag, dtype = self.source_dtype)
+            existing[id_column] = existing[id_column].astype("int64")
+
+            cdm = cdm[~cdm[id_column].isin(self.find_unchanged_ids(cdm, existing, id_column))]
+            is_updated = cdm[id_column].isin(existing[id_column])
+            logging.info(f"{self.table} 증분 변환: 추가 {(~is_updated).sum()}건, 수정 {is_updated.sum()}건")
+            if cdm.empty:
+                logging.info(f"{self.table} 증분 변환: 추가되거나 바뀐 데이터가 없어 기존 테이블을 유지합니다.")
+                self.save_watermark()
+                return
+
+            existing = existing[~existing[id_column].isin(cdm[id_column])]
+            cdm = pd.concat([existing, cdm], ignore_index = True)
+
+        self.write_csv(cdm, self.cdm_path, self.output_filename)
+        self.save_watermark()
+
+    def find_unchanged_ids(self, cdm, existing, id_column):
+        """
+        cdm 중 id가 같은 existing(문자열로 읽은 기존 CDM 테이블)의 행과 저장했을 때의 값이 모두 같은 행의 id를 반환합니다.
+        """
+        cdm = cdm[cdm[id_column].isin(existing[id_column])]
+        if cdm.empty:
+            return pd.Index([], dtype = np.int64)
+
+        # 저장할 때와 같이 변환한 뒤 문자열로 읽어 기존 테이블과 비교
+        written = pd.read_csv(io.StringIO(format_dates(self.conform_schema(cdm), self.table).to_csv(index = False)), dtype = str)
+        written.index = written[id_column].astype("int64")
+        existing = existing.set_index(existing[id_column]).loc[written.index]
+        columns = [col for col in written.columns if col in existing.columns and col != id_column]
+        written, existing = written[columns], existing[columns]
+        unchanged = ((written == existing) | (written.isna() & existing.isna())).all(axis = 1)
+        return written.index[unchanged.to_numpy()]
+
+    def make_stable_id(self, keys):
+        """
+        자연키로부터 행 순서나 실행 방식(분할, 병렬 실행 등)과 관계없이 항상 같은 63비트 양의 정수 id를 만듭니다.
+        keys는 자연키 Series 또는 자연키 컬럼의 DataFrame이며, 값을 문자열로 바꾸어 ';'로 이은 뒤 해시합니다.
+        자연키는 행마다 달라야 하므로 자연키가 같은 행이 여러 개이거나 서로 다른 자연키의 해시가 겹치면 ValueError를 발생시킵니다.
+        """
+        if isinstance(keys, pd.DataFrame):
+            keys = reduce(lambda left, right: left + ';' + right, [keys[col].astype(str) for col in keys.columns])
         else:
-            df.to_csv(os.path.join(file_path, hospital_code, filename + ".csv"), encoding = encoding, index = False)
+            keys = keys.astype(str)
+
+        if keys.duplicated().any():
+            raise ValueError(f"{self.table} 테이블에서 자연키가 같은 행이 여러 개입니다: {keys[keys.duplicated(keep = False)].head().tolist()}")
+
+        hashed = pd.util.hash_pandas_object(keys, index = False).values & np.uint64(0x7FFFFFFFFFFFFFFF)
+        ids = pd.Series(hashed.astype(np.int64), index = keys.index)
+
+        if ids.duplicated().any():
+            raise ValueError(f"{self.table} 테이블에서 서로 다른 자연키의 id가 겹칩니다: {keys[ids.duplicated(keep = False)].head().tolist()}")
+        return ids
+
+    def publish_csv(self):
+        """
+        intermediate_format이 parquet인 경우 CDM 경로의 parquet 파일을 모두 CSV 파일로 저장합니다.
+        QC 등 CSV 파일을 사용하는 작업 전에 실행합니다.
+        """
+        if self.intermediate_format != "parquet":
+            return
+        
+        cdm_dir = self.get_cdm_dir()
+        for file in sorted(os.listdir(cdm_dir)):
+            if not file.endswith(".parquet"):
+                continue
+            df = format_dates(pd.read_parquet(os.path.join(cdm_dir, file)), file[:-len(".parquet")])
+            df.to_csv(os.path.join(cdm_dir, file[:-len(".parquet")] + ".csv"), encoding = self.cdm_encoding, index = False)
+            logging.info(f"{file} CSV 파일 생성 완료, row수: {len(df)}")
 
     def transform(self):
         """
@@ -184,6 +1114,7 @@ class CareSiteTransformer(DataTransformer):
         except Exception as e :
             # 예외 발생 시 로그에 에러 메시지 기록
             logging.error(f"Error in transformation: {e}", exc_info = True)
+            raise
 
     def process_source(self):
         """
@@ -192,7 +1123,7 @@ class CareSiteTransformer(DataTransformer):
         """
         try:
             source_data = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
-            logging.debug(f"원천 데이터 row수: {len(source_data)}")
+            self.record_lineage(source_data, "원천 데이터")
 
             location = self.read_csv(self.location_data, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
             return source_data, location
@@ -208,7 +1139,7 @@ class CareSiteTransformer(DataTransformer):
         """
         try:
             cdm = pd.DataFrame({
-                "care_site_id" : source_data.index + 1,
+                "care_site_id" : self.make_stable_id(source_data[[self.care_site_source_value, self.place_of_service_source_value, self.care_site_fromdate]]),
                 "care_site_name": source_data[self.care_site_name],
                 "place_of_service_concept_id": self.place_of_service_concept_id,            
                 "location_id": location.loc[location[self.location_source_value] == self.target_zip, "LOCATION_ID"].tolist()[0],
@@ -218,14 +1149,14 @@ class CareSiteTransformer(DataTransformer):
                 self.care_site_todate: source_data[self.care_site_todate]
             })
 
-            logging.debug(f"CDM 데이터 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
             
             return cdm
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
             
         
 class ProviderTransformer(DataTransformer):
@@ -258,6 +1189,7 @@ class ProviderTransformer(DataTransformer):
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 변환 중 오류: {e}", exc_info=True)
+            raise
 
     def process_source(self):
         """
@@ -265,9 +1197,9 @@ class ProviderTransformer(DataTransformer):
         """
         try :
             source_data = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
-            care_site = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
+            care_site = self.read_dimension("care_site")
             # concept_etc = self.read_csv(self.concept_etc, path_type = self.cdm_flag, dtype = self.source_dtype)
-            logging.debug(f"원천 데이터 row수: {len(source_data)}")
+            self.record_lineage(source_data, "원천 데이터")
 
             source = pd.merge(source_data,
                             care_site,
@@ -275,12 +1207,13 @@ class ProviderTransformer(DataTransformer):
                             right_on = "care_site_source_value",
                             how = "left")
             
-            logging.debug(f"CDM 결합 후 원천 데이터 row수: {len(source_data)}")
+            self.record_lineage(source_data, "CDM 결합 후 원천 데이터")
         
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 원천 데이터 처리 중 오류:\n {e}", exc_info=True)
+            raise
 
     def transform_cdm(self, source_data):
         """
@@ -317,14 +1250,14 @@ class ProviderTransformer(DataTransformer):
 
             cdm["provider_id"] = cdm.index +  1
 
-            logging.debug(f"CDM 데이터 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류: {e}", exc_info = True)
+            raise
 
          
 class PersonTransformer(DataTransformer):
@@ -373,11 +1306,11 @@ class PersonTransformer(DataTransformer):
         try:
             source_data = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
             location_data = self.read_csv(self.location_data, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f"원천 데이터 row수: {len(source_data)}")
+            self.record_lineage(source_data, "원천 데이터")
             
             source_data = pd.merge(source_data, location_data, left_on = self.location_source_value, right_on="LOCATION_SOURCE_VALUE", how = "left")
             source_data.loc[source_data["LOCATION_ID"].isna(), "LOCATION_ID"] = None
-            logging.debug(f"location 테이블과 결합 후 원천 데이터1 row수: {len(source_data)}")
+            self.record_lineage(source_data, "location 테이블과 결합 후 원천 데이터1")
 
             # 상병조건이 있는 경우
             if self.diag_condition:
@@ -388,7 +1321,7 @@ class PersonTransformer(DataTransformer):
 
                 source_data = pd.merge(source_data, condition, on=self.person_source_value, how = "inner", suffixes=('', '_diag'))
 
-            logging.debug(f"CDM테이블과 결합 후 원천 데이터 row수: source: {len(source_data)}")
+            self.record_lineage(source_data, "CDM테이블과 결합 후 원천 데이터")
 
             return source_data
         
@@ -415,7 +1348,7 @@ class PersonTransformer(DataTransformer):
             gender_concept_id = [8507, 8532]
 
             cdm = pd.DataFrame({
-                "person_id" : source.index + 1,
+                "person_id" : self.make_stable_id(source[self.person_source_value]),
                 "gender_concept_id": np.select(gender_conditions, gender_concept_id, default = self.no_matching_concept[0]),
                 "year_of_birth": source[self.birth_datetime].str[:4],
                 "month_of_birth": source[self.birth_datetime].str[4:6],
@@ -442,14 +1375,14 @@ class PersonTransformer(DataTransformer):
             cdm["birth_datetime"] = cdm["birth_datetime"].dt.strftime('%Y-%m-%d %H:%M:%S')
             cdm["death_datetime"] = cdm["death_datetime"].dt.strftime('%Y-%m-%d %H:%M:%S')
 
-            logging.debug(f"CDM 데이터 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류: {e}", exc_info = True)
+            raise
 
 
 class VisitOccurrenceTransformer(DataTransformer):
@@ -511,10 +1444,10 @@ class VisitOccurrenceTransformer(DataTransformer):
             # 원천 및 CDM 데이터 불러오기
             source = self.read_csv(self.source_data, path_type = self.source_flag , dtype = self.source_dtype)
             source2 = self.read_csv(self.source_data2, path_type = self.source_flag , dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag , dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            concept_etc = self.read_dimension("concept_etc")
             logging.debug(f"원천 데이터 row수: source: {len(source)}, source2: {len(source2)}")
 
             # 원천 데이터 범위 설정
@@ -523,29 +1456,25 @@ class VisitOccurrenceTransformer(DataTransformer):
             source[self.frstrgstdt] = pd.to_datetime(source[self.frstrgstdt])
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.meddate].dt.strftime("%Y%m%d") + ';' + source[self.visit_no] + ';' + source[self.hospital]
             source = source[source[self.meddate] <= self.data_range]
-            logging.debug(f"데이터1 범위 조건 적용 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "데이터1 범위 조건 적용 후 원천 데이터")
 
             # 불러온 원천 전처리
             source = pd.merge(source, person_data, left_on = self.person_source_value, right_on="person_source_value", how="inner")
-            source = source.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f"person 테이블과 결합 후 원천 데이터1 row수: {len(source)}")
+            self.record_lineage(source, "person 테이블과 결합 후 원천 데이터1")
 
             source = pd.merge(source, care_site_data, left_on = [self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
-            logging.debug(f"care_site 테이블과 결합 후 원천 데이터1 row수: {len(source)}")
+            self.record_lineage(source, "care_site 테이블과 결합 후 원천 데이터1")
             
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors="coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors="coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna("19000101")
             source[self.care_site_todate] = source[self.care_site_todate].fillna("20991231")
             source= source[(source[self.frstrgstdt] >= source[self.care_site_fromdate] ) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터1 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터1")
 
             source = pd.merge(source, provider_data, left_on = self.orddr, right_on="provider_source_value", how="left", suffixes=('', '_y'))
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
-            logging.debug(f"provider 테이블과 결합 후 원천 데이터1 row수: {len(source)}")
+            self.record_lineage(source, "provider 테이블과 결합 후 원천 데이터1")
 
             source["visit_type_concept_id"] = np.select([source[self.meddept] == "CTC"], [44818519], default = 44818518)
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)
             source = pd.merge(source, concept_etc, left_on = "visit_type_concept_id", right_on="concept_id", how="left")
 
             # 원천 데이터2 범위 설정
@@ -554,37 +1483,35 @@ class VisitOccurrenceTransformer(DataTransformer):
             source2[self.frstrgstdt] = pd.to_datetime(source2[self.frstrgstdt])
             source2["visit_source_key"] = source2[self.person_source_value] + ';' + source2[self.admdate].dt.strftime("%Y%m%d") + ';' + source2[self.visit_no] + ';' + source2[self.hospital]
             source2 = source2[source2[self.admdate] <= self.data_range]
-            logging.debug(f"데이터2 범위 조건 적용 후 원천 데이터2 row수: {len(source2)}")
+            self.record_lineage(source2, "데이터2 범위 조건 적용 후 원천 데이터2")
 
             # 불러온 원천2 전처리    
             source2 = pd.merge(source2, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            source2 = source2.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f"person 테이블과 결합 후 원천 데이터2 row수: {len(source2)}")
+            self.record_lineage(source2, "person 테이블과 결합 후 원천 데이터2")
 
             source2 = pd.merge(source2, care_site_data, left_on = [self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
-            logging.debug(f"care_site 테이블과 결합 후 원천 데이터2 row수: {len(source2)}")
+            self.record_lineage(source2, "care_site 테이블과 결합 후 원천 데이터2")
 
-            source2[self.care_site_fromdate] = pd.to_datetime(source2[self.care_site_fromdate], errors="coerce")
-            source2[self.care_site_todate] = pd.to_datetime(source2[self.care_site_todate], errors="coerce")
             source2[self.care_site_fromdate] = source2[self.care_site_fromdate].fillna("19000101")
             source2[self.care_site_todate] = source2[self.care_site_todate].fillna("20991231")
             source2 = source2[(source2[self.frstrgstdt] >= source2[self.care_site_fromdate]) & (source2[self.frstrgstdt] <= source2[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터2 row수: {len(source2)}")
+            self.record_lineage(source2, "care_site 사용 기간 조건 설정 후 원천 데이터2")
 
             source2 = pd.merge(source2, provider_data, left_on = self.chadr, right_on="provider_source_value", how="left", suffixes=('', '_y'))
             source2.loc[source2["care_site_id"].isna(), "care_site_id"] = 0
-            logging.debug(f"provider 테이블과 결합 후 원천 데이터1 row수: {len(source2)}")
+            self.record_lineage(source2, "provider 테이블과 결합 후 원천 데이터2")
 
             source2["visit_type_concept_id"] = np.select([source2[self.meddept] == "CTC"], [44818519], default = 44818518)
             source2 = pd.merge(source2, concept_etc, left_on = "visit_type_concept_id", right_on="concept_id", how="left")
-            logging.debug(f"concept_etc 테이블과 결합 후 원천 데이터2 row수: {len(source2)}")
+            self.record_lineage(source2, "concept_etc 테이블과 결합 후 원천 데이터2")
 
-            logging.debug(f"CDM 테이블과 결합 후 원천 데이터 row수: {len(source2)}")
+            self.record_lineage(source2, "CDM 테이블과 결합 후 원천 데이터")
 
             return source, source2
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source, source2):
         """
@@ -598,9 +1525,9 @@ class VisitOccurrenceTransformer(DataTransformer):
                 "환자명": source["환자명"],
                 "visit_concept_id": np.select([source[self.visit_source_value] == "O"], [9202], default = self.no_matching_concept[0]),
                 "visit_start_date": source[self.meddate],
-                "visit_start_datetime": pd.to_datetime(source["visit_start_datetime"], format="%Y%m%d%H%M%S"),
+                "visit_start_datetime": parse_datetime(source["visit_start_datetime"], "%Y%m%d%H%M%S"),
                 "visit_end_date": source[self.meddate],
-                "visit_end_datetime": pd.to_datetime(source["visit_start_datetime"], format="%Y%m%d%H%M%S"),
+                "visit_end_datetime": parse_datetime(source["visit_start_datetime"], "%Y%m%d%H%M%S"),
                 "visit_type_concept_id": np.select([source["visit_type_concept_id"].notna()], [source["visit_type_concept_id"]], default = self.no_matching_concept[0]),
                 "visit_type_concept_id_name": np.select([source["concept_name"].notna()], [source["concept_name"]], default=self.no_matching_concept[1]),
                 "provider_id": source["provider_id"],
@@ -628,9 +1555,9 @@ class VisitOccurrenceTransformer(DataTransformer):
                 "환자명": source2["환자명"],
                 "visit_concept_id": np.select(visit_condition, visit_concept_id, default = 0),
                 "visit_start_date": source2[self.admdate],
-                "visit_start_datetime": pd.to_datetime(source2["visit_start_datetime"], format="%Y%m%d%H%M%S"),
-                "visit_end_date": pd.to_datetime(source2[self.dschdate], format="%Y%m%d"),
-                "visit_end_datetime": (source2[self.dschdate] + source2[self.dschtime]).apply(lambda x: datetime.strptime(x, '%Y%m%d%H%M%S')),
+                "visit_start_datetime": parse_datetime(source2["visit_start_datetime"], "%Y%m%d%H%M%S"),
+                "visit_end_date": parse_datetime(source2[self.dschdate], "%Y%m%d"),
+                "visit_end_datetime": parse_datetime(source2[self.dschdate] + source2[self.dschtime], "%Y%m%d%H%M%S"),
                 "visit_type_concept_id": np.select([source2["visit_type_concept_id"].notna()], [source2["visit_type_concept_id"]], default = self.no_matching_concept[0]),
                 "visit_type_concept_id_name": np.select([source2["concept_name"].notna()], [source2["concept_name"]], default=self.no_matching_concept[1]),
                 "provider_id": source2["provider_id"],
@@ -648,21 +1575,22 @@ class VisitOccurrenceTransformer(DataTransformer):
             cdm = pd.concat([cdm_o, cdm_ie], axis = 0)
             
             cdm.reset_index(drop=True, inplace = True)
-            cdm["visit_occurrence_id"] = cdm.index + 1
+            # 63비트 id가 float로 바뀌면 값이 달라지므로 Int64로 shift
+            # 진료의(provider_source_value) 하나가 여러 provider와 결합할 수 있으므로 provider_id도 자연키에 포함
+            cdm["visit_occurrence_id"] = self.make_stable_id(cdm[["visit_source_value", "visit_source_key", "provider_id"]]).astype("Int64")
             cdm.sort_values(by=["person_id", "visit_start_datetime"], inplace = True)
-            cdm["preceding_visit_occurrence_id"] = cdm.groupby("person_id")["visit_occurrence_id"].shift(1)
-            cdm["preceding_visit_occurrence_id"] = cdm["preceding_visit_occurrence_id"].apply(lambda x : x if pd.isna(x) else str(int(x)))
+            cdm["preceding_visit_occurrence_id"] = cdm.groupby("person_id")["visit_occurrence_id"].shift(1).astype("Int64")
 
             cdm = cdm[self.columns]
             
-            logging.debug(f"CDM 데이터 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류: {e}", exc_info = True)
+            raise
 
 
 class VisitDetailTransformer(DataTransformer):
@@ -719,12 +1647,12 @@ class VisitDetailTransformer(DataTransformer):
         """
         try :
             source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f"원천 데이터 row수: {len(source)}")
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            concept_etc = self.read_dimension("concept_etc")
+            self.record_lineage(source, "원천 데이터")
 
             # visit_source_key 생성
             source[self.admdate] = pd.to_datetime(source[self.admdate])
@@ -742,19 +1670,16 @@ class VisitDetailTransformer(DataTransformer):
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            source = source.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f"person 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "person 테이블과 결합 후 원천 데이터")
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on = [self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
-            logging.debug(f"care_site 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 테이블과 결합 후 원천 데이터")
 
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors="coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors="coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna("19000101")
             source[self.care_site_todate] = source[self.care_site_todate].fillna("20991231")
             source= source[( source[self.frstrgstdt] >= source[self.care_site_fromdate]) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터")
 
             # # 병동명을 위한 care_site table과 병합
             # source = pd.merge(source, care_site_data, left_on=self.wardno, right_on="care_site_source_value", how="left", suffixes=('', '_wardno'))
@@ -762,24 +1687,21 @@ class VisitDetailTransformer(DataTransformer):
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f"provider 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "provider 테이블과 결합 후 원천 데이터")
 
             # visit_occurrence테이블에서 I에 해당하는 데이터만 추출
             visit_data = visit_data[visit_data["visit_source_value"].isin(["I"])]
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key"], right_on=["visit_source_key"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_occurrence 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 원천 데이터")
 
             source["visit_detail_type_concept_id"] = 44818518
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)
             source = pd.merge(source, concept_etc, left_on="visit_detail_type_concept_id", right_on='concept_id')
-            logging.debug(f"concept_etc 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "concept_etc 테이블과 결합 후 원천 데이터")
 
             # 컬럼을 datetime형태로 변경
             source[self.visit_detail_start_datetime] = pd.to_datetime(source[self.visit_detail_start_datetime])
             source[self.visit_detail_end_datetime] = pd.to_datetime(source[self.visit_detail_end_datetime], errors="coerce")
-            source["visit_start_datetime"] = pd.to_datetime(source["visit_start_datetime"])
-            source["visit_end_datetime"] = pd.to_datetime(source["visit_end_datetime"])
             
             # 에러 발생하는 부분을 최대값으로 처리
             # 최대 Timestamp 값
@@ -790,12 +1712,13 @@ class VisitDetailTransformer(DataTransformer):
 
             source = source[(source[self.visit_detail_start_datetime] >= source["visit_start_datetime"]) & (source[self.visit_detail_start_datetime] <= source["visit_end_datetime"])]
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
-            logging.debug(f"visit_detail 날짜조건 적용 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_detail 날짜조건 적용 후 데이터")
 
             return source
         
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -832,21 +1755,22 @@ class VisitDetailTransformer(DataTransformer):
             cdm = cdm[cdm["visit_detail_start_datetime"] <= self.data_range]
             # 컬럼 생성
             cdm.reset_index(drop = True, inplace = True)
-            cdm["visit_detail_id"] = cdm.index + 1
+            # 63비트 id가 float로 바뀌면 값이 달라지므로 Int64로 shift
+            # 진료의(provider_source_value) 하나가 여러 provider와 결합할 수 있으므로 provider_id도 자연키에 포함
+            cdm["visit_detail_id"] = self.make_stable_id(cdm[["visit_occurrence_id", "visit_detail_start_datetime", "visit_detail_source_value", "진료과", "provider_id"]]).astype("Int64")
             cdm.sort_values(by=["person_id", "visit_detail_start_datetime"], inplace = True)
-            cdm["preceding_visit_detail_id"] = cdm.groupby("person_id")["visit_detail_id"].shift(1)
-            cdm["preceding_visit_detail_id"] = cdm["preceding_visit_detail_id"].apply(lambda x : str(int(x)) if not pd.isna(x) else x)
+            cdm["preceding_visit_detail_id"] = cdm.groupby("person_id")["visit_detail_id"].shift(1).astype("Int64")
 
             cdm = cdm[self.columns]
 
-            logging.debug(f"CDM 데이터 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류: {e}", exc_info = True)
+            raise
 
 class LocalKCDTransformer(DataTransformer):
     def __init__(self, config_path):
@@ -893,6 +1817,29 @@ class LocalKCDTransformer(DataTransformer):
             logging.error(f"{self.table} 테이블 변환 중 오류:\n {e}", exc_info=True)
             raise
     
+    def match_diagcode(self, diagcode, concept_kcd):
+        """
+        진단코드별로 앞에서부터 가장 길게 일치하는 KCD7 concept_code의 concept 행을 반환합니다.
+        concept_code로 인덱스를 한 번 만든 뒤 진단코드 길이별로 앞부분을 잘라 한 번에 조회하므로
+        진단코드마다 concept 테이블 전체를 검색하지 않습니다.
+        일치하는 코드가 없으면 모든 컬럼이 빈 값인 행을 반환하며, 결과의 순서는 diagcode와 같습니다.
+        """
+        # 같은 concept_code가 여러 개면 첫 번째 행을 사용
+        concept_kcd = concept_kcd[concept_kcd[self.concept_code].notna()].drop_duplicates(subset = self.concept_code).reset_index(drop = True)
+        code_index = pd.Index(concept_kcd[self.concept_code])
+
+        matched_position = np.full(len(diagcode), -1)
+        max_length = diagcode.str.len().max()
+        max_length = 0 if pd.isna(max_length) else int(max_length)
+
+        # 긴 앞부분부터 조회하여 아직 매칭되지 않은 코드에만 결과 반영
+        for length in range(max_length, 0, -1):
+            position = code_index.get_indexer(diagcode.str[:length])
+            unmatched = (matched_position == -1) & (position != -1)
+            matched_position[unmatched] = position[unmatched]
+
+        return concept_kcd.reindex(matched_position)
+
     def process_source(self):
         """
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
@@ -904,44 +1851,35 @@ class LocalKCDTransformer(DataTransformer):
 
             # 2. diag 테이블 처리
             source['changed_diagcode'] = source[self.diagcode].str.split('.').str[0]
-            logging.debug(f'조건 적용 후 row수: {len(source)}')
+            self.record_lineage(source, "조건 적용 후")
 
             # concept 테이블 처리
             concept_kcd[self.concept_code] = concept_kcd[self.concept_code].str.replace('.', '')
             concept_kcd = concept_kcd[concept_kcd[self.vocabulary_id] == 'KCD7']
 
-            # 3. 매칭 함수 정의
-            def match_diagcode(diagcode, concept_kcd):
-                for i in range(len(diagcode), 0, -1):
-                    sub_diagcode = diagcode[:i]
-                    match = concept_kcd[concept_kcd[self.concept_code] == sub_diagcode]
-                    if not match.empty:
-                        return match.iloc[0]
-                return pd.Series([None]*len(concept_kcd.columns), index=concept_kcd.columns)
+            # 3. 매칭 수행
+            matched_df = self.match_diagcode(source['changed_diagcode'], concept_kcd)
+            self.record_lineage(matched_df, "matched_df")
 
-            # 4. 매칭 수행
-            matched_df = source.apply(lambda row: match_diagcode(row['changed_diagcode'], concept_kcd), axis=1)
-            logging.debug(f'matched_df row수: {len(matched_df)}')
-
-            # 5. 원래 source 매칭 결과 합치기
+            # 4. 원래 source 매칭 결과 합치기
             local_kcd = pd.concat([source.reset_index(drop=True), matched_df.reset_index(drop=True)], axis=1)
-            logging.debug(f'원천 데이터와 합친 후 row수: {len(matched_df)}')
+            self.record_lineage(matched_df, "원천 데이터와 합친 후")
 
-            # 6. 필요한 컬럼 선택 및 기본값 설정
+            # 5. 필요한 컬럼 선택 및 기본값 설정
             local_kcd = local_kcd[[self.diagcode, 'changed_diagcode', self.fromdate, self.todate, self.engname, self.korname, self.hospital,
                                 self.concept_id, self.concept_name, self.domain_id, self.vocabulary_id, self.concept_class_id, 
                                 self.standard_concept, self.concept_code, self.valid_start_date, self.valid_end_date, self.invalid_reason]]
 
             local_kcd = local_kcd.sort_values(self.diagcode)
 
-            logging.debug(f'local_kcd row수: {len(local_kcd)}')
-            logging.debug(f"요약:\n{local_kcd.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{local_kcd.isnull().sum().to_string()}")
+            self.record_lineage(local_kcd, "local_kcd")
+            self.log_summary(local_kcd)
 
             return local_kcd
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class ConditionOccurrenceTransformer(DataTransformer):
@@ -965,19 +1903,24 @@ class ConditionOccurrenceTransformer(DataTransformer):
         self.todate = self.cdm_config["columns"]["todate"]
         self.engname = self.cdm_config["columns"]["engname"]
         self.diagcode = self.cdm_config["columns"]["diagcode"]
+        # 중복 제거 및 증분 변환 시 행을 구분하는 원천 데이터 컬럼
+        self.natural_key = [self.person_source_value, self.condition_start_datetime, self.condition_source_value, self.hospital, self.visit_no, "DIAGHISTNO", self.meddept, "DIAGNO", self.orddd]
+        # chunksize 단위 변환 시 chunk로 나누어 읽을 원천 데이터
+        self.stream_source = self.source_data
         
     def transform(self):
         """
         소스 데이터를 읽어들여 CDM 형식으로 변환하고 결과를 CSV 파일로 저장하는 메소드입니다.
         """
         try:
-            source_data = self.process_source()
-            logging.info(f"{self.table} 테이블: {len(source_data)}건")
-            transformed_data = self.transform_cdm(source_data)
-
+            if self.get_chunksize():
+                self.transform_chunks("condition_occurrence_id")
+            else:
+                source_data = self.process_source()
+                logging.info(f"{self.table} 테이블: {len(source_data)}건")
+                transformed_data = self.transform_cdm(source_data)
 
-            # save_path = os.path.join(self.cdm_path, self.output_filename)
-            self.write_csv(transformed_data, self.cdm_path, self.output_filename)
+                self.write_incremental(transformed_data, "condition_occurrence_id")
 
             logging.info(f"{self.table} 테이블 변환 완료")
             logging.info(f"============================")
@@ -992,14 +1935,15 @@ class ConditionOccurrenceTransformer(DataTransformer):
         """
         try: 
             source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
+            source = self.filter_incremental(source)
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
             # concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype)
             local_kcd = self.read_csv(self.local_kcd_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            logging.debug(f"원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "원천 데이터")
 
             # 원천에서 조건걸기
             source[self.condition_start_datetime] = pd.to_datetime(source[self.condition_start_datetime], format="%Y%m%d")
@@ -1010,72 +1954,55 @@ class ConditionOccurrenceTransformer(DataTransformer):
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.orddd].dt.strftime("%Y%m%d") + ';' + source[self.visit_no] + ';' + source[self.hospital]
             source = source[source[self.condition_start_datetime] <= self.data_range]
             source = source[source[self.condition_start_datetime].notna()]
-            logging.debug(f"조건 적용후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "조건 적용후 원천 데이터")
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            source = source.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f"person 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "person 테이블과 결합 후 원천 데이터")
 
             # local_kcd와 병합
             local_kcd[self.fromdate] = pd.to_datetime(local_kcd[self.fromdate], format="%Y%m%d", errors = "coerce")
             # local_kcd[self.fromdate].fillna(pd.Timestamp('1900-01-01'), inplace = True)
             local_kcd[self.todate] = pd.to_datetime(local_kcd[self.todate], format="%Y%m%d", errors = "coerce")
             # local_kcd[self.todate].fillna(pd.Timestamp('2099-12-31'), inplace = True)
-            logging.debug(f"local_kcd 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "local_kcd 테이블과 결합 후 원천 데이터")
 
-            source = pd.merge(source, local_kcd, left_on = [self.condition_source_value, self.hospital], right_on = [self.diagcode, self.hospital], how = "left", suffixes=('', '_kcd'))
-            source[self.fromdate] = source[self.fromdate].fillna(pd.to_datetime('1900-01-01'))
-            source[self.todate] = source[self.todate].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.condition_start_datetime].dt.date >= source[self.fromdate]) & (source[self.condition_start_datetime].dt.date <= source[self.todate])]
-            logging.debug(f"local_kcd 테이블의 날짜 조건 적용 후 원천 데이터 row수: {len(source)}")
+            source = self.merge_valid_period(source, local_kcd, left_on = [self.condition_source_value, self.hospital], right_on = [self.diagcode, self.hospital], date_column = self.condition_start_datetime, suffixes=('', '_kcd'))
+            self.record_lineage(source, "local_kcd 테이블의 날짜 조건 적용 후 원천 데이터")
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=[self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
-            logging.debug(f"care_site 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 테이블과 결합 후 원천 데이터")
             
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors="coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors="coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna(pd.to_datetime("1900-01-01"))
             source[self.care_site_todate] = source[self.care_site_todate].fillna(pd.to_datetime("2099-12-31"))
             source= source[(source[self.frstrgstdt] >= source[self.care_site_fromdate]) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f"provider 테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "provider 테이블과 결합 후 원천 데이터")
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"], errors = "coerce")
-            visit_data["visit_end_datetime"] = pd.to_datetime(visit_data["visit_end_datetime"], errors = "coerce")
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key"], right_on=["visit_source_key"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_occurrence 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.condition_start_datetime] >= source["visit_detail_start_datetime"]) & (source[self.condition_start_datetime] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.condition_start_datetime] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            source = source.drop_duplicates(subset=[self.person_source_value, self.condition_start_datetime, self.condition_source_value, self.hospital, self.visit_no, "DIAGHISTNO", self.meddept, "DIAGNO", self.orddd])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복 제거 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 원천 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.condition_start_datetime)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
+            source = source.drop_duplicates(subset=self.natural_key)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복 제거 후 원천 데이터")
 
             # care_site_id가 없는 경우 0으로 값 입력
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
 
-            logging.debug(f"CDM테이블과 결합 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "process_source", date_column = self.condition_start_datetime)
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
     
 
     def transform_cdm(self, source):
@@ -1085,7 +2012,7 @@ class ConditionOccurrenceTransformer(DataTransformer):
         """
         try : 
             cdm = pd.DataFrame({
-                "condition_occurrence_id": source.index + 1,
+                "condition_occurrence_id": self.make_stable_id(source[self.natural_key]),
                 "person_id": source["person_id"],
                 "condition_concept_id": np.select([source["concept_id"].notna()], [source["concept_id"]], self.no_matching_concept[0]),
                 "condition_start_date": source[self.condition_start_datetime].dt.date,
@@ -1115,14 +2042,14 @@ class ConditionOccurrenceTransformer(DataTransformer):
             cdm["condition_end_date"] = pd.to_datetime(cdm["condition_end_date"],errors = "coerce").dt.date
             cdm["condition_end_datetime"] = pd.to_datetime(cdm["condition_end_datetime"], errors = "coerce")
 
-            logging.debug(f"CDM 데이터 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류: {e}", exc_info = True)
+            raise
 
 class DrugEDITransformer(DataTransformer):
     def __init__(self, config_path):
@@ -1171,7 +2098,7 @@ class DrugEDITransformer(DataTransformer):
             source = self.read_csv(self.order_data, path_type = self.source_flag, dtype = self.source_dtype)
             concept_data = self.read_csv(self.concept_data, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
             atc_data = self.read_csv(self.atc_data, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f'원천 데이터 row수: order: {len(source)}')
+            self.record_lineage(source, "원천 데이터")
 
             # concept_id 매핑
             source[self.fromdate].fillna("19000101")
@@ -1182,26 +2109,26 @@ class DrugEDITransformer(DataTransformer):
             concept_data = concept_data[concept_data["Sequence"] == 1]
 
             source = pd.merge(source, concept_data, left_on=self.edicode, right_on="concept_code", how="left")
-            logging.debug(f'concept merge후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept merge후 데이터")
 
             # ATC코드 매핑
             atc_data[self.standard_code] = atc_data[self.standard_code].str[3:-1]
 
             source = pd.merge(source, atc_data, left_on=self.edicode, right_on=self.standard_code, how = "left")
-            logging.debug(f'ATC 매핑 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "ATC 매핑 후 데이터")
             # local_edi = source[[self.ordercode, self.fromdate, self.todate, self.edicode, "concept_id", "concept_name",
             #                     "domain_id", "vocabulary_id", "concept_class_id", "standard_concept",
             #                     "concept_code", "valid_start_date", "valid_end_date", "invalid_reason"]]
             # logging.debug(f'중복되는 concept_id 제거 후 데이터 row수: {len(source)}')
         
-            logging.debug(f'local_edi row수: {len(source)}')
-            logging.debug(f"요약:\n{source.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{source.isnull().sum().to_string()}")
+            self.record_lineage(source, "local_edi")
+            self.log_summary(source)
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class DrugexposureTransformer(DataTransformer):
@@ -1228,18 +2155,23 @@ class DrugexposureTransformer(DataTransformer):
         self.route_source_value = self.cdm_config["columns"]["route_source_value"]
         self.dose_unit_source_value = self.cdm_config["columns"]["dose_unit_source_value"]
         self.orddd = self.cdm_config["columns"]["orddd"]
+        # 중복 제거 및 증분 변환 시 행을 구분하는 원천 데이터 컬럼
+        self.natural_key = [self.person_source_value, self.drug_exposure_start_datetime, "PRCPNO", self.hospital, self.drug_source_value, self.orddd, self.meddept]
+        # chunksize 단위 변환 시 chunk로 나누어 읽을 원천 데이터
+        self.stream_source = self.source_data
         
     def transform(self):
         """
         소스 데이터를 읽어들여 CDM 형식으로 변환하고 결과를 CSV 파일로 저장하는 메소드입니다.
         """
         try:
-            source_data = self.process_source()
-            transformed_data = self.transform_cdm(source_data)
-
+            if self.get_chunksize():
+                self.transform_chunks("drug_exposure_id")
+            else:
+                source_data = self.process_source()
+                transformed_data = self.transform_cdm(source_data)
 
-            # save_path = os.path.join(self.cdm_path, self.output_filename)
-            self.write_csv(transformed_data, self.cdm_path, self.output_filename)
+                self.write_incremental(transformed_data, "drug_exposure_id")
 
             logging.info(f"{self.table} 테이블 변환 완료")
             logging.info(f"============================")
@@ -1253,21 +2185,25 @@ class DrugexposureTransformer(DataTransformer):
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
         """
         try : 
-            source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
+            # 필요한 컬럼(증분 변환 기준 컬럼 포함)만 원천에서 조건을 적용하며 읽기
+            columns = [self.person_source_value, self.drug_source_value, self.drug_exposure_start_datetime,
+                       self.meddept, self.days_supply, self.qty, self.cnt, self.provider,
+                       self.dose_unit_source_value, self.hospital, self.route_source_value, self.orddd, self.visit_no, "PRCPNO", self.frstrgstdt]
+            source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype,
+                                   usecols = columns, optional_columns = self.watermark_columns, filters = [(self.drug_exposure_start_datetime, "<=", self.data_range)])
+            source = self.filter_incremental(source)
             drug_edi = self.read_csv(self.drug_edi_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
+            concept_etc = self.read_dimension("concept_etc")
 
-            logging.info(f"원천 데이터 row수:, {len(source)}")
+            self.record_lineage(source, "원천 데이터")
 
             # 원천에서 조건걸기
-            source = source[[self.person_source_value, self.drug_source_value, self.drug_exposure_start_datetime,
-                             self.meddept, self.days_supply, self.qty, self.cnt, self.provider,
-                             self.dose_unit_source_value, self.hospital, self.route_source_value, self.orddd, self.visit_no, "PRCPNO", self.frstrgstdt]]
+            source = source[columns]
             source["진료일시"] = source[self.orddd]
             source[self.drug_exposure_start_datetime] = pd.to_datetime(source[self.drug_exposure_start_datetime])
             source[self.orddd] = pd.to_datetime(source[self.orddd])
@@ -1275,65 +2211,45 @@ class DrugexposureTransformer(DataTransformer):
             # visit_source_key 생성
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.orddd].dt.strftime("%Y%m%d") + ';' + source[self.visit_no] + ';' + source[self.hospital]
             source = source[(source[self.drug_exposure_start_datetime] <= self.data_range)]
-            logging.info(f"조건 적용후 원천 데이터 row수:, {len(source)}")
+            self.record_lineage(source, "조건 적용후 원천 데이터")
             
-            person_data = person_data[["person_id", "person_source_value", "환자명"]]
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            logging.info(f"person 테이블과 결합 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "person 테이블과 결합 후 원천 데이터")
 
             drug_edi = drug_edi[[self.drugcd, self.fromdate, self.todate, self.edicode, "concept_id", "ATC코드", "ATC 코드명", self.drug_source_value_name]]
             drug_edi[self.fromdate] = pd.to_datetime(drug_edi[self.fromdate] , format="%Y%m%d", errors="coerce")
             drug_edi[self.todate] = pd.to_datetime(drug_edi[self.todate] , format="%Y%m%d", errors="coerce")
 
             # LOCAL코드와 EDI코드 매핑 테이블과 병합
-            source = pd.merge(source, drug_edi, left_on=self.drug_source_value, right_on=self.drugcd, how="left")
-            logging.info(f"local_edi와 병합 후 데이터 row수:, {len(source)}")
-            source[self.fromdate] = source[self.fromdate].fillna(pd.to_datetime('1900-01-01'))
-            source[self.todate] = source[self.todate].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.drug_exposure_start_datetime] >= source[self.fromdate]) & (source[self.drug_exposure_start_datetime] <= source[self.todate])]
-            logging.info(f"local_edi날짜 조건 적용 후 데이터 row수: {len(source)}")
+            source = self.merge_valid_period(source, drug_edi, left_on=self.drug_source_value, right_on=self.drugcd, date_column=self.drug_exposure_start_datetime)
+            self.record_lineage(source, "local_edi 테이블의 날짜 조건 적용 후 원천 데이터")
 
             
-            care_site_data = care_site_data[["care_site_id", "care_site_source_value", "place_of_service_source_value", "care_site_name", self.care_site_fromdate, self.care_site_todate]]
-            provider_data = provider_data[["provider_id", "provider_source_value", "provider_name"]]
             visit_data = visit_data[["visit_occurrence_id", "visit_start_date", "care_site_id", "visit_source_value", "person_id", "visit_source_key"]]
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=[self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
-            logging.info(f"care_site 테이블과 결합 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 테이블과 결합 후 원천 데이터")
 
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors = "coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors = "coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna(pd.to_datetime("1900-01-01"))
             source[self.care_site_todate] = source[self.care_site_todate].fillna(pd.to_datetime("2099-12-31"))
             source= source[(source[self.frstrgstdt] >= source[self.care_site_fromdate]) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.info(f"provider 테이블과 결합 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "provider 테이블과 결합 후 원천 데이터")
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key"], right_on=["visit_source_key"], how="left", suffixes=('', '_y'))
-            logging.info(f"visit_occurrence 테이블과 결합 후 데이터 row수: {len(source)}")
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.drug_exposure_start_datetime] >= source["visit_detail_start_datetime"]) & (source[self.drug_exposure_start_datetime] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.drug_exposure_start_datetime] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
-            source = source.drop_duplicates(subset=[self.person_source_value, self.drug_exposure_start_datetime, "PRCPNO", self.hospital, self.drug_source_value, self.orddd, self.meddept])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 원천 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.drug_exposure_start_datetime)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
+            source = source.drop_duplicates(subset=self.natural_key)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터")
 
             # care_site_id가 없는 경우 0으로 값 입력
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
@@ -1341,15 +2257,15 @@ class DrugexposureTransformer(DataTransformer):
 
             # drug_type_concept_id_name가져오기
             source["drug_type_concept_id"] = 38000177
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)
             source = pd.merge(source, concept_etc, left_on = "drug_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_drug_type'))
 
-            logging.info(f"CDM테이블과 병합 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "process_source", date_column = self.drug_exposure_start_datetime)
 
             return source
         
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -1358,13 +2274,13 @@ class DrugexposureTransformer(DataTransformer):
         """
         try : 
             cdm = pd.DataFrame({
-            "drug_exposure_id": source.index + 1,
+            "drug_exposure_id": self.make_stable_id(source[self.natural_key]),
             "person_id": source["person_id"],
             "환자명": source["환자명"],
             "drug_concept_id": np.select([source["concept_id"].notna()], [source["concept_id"]], default=self.no_matching_concept[0]),
             "drug_exposure_start_date": source[self.drug_exposure_start_datetime].dt.date,
             "drug_exposure_start_datetime": source[self.drug_exposure_start_datetime],
-            "drug_exposure_end_date": source[self.drug_exposure_start_datetime].dt.date + pd.to_timedelta(source[self.days_supply].astype(int) - 1, unit="days"),
+            "drug_exposure_end_date": (source[self.drug_exposure_start_datetime] + pd.to_timedelta(source[self.days_supply].astype(int) - 1, unit="days")).dt.date,
             "drug_exposure_end_datetime": source[self.drug_exposure_start_datetime] + pd.to_timedelta(source[self.days_supply].astype(int) - 1, unit="days"),
             "verbatim_end_date": None,
             "drug_type_concept_id": np.select([source["drug_type_concept_id"].notna()], [source["drug_type_concept_id"]], default = self.no_matching_concept[0]),
@@ -1403,14 +2319,14 @@ class DrugexposureTransformer(DataTransformer):
             "dcyn": None
             })
 
-            logging.info(f"CDM테이블 row수: {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류: {e}", exc_info = True)
+            raise
 
 
 class MeasurementEDITransformer(DataTransformer):
@@ -1463,11 +2379,11 @@ class MeasurementEDITransformer(DataTransformer):
             
             # 처방코드 마스터와 수가코드 매핑
             source = pd.merge(order_data, edi_data, left_on=[self.ordercode, self.hospital], right_on=[self.sugacode, self.hospital], how="left")
-            logging.debug(f'처방코드, 수가코드와 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "처방코드, 수가코드와 결합 후 데이터")
             
             # 검사코드 마스터 테이블은 코드 사용기간에 따른 이력이 없으므로 검사코드 사용기간 조건 제외
             # source = source[(source[self.order_fromdate] >= source[self.fromdd]) &  (source[self.order_fromdate] <= source[self.todd])]
-            logging.debug(f'조건 적용 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "조건 적용 후 데이터")
 
             concept_data = concept_data.sort_values(by = ["vocabulary_id"], ascending=[False])
             concept_data['Sequence'] = concept_data.groupby(["concept_code"]).cumcount() + 1
@@ -1475,7 +2391,7 @@ class MeasurementEDITransformer(DataTransformer):
 
             # concept_id 매핑
             source = pd.merge(source, concept_data, left_on=self.edicode, right_on="concept_code", how="left")
-            logging.debug(f'concept merge후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept merge후 데이터")
 
             # EDI코드 사용기간 먼저, EDI가 없다면 처방 사용기간 적용
             source[self.fromdate] = source[self.fromdd].where(source[self.fromdd].notna(), source[self.order_fromdate])
@@ -1483,16 +2399,16 @@ class MeasurementEDITransformer(DataTransformer):
 
 
             # drug의 경우 KCD, EDI 순으로 매핑
-            logging.debug(f'중복되는 concept_id 제거 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "중복되는 concept_id 제거 후 데이터")
         
-            logging.debug(f'local_edi row수: {len(source)}')
-            logging.debug(f"요약:\n{source.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{source.isnull().sum().to_string()}")
+            self.record_lineage(source, "local_edi")
+            self.log_summary(source)
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class MeasurementDiagTransformer(DataTransformer):
@@ -1519,18 +2435,23 @@ class MeasurementDiagTransformer(DataTransformer):
         self.ordcode = self.cdm_config["columns"]["ordcode"]
         self.orddd = self.cdm_config["columns"]["orddd"]
         self.spccd = self.cdm_config["columns"]["spccd"]
+        # 중복 제거 및 measurement_id 생성 시 행을 구분하는 원천 데이터 컬럼
+        self.natural_key = [self.hospital, self.person_source_value, self.orddd, self.orddate, self.visit_no, self.measurement_source_value, self.ordcode, self.spccd]
+        # chunksize 단위 변환 시 chunk로 나누어 읽을 원천 데이터(검사결과)
+        self.stream_source = self.source_data4
                 
     def transform(self):
         """
         소스 데이터를 읽어들여 CDM 형식으로 변환하고 결과를 CSV 파일로 저장하는 메소드입니다.
         """
         try : 
-            source_data = self.process_source()
-            transformed_data = self.transform_cdm(source_data)
-
+            if self.get_chunksize():
+                self.transform_chunks("measurement_id")
+            else:
+                source_data = self.process_source()
+                transformed_data = self.transform_cdm(source_data)
 
-            # save_path = os.path.join(self.cdm_path, self.output_filename)
-            self.write_csv(transformed_data, self.cdm_path, self.output_filename)
+                self.write_csv(transformed_data, self.cdm_path, self.output_filename)
 
             logging.info(f"{self.table} 테이블 변환 완료")
             logging.info(f"============================")
@@ -1544,53 +2465,39 @@ class MeasurementDiagTransformer(DataTransformer):
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
         """
         try:
-            source1 = self.read_csv(self.source_data1, path_type = self.source_flag, dtype = self.source_dtype)
-            source2 = self.read_csv(self.source_data2, path_type = self.source_flag, dtype = self.source_dtype)
-            source3 = self.read_csv(self.source_data3, path_type = self.source_flag, dtype = self.source_dtype)
-            source4 = self.read_csv(self.source_data4, path_type = self.source_flag, dtype = self.source_dtype)
             local_edi = self.read_csv(self.measurement_edi_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
             unit_data = self.read_csv(self.concept_unit, path_type = self.source_flag , dtype = self.source_dtype, encoding=self.cdm_encoding)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
+            concept_etc = self.read_dimension("concept_etc")
             unit_concept_synonym = self.read_csv(self.unit_concept_synonym, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f'원천 데이터 row수: {len(source1)}, {len(source2)}, {len(source3)}, {len(source4)}')
-
-            # 원천에서 조건걸기
-            source1 = source1[[self.hospital, self.orddate, self.person_source_value, "PRCPHISTNO", "ORDDD", "CRETNO", "PRCPCLSCD", "LASTUPDTDT", "ORDDRID", "PRCPNM", "PRCPCD", "PRCPHISTCD", "PRCPNO", "ORDDEPTCD"]]
-            source1[self.orddate] = pd.to_datetime(source1[self.orddate])
-            source1["ORDDD"] = pd.to_datetime(source1["ORDDD"])
-            source1 = source1[(source1[self.orddate] <= self.data_range)]
-            source1 = source1[(source1["PRCPHISTCD"] == "O") & (source1[self.hospital] == self.hospital_code) ]
-            
-            source2 = source2[[self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO", "EXECPRCPUNIQNO", "ORDDD", self.unit_source_value, "EXECDD", "EXECTM"]]
-            source2[self.orddate] = pd.to_datetime(source2[self.orddate])
-            source2 = source2[(source2[self.orddate] <= self.data_range)]
-
-            source3 = source3[[self.hospital, self.orddate, "EXECPRCPUNIQNO", "BCNO", "TCLSCD", "SPCCD", "ORDDD"]]
-            source3[self.orddate] = pd.to_datetime(source3[self.orddate])
-            source3 = source3[(source3[self.orddate] <= self.data_range)]
-
-            source4 = source4[[self.hospital, "BCNO", "TCLSCD", self.spccd, "RSLTFLAG", self.measurement_source_value, self.measurement_date, self.range_low, self.range_high, self.value_source_value, "RSLTSTAT", "LASTREPTDT", self.frstrgstdt]]
-            source4 = source4[(source4["RSLTFLAG"] == "O") & (source4["RSLTSTAT"].isin(["4", "5"]))]
 
-            logging.debug(f'조건적용 후 원천 데이터 row수: {len(source1)}, {len(source2)}, {len(source3)}, {len(source4)}')
-
-            source = pd.merge(source2, source1, left_on=[self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO"], right_on=[self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO"], how="inner", suffixes=("", "_diag1"))
-            logging.debug(f'source1, source2 병합 후 데이터 개수:, {len(source)}')
-            del source1
-            del source2
-
-            source = pd.merge(source, source3, left_on=[self.hospital, self.orddate, "EXECPRCPUNIQNO"], right_on=[self.hospital, self.orddate, "EXECPRCPUNIQNO"], how="inner", suffixes=("", "_diag3"))
-            logging.debug(f'source, source3 병합 후 데이터 개수:, {len(source)}')
-
-            source = pd.merge(source, source4, left_on=[self.hospital, "BCNO", "TCLSCD", self.spccd], right_on=[self.hospital, "BCNO", "TCLSCD", self.spccd], how="inner", suffixes=("", "_diag4"))
-            logging.debug(f'source, source4 병합 후 데이터 개수:, {len(source)}')
-            del source3
-            del source4
+            # 처방(source1), 실시(source2), 검체(source3)를 join한 index에 검사결과(source4)를 나누어 읽으며 join
+            # 필요한 컬럼만 읽고 원천에서 조건걸기
+            plan = [
+                {"file_name": self.source_data2,
+                 "columns": [self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO", "EXECPRCPUNIQNO", "ORDDD", self.unit_source_value, "EXECDD", "EXECTM"],
+                 "datetime_columns": [self.orddate],
+                 "filters": [(self.orddate, "<=", self.data_range)]},
+                {"file_name": self.source_data1,
+                 "columns": [self.hospital, self.orddate, self.person_source_value, "PRCPHISTNO", "ORDDD", "CRETNO", "PRCPCLSCD", "LASTUPDTDT", "ORDDRID", "PRCPNM", "PRCPCD", "PRCPHISTCD", "PRCPNO", "ORDDEPTCD"],
+                 "datetime_columns": [self.orddate, "ORDDD"],
+                 "filters": [(self.orddate, "<=", self.data_range), ("PRCPHISTCD", "==", "O"), (self.hospital, "==", self.hospital_code)],
+                 "left_on": [self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO"], "right_on": [self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO"], "suffix": "_diag1"},
+                {"file_name": self.source_data3,
+                 "columns": [self.hospital, self.orddate, "EXECPRCPUNIQNO", "BCNO", "TCLSCD", "SPCCD", "ORDDD"],
+                 "datetime_columns": [self.orddate],
+                 "filters": [(self.orddate, "<=", self.data_range)],
+                 "left_on": [self.hospital, self.orddate, "EXECPRCPUNIQNO"], "right_on": [self.hospital, self.orddate, "EXECPRCPUNIQNO"], "suffix": "_diag3"},
+                {"file_name": self.source_data4,
+                 "columns": [self.hospital, "BCNO", "TCLSCD", self.spccd, "RSLTFLAG", self.measurement_source_value, self.measurement_date, self.range_low, self.range_high, self.value_source_value, "RSLTSTAT", "LASTREPTDT", self.frstrgstdt],
+                 "filters": [("RSLTFLAG", "==", "O"), ("RSLTSTAT", "in", ["4", "5"])],
+                 "left_on": [self.hospital, "BCNO", "TCLSCD", self.spccd], "right_on": [self.hospital, "BCNO", "TCLSCD", self.spccd], "suffix": "_diag4"}
+            ]
+            source = self.join_sources(plan)
 
             # visit_source_key 생성
             source["진료일시"] = source[self.orddd]
@@ -1603,84 +2510,59 @@ class MeasurementDiagTransformer(DataTransformer):
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.orddd].dt.strftime("%Y%m%d") + ';' + source[self.visit_no] + ';' + source[self.hospital]
             source[self.measurement_date] = pd.to_datetime(source[self.measurement_date])
 
-            # value_as_number float형태로 저장되게 값 변경
+            # value_as_number float형태로 저장되게 값 변경하고 비교 연산자, 숫자가 아닌 결과값 분리
             # source["value_as_number"] = source[self.value_source_value].str.extract('(-?\d+\.\d+|\d+)')
-            source["value_as_number"] = source[self.value_source_value].apply(convert_to_numeric)
-            source["value_as_number"].astype(float)
+            source = pd.concat([source, parse_numeric_value(source[self.value_source_value])], axis = 1)
             # source[self.range_low] = source[self.range_low].str.extract('(-?\d+\.\d+|\d+)')
-            source[self.range_low] = source[self.range_low].apply(convert_to_numeric)
-            source[self.range_low].astype(float)
+            source[self.range_low] = parse_numeric_value(source[self.range_low])["value_as_number"]
             # source[self.range_high] = source[self.range_high].str.extract('(-?\d+\.\d+|\d+)')
-            source[self.range_high] = source[self.range_high].apply(convert_to_numeric)
-            source[self.range_high].astype(float)
+            source[self.range_high] = parse_numeric_value(source[self.range_high])["value_as_number"]
             
-            person_data = person_data[["person_id", "person_source_value", "환자명"]]
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
             del person_data
-            logging.debug(f'person 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 데이터")
             
             # local_edi 전처리
             local_edi = local_edi[[self.ordcode, self.fromdate, self.todate, self.edicode, "concept_id", self.hospital, "TCLSNM", self.spccd, "ORDNM"]]
             local_edi[self.fromdate] = pd.to_datetime(local_edi[self.fromdate] , format="%Y%m%d", errors="coerce")
             local_edi[self.todate] = pd.to_datetime(local_edi[self.todate] , format="%Y%m%d", errors="coerce")
 
-            source = pd.merge(source, local_edi, left_on=[self.measurement_source_value, self.spccd, self.hospital], right_on=[self.ordcode, self.spccd, self.hospital], how="left", suffixes=('', '_testcd'))
-            logging.debug(f"EDI코드 사용기간별 필터 적용 전 데이터 row수: {len(source)}")
-
-            source[self.fromdate] = source[self.fromdate].fillna(pd.to_datetime('1900-01-01'))
-            source[self.todate] = source[self.todate].fillna(pd.to_datetime('2099-12-31'))
-
             # source = pd.merge(source, local_edi, left_on=[self.ordcode, self.spccd, self.hospital], right_on=[self.ordcode, self.spccd, self.hospital], how="left", suffixes=('', '_order'))
-            source = source[(source[self.orddate] >= source[self.fromdate]) & (source[self.orddate] <= source[self.todate])]
+            source = self.merge_valid_period(source, local_edi, left_on=[self.measurement_source_value, self.spccd, self.hospital], right_on=[self.ordcode, self.spccd, self.hospital], date_column=self.orddate, suffixes=('', '_testcd'))
             del local_edi
-            logging.debug(f'EDI코드 테이블과 병합 후 데이터 row수:, {len(source)}')
+            self.record_lineage(source, "EDI코드 테이블과 병합 후 데이터")
     
             # 데이터 컬럼 줄이기
-            care_site_data = care_site_data[["care_site_id", "care_site_source_value", "place_of_service_source_value", "care_site_name", self.care_site_fromdate, self.care_site_todate]]
-            provider_data = provider_data[["provider_id", "provider_source_value", "provider_name"]]
             visit_data = visit_data[["visit_occurrence_id", "visit_start_date", "care_site_id", "visit_source_value", "person_id", "visit_source_key"]]
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=[self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
             del care_site_data
-            logging.debug(f'care_site 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "care_site 테이블과 결합 후 데이터")
 
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors = "coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors = "coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna(pd.to_datetime("1900-01-01"))
             source[self.care_site_todate] = source[self.care_site_todate].fillna(pd.to_datetime("2099-12-31"))
             source= source[(source[self.frstrgstdt] >= source[self.care_site_fromdate]) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f'provider 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "provider 테이블과 결합 후 데이터")
 
-            # visit_start_datetime 형태 변경
             # source["ORDDD"] = pd.to_datetime(source["ORDDD"])
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key"], right_on=["visit_source_key"], how="left", suffixes=('', '_y'))
             del visit_data
-            logging.debug(f'visit_occurrence 테이블과 결합 후 데이터 row수: {len(source)}')
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.orddate] >= source["visit_detail_start_datetime"]) & (source[self.orddate] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.orddate] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.orddate)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
             ## visit_detail로 인해 중복되는 항목 제거를 위함.
-            source = source.drop_duplicates(subset=[self.hospital, self.person_source_value, self.orddd, self.orddate, self.visit_no, self.measurement_source_value, self.ordcode, self.spccd])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터 row수: {len(source)}")
+            source = source.drop_duplicates(subset=self.natural_key)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터")
 
             # 값이 없는 경우 0으로 값 입력
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
@@ -1690,49 +2572,31 @@ class MeasurementDiagTransformer(DataTransformer):
             # concept_unit과 병합
             unit_data = unit_data[["concept_id", "concept_name", "concept_code"]]
             source = pd.merge(source, unit_data, left_on=self.unit_source_value, right_on="concept_code", how="left", suffixes=["", "_unit"])
-            logging.debug(f'unit 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "unit 테이블과 결합 후 데이터")
             # unit 동의어 적용
             source = pd.merge(source, unit_concept_synonym, left_on = self.unit_source_value, right_on = "concept_synonym_name", how = "left", suffixes=["", "_synonym"])
-            logging.debug(f'unit synonym 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "unit synonym 테이블과 결합 후 데이터")
             
 
             ### concept_etc테이블과 병합 ###
-            concept_etc = concept_etc[["concept_id", "concept_name"]]
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["measurement_type_concept_id"] = 44818702
             source = pd.merge(source, concept_etc, left_on = "measurement_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_measurement_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
-            # operator_concept_id 만들고 operator_concept_id_name 기반 만들기
-            operator_condition = [
-                    source[self.value_source_value].isin([">"])
-                    , source[self.value_source_value].isin([">="])
-                    , source[self.value_source_value].isin(["="])
-                    , source[self.value_source_value].isin(["<="])
-                    , source[self.value_source_value].isin(["<"])
-            ]
-            operator_value = [
-                    4172704
-                    , 4171755
-                    , 4172703
-                    , 4171754
-                    , 4171756
-            ]
-
-            source["operator_concept_id"] = np.select(operator_condition, operator_value)
+            # operator_concept_id_name 기반 만들기(operator_concept_id는 결과값 변환 시 생성)
             source = pd.merge(source, concept_etc, left_on = "operator_concept_id", right_on="concept_id", how="left", suffixes=('', '_operator'))
-            logging.debug(f'concept_etc: operator_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: operator_concept_id 테이블과 결합 후 데이터")
 
             # value_as_concept_id 만들고 value_as_concept_id_name 기반 만들기
             value_concept_condition = [
-                source[self.value_source_value] == "+"
-                , source[self.value_source_value] == "++"
-                , source[self.value_source_value] == "+++"
-                , source[self.value_source_value] == "++++"
-                , source[self.value_source_value].str.lower() == "negative"
-                , source[self.value_source_value].str.lower() == "positive"
+                source["value_text"] == "+"
+                , source["value_text"] == "++"
+                , source["value_text"] == "+++"
+                , source["value_text"] == "++++"
+                , source["value_text"].str.lower() == "negative"
+                , source["value_text"].str.lower() == "positive"
             ]
             value_concept_value = [
                 4123508
@@ -1744,14 +2608,15 @@ class MeasurementDiagTransformer(DataTransformer):
             ]
             source["value_as_concept_id"] = np.select(value_concept_condition, value_concept_value)
             source = pd.merge(source, concept_etc, left_on = "value_as_concept_id", right_on="concept_id", how="left", suffixes=('', '_value_as_concept'))
-            logging.debug(f'concept_etc: value_as_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: value_as_concept_id 테이블과 결합 후 데이터")
 
-            logging.debug(f'CDM 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "process_source", date_column = self.orddate)
 
             return source
         
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -1785,7 +2650,7 @@ class MeasurementDiagTransformer(DataTransformer):
             ]
 
             cdm = pd.DataFrame({
-                "measurement_id": source.index + 1,
+                "measurement_id": self.make_stable_id(source[self.natural_key]),
                 "person_id": source["person_id"],
                 "환자명": source["환자명"],
                 "measurement_concept_id": np.select([source["concept_id"].notna()], [source["concept_id"]], default=self.no_matching_concept[0]),
@@ -1834,14 +2699,14 @@ class MeasurementDiagTransformer(DataTransformer):
                 "결과내역": source[self.value_source_value]
                 })
 
-            logging.debug(f'CDM 데이터 row수: {len(cdm)}')
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class MeasurementpthTransformer(DataTransformer):
@@ -1867,18 +2732,24 @@ class MeasurementpthTransformer(DataTransformer):
         self.orddd = self.cdm_config["columns"]["orddd"]
         self.unit_source_value = self.cdm_config["columns"]["unit_source_value"]
         self.ordcode = self.cdm_config["columns"]["ordcode"]
+        # chunksize 단위 변환 시 chunk로 나누어 읽을 원천 데이터(처방)
+        self.stream_source = self.source_data4
+        # 처방(처방일자, 처방번호, 처방이력번호)과 병리 결과 등록(병리번호, 결과등록일자, 결과등록번호, 결과등록이력번호)으로 행을 구분하는 자연키
+        self.natural_key = [self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO", "PTNO", "RSLTRGSTDD", "RSLTRGSTNO", "RSLTRGSTHISTNO"]
+        self.joined_key = ["provider_id", "visit_occurrence_id", "visit_detail_id"]
                 
     def transform(self):
         """
         소스 데이터를 읽어들여 CDM 형식으로 변환하고 결과를 CSV 파일로 저장하는 메소드입니다.
         """
         try : 
-            source_data = self.process_source()
-            transformed_data = self.transform_cdm(source_data)
+            if self.get_chunksize():
+                self.transform_chunks("measurement_id")
+            else:
+                source_data = self.process_source()
+                transformed_data = self.transform_cdm(source_data)
 
-
-            # save_path = os.path.join(self.cdm_path, self.output_filename)
-            self.write_csv(transformed_data, self.cdm_path, self.output_filename)
+                self.write_csv(transformed_data, self.cdm_path, self.output_filename)
 
             logging.info(f"{self.table} 테이블 변환 완료")
             logging.info(f"============================")
@@ -1892,51 +2763,37 @@ class MeasurementpthTransformer(DataTransformer):
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
         """
         try:
-            source1 = self.read_csv(self.source_data1, path_type = self.source_flag, dtype = self.source_dtype)
-            source2 = self.read_csv(self.source_data2, path_type = self.source_flag, dtype = self.source_dtype)
-            source3 = self.read_csv(self.source_data3, path_type = self.source_flag, dtype = self.source_dtype)
-            source4 = self.read_csv(self.source_data4, path_type = self.source_flag, dtype = self.source_dtype)
             local_edi = self.read_csv(self.procedure_edi_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
             # unit_data = self.read_csv(self.concept_unit, path_type = self.source_flag , dtype = self.source_dtype, encoding=self.cdm_encoding)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag , dtype = self.source_dtype, encoding=self.cdm_encoding)
+            concept_etc = self.read_dimension("concept_etc")
             # unit_concept_synonym = self.read_csv(self.unit_concept_synonym, path_type = self.source_flag , dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f'원천 데이터 row수: {len(source1)}, {len(source2)}, {len(source3)}, {len(source4)}')
 
-            # 원천에서 조건걸기
-            source1 = source1[[self.hospital, self.person_source_value, "PTNO", "RSLTRGSTDD", "RSLTRGSTNO", "RSLTRGSTHISTNO", "RSLTRGSTTM", "DELFLAGCD", "HISTNO", "GROSTESTRECDD", "GROSTESTRECTM"]]
-            source1 = source1[(source1["RSLTRGSTHISTNO"] == "1") & (source1["DELFLAGCD"] == "0") & (source1["HISTNO"] == "1") ]
-            
-            source2 = source2[[self.hospital, self.person_source_value, "PTNO", "RSLTRGSTDD", "RSLTRGSTNO", "RSLTRGSTHISTNO", self.value_source_value]]
-
-            source3 = source3[[self.hospital, "PTNO", "PRCPDD", "PRCPNO", "ACPTSTATCD", self.measurement_source_value, "SPCCD", "READDD", "READTM", "ACPTDD", "ACPTTM"]]
-            source3[self.orddate] = pd.to_datetime(source3[self.orddate])
-            source3 = source3[(source3[self.orddate] <= self.data_range)]
-            source3 = source3[source3["ACPTSTATCD"].isin(["3", "4"])]
-
-            source4 = source4[[self.hospital, self.orddate, self.person_source_value, "PRCPHISTNO", "ORDDD", "CRETNO", "PRCPCLSCD", "LASTUPDTDT", "ORDDRID", "PRCPCD", "PRCPHISTCD", "PRCPNO", "ORDDEPTCD", self.frstrgstdt]]
-            source4[self.orddate] = pd.to_datetime(source4[self.orddate])
-            source4 = source4[(source4[self.orddate] <= self.data_range)]
-            source4 = source4[(source4["PRCPHISTCD"] == "O")]
-
-            logging.debug(f'조건적용 후 원천 데이터 row수: {len(source1)}, {len(source2)}, {len(source3)}, {len(source4)}')
-
-            source = pd.merge(source1, source2, left_on=[self.hospital, self.person_source_value, "PTNO", "RSLTRGSTNO", "RSLTRGSTDD", "RSLTRGSTHISTNO"], right_on=[self.hospital, self.person_source_value, "PTNO", "RSLTRGSTNO", "RSLTRGSTDD", "RSLTRGSTHISTNO"], how="inner", suffixes=("", "_pth2"))
-            logging.debug(f'source1, source2 병합 후 데이터 개수:, {len(source)}')
-            del source1
-            del source2
-
-            source = pd.merge(source, source3, left_on=[self.hospital, "PTNO"], right_on=[self.hospital, "PTNO"], how="inner", suffixes=("", "_pth3"))
-            logging.debug(f'source, source3 병합 후 데이터 개수:, {len(source)}')
-
-            source = pd.merge(source, source4, left_on=[self.hospital, "PRCPDD", "PRCPNO"], right_on=[self.hospital, "PRCPDD", "PRCPNO"], how="inner", suffixes=("", "_pth4"))
-            logging.debug(f'source, source4 병합 후 데이터 개수:, {len(source)}')
-            del source3
-            del source4
+            # 병리 결과(source1, source2), 접수(source3)를 join한 index에 처방(source4)을 나누어 읽으며 join
+            # 필요한 컬럼만 읽고 원천에서 조건걸기
+            plan = [
+                {"file_name": self.source_data1,
+                 "columns": [self.hospital, self.person_source_value, "PTNO", "RSLTRGSTDD", "RSLTRGSTNO", "RSLTRGSTHISTNO", "RSLTRGSTTM", "DELFLAGCD", "HISTNO", "GROSTESTRECDD", "GROSTESTRECTM"],
+                 "filters": [("RSLTRGSTHISTNO", "==", "1"), ("DELFLAGCD", "==", "0"), ("HISTNO", "==", "1")]},
+                {"file_name": self.source_data2,
+                 "columns": [self.hospital, self.person_source_value, "PTNO", "RSLTRGSTDD", "RSLTRGSTNO", "RSLTRGSTHISTNO", self.value_source_value],
+                 "left_on": [self.hospital, self.person_source_value, "PTNO", "RSLTRGSTNO", "RSLTRGSTDD", "RSLTRGSTHISTNO"], "right_on": [self.hospital, self.person_source_value, "PTNO", "RSLTRGSTNO", "RSLTRGSTDD", "RSLTRGSTHISTNO"], "suffix": "_pth2"},
+                {"file_name": self.source_data3,
+                 "columns": [self.hospital, "PTNO", "PRCPDD", "PRCPNO", "ACPTSTATCD", self.measurement_source_value, "SPCCD", "READDD", "READTM", "ACPTDD", "ACPTTM"],
+                 "datetime_columns": [self.orddate],
+                 "filters": [(self.orddate, "<=", self.data_range), ("ACPTSTATCD", "in", ["3", "4"])],
+                 "left_on": [self.hospital, "PTNO"], "right_on": [self.hospital, "PTNO"], "suffix": "_pth3"},
+                {"file_name": self.source_data4,
+                 "columns": [self.hospital, self.orddate, self.person_source_value, "PRCPHISTNO", "ORDDD", "CRETNO", "PRCPCLSCD", "LASTUPDTDT", "ORDDRID", "PRCPCD", "PRCPHISTCD", "PRCPNO", "ORDDEPTCD", self.frstrgstdt],
+                 "datetime_columns": [self.orddate],
+                 "filters": [(self.orddate, "<=", self.data_range), ("PRCPHISTCD", "==", "O")],
+                 "left_on": [self.hospital, "PRCPDD", "PRCPNO"], "right_on": [self.hospital, "PRCPDD", "PRCPNO"], "suffix": "_pth4"}
+            ]
+            source = self.join_sources(plan)
 
             # visit_source_key 생성
             source[self.measurement_date] = source["ACPTDD"] + source["ACPTTM"]
@@ -1951,11 +2808,10 @@ class MeasurementpthTransformer(DataTransformer):
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.orddd].dt.strftime("%Y%m%d") + ';' + source[self.visit_no] + ';' + source[self.hospital]
             source[self.measurement_date] = pd.to_datetime(source[self.measurement_date])
 
-            person_data = person_data[["person_id", "person_source_value", "환자명"]]
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
             del person_data
-            logging.debug(f'person 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 데이터")
             
             # local_edi 전처리
             local_edi = local_edi[[self.ordcode, self.fromdate, self.todate, self.edicode, "concept_id", self.hospital, "ORDNM", "PRCPNM"]]
@@ -1968,57 +2824,39 @@ class MeasurementpthTransformer(DataTransformer):
             # del local_edi
             # logging.debug(f'EDI코드 테이블과 병합 후 데이터 row수:, {len(source)}')
 
-            source = pd.merge(source, local_edi, left_on=[self.ordcode, self.hospital], right_on=[self.ordcode, self.hospital], how="left", suffixes=('', '_order'))
-            source[self.fromdate] = source[self.fromdate].fillna(pd.to_datetime('1900-01-01'))
-            source[self.todate] = source[self.todate].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.orddate] >= source[self.fromdate]) & (source[self.orddate] <= source[self.todate])]
+            source = self.merge_valid_period(source, local_edi, left_on=[self.ordcode, self.hospital], right_on=[self.ordcode, self.hospital], date_column=self.orddate, suffixes=('', '_order'))
             del local_edi
-            logging.debug(f'EDI코드 테이블과 병합 후 데이터 row수:, {len(source)}')
+            self.record_lineage(source, "EDI코드 테이블과 병합 후 데이터")
             
             # 데이터 컬럼 줄이기
-            care_site_data = care_site_data[["care_site_id", "care_site_source_value", "place_of_service_source_value", "care_site_name", self.care_site_fromdate, self.care_site_todate]]
-            provider_data = provider_data[["provider_id", "provider_source_value", "provider_name"]]
             visit_data = visit_data[["visit_occurrence_id", "visit_start_date", "care_site_id", "visit_source_value", "person_id", "visit_source_key"]]
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=[self.meddept, self.hospital], right_on=["care_site_source_value", "place_of_service_source_value"], how="left")
             del care_site_data
-            logging.debug(f'care_site 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "care_site 테이블과 결합 후 데이터")
 
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors = "coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors = "coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna(pd.to_datetime("1900-01-01"))
             source[self.care_site_todate] = source[self.care_site_todate].fillna(pd.to_datetime("2099-12-31"))
             source= source[(source[self.frstrgstdt] >= source[self.care_site_fromdate]) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f'provider 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "provider 테이블과 결합 후 데이터")
 
-            # visit_start_datetime 형태 변경
             source[self.orddd] = pd.to_datetime(source[self.orddd])
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key"], right_on=["visit_source_key"], how="left", suffixes=('', '_y'))
             del visit_data
-            logging.debug(f'visit_occurrence 테이블과 결합 후 데이터 row수: {len(source)}')
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.orddate] >= source["visit_detail_start_datetime"]) & (source[self.orddate] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.orddate] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.orddate)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
             source = source.drop_duplicates()
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터")
 
             # 값이 없는 경우 0으로 값 입력
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
@@ -2035,13 +2873,11 @@ class MeasurementpthTransformer(DataTransformer):
             
 
             ### concept_etc테이블과 병합 ###
-            concept_etc = concept_etc[["concept_id", "concept_name"]]
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["measurement_type_concept_id"] = 44818702
             source = pd.merge(source, concept_etc, left_on = "measurement_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_measurement_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
             # operator_concept_id 만들고 operator_concept_id_name 기반 만들기
             operator_condition = [
@@ -2061,7 +2897,7 @@ class MeasurementpthTransformer(DataTransformer):
 
             source["operator_concept_id"] = np.select(operator_condition, operator_value)
             source = pd.merge(source, concept_etc, left_on = "operator_concept_id", right_on="concept_id", how="left", suffixes=('', '_operator'))
-            logging.debug(f'concept_etc: operator_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: operator_concept_id 테이블과 결합 후 데이터")
 
             # value_as_concept_id 만들고 value_as_concept_id_name 기반 만들기
             value_concept_condition = [
@@ -2082,14 +2918,15 @@ class MeasurementpthTransformer(DataTransformer):
             ]
             source["value_as_concept_id"] = np.select(value_concept_condition, value_concept_value)
             source = pd.merge(source, concept_etc, left_on = "value_as_concept_id", right_on="concept_id", how="left", suffixes=('', '_value_as_concept'))
-            logging.debug(f'concept_etc: value_as_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: value_as_concept_id 테이블과 결합 후 데이터")
 
-            logging.debug(f'CDM 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "CDM 테이블과 결합 후 데이터")
 
             return source
         
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -2172,18 +3009,19 @@ class MeasurementpthTransformer(DataTransformer):
                 })
                 
             cdm = cdm.drop_duplicates()
+            # 값이 바뀌어도 id가 유지되도록 중복 제거 후 남은 행의 자연키로 id 생성
+            # 원천 행 하나가 provider, visit_occurrence, visit_detail과 결합하여 여러 행이 될 수 있으므로 결합한 id도 자연키에 포함
+            cdm["measurement_id"] = self.make_stable_id(pd.concat([source.loc[cdm.index, self.natural_key], cdm[self.joined_key]], axis = 1))
             cdm.reset_index(drop=True, inplace=True)
 
-            cdm["measurement_id"] = cdm.index + 1
-
-            logging.debug(f'CDM 데이터 row수: {len(cdm)}')
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class MeasurementVSTransformer(DataTransformer):
@@ -2199,6 +3037,9 @@ class MeasurementVSTransformer(DataTransformer):
         self.measurement_date = self.cdm_config["columns"]["measurement_date"]
         self.value_source_value = self.cdm_config["columns"]["value_source_value"]
         self.measurement_source_value = self.cdm_config["columns"]["measurement_source_value"]
+        self.natural_key = [self.person_source_value, self.orddd, self.measurement_date, self.measurement_source_value]
+        # 원천 행 하나가 visit_occurrence, visit_detail과 결합하여 여러 행이 될 수 있으므로 결합한 id도 자연키에 포함
+        self.joined_key = ["visit_occurrence_id", "visit_detail_id"]
         
     def transform(self):
         """
@@ -2225,12 +3066,12 @@ class MeasurementVSTransformer(DataTransformer):
         """
         try:
             source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
+            person_data = self.read_dimension("person")
             # provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f'원천 데이터 row수: {len(source)}')
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
+            concept_etc = self.read_dimension("concept_etc")
+            self.record_lineage(source, "원천 데이터")
 
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.orddd] + ';' + ';'
 
@@ -2238,59 +3079,46 @@ class MeasurementVSTransformer(DataTransformer):
             source["처방일"] = source[self.measurement_date]
             source[self.measurement_date] = pd.to_datetime(source[self.measurement_date], errors="coerce")
             source = source[(source[self.measurement_date] <= self.data_range)]
-            logging.debug(f'조건 적용후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "조건 적용후 원천 데이터")
 
             # CDM 데이터 컬럼 줄이기
-            person_data = person_data[["person_id", "person_source_value", "환자명"]]
             visit_data = visit_data[["visit_occurrence_id", "visit_start_date", "care_site_id", "visit_source_value", "person_id"]]
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            logging.debug(f'person 테이블과 결합 후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 원천 데이터")
 
             # provider table과 병합
             # source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
             # logging.debug(f'provider 테이블과 결합 후 원천 데이터 row수: {len(source)}')
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
             source = pd.merge(source, visit_data, left_on=["person_id", self.measurement_date], right_on=["person_id", "visit_start_date"], how="left", suffixes=('', '_y'))
-            logging.debug(f'visit_occurrence 테이블과 결합 후 원천 데이터 row수: {len(source)}')
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.measurement_date] >= source["visit_detail_start_datetime"]) & (source[self.measurement_date] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.measurement_date] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 원천 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.measurement_date)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
             source = source.drop_duplicates()
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)   
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["measurement_type_concept_id"] = 44818702
             source = pd.merge(source, concept_etc, left_on = "measurement_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_measurement_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
             # 값이 없는 경우 0으로 값 입력
             source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
 
-            logging.debug(f'CDM 테이블과 결합 후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "process_source", date_column = self.measurement_date)
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -2313,13 +3141,12 @@ class MeasurementVSTransformer(DataTransformer):
 
             # 숫자가 아닌 value 값 수정
             # source["value_as_number"] = source[self.value_source_value].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source["value_as_number"] = source[self.value_source_value].apply(convert_to_numeric).copy()
-            source["value_as_number"].astype(float)
+            source["value_as_number"] = parse_numeric_value(source[self.value_source_value])["value_as_number"]
 
 
             # cdm생성
             cdm = pd.DataFrame({
-                "measurement_id": source.index + 1,
+                "measurement_id": self.make_stable_id(source[self.natural_key + self.joined_key]),
                 "person_id": source["person_id"],
                 "환자명": source["환자명"],
                 "measurement_concept_id": self.no_matching_concept[0],
@@ -2366,14 +3193,14 @@ class MeasurementVSTransformer(DataTransformer):
                 "결과내역": source[self.value_source_value]
                 })
 
-            logging.debug(f'CDM 데이터 row수: {len(cdm)}')
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class MeasurementNITransformer(DataTransformer):
@@ -2394,6 +3221,9 @@ class MeasurementNITransformer(DataTransformer):
         self.breth = self.cdm_config["columns"]["breth"]
         self.bdtp = self.cdm_config["columns"]["bdtp"]
         self.spo2 = self.cdm_config["columns"]["spo2"]
+        self.natural_key = [self.hospital, self.person_source_value, self.admtime, self.provider]
+        # 원천 행 하나가 provider, visit_occurrence, visit_detail과 결합하여 여러 행이 될 수 있으므로 결합한 id도 자연키에 포함
+        self.joined_key = ["provider_id", "visit_occurrence_id", "visit_detail_id"]
 
         
     def transform(self):
@@ -2420,33 +3250,32 @@ class MeasurementNITransformer(DataTransformer):
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
         """
         try:
-            source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f'원천 데이터 row수: {len(source)}')
+            # 필요한 컬럼만 원천에서 읽기
+            columns = [self.person_source_value, self.admtime, self.provider, self.height, self.weight, self.sbp, self.dbp, self.pulse, self.breth, self.bdtp, self.spo2, self.hospital]
+            source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype, usecols = columns)
+            person_data = self.read_dimension("person")
+            care_site_data = self.read_dimension("care_site")
+            provider_data = self.read_dimension("provider")
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
+            concept_etc = self.read_dimension("concept_etc")
+            self.record_lineage(source, "원천 데이터")
 
             # 원천에서 조건걸기
-            source = source[[self.person_source_value, self.admtime, self.provider, self.height, self.weight, self.sbp, self.dbp, self.pulse, self.breth, self.bdtp, self.spo2, self.hospital]]
+            source = source[columns]
             # visit_source_key 생성
             source["visit_source_key"] = source[self.person_source_value] + ';' + source[self.admtime] + ';' +  ';' + source[self.hospital]
 
             source[self.admtime] = pd.to_datetime(source[self.admtime], format="%Y%m%d")
             source = source[(source[self.admtime] <= self.data_range)]
-            logging.debug(f'조건 적용후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "조건 적용후 원천 데이터")
 
             # CDM 데이터 컬럼 줄이기
-            person_data = person_data[["person_id", "person_source_value", "환자명"]]
-            care_site_data = care_site_data[["care_site_id", "care_site_source_value", "care_site_name", "place_of_service_source_value"]]
-            provider_data = provider_data[["provider_id", "provider_source_value", "provider_name"]]
             visit_data = visit_data[["visit_occurrence_id", "visit_start_date", "care_site_id", "visit_source_value", "person_id", "visit_source_key"]]
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            logging.debug(f'person 테이블과 결합 후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 원천 데이터")
             
             # care_site table과 병합
             # source = pd.merge(source, care_site_data, left_on=self.meddept, right_on="care_site_source_value", how="left")
@@ -2454,47 +3283,35 @@ class MeasurementNITransformer(DataTransformer):
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f'provider 테이블과 결합 후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "provider 테이블과 결합 후 원천 데이터")
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
             visit_data = visit_data[visit_data["visit_source_value"] == 'I']
             visit_data["instcd"] = visit_data["visit_source_key"].str.split(';', expand = True)[3]
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
             source = pd.merge(source, visit_data, left_on=["person_id", self.admtime, self.hospital], right_on=["person_id", "visit_start_date", "instcd"], how="left", suffixes=('', '_y'))
-            logging.debug(f'visit_occurrence 테이블과 결합 후 원천 데이터 row수: {len(source)}')
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.admtime] >= source["visit_detail_start_datetime"]) & (source[self.admtime] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.admtime] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 원천 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.admtime)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
             source = source.drop_duplicates()
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["measurement_type_concept_id"] = 44818702
             source = pd.merge(source, concept_etc, left_on = "measurement_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_measurement_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
-            logging.debug(f'CDM 테이블과 결합 후 원천 데이터 row수: {len(source)}')
+            self.record_lineage(source, "CDM 테이블과 결합 후 원천 데이터")
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -2529,44 +3346,34 @@ class MeasurementNITransformer(DataTransformer):
 
             # 숫자가 아닌 value 값 수정
             # source_weight["value_as_number"] = source_weight[self.weight].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_weight["value_as_number"] = source_weight[self.weight].apply(convert_to_numeric)
-            source_weight["value_as_number"].astype(float)
+            source_weight["value_as_number"] = parse_numeric_value(source_weight[self.weight])["value_as_number"]
 
             # source_height["value_as_number"] = source_height[self.height].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_height["value_as_number"] = source_height[self.height].apply(convert_to_numeric)
-            source_height["value_as_number"].astype(float)
+            source_height["value_as_number"] = parse_numeric_value(source_height[self.height])["value_as_number"]
 
             # source_bmi[self.weight] = source_bmi[self.height].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_bmi[self.weight] = source_bmi[self.height].apply(convert_to_numeric)
-            source_bmi[self.weight] = source_bmi[self.weight].astype(float)
+            source_bmi[self.weight] = parse_numeric_value(source_bmi[self.height])["value_as_number"]
             # source_bmi[self.height] = source_bmi[self.height].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_bmi[self.height] = source_bmi[self.height].apply(convert_to_numeric)
-            source_bmi[self.height] = source_bmi[self.height].astype(float)
+            source_bmi[self.height] = parse_numeric_value(source_bmi[self.height])["value_as_number"]
             source_bmi['bmi'] = round(source_bmi[self.weight] / (source_bmi[self.height]*0.01)**2, 1)
 
             # source_sbp["value_as_number"] = source_sbp[self.sbp].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_sbp["value_as_number"] = source_sbp[self.sbp].apply(convert_to_numeric)
-            source_sbp["value_as_number"].astype(float)
+            source_sbp["value_as_number"] = parse_numeric_value(source_sbp[self.sbp])["value_as_number"]
 
             # source_dbp["value_as_number"] = source_dbp[self.dbp].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_dbp["value_as_number"] = source_dbp[self.dbp].apply(convert_to_numeric)
-            source_dbp["value_as_number"].astype(float)
+            source_dbp["value_as_number"] = parse_numeric_value(source_dbp[self.dbp])["value_as_number"]
 
             # source_pulse["value_as_number"] = source_pulse[self.pulse].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_pulse["value_as_number"] = source_pulse[self.pulse].apply(convert_to_numeric)
-            source_pulse["value_as_number"].astype(float)
+            source_pulse["value_as_number"] = parse_numeric_value(source_pulse[self.pulse])["value_as_number"]
 
             # source_breth["value_as_number"] = source_breth[self.breth].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_breth["value_as_number"] = source_breth[self.breth].apply(convert_to_numeric)
-            source_breth["value_as_number"].astype(float)
+            source_breth["value_as_number"] = parse_numeric_value(source_breth[self.breth])["value_as_number"]
 
             # source_bdtp["value_as_number"] = source_bdtp[self.bdtp].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_bdtp["value_as_number"] = source_bdtp[self.bdtp].apply(convert_to_numeric)
-            source_bdtp["value_as_number"].astype(float)
+            source_bdtp["value_as_number"] = parse_numeric_value(source_bdtp[self.bdtp])["value_as_number"]
 
             # source_spo2["value_as_number"] = source_spo2[self.spo2].str.extract(r'(-?\d+\.\d+|\d+)').copy()
-            source_spo2["value_as_number"] = source_spo2[self.spo2].apply(convert_to_numeric)
-            source_spo2["value_as_number"].astype(float)
+            source_spo2["value_as_number"] = parse_numeric_value(source_spo2[self.spo2])["value_as_number"]
 
             logging.debug(f"""값이 있는 원천 데이터 row수:\n 
                         source_weight: {len(source_weight)}\n
@@ -2583,481 +3390,69 @@ class MeasurementNITransformer(DataTransformer):
                              }
                         """)
 
-            # weight값이 저장된 cdm생성
-            cdm_weight = pd.DataFrame({
-                "measurement_id": source_weight.index + 1,
-                "person_id": source_weight["person_id"],
-                "환자명": source_weight["환자명"],
-                "measurement_concept_id": measurement_concept["weight"][0],
-                "measurement_date": source_weight[self.admtime].dt.date,
-                "measurement_datetime": source_weight[self.admtime],
-                "measurement_time": source_weight[self.admtime].dt.time,
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_weight["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_weight["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["weight"][2],
-                "unit_concept_id_name": measurement_concept["weight"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_weight["provider_id"],
-                "provider_name": source_weight["provider_name"],
-                "visit_occurrence_id": source_weight["visit_occurrence_id"],
-                "visit_detail_id": source_weight["visit_detail_id"],
-                "measurement_source_value": measurement_concept["weight"][1],
-                "measurement_source_value_name": measurement_concept["weight"][1],
-                "measurement_source_concept_id": measurement_concept["weight"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["weight"][3],
-                "value_source_value": source_weight[self.weight],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_weight["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_weight["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_weight[self.weight]
-                })
-
-            # height값이 저장된 cdm생성
-            cdm_height = pd.DataFrame({
-                "measurement_id": source_height.index + 1,
-                "person_id": source_height["person_id"],
-                "환자명": source_height["환자명"],
-                "measurement_concept_id": measurement_concept["height"][0],
-                "measurement_date": source_height[self.admtime].dt.date,
-                "measurement_datetime": source_height[self.admtime],
-                "measurement_time": source_height[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_height["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_height["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["height"][2],
-                "unit_concept_id_name": measurement_concept["height"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_height["provider_id"],
-                "provider_name": source_height["provider_name"],
-                "visit_occurrence_id": source_height["visit_occurrence_id"],
-                "visit_detail_id": source_height["visit_detail_id"],
-                "measurement_source_value": measurement_concept["height"][1],
-                "measurement_source_value_name": measurement_concept["height"][1],
-                "measurement_source_concept_id": measurement_concept["height"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["height"][3],
-                "value_source_value": source_height[self.height],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_height["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_height["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_height[self.height] 
-                })
-
-            # bmi값이 저장된 cdm생성
-            cdm_bmi = pd.DataFrame({
-                "measurement_id": source_bmi.index + 1,
-                "person_id": source_bmi["person_id"],
-                "환자명": source_bmi["환자명"],
-                "measurement_concept_id": measurement_concept["bmi"][0],
-                "measurement_date": source_bmi[self.admtime].dt.date,
-                "measurement_datetime": source_bmi[self.admtime],
-                "measurement_time": source_bmi[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_bmi["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_bmi["bmi"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["bmi"][2],
-                "unit_concept_id_name": measurement_concept["bmi"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_bmi["provider_id"],
-                "provider_name": source_bmi["provider_name"],
-                "visit_occurrence_id": source_bmi["visit_occurrence_id"],
-                "visit_detail_id": source_bmi["visit_detail_id"],
-                "measurement_source_value": measurement_concept["bmi"][1],
-                "measurement_source_value_name": measurement_concept["bmi"][1],
-                "measurement_source_concept_id": measurement_concept["bmi"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["bmi"][3],
-                "value_source_value": source_bmi["bmi"],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_bmi["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_bmi["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_bmi["bmi"]
-                })
-
-            cdm_sbp = pd.DataFrame({
-                "measurement_id": source_sbp.index + 1,
-                "person_id": source_sbp["person_id"],
-                "환자명": source_sbp["환자명"],
-                "measurement_concept_id": measurement_concept["sbp"][0],
-                "measurement_date": source_sbp[self.admtime].dt.date,
-                "measurement_datetime": source_sbp[self.admtime],
-                "measurement_time": source_sbp[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_sbp["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_sbp["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["sbp"][2],
-                "unit_concept_id_name": measurement_concept["sbp"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_sbp["provider_id"],
-                "provider_name": source_sbp["provider_name"],
-                "visit_occurrence_id": source_sbp["visit_occurrence_id"],
-                "visit_detail_id": source_sbp["visit_detail_id"],
-                "measurement_source_value": measurement_concept["sbp"][1],
-                "measurement_source_value_name": measurement_concept["sbp"][1],
-                "measurement_source_concept_id": measurement_concept["sbp"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["sbp"][3],
-                "value_source_value": source_sbp[self.sbp],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_sbp["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_sbp["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_sbp[self.sbp]  
-                })
-
-            cdm_dbp = pd.DataFrame({
-                "measurement_id": source_dbp.index + 1,
-                "person_id": source_dbp["person_id"],
-                "환자명": source_dbp["환자명"],
-                "measurement_concept_id": measurement_concept["dbp"][0],
-                "measurement_date": source_dbp[self.admtime].dt.date,
-                "measurement_datetime": source_dbp[self.admtime],
-                "measurement_time": source_dbp[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_dbp["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_dbp["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["dbp"][2],
-                "unit_concept_id_name": measurement_concept["dbp"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_dbp["provider_id"],
-                "provider_name": source_dbp["provider_name"],
-                "visit_occurrence_id": source_dbp["visit_occurrence_id"],
-                "visit_detail_id": source_dbp["visit_detail_id"],
-                "measurement_source_value": measurement_concept["dbp"][1],
-                "measurement_source_value_name": measurement_concept["dbp"][1],
-                "measurement_source_concept_id": measurement_concept["dbp"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["dbp"][3],
-                "value_source_value": source_dbp[self.dbp],
-                "vocabulary_id": "SNOMED",
-                "처방명": None,
-                "환자구분": source_dbp["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_dbp[self.dbp] 
-                })
-
-            cdm_pulse = pd.DataFrame({
-                "measurement_id": source_pulse.index + 1,
-                "person_id": source_pulse["person_id"],
-                "환자명": source_pulse["환자명"],
-                "measurement_concept_id": measurement_concept["pulse"][0],
-                "measurement_date": source_pulse[self.admtime].dt.date,
-                "measurement_datetime": source_pulse[self.admtime],
-                "measurement_time": source_pulse[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_pulse["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_pulse["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["pulse"][2],
-                "unit_concept_id_name": measurement_concept["pulse"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_pulse["provider_id"],
-                "provider_name": source_pulse["provider_name"],
-                "visit_occurrence_id": source_pulse["visit_occurrence_id"],
-                "visit_detail_id": source_pulse["visit_detail_id"],
-                "measurement_source_value": measurement_concept["pulse"][1],
-                "measurement_source_value_name": measurement_concept["pulse"][1],
-                "measurement_source_concept_id": measurement_concept["pulse"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["pulse"][3],
-                "value_source_value": source_pulse[self.pulse],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_pulse["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_pulse["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_pulse[self.pulse]  
-                })
-
-            cdm_breth = pd.DataFrame({
-                "measurement_id": source_breth.index + 1,
-                "person_id": source_breth["person_id"],
-                "환자명": source_breth["환자명"],
-                "measurement_concept_id": measurement_concept["breth"][0],
-                "measurement_date": source_breth[self.admtime].dt.date,
-                "measurement_datetime": source_breth[self.admtime],
-                "measurement_time": source_breth[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_breth["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_breth["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["breth"][2],
-                "unit_concept_id_name": measurement_concept["breth"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_breth["provider_id"],
-                "provider_name": source_breth["provider_name"],
-                "visit_occurrence_id": source_breth["visit_occurrence_id"],
-                "visit_detail_id": source_breth["visit_detail_id"],
-                "measurement_source_value": measurement_concept["breth"][1],
-                "measurement_source_value_name": measurement_concept["breth"][1],
-                "measurement_source_concept_id": measurement_concept["breth"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["breth"][3],
-                "value_source_value": source_breth[self.breth],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_breth["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_breth["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_breth[self.breth]  
-                })
-
-            cdm_bdtp = pd.DataFrame({
-                "measurement_id": source_bdtp.index + 1,
-                "person_id": source_bdtp["person_id"],
-                "환자명": source_bdtp["환자명"],
-                "measurement_concept_id": measurement_concept["bdtp"][0],
-                "measurement_date": source_bdtp[self.admtime].dt.date,
-                "measurement_datetime": source_bdtp[self.admtime],
-                "measurement_time": source_bdtp[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_bdtp["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_bdtp["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["bdtp"][2],
-                "unit_concept_id_name": measurement_concept["bdtp"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_bdtp["provider_id"],
-                "provider_name": source_bdtp["provider_name"],
-                "visit_occurrence_id": source_bdtp["visit_occurrence_id"],
-                "visit_detail_id": source_bdtp["visit_detail_id"],
-                "measurement_source_value": measurement_concept["bdtp"][1],
-                "measurement_source_value_name": measurement_concept["bdtp"][1],
-                "measurement_source_concept_id": measurement_concept["bdtp"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["bdtp"][3],
-                "value_source_value": source_bdtp[self.bdtp],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_bdtp["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_bdtp["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_bdtp[self.bdtp] 
-                })
-
-            cdm_spo2 = pd.DataFrame({
-                "measurement_id": source_spo2.index + 1,
-                "person_id": source_spo2["person_id"],
-                "환자명": source_spo2["환자명"],
-                "measurement_concept_id": measurement_concept["spo2"][0],
-                "measurement_date": source_spo2[self.admtime].dt.date,
-                "measurement_datetime": source_spo2[self.admtime],
-                "measurement_time": source_spo2[self.admtime].dt.time, 
-                # "measurement_date_type": "입원일자", 
-                "measurement_type_concept_id": 44818702,
-                "measurement_type_concept_id_name": source_spo2["concept_name"],
-                "operator_concept_id": self.no_matching_concept[0],
-                "operator_concept_id_name": self.no_matching_concept[1],
-                "value_as_number": source_spo2["value_as_number"],
-                "value_as_concept_id": self.no_matching_concept[0],
-                "value_as_concept_id_name": self.no_matching_concept[1],
-                "unit_concept_id": measurement_concept["spo2"][2],
-                "unit_concept_id_name": measurement_concept["spo2"][3],
-                "range_low": None,
-                "range_high": None,
-                "provider_id": source_spo2["provider_id"],
-                "provider_name": source_spo2["provider_name"],
-                "visit_occurrence_id": source_spo2["visit_occurrence_id"],
-                "visit_detail_id": source_spo2["visit_detail_id"],
-                "measurement_source_value": measurement_concept["spo2"][1],
-                "measurement_source_value_name": measurement_concept["spo2"][1],
-                "measurement_source_concept_id": measurement_concept["spo2"][0],
-                "EDI코드": None,
-                "unit_source_value": measurement_concept["spo2"][3],
-                "value_source_value": source_spo2[self.spo2],
-                "vocabulary_id": "SNOMED",
-                "visit_source_key": source_spo2["visit_source_key"],
-                "처방코드": None,
-                "처방명": None,
-                "환자구분": source_spo2["visit_source_value"],
-                "진료과": None,
-                "진료과명": None,
-                "처방일": None,
-                "진료일시": None,
-                "접수일시": None,
-                "실시일시": None,
-                "판독일시": None,
-                "보고일시": None,
-                "처방순번": None,
-                "정상치(상)": None,
-                "정상치(하)": None,
-                # "나이": None,
-                "결과내역": source_spo2[self.spo2]
-                })
-            logging.debug(f"""weight값이 있는 원천 데이터 row수:\n 
-                        cdm_weight: {len(cdm_weight)}\n
-                        cdm_height: {len(cdm_height)}\n
-                        cdm_bmi: {len(cdm_bmi)}\n
-                        cdm_sbp: {len(cdm_sbp)}\n
-                        cdm_dbp: {len(cdm_dbp)}\n
-                        cdm_pulse: {len(cdm_pulse)}\n
-                        cdm_breth: {len(cdm_breth)}\n
-                        cdm_dbtp: {len(cdm_bdtp)}\n
-                        cdm_spo2: {len(cdm_spo2)}\n
-                        총합: {len(cdm_weight) + len(cdm_height) + len(cdm_bmi) + len(cdm_sbp)
-                             + len(cdm_dbp) + len(cdm_pulse) + len(cdm_breth) + len(cdm_bdtp) + len(cdm_spo2)
-                             }
-                        """)
-            
-            cdm = pd.concat([cdm_weight, cdm_height, cdm_bmi, cdm_sbp, cdm_dbp, cdm_pulse, cdm_breth, cdm_bdtp, cdm_spo2], axis = 0, ignore_index=True)
+            # 측정 항목별 원천 데이터와 값 컬럼, cdm 생성 순서는 weight, height, bmi, sbp, dbp, pulse, breth, bdtp, spo2
+            vital_sources = [
+                ("weight", source_weight, self.weight),
+                ("height", source_height, self.height),
+                ("bmi", source_bmi, "bmi"),
+                ("sbp", source_sbp, self.sbp),
+                ("dbp", source_dbp, self.dbp),
+                ("pulse", source_pulse, self.pulse),
+                ("breth", source_breth, self.breth),
+                ("bdtp", source_bdtp, self.bdtp),
+                ("spo2", source_spo2, self.spo2)
+            ]
 
-            logging.debug(f'CDM 데이터 row수: {len(cdm)}')
-            logging.debug(f"요약:\n{cdm.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            # 항목별 값이 저장된 cdm생성, 컬럼 순서와 나머지 컬럼(결측값)은 measurement 테이블 정의를 따름
+            cdm_vitals = {}
+            for key, vital, value_column in vital_sources:
+                concept_id, concept_name, unit_concept_id, unit_concept_name = measurement_concept[key]
+                value_as_number = vital["bmi"] if key == "bmi" else vital["value_as_number"]
+                cdm_vitals[key] = build_frame("measurement", {
+                    "measurement_id": self.make_stable_id(vital[self.natural_key + self.joined_key].assign(measurement = key)),
+                    "person_id": vital["person_id"],
+                    "환자명": vital["환자명"],
+                    "measurement_concept_id": concept_id,
+                    "measurement_date": vital[self.admtime].dt.date,
+                    "measurement_datetime": vital[self.admtime],
+                    "measurement_time": vital[self.admtime].dt.time,
+                    "measurement_type_concept_id": 44818702,
+                    "measurement_type_concept_id_name": vital["concept_name"],
+                    "operator_concept_id": self.no_matching_concept[0],
+                    "operator_concept_id_name": self.no_matching_concept[1],
+                    "value_as_number": value_as_number,
+                    "value_as_concept_id": self.no_matching_concept[0],
+                    "value_as_concept_id_name": self.no_matching_concept[1],
+                    "unit_concept_id": unit_concept_id,
+                    "unit_concept_id_name": unit_concept_name,
+                    "provider_id": vital["provider_id"],
+                    "provider_name": vital["provider_name"],
+                    "visit_occurrence_id": vital["visit_occurrence_id"],
+                    "visit_detail_id": vital["visit_detail_id"],
+                    "measurement_source_value": concept_name,
+                    "measurement_source_value_name": concept_name,
+                    "measurement_source_concept_id": concept_id,
+                    "unit_source_value": unit_concept_name,
+                    "value_source_value": vital[value_column],
+                    "vocabulary_id": "SNOMED",
+                    "visit_source_key": vital["visit_source_key"],
+                    "환자구분": vital["visit_source_value"],
+                    "결과내역": vital[value_column]
+                    }, index = vital.index)
+
+            logging.debug("항목별 cdm 데이터 row수:\n" + "\n".join(f"cdm_{key}: {len(frame)}" for key, frame in cdm_vitals.items())
+                          + f"\n총합: {sum(len(frame) for frame in cdm_vitals.values())}")
+
+            cdm = pd.concat(list(cdm_vitals.values()), axis = 0, ignore_index=True)
+
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class MergeMeasurementTransformer(DataTransformer):
@@ -3107,14 +3502,18 @@ class MergeMeasurementTransformer(DataTransformer):
             # axis = 0을 통해 행으로 데이터 합치기, ignore_index = True를 통해 dataframe index재설정
             cdm = pd.concat([source1, source2, source3, source4], axis = 0, ignore_index=True)
 
-            cdm["measurement_id"] = cdm.index + 1
+            # 원천 테이블별 measurement_id는 고정 id이므로 원천 테이블명과 함께 다시 해시하여 id 생성
+            source_table = np.repeat([self.source_data1, self.source_data2, self.source_data3, self.source_data4],
+                                     [len(source1), len(source2), len(source3), len(source4)])
+            cdm["measurement_id"] = self.make_stable_id(pd.DataFrame({"source_table": source_table, "measurement_id": cdm["measurement_id"]}))
 
-            logging.debug(f"CDM 데이터 row수 : {len(cdm)}")
+            self.record_lineage(cdm, "CDM 데이터")
 
             return cdm
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
 
 class ProcedureEDITransformer(DataTransformer):
@@ -3168,9 +3567,9 @@ class ProcedureEDITransformer(DataTransformer):
             order_data = order_data[[self.ordercode, self.hospital, self.fromdd, self.todd, "PRCPNM", "PRCPHNGNM"]]
             # 처방코드 마스터와 수가코드 매핑
             source = pd.merge(order_data, edi_data, left_on=[self.ordercode, self.hospital], right_on=[self.sugacode, self.hospital], how="left")
-            logging.debug(f'처방코드, 수가코드와 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "처방코드, 수가코드와 결합 후 데이터")
             source = source[(source["FROMDD_x"] >= source["FROMDD_y"]) & (source["FROMDD_x"] <= source["TODD_y"])]
-            logging.debug(f'조건 적용 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "조건 적용 후 데이터")
 
             # fromdate, todate 설정
             source[self.fromdate] = source["FROMDD_x"].where(source["FROMDD_x"].notna(), source["FROMDD_y"])
@@ -3182,7 +3581,7 @@ class ProcedureEDITransformer(DataTransformer):
 
             # concept_id 매핑
             source = pd.merge(source, concept_data, left_on=self.edicode, right_on="concept_code", how="left")
-            logging.debug(f'concept merge후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept merge후 데이터")
 
             # local_edi = source[[self.ordercode, self.fromdate, self.todate, self.edicode, self.hospital,
             #                      "concept_id", "concept_name", "domain_id", "vocabulary_id", "concept_class_id", 
@@ -3191,17 +3590,17 @@ class ProcedureEDITransformer(DataTransformer):
         
             # 중복제거
             source = source.drop_duplicates()
-            logging.debug(f'중복제거 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "중복제거 후 데이터")
 
 
-            logging.debug(f'local_edi row수: {len(source)}')
-            logging.debug(f"요약:\n{source.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{source.isnull().sum().to_string()}")
+            self.record_lineage(source, "local_edi")
+            self.log_summary(source)
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class ProcedurePACSTransformer(DataTransformer):
@@ -3221,6 +3620,9 @@ class ProcedurePACSTransformer(DataTransformer):
         self.orddd = self.cdm_config["columns"]["orddd"]
         self.readtext = self.cdm_config["columns"]["readtext"]
         self.conclusion = self.cdm_config["columns"]["conclusion"]
+        # 처방(처방일자, 처방번호, 처방이력번호)과 영상검사 오더(HISORDERID)로 행을 구분하는 자연키
+        self.natural_key = [self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO", "HISORDERID"]
+        self.joined_key = ["provider_id", "visit_occurrence_id", "visit_detail_id"]
 
         
     def transform(self):
@@ -3247,37 +3649,35 @@ class ProcedurePACSTransformer(DataTransformer):
         소스 데이터를 로드하고 전처리 작업을 수행하는 메소드입니다.
         """
         try: 
-            source1 = self.read_csv(self.source_data1, path_type = self.source_flag, dtype = self.source_dtype)
-            source2 = self.read_csv(self.source_data2, path_type = self.source_flag, dtype = self.source_dtype)
-            source3 = self.read_csv(self.source_data3, path_type = self.source_flag, dtype = self.source_dtype)
+            # 필요한 컬럼만 원천에서 조건을 적용하며 읽기
+            source1 = self.read_csv(self.source_data1, path_type = self.source_flag, dtype = self.source_dtype,
+                                    usecols = [self.hospital, self.orddate, self.person_source_value, "PRCPHISTCD", "ORDDD", 
+                                               "CRETNO", "PRCPCLSCD", "PRCPNO", "PRCPHISTNO", "LASTUPDTDT", 
+                                               "ORDDRID", "PRCPNM", "PRCPCD", self.meddept, self.frstrgstdt],
+                                    filters = [(self.orddate, "<=", self.data_range)])
+            source2 = self.read_csv(self.source_data2, path_type = self.source_flag, dtype = self.source_dtype,
+                                    usecols = [self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO", "EXECPRCPUNIQNO", "EXECDD", "EXECTM"],
+                                    filters = [(self.orddate, "<=", self.data_range)])
+            source3 = self.read_csv(self.source_data3, path_type = self.source_flag, dtype = self.source_dtype,
+                                    usecols = ["PATID", "HISORDERID", "QUEUEID", "CONFDATE", "CONFTIME", self.conclusion, self.readtext])
             procedure_edi = self.read_csv(self.procedure_edi_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_detail = self.read_csv(self.visit_detail, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f"원천 데이터 row수: 검사처방: {len(source1)}, 처방상세: {len(source2)}, 영상검사결과: {len(source3)}")
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            visit_detail = self.read_dimension("visit_detail")
+            concept_etc = self.read_dimension("concept_etc")
+            logging.debug(f"조건적용 후 원천 데이터 row수: 검사처방: {len(source1)}, 처방상세: {len(source2)}, 영상검사결과: {len(source3)}")
 
-            # 원천에서 조건걸기
-            source1 = source1[[self.hospital, self.orddate, self.person_source_value, "PRCPHISTCD", "ORDDD", 
-                               "CRETNO", "PRCPCLSCD", "PRCPNO", "PRCPHISTNO", "LASTUPDTDT", 
-                               "ORDDRID", "PRCPNM", "PRCPCD", self.meddept, self.frstrgstdt]]
             source1[self.orddate] = pd.to_datetime(source1[self.orddate])
             source1[self.frstrgstdt] = pd.to_datetime(source1[self.frstrgstdt])
             # source1["ORDDD"] = pd.to_datetime(source1["ORDDD"])
-            source1 = source1[(source1[self.orddate] <= self.data_range)]
 
-            source2 = source2[[self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO", "EXECPRCPUNIQNO", "EXECDD", "EXECTM"]]
             source2["HISORDERID"] = source2["PRCPDD"] + source2["EXECPRCPUNIQNO"]
             source2[self.orddate] = pd.to_datetime(source2[self.orddate])
-            source2 = source2[(source2[self.orddate] <= self.data_range)]
-
-            source3 = source3[["PATID", "HISORDERID", "QUEUEID", "CONFDATE", "CONFTIME", self.conclusion, self.readtext]]
-            logging.debug(f"조건적용 후 원천 데이터 row수: 검사처방: {len(source1)}, 처방상세: {len(source2)}, 영상검사결과: {len(source3)}")
 
             source = pd.merge(source1, source2, left_on=[self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO"], right_on=[self.hospital, self.orddate, "PRCPNO", "PRCPHISTNO"], how="inner", suffixes=("", "_2"))
-            logging.debug(f"검사처방, 처방상세 결합 후 데이터 수: {len(source)}")
+            self.record_lineage(source, "검사처방, 처방상세 결합 후")
             del source1
             del source2
             
@@ -3298,7 +3698,7 @@ class ProcedurePACSTransformer(DataTransformer):
                                     .merge(grouped_readtext, on='HISORDERID', how='outer'))
             source = pd.merge(source, source3, left_on=["PID", "HISORDERID"], right_on=["PATID", "HISORDERID"], how="inner", suffixes=("", "_3"))
             del source3
-            logging.debug(f"검사처방, 처방상세, 영상검사결과 결합 후 데이터 수: {len(source)}")
+            self.record_lineage(source, "검사처방, 처방상세, 영상검사결과 결합 후")
             
             source["진료일시"] = source[self.orddd]
 
@@ -3311,8 +3711,7 @@ class ProcedurePACSTransformer(DataTransformer):
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            source = source.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f'person 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 데이터")
             
             procedure_edi = procedure_edi[[self.procedure_source_value, self.fromdate, self.todate, self.edicode, "concept_id", self.hospital, "ORDNM"]]
             procedure_edi[self.fromdate] = pd.to_datetime(procedure_edi[self.fromdate], errors="coerce")
@@ -3321,68 +3720,51 @@ class ProcedurePACSTransformer(DataTransformer):
             # procedure_edi[self.todate].fillna(pd.Timestamp('2099-12-31'), inplace = True)
 
             # LOCAL코드와 EDI코드 매핑 테이블과 병합
-            source = pd.merge(source, procedure_edi, left_on=[self.procedure_source_value, self.hospital], right_on=[self.procedure_source_value, self.hospital], how="left")
-            logging.debug(f'local_edi 테이블과 결합 후 데이터 row수: {len(source)}')
-            source[self.fromdate] = source[self.fromdate].fillna(pd.to_datetime('1900-01-01'))
-            source[self.todate] = source[self.todate].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.orddate] >= source[self.fromdate]) & (source[self.orddate] <= source[self.todate])]
-            logging.debug(f"local_edi 사용기간별 필터 적용 후 데이터 row수: {len(source)}")
+            source = self.merge_valid_period(source, procedure_edi, left_on=[self.procedure_source_value, self.hospital], right_on=[self.procedure_source_value, self.hospital], date_column=self.orddate)
+            self.record_lineage(source, "local_edi 사용기간별 필터 적용 후 데이터")
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=self.meddept, right_on="care_site_source_value", how="left")
-            logging.debug(f'care_site 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "care_site 테이블과 결합 후 데이터")
 
-            source[self.care_site_fromdate] = pd.to_datetime(source[self.care_site_fromdate], errors = "coerce")
-            source[self.care_site_todate] = pd.to_datetime(source[self.care_site_todate], errors = "coerce")
             source[self.care_site_fromdate] = source[self.care_site_fromdate].fillna(pd.to_datetime("1900-01-01"))
             source[self.care_site_todate] = source[self.care_site_todate].fillna(pd.to_datetime("2099-12-31"))
             source = source[(source[self.frstrgstdt] >= source[self.care_site_fromdate]) & (source[self.frstrgstdt] <= source[self.care_site_todate])]
-            logging.debug(f"care_site 사용 기간 조건 설정 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "care_site 사용 기간 조건 설정 후 원천 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f'provider 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "provider 테이블과 결합 후 데이터")
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key" ], right_on=["visit_source_key" ], how="left", suffixes=('', '_y'))
-            logging.debug(f'visit_occurrence 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["procedure_type_concept_id"] = 38000275
             source = pd.merge(source, concept_etc, left_on = "procedure_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_procedure_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
-
-            visit_detail = visit_detail[["visit_detail_id", "visit_detail_start_datetime", "visit_detail_end_datetime", "visit_occurrence_id"]]
-            visit_detail["visit_detail_start_datetime"] = pd.to_datetime(visit_detail["visit_detail_start_datetime"])
-            visit_detail["visit_detail_end_datetime"] = pd.to_datetime(visit_detail["visit_detail_end_datetime"])
-            source = pd.merge(source, visit_detail, left_on=["visit_occurrence_id"], right_on=["visit_occurrence_id"], how="left", suffixes=('', '_y'))
-            logging.debug(f"visit_detail 테이블과 결합 후 원천 데이터 row수: {len(source)}")
-
-            source["visit_detail_start_datetime"] = source["visit_detail_start_datetime"].fillna(pd.to_datetime('1900-01-01'))
-            source["visit_detail_end_datetime"] = source["visit_detail_end_datetime"].fillna(pd.to_datetime('2099-12-31'))
-            source = source[(source[self.orddate] >= source["visit_detail_start_datetime"]) & (source[self.orddate] <= source["visit_detail_end_datetime"])]
-            # source["visit_detail_id"] = source.apply(lambda row: row['visit_detail_id'] if pd.notna(row['visit_detail_start_datetime']) and row['visit_detail_start_datetime'] <= row[self.orddate] <= row['visit_detail_end_datetime'] else pd.NA, axis=1)
-            source = source.drop(columns = ["visit_detail_start_datetime", "visit_detail_end_datetime"])
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
+
+            # 발생 시점이 포함되는 visit_detail_id 부여
+            source = self.merge_visit_detail(source, visit_detail, self.orddate)
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 후 원천 데이터")
             source = source.drop_duplicates()
-            logging.debug(f"visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터 row수: {len(source)}")
+            self.record_lineage(source, "visit_detail 테이블과 결합 후 조건 적용 및 중복제거 후 원천 데이터")
 
             # 값이 없는 경우 0으로 값 입력
             # source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
             source.loc[source["concept_id"].isna(), "concept_id"] = 0
 
-            logging.debug(f'CDM 테이블과 결합 후 데이터 row수, {len(source)}, {source}')
+            self.record_lineage(source, "CDM 테이블과 결합 후 데이터")
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -3432,18 +3814,19 @@ class ProcedurePACSTransformer(DataTransformer):
                 })
             
             cdm = cdm.drop_duplicates()
+            # 값이 바뀌어도 id가 유지되도록 중복 제거 후 남은 행의 자연키로 id 생성
+            # 원천 행 하나가 provider, visit_occurrence, visit_detail과 결합하여 여러 행이 될 수 있으므로 결합한 id도 자연키에 포함
+            cdm["procedure_occurrence_id"] = self.make_stable_id(pd.concat([source.loc[cdm.index, self.natural_key], cdm[self.joined_key]], axis = 1))
             cdm.reset_index(drop=True, inplace=True)
 
-            cdm["procedure_occurrence_id"] = cdm.index + 1
-
-            logging.debug(f'CDM 데이터 row수, {len(cdm)}')
-            logging.debug(f"요약:\n{source.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class ProcedureBaseOrderTransformer(DataTransformer):
@@ -3488,12 +3871,12 @@ class ProcedureBaseOrderTransformer(DataTransformer):
         try: 
             source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
             procedure_edi = self.read_csv(self.procedure_edi_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f"원천 데이터 row수: {len(source)}")
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            concept_etc = self.read_dimension("concept_etc")
+            self.record_lineage(source, "원천 데이터")
 
             # 원천에서 조건걸기
             
@@ -3507,7 +3890,7 @@ class ProcedureBaseOrderTransformer(DataTransformer):
             source[self.orddd] = pd.to_datetime(source[self.orddd])
             source["visit_source_key"] = source[self.person_source_value] + source[self.meddept] + source[self.orddd].dt.strftime("%Y%m%d") + source[self.visit_no] + source[self.hospital]
             source = source[(source[self.procedure_date] <= self.data_range)]
-            logging.debug(f"조건적용 후 원천 데이터 row수:{len(source)}")
+            self.record_lineage(source, "조건적용 후 원천 데이터")
 
 
             procedure_edi = procedure_edi[[self.procedure_source_value, self.fromdate, self.todate, self.edicode, "concept_id", self.hospital, "ORDNM"]]
@@ -3518,56 +3901,52 @@ class ProcedureBaseOrderTransformer(DataTransformer):
 
             # LOCAL코드와 EDI코드 매핑 테이블과 병합
             source = pd.merge(source, procedure_edi, left_on=[self.procedure_source_value, self.hospital], right_on=[self.procedure_source_value, self.hospital], how="left")
-            logging.debug(f'local_edi 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "local_edi 테이블과 결합 후 데이터")
             source = source[(source[self.procedure_date] >= source[self.fromdate]) & (source[self.procedure_date] <= source[self.todate])]
-            logging.debug(f"local_edi 사용기간별 필터 적용 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "local_edi 사용기간별 필터 적용 후 데이터")
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            source = source.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f'person 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 데이터")
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=self.meddept, right_on="care_site_source_value", how="left")
-            logging.debug(f'care_site 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "care_site 테이블과 결합 후 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f'provider 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "provider 테이블과 결합 후 데이터")
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key" ], right_on=["visit_source_key" ], how="left", suffixes=('', '_y'))
-            logging.debug(f'visit_occurrence 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["procedure_type_concept_id"] = 38000275
             source = pd.merge(source, concept_etc, left_on = "procedure_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_procedure_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["procedure_type_concept_id"] = 38000275
             source = pd.merge(source, concept_etc, left_on = "procedure_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_procedure_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
             # 값이 없는 경우 0으로 값 입력
             source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
             source.loc[source["concept_id"].isna(), "concept_id"] = 0
 
-            logging.debug(f'CDM 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "CDM 테이블과 결합 후 데이터")
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -3615,14 +3994,14 @@ class ProcedureBaseOrderTransformer(DataTransformer):
                 "결과단위": None
                 })
 
-            logging.debug(f'CDM 데이터 row수, {len(cdm)}')
-            logging.debug(f"요약:\n{source.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class ProcedureBldOrderTransformer(DataTransformer):
@@ -3667,12 +4046,12 @@ class ProcedureBldOrderTransformer(DataTransformer):
         try: 
             source = self.read_csv(self.source_data, path_type = self.source_flag, dtype = self.source_dtype)
             procedure_edi = self.read_csv(self.procedure_edi_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            person_data = self.read_csv(self.person_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            provider_data = self.read_csv(self.provider_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            care_site_data = self.read_csv(self.care_site_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            visit_data = self.read_csv(self.visit_data, path_type = self.cdm_flag, dtype = self.source_dtype)
-            concept_etc = self.read_csv(self.concept_etc, path_type = self.source_flag, dtype = self.source_dtype, encoding=self.cdm_encoding)
-            logging.debug(f"원천 데이터 row수: {len(source)}")
+            person_data = self.read_dimension("person")
+            provider_data = self.read_dimension("provider")
+            care_site_data = self.read_dimension("care_site")
+            visit_data = self.read_dimension("visit_occurrence")
+            concept_etc = self.read_dimension("concept_etc")
+            self.record_lineage(source, "원천 데이터")
 
             # 원천에서 조건걸기
             source = source[[self.hospital, self.procedure_date, self.person_source_value, self.meddept,
@@ -3684,7 +4063,7 @@ class ProcedureBldOrderTransformer(DataTransformer):
             source[self.orddd] = pd.to_datetime(source[self.orddd])
             source["visit_source_key"] = source[self.person_source_value] + source[self.meddept] + source[self.orddd].dt.strftime("%Y%m%d") + source[self.visit_no] + source[self.hospital]
             source = source[(source[self.procedure_date] <= self.data_range)]
-            logging.debug(f"조건적용 후 원천 데이터 row수:{len(source)}")
+            self.record_lineage(source, "조건적용 후 원천 데이터")
 
 
             procedure_edi = procedure_edi[[self.procedure_source_value, self.fromdate, self.todate, self.edicode, "concept_id", self.hospital, "ORDNM"]]
@@ -3695,56 +4074,52 @@ class ProcedureBldOrderTransformer(DataTransformer):
 
             # LOCAL코드와 EDI코드 매핑 테이블과 병합
             source = pd.merge(source, procedure_edi, left_on=[self.procedure_source_value, self.hospital], right_on=[self.procedure_source_value, self.hospital], how="left")
-            logging.debug(f'local_edi 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "local_edi 테이블과 결합 후 데이터")
             source = source[(source[self.procedure_date] >= source[self.fromdate]) & (source[self.procedure_date] <= source[self.todate])]
-            logging.debug(f"local_edi 사용기간별 필터 적용 후 데이터 row수: {len(source)}")
+            self.record_lineage(source, "local_edi 사용기간별 필터 적용 후 데이터")
 
             # person table과 병합
             source = pd.merge(source, person_data, left_on=self.person_source_value, right_on="person_source_value", how="inner")
-            source = source.drop(columns = ["care_site_id", "provider_id"])
-            logging.debug(f'person 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "person 테이블과 결합 후 데이터")
 
             # care_site table과 병합
             source = pd.merge(source, care_site_data, left_on=self.meddept, right_on="care_site_source_value", how="left")
-            logging.debug(f'care_site 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "care_site 테이블과 결합 후 데이터")
 
             # provider table과 병합
             source = pd.merge(source, provider_data, left_on=self.provider, right_on="provider_source_value", how="left", suffixes=('', '_y'))
-            logging.debug(f'provider 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "provider 테이블과 결합 후 데이터")
 
-            # visit_start_datetime 형태 변경
-            visit_data["visit_start_date"] = pd.to_datetime(visit_data["visit_start_date"])
 
             # visit_occurrence table과 병합
             source = pd.merge(source, visit_data, left_on=["visit_source_key" ], right_on=["visit_source_key" ], how="left", suffixes=('', '_y'))
-            logging.debug(f'visit_occurrence 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "visit_occurrence 테이블과 결합 후 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["procedure_type_concept_id"] = 38000275
             source = pd.merge(source, concept_etc, left_on = "procedure_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_procedure_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
             ### concept_etc테이블과 병합 ###
-            concept_etc["concept_id"] = concept_etc["concept_id"].astype(int)            
 
             # type_concept_id 만들고 type_concept_id_name 기반 만들기
             source["procedure_type_concept_id"] = 38000275
             source = pd.merge(source, concept_etc, left_on = "procedure_type_concept_id", right_on="concept_id", how="left", suffixes=('', '_procedure_type'))
-            logging.debug(f'concept_etc: type_concept_id 테이블과 결합 후 데이터 row수: {len(source)}')
+            self.record_lineage(source, "concept_etc: type_concept_id 테이블과 결합 후 데이터")
 
             # 값이 없는 경우 0으로 값 입력
             source.loc[source["care_site_id"].isna(), "care_site_id"] = 0
             source.loc[source["concept_id"].isna(), "concept_id"] = 0
 
-            logging.debug(f'CDM 테이블과 결합 후 데이터 row수, {len(source)}')
+            self.record_lineage(source, "CDM 테이블과 결합 후 데이터")
 
             return source
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
     def transform_cdm(self, source):
         """
@@ -3792,14 +4167,14 @@ class ProcedureBldOrderTransformer(DataTransformer):
                 "결과단위": None
                 })
 
-            logging.debug(f'CDM 데이터 row수, {len(cdm)}')
-            logging.debug(f"요약:\n{source.describe(include = 'all').T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm   
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 CDM 데이터 변환 중 오류:\n {e}", exc_info = True)
+            raise
 
 
 class MergeProcedureTransformer(DataTransformer):
@@ -3853,14 +4228,18 @@ class MergeProcedureTransformer(DataTransformer):
             # axis = 0을 통해 행으로 데이터 합치기, ignore_index = True를 통해 dataframe index재설정
             cdm = pd.concat([source1, source2, source3], axis = 0, ignore_index=True)
 
-            cdm["procedure_occurrence_id"] = cdm.index + 1
+            # 원천 테이블별 procedure_occurrence_id는 고정 id이므로 원천 테이블명과 함께 다시 해시하여 id 생성
+            source_table = np.repeat([self.source_data1, self.source_data2, self.source_data3],
+                                     [len(source1), len(source2), len(source3)])
+            cdm["procedure_occurrence_id"] = self.make_stable_id(pd.DataFrame({"source_table": source_table, "procedure_occurrence_id": cdm["procedure_occurrence_id"]}))
 
-            logging.debug(f"CDM 데이터 row수 : {len(cdm)}")
+            self.record_lineage(cdm, "CDM 데이터")
 
             return cdm
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
 
         
 class ObservationPeriodTransformer(DataTransformer):
@@ -3952,12 +4331,11 @@ class ObservationPeriodTransformer(DataTransformer):
                 "period_type_concept_id": 44814724
             })  
 
-            logging.debug(f"CDM 데이터 row수 {len(cdm)}")
-            logging.debug(f"요약:\n{cdm.describe(include = 'O').T.to_string()}")
-            logging.debug(f"요약:\n{cdm.describe().T.to_string()}")
-            logging.debug(f"컬럼별 null 개수:\n{cdm.isnull().sum().to_string()}")
+            self.record_lineage(cdm, "CDM 데이터")
+            self.log_summary(cdm)
 
             return cdm
 
         except Exception as e :
             logging.error(f"{self.table} 테이블 소스 데이터 처리 중 오류: {e}", exc_info = True)
+            raise
@@ -2,7 +2,6 @@ import pandas as pd
 import numpy as np
 import os, sys
 from datetime import datetime
-import inspect
 # 상위 디렉토리 (my_project 폴더)를 sys.path에 추가
 current_dir = os.path.dirname(__file__)  # 현재 파일의 디렉토리
 parent_dir = os.path.dirname(current_dir)  # 현재 디렉토리의 부모 디렉토리 (QC)
@@ -10,951 +9,227 @@ project_dir = os.path.dirname(parent_dir)  # QC의 부모 디렉토리 (my_proje
 sys.path.insert(0, project_dir)
 from QC.src.excel_util import find_excel_row_and_write_error_ratio
 
-def DQ_0001(cdm_path, excel_path, sheetname):
-    """
-    person_source_value에 NULL이나 공백 있는지 진단
-    """
-    table_name = "person"
-    column_name = "person_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-
-    null_count = cdm[column_name].isnull().sum()
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = null_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-
-def DQ_0002(cdm_path, excel_path, sheetname):
-    """
-    person_source_value는 중복값 없는지 확인
-    """
-    table_name = "person"
-    column_name = "person_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
- 
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0003(cdm_path, excel_path, sheetname):
-    """
-    year_of_birth가 올 해 이전 날짜로 채워져 있는지 확인
-    """
-    table_name = "person"
-    column_name = "year_of_birth"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[cdm[column_name] > datetime.now().year])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0004(cdm_path, excel_path, sheetname):
-    """
-    month_of_birth가 올 해 이전 날짜로 채워져 있는지 확인
-    """
-    table_name = "person"
-    column_name = "month_of_birth"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[(cdm[column_name] > 12)| (cdm[column_name] < 1)])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0005(cdm_path, excel_path, sheetname):
-    """
-    day_of_birth가 올 해 이전 날짜로 채워져 있는지 확인
-    """
-    table_name = "person"
-    column_name = "day_of_birth"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[(cdm[column_name] > 31)| (cdm[column_name] < 1)])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0006(cdm_path, excel_path, sheetname):
-    """
-    gender_source_value가 NULL이나 공백이 있는지 확인
-    """
-    table_name = "person"
-    column_name = "gender_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0007(cdm_path, excel_path, sheetname):
-    """
-    death_datetime이 birth_datetime보다 빠를 수 없음을 확인
-    """
-    table_name = "person"
-    column_name = "death_datetime"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    cdm[column_name] = pd.to_datetime(cdm[column_name])
-    cdm["birth_datetime"] = pd.to_datetime(cdm["birth_datetime"])
-
-    error_count = len(cdm[cdm[column_name] < cdm["birth_datetime"]])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0008(cdm_path, excel_path, sheetname):
-    """
-    visit_occurrence_id에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "visit_occurrence"
-    column_name = "visit_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0009(cdm_path, excel_path, sheetname):
-    """
-    visit_occurrence_id에 중복값이 있는지 확인
-    """
-    table_name = "visit_occurrence"
-    column_name = "visit_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0010(cdm_path, excel_path, sheetname):
-    """
-    visit_start_date가 visit_end_date보다 큰 데이터가 있는지 확인
-    """
-    table_name = "visit_occurrence"
-    column_name = "visit_start_date"
-    compare_column = "visit_end_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[cdm[column_name] > cdm[compare_column]])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
+# DQ 진단 규칙
+# check 종류
+# - null: column에 NULL이나 공백이 있는 행 수
+# - duplicate: column 값이 중복된 행 수
+# - range: column 값이 min보다 작거나 max보다 큰 행 수
+# - date_order: column이 compare_column보다 큰 행 수(문자열 비교, parse_dates가 True이면 날짜로 변환하여 비교)
+# - foreign_key: reference_table과 column으로 outer merge한 결과에서 column이 NULL이나 공백인 행 수
+#                (row_count도 outer merge한 결과의 행 수)
+# ratio가 "null"이면 error_ratio는 NULL인 행 수만으로 계산
+DQ_RULES = [
+    {"id": "DQ_0001", "table": "person", "check": "null", "column": "person_source_value", "ratio": "null",
+     "description": "person_source_value에 NULL이나 공백 있는지 진단"},
+    {"id": "DQ_0002", "table": "person", "check": "duplicate", "column": "person_source_value",
+     "description": "person_source_value는 중복값 없는지 확인"},
+    {"id": "DQ_0003", "table": "person", "check": "range", "column": "year_of_birth", "max": datetime.now().year,
+     "description": "year_of_birth가 올 해 이전 날짜로 채워져 있는지 확인"},
+    {"id": "DQ_0004", "table": "person", "check": "range", "column": "month_of_birth", "min": 1, "max": 12,
+     "description": "month_of_birth가 올 해 이전 날짜로 채워져 있는지 확인"},
+    {"id": "DQ_0005", "table": "person", "check": "range", "column": "day_of_birth", "min": 1, "max": 31,
+     "description": "day_of_birth가 올 해 이전 날짜로 채워져 있는지 확인"},
+    {"id": "DQ_0006", "table": "person", "check": "null", "column": "gender_source_value",
+     "description": "gender_source_value가 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0007", "table": "person", "check": "date_order", "column": "birth_datetime", "compare_column": "death_datetime", "parse_dates": True,
+     "description": "death_datetime이 birth_datetime보다 빠를 수 없음을 확인"},
+    {"id": "DQ_0008", "table": "visit_occurrence", "check": "null", "column": "visit_occurrence_id",
+     "description": "visit_occurrence_id에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0009", "table": "visit_occurrence", "check": "duplicate", "column": "visit_occurrence_id",
+     "description": "visit_occurrence_id에 중복값이 있는지 확인"},
+    {"id": "DQ_0010", "table": "visit_occurrence", "check": "date_order", "column": "visit_start_date", "compare_column": "visit_end_date",
+     "description": "visit_start_date가 visit_end_date보다 큰 데이터가 있는지 확인"},
+    {"id": "DQ_0011", "table": "visit_occurrence", "check": "null", "column": "visit_start_date",
+     "description": "visit_start_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0012", "table": "visit_occurrence", "check": "null", "column": "visit_start_datetime",
+     "description": "visit_start_datetime에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0013", "table": "visit_occurrence", "check": "foreign_key", "column": "person_id", "reference_table": "person",
+     "description": "visit_occurrence의 person_id중 person테이블에 없는 환자인지 확인"},
+    {"id": "DQ_0014", "table": "visit_occurrence", "check": "null", "column": "visit_source_value",
+     "description": "visit_source_value에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0015", "table": "condition_occurrence", "check": "null", "column": "visit_occurrence_id",
+     "description": "condition_occurrence테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0016", "table": "drug_exposure", "check": "null", "column": "visit_occurrence_id",
+     "description": "drug_exposure테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0017", "table": "measurement", "check": "null", "column": "visit_occurrence_id",
+     "description": "measurement테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0018", "table": "procedure_occurrence", "check": "null", "column": "visit_occurrence_id",
+     "description": "procedure_occurrence테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0019", "table": "condition_occurrence", "check": "null", "column": "condition_occurrence_id",
+     "description": "condition_occurrence테이블에 condition_occurrence_id컬럼의 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0020", "table": "condition_occurrence", "check": "duplicate", "column": "condition_occurrence_id",
+     "description": "condition_occurrence_id에 중복값이 있는지 확인"},
+    {"id": "DQ_0021", "table": "condition_occurrence", "check": "date_order", "column": "condition_start_date", "compare_column": "condition_end_date",
+     "description": "condition_start_date가 condition_end_date보다 큰 데이터가 있는지 확인"},
+    {"id": "DQ_0022", "table": "condition_occurrence", "check": "null", "column": "condition_start_date",
+     "description": "condition_start_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0023", "table": "condition_occurrence", "check": "null", "column": "condition_start_datetime",
+     "description": "condition_start_datetime에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0024", "table": "condition_occurrence", "check": "null", "column": "condition_source_value",
+     "description": "condition_source_value에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0025", "table": "condition_occurrence", "check": "foreign_key", "column": "person_id", "reference_table": "person",
+     "description": "condition_occurrence person_id중 person테이블에 없는 환자인지 확인"},
+    {"id": "DQ_0026", "table": "drug_exposure", "check": "null", "column": "drug_exposure_id",
+     "description": "drug_exposure_id에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0027", "table": "drug_exposure", "check": "duplicate", "column": "drug_exposure_id",
+     "description": "drug_exposure_id에 중복값이 있는지 확인"},
+    {"id": "DQ_0028", "table": "drug_exposure", "check": "date_order", "column": "drug_exposure_start_date", "compare_column": "drug_exposure_end_date",
+     "description": "drug_exposure_start_date가 drug_exposure_end_date보다 큰 데이터가 있는지 확인"},
+    {"id": "DQ_0029", "table": "drug_exposure", "check": "null", "column": "drug_exposure_start_date",
+     "description": "drug_exposure_start_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0030", "table": "drug_exposure", "check": "null", "column": "drug_exposure_start_datetime",
+     "description": "drug_exposure_start_datetime에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0031", "table": "drug_exposure", "check": "foreign_key", "column": "person_id", "reference_table": "person",
+     "description": "drug_exposure의 person_id중 person테이블에 없는 환자인지 확인"},
+    {"id": "DQ_0032", "table": "drug_exposure", "check": "null", "column": "drug_source_value",
+     "description": "drug_source_value에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0033", "table": "measurement", "check": "null", "column": "measurement_id",
+     "description": "measurement_id에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0034", "table": "measurement", "check": "duplicate", "column": "measurement_id",
+     "description": "measurement_id에 중복값이 있는지 확인"},
+    {"id": "DQ_0035", "table": "measurement", "check": "null", "column": "measurement_date",
+     "description": "measurement_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0036", "table": "measurement", "check": "null", "column": "measurement_datetime",
+     "description": "measurement_datetime에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0037", "table": "measurement", "check": "foreign_key", "column": "person_id", "reference_table": "person",
+     "description": "measurement의 person_id중 person테이블에 없는 환자인지 확인"},
+    {"id": "DQ_0038", "table": "measurement", "check": "null", "column": "measurement_source_value",
+     "description": "measurement_source_value에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0039", "table": "procedure_occurrence", "check": "null", "column": "procedure_occurrence_id",
+     "description": "procedure_occurrence_id에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0040", "table": "procedure_occurrence", "check": "duplicate", "column": "procedure_occurrence_id",
+     "description": "procedure_occurrence_id에 중복값이 있는지 확인"},
+    {"id": "DQ_0041", "table": "procedure_occurrence", "check": "null", "column": "procedure_date",
+     "description": "procedure_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0042", "table": "procedure_occurrence", "check": "null", "column": "procedure_datetime",
+     "description": "procedure_datetime에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0043", "table": "procedure_occurrence", "check": "foreign_key", "column": "person_id", "reference_table": "person",
+     "description": "procedure_occurrence의 person_id중 person테이블에 없는 환자인지 확인"},
+    {"id": "DQ_0044", "table": "procedure_occurrence", "check": "null", "column": "procedure_source_value",
+     "description": "procedure_source_value에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0045", "table": "observation_period", "check": "null", "column": "observation_period_id",
+     "description": "observation_period_id에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0046", "table": "observation_period", "check": "duplicate", "column": "observation_period_id",
+     "description": "observation_period_id에 중복값이 있는지 확인"},
+    {"id": "DQ_0047", "table": "observation_period", "check": "date_order", "column": "observation_period_start_date", "compare_column": "observation_period_end_date",
+     "description": "observation_period_start_date가 observation_period_end_date보다 큰 데이터가 있는지 확인"},
+    {"id": "DQ_0048", "table": "observation_period", "check": "null", "column": "observation_period_start_date",
+     "description": "observation_period_start_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0049", "table": "observation_period", "check": "null", "column": "observation_period_end_date",
+     "description": "observation_period_end_date에 NULL이나 공백이 있는지 확인"},
+    {"id": "DQ_0050", "table": "observation_period", "check": "foreign_key", "column": "person_id", "reference_table": "person",
+     "description": "observation_period의 person_id중 person테이블에 없는 환자인지 확인"}
+]
+
+
+def rule_columns(rule):
+    """
+    규칙에서 사용하는 컬럼 목록
+    """
+    columns = [rule["column"]]
+    if rule["check"] == "date_order":
+        columns.append(rule["compare_column"])
+    return columns
+
+
+def read_table(cdm_path, table_name, columns):
+    """
+    CDM 테이블에서 필요한 컬럼만 문자열로 읽기
+    """
+    return pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), usecols=list(dict.fromkeys(columns)), dtype=str)
+
+
+def outer_merge_counts(values, reference_counts):
+    """
+    reference와 outer merge했을 때 key가 NULL이나 공백인 행 수와 전체 행 수를 merge 없이 계산
+    """
+    counts = pd.concat([values.value_counts(dropna=False), reference_counts], axis=1, keys=["cdm", "reference"]).fillna(0)
+    # 양쪽에 있는 key는 곱만큼, 한쪽에만 있는 key는 그 행 수만큼 merge 결과에 남음
+    matched = (counts["cdm"] > 0) & (counts["reference"] > 0)
+    sizes = (counts["cdm"] * counts["reference"]).where(matched, counts["cdm"] + counts["reference"])
+    keys = counts.index.to_series(index=counts.index)
+    missing = keys.isnull() | keys.astype(str).str.strip().eq("")
+    return int(sizes[missing].sum()), int(sizes.sum())
+
+
+def evaluate_rules(cdm, rules, references):
+    """
+    한 테이블의 규칙을 한 번에 진단하여 {규칙 id: (error_count, row_count, error_ratio)} 반환
+    """
+    results = {}
+    row_count = len(cdm)
+
+    # NULL, 공백 진단 컬럼은 한 번에 계산
+    null_columns = list(dict.fromkeys(rule["column"] for rule in rules if rule["check"] == "null"))
+    if null_columns:
+        null_counts = cdm[null_columns].isnull().sum()
+        empty_counts = cdm[null_columns].apply(lambda s: s.str.strip().eq("")).sum()
+
+    for rule in rules:
+        check = rule["check"]
+        column = rule["column"]
+        rule_row_count = row_count
+
+        if check == "null":
+            error_count = null_counts[column] + empty_counts[column]
+        elif check == "duplicate":
+            error_count = cdm[column].duplicated(keep=False).sum()
+        elif check == "range":
+            values = pd.to_numeric(cdm[column], errors="coerce")
+            error_mask = pd.Series(False, index=cdm.index)
+            if rule.get("min") is not None:
+                error_mask |= values < rule["min"]
+            if rule.get("max") is not None:
+                error_mask |= values > rule["max"]
+            error_count = error_mask.sum()
+        elif check == "date_order":
+            start = cdm[column]
+            end = cdm[rule["compare_column"]]
+            if rule.get("parse_dates"):
+                start = pd.to_datetime(start, errors="coerce")
+                end = pd.to_datetime(end, errors="coerce")
+            error_count = (start.notnull() & end.notnull() & (start > end)).sum()
+        elif check == "foreign_key":
+            error_count, rule_row_count = outer_merge_counts(cdm[column], references[(rule["reference_table"], column)])
+        else:
+            raise ValueError(f"지원하지 않는 DQ check입니다: {check}")
+
+        ratio_count = null_counts[column] if rule.get("ratio") == "null" else error_count
+        error_ratio = ratio_count / rule_row_count if rule_row_count else 0
+        results[rule["id"]] = (int(error_count), rule_row_count, error_ratio)
+
+    return results
 
-def DQ_0011(cdm_path, excel_path, sheetname):
-    """
-    visit_source_value에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "visit_occurrence"
-    column_name = "visit_start_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
 
-def DQ_0012(cdm_path, excel_path, sheetname):
+def read_references(cdm_path, rules):
     """
-    visit_start_datetime에 NULL이나 공백이 있는지 확인
+    foreign_key 규칙이 참조하는 컬럼을 참조 테이블에서 한 번만 읽어 {(reference_table, column): 값별 행 수} 반환
     """
-    table_name = "visit_occurrence"
-    column_name = "visit_start_datetime"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
+    references = {}
+    for reference in dict.fromkeys((rule["reference_table"], rule["column"]) for rule in rules if rule["check"] == "foreign_key"):
+        reference_table, reference_column = reference
+        values = read_table(cdm_path, reference_table, [reference_column])[reference_column]
+        references[reference] = values.value_counts(dropna=False)
+    return references
 
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
 
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0013(cdm_path, excel_path, sheetname):
+def run_dq_checks(cdm_path, excel_path, sheetname, rules=DQ_RULES, references=None):
     """
-    visit_occurrence의 person_id중 person테이블에 없는 환자인지 확인
+    규칙을 테이블별로 묶어 테이블마다 필요한 컬럼만 한 번 읽고 진단 결과를 기록
+    references를 넘기지 않으면 참조 테이블을 여기서 읽음
     """
-    table_name = "visit_occurrence"
-    column_name = "person_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    person = pd.read_csv(os.path.join(cdm_path, "person" + ".csv"), dtype=str)
-
-    cdm = pd.merge(cdm, person, on=column_name, how="outer") #, suffixes=('', '_p'))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0014(cdm_path, excel_path, sheetname):
-    """
-    visit_source_value에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "visit_occurrence"
-    column_name = "visit_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0015(cdm_path, excel_path, sheetname):
-    """
-    condition_occurrence테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "visit_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0016(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "visit_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0017(cdm_path, excel_path, sheetname):
-    """
-    measurement테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인
-    """
-    table_name = "measurement"
-    column_name = "visit_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0018(cdm_path, excel_path, sheetname):
-    """
-    procedure_occurrence테이블에 visit_occurrence_id컬럼의 NULL이나 공백이 있는지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "visit_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0019(cdm_path, excel_path, sheetname):
-    """
-    condition_occurrence테이블에 condition_occurrence_id컬럼의 NULL이나 공백이 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "condition_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0020(cdm_path, excel_path, sheetname):
-    """
-    condition_occurrence_id에 중복값이 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "condition_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0021(cdm_path, excel_path, sheetname):
-    """
-    condition_start_date가 condition_end_date보다 큰 데이터가 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "condition_start_date"
-    compare_column = "condition_end_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[cdm[column_name] > cdm[compare_column]])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-
-def DQ_0022(cdm_path, excel_path, sheetname):
-    """
-    condition_start_date에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "condition_start_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0023(cdm_path, excel_path, sheetname):
-    """
-    condition_start_datetime에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "condition_start_datetime"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0024(cdm_path, excel_path, sheetname):
-    """
-    condition_source_value에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "condition_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0025(cdm_path, excel_path, sheetname):
-    """
-    condition_occurrence person_id중 person테이블에 없는 환자인지 확인
-    """
-    table_name = "condition_occurrence"
-    column_name = "person_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    person = pd.read_csv(os.path.join(cdm_path, "person" + ".csv"), dtype=str)
-
-    cdm = pd.merge(cdm, person, on=column_name, how="outer", suffixes=('', '_'))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0026(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure_id에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "drug_exposure_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
+    rules_by_table = {}
+    for rule in rules:
+        rules_by_table.setdefault(rule["table"], []).append(rule)
 
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
+    if references is None:
+        references = read_references(cdm_path, rules)
 
-def DQ_0027(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure_id에 중복값이 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "drug_exposure_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0028(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure_start_date가 drug_exposure_end_date보다 큰 데이터가 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "drug_exposure_start_date"
-    compare_column = "drug_exposure_end_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[cdm[column_name] > cdm[compare_column]])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-
-def DQ_0029(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure_start_date에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "drug_exposure_start_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0030(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure_start_datetime에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "drug_exposure_start_datetime"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0031(cdm_path, excel_path, sheetname):
-    """
-    drug_exposure의 person_id중 person테이블에 없는 환자인지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "person_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    person = pd.read_csv(os.path.join(cdm_path, "person" + ".csv"), dtype=str)
-
-    cdm = pd.merge(cdm, person, on=column_name, how="outer", suffixes=('', '_'))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0032(cdm_path, excel_path, sheetname):
-    """
-    drug_source_value에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "drug_exposure"
-    column_name = "drug_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0033(cdm_path, excel_path, sheetname):
-    """
-    measurement_id에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0034(cdm_path, excel_path, sheetname):
-    """
-    measurement_id에 중복값이 있는지 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0035(cdm_path, excel_path, sheetname):
-    """
-    measurement_date에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0036(cdm_path, excel_path, sheetname):
-    """
-    measurement_datetime에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_datetime"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0037(cdm_path, excel_path, sheetname):
-    """
-    measurement의 person_id중 person테이블에 없는 환자인지 확인
-    """
-    table_name = "measurement"
-    column_name = "person_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    person = pd.read_csv(os.path.join(cdm_path, "person" + ".csv"), dtype=str)
-
-    cdm = pd.merge(cdm, person, on=column_name, how="outer", suffixes=('', '_'))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0038(cdm_path, excel_path, sheetname):
-    """
-    measurement_source_value에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0039(cdm_path, excel_path, sheetname):
-    """
-    procedure_occurrence_id에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "procedure_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0040(cdm_path, excel_path, sheetname):
-    """
-    procedure_occurrence_id에 중복값이 있는지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "procedure_occurrence_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0041(cdm_path, excel_path, sheetname):
-    """
-    procedure_date에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "procedure_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0042(cdm_path, excel_path, sheetname):
-    """
-    procedure_datetime에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "procedure_datetime"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0043(cdm_path, excel_path, sheetname):
-    """
-    procedure_occurrence의 person_id중 person테이블에 없는 환자인지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "person_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    person = pd.read_csv(os.path.join(cdm_path, "person" + ".csv"), dtype=str)
-
-    cdm = pd.merge(cdm, person, on=column_name, how="outer", suffixes=('', '_'))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0044(cdm_path, excel_path, sheetname):
-    """
-    procedure_source_value에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "procedure_occurrence"
-    column_name = "procedure_source_value"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0045(cdm_path, excel_path, sheetname):
-    """
-    observation_period_id에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "observation_period"
-    column_name = "observation_period_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0046(cdm_path, excel_path, sheetname):
-    """
-    observation_period_id에 중복값이 있는지 확인
-    """
-    table_name = "observation_period"
-    column_name = "observation_period_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = cdm[column_name].duplicated(keep=False).sum()
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0047(cdm_path, excel_path, sheetname):
-    """
-    observation_period_start_date가 observation_period_end_date보다 큰 데이터가 있는지 확인
-    """
-    table_name = "observation_period"
-    column_name = "observation_period_start_date"
-    compare_column = "observation_period_end_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-
-    error_count = len(cdm[cdm[column_name] > cdm[compare_column]])
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-
-def DQ_0048(cdm_path, excel_path, sheetname):
-    """
-    observation_period_start_date에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "observation_period"
-    column_name = "observation_period_start_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0049(cdm_path, excel_path, sheetname):
-    """
-    observation_period_end_date에 NULL이나 공백이 있는지 확인
-    """
-    table_name = "observation_period"
-    column_name = "observation_period_end_date"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
-
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
-
-def DQ_0050(cdm_path, excel_path, sheetname):
-    """
-    observation_period의 person_id중 person테이블에 없는 환자인지 확인
-    """
-    table_name = "observation_period"
-    column_name = "person_id"
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    person = pd.read_csv(os.path.join(cdm_path, "person" + ".csv"), dtype=str)
-
-    cdm = pd.merge(cdm, person, on=column_name, how="outer", suffixes=('', '_'))
-
-    # NULL, 공백, person테이블과 관계 확인!
-    cdm[column_name] = cdm[column_name].str.strip()
-    empty_count = sum(cdm[column_name] == '')
-    null_count = cdm[column_name].isnull().sum()
-
-    error_count = null_count + empty_count
-    row_count = len(cdm)
-    null_ratio = error_count / row_count
+    for table_name, table_rules in rules_by_table.items():
+        columns = [column for rule in table_rules for column in rule_columns(rule)]
+        cdm = read_table(cdm_path, table_name, columns)
 
-    find_excel_row_and_write_error_ratio(excel_path, sheetname, id, error_count, row_count, null_ratio)
+        results = evaluate_rules(cdm, table_rules, references)
+        for rule in table_rules:
+            error_count, row_count, error_ratio = results[rule["id"]]
+            find_excel_row_and_write_error_ratio(excel_path, sheetname, rule["id"], error_count, row_count, error_ratio)
@@ -1,12 +1,168 @@
+import os
+from contextlib import contextmanager
 import pandas as pd
 from openpyxl import load_workbook
 
+# qc_result_writer 안에서 실행 중인 결과 저장 객체
+_active_writer = None
+
+class QCResultWriter:
+    """
+    QC 결과를 메모리에 모아 두었다가 한 번에 저장
+    workbook은 한 번만 읽고, sheet별 key(A열) -> row 위치는 처음 사용할 때 한 번만 계산
+    """
+    def __init__(self, excel_path):
+        self.excel_path = excel_path
+        self.wb = load_workbook(excel_path)
+        self.row_index = {}
+        self.results = []
+
+    def sheet_row_count(self, sheetname):
+        return self.wb[sheetname].max_row
+
+    def get_row_index(self, sheetname):
+        """
+        key_column이 A1에 있다는 가정으로 key -> row 번호 생성
+        """
+        if sheetname not in self.row_index:
+            ws = self.wb[sheetname]
+            index = {}
+            for row in ws.iter_rows(min_row=2, max_col=1): # 첫 행은 헤더로 가정, 데이터는 두 번째 행부터 시작
+                index.setdefault(row[0].value, row[0].row)
+            self.row_index[sheetname] = index
+        return self.row_index[sheetname]
+
+    def write_row(self, sheetname, key_value, values):
+        """
+        key_value가 있는 행의 {열 이름: 값}을 기록
+        """
+        ws = self.wb[sheetname]
+        row_number = self.get_row_index(sheetname).get(key_value)
+        if row_number is not None:
+            for column, value in values.items():
+                ws[column + str(row_number)] = value
+
+        header = {column: ws[column + "1"].value or column for column in values}
+        result = {"sheet": sheetname, "key": key_value}
+        result.update({header[column]: value for column, value in values.items()})
+        self.results.append(pd.DataFrame([result]))
+
+    def append_df(self, sheetname, df):
+        """
+        sheet의 마지막 행 다음에 df 추가
+        """
+        ws = self.wb[sheetname]
+        for row in df.itertuples(index=False):
+            ws.append([None if pd.isna(value) else value for value in row])
+
+        self.row_index.pop(sheetname, None)
+
+        result = df.copy()
+        result.insert(0, "sheet", sheetname)
+        self.results.append(result)
+
+    def save(self, results_path=None):
+        """
+        workbook을 한 번 저장하고, results_path가 있으면 결과 테이블을 csv 또는 parquet로 저장
+        """
+        self.wb.save(self.excel_path)
+
+        if results_path and self.results:
+            results = pd.concat(self.results, ignore_index=True)
+            if results_path.endswith(".parquet"):
+                object_columns = results.select_dtypes(include="object").columns
+                results = results.astype({column: "string" for column in object_columns})
+                results.to_parquet(results_path, index=False)
+            else:
+                results.to_csv(results_path, index=False, encoding="utf-8-sig")
+
+    def replay(self, operations):
+        """
+        QCResultCollector가 모은 기록을 순서대로 반영
+        """
+        for method, args in operations:
+            getattr(self, method)(*args)
+
+class QCResultCollector:
+    """
+    workbook을 수정하지 않고 QC 결과 기록만 모으는 객체
+    프로세스 풀에서 실행한 QC 작업의 결과를 QCResultWriter.replay로 한 프로세스에서만 기록하기 위해 사용
+    """
+    def __init__(self, excel_path):
+        self.excel_path = excel_path
+        self.operations = []
+
+    def sheet_row_count(self, sheetname):
+        wb = load_workbook(self.excel_path, read_only=True)
+        return wb[sheetname].max_row
+
+    def write_row(self, sheetname, key_value, values):
+        self.operations.append(("write_row", (sheetname, key_value, values)))
+
+    def append_df(self, sheetname, df):
+        self.operations.append(("append_df", (sheetname, df)))
+
+@contextmanager
+def active_writer(writer):
+    """
+    with 블록 안의 QC 결과 기록에 writer를 사용
+    """
+    global _active_writer
+    previous = _active_writer
+    _active_writer = writer
+    try:
+        yield writer
+    finally:
+        _active_writer = previous
+
+@contextmanager
+def collect_qc_results(excel_path):
+    """
+    with 블록 안의 QC 결과 기록을 workbook에 쓰지 않고 모음
+    """
+    with active_writer(QCResultCollector(excel_path)) as collector:
+        yield collector
+
+@contextmanager
+def qc_result_writer(excel_path, results_path=None):
+    """
+    with 블록 안의 QC 결과 기록을 모아 블록이 끝날 때 한 번 저장
+    """
+    with active_writer(QCResultWriter(excel_path)) as writer:
+        yield writer
+        writer.save(results_path)
+
+def active_result_writer(excel_path):
+    """
+    excel_path에 대해 qc_result_writer가 실행 중이면 해당 객체 반환
+    """
+    if _active_writer is not None and os.path.abspath(_active_writer.excel_path) == os.path.abspath(excel_path):
+        return _active_writer
+    return None
+
+@contextmanager
+def get_result_writer(excel_path):
+    """
+    qc_result_writer 실행 중이면 해당 객체를 사용하고, 아니면 한 번 쓰고 바로 저장
+    """
+    writer = active_result_writer(excel_path)
+    if writer is not None:
+        yield writer
+    else:
+        writer = QCResultWriter(excel_path)
+        yield writer
+        writer.save()
+
 def write_df_to_excel(excel_path, sheetname, df):
     "원하는 엑셀 파일에 데이터 쓰기"
-    with pd.ExcelWriter(excel_path, engine="openpyxl", mode = "a", if_sheet_exists='overlay') as writer:
-            df.to_excel(writer, sheet_name=sheetname, startrow=writer.sheets[sheetname].max_row , index=False, header=None)
+    with get_result_writer(excel_path) as writer:
+        writer.append_df(sheetname, df)
 
 def get_sheet_row_count(excel_path, sheetname):
+    writer = active_result_writer(excel_path)
+    if writer is not None:
+        return writer.sheet_row_count(sheetname)
+
     wb = load_workbook(excel_path)
     ws = wb[sheetname]
 
@@ -18,43 +174,13 @@ def find_excel_row_and_write_error_ratio(excel_path, sheetname, key_value, error
     """
     key_column이 A1에 있다는 가정으로 실행
     """
-    wb = load_workbook(excel_path)
-    ws = wb[sheetname]
-
-    for row in ws.iter_rows(min_row=2, max_col=ws.max_column): # 첫 행은 헤더로 가정, 데이터는 두 번째 행부터 시작
-        if row[0].value == key_value:
-            error_count_cell_address = 'G' + str(row[0].row)  # G열 같은 행의 셀 주소 생성
-            row_count_cell_address = 'H' + str(row[0].row)  # G열 같은 행의 셀 주소 생성
-            error_rate_cell_address = 'I' + str(row[0].row)  # G열 같은 행의 셀 주소 생성
-
-            ws[error_count_cell_address] = error_count  # 새로운 값 할당
-            ws[row_count_cell_address] = row_count  # 새로운 값 할당
-            ws[error_rate_cell_address] = error_rate  # 새로운 값 할당
-            break
-    
-    wb.save(excel_path)
+    with get_result_writer(excel_path) as writer:
+        writer.write_row(sheetname, key_value, {"G": error_count, "H": row_count, "I": error_rate})
 
 def find_excel_row_and_write_metadata_count(excel_path, sheetname, key_value, feature_count, row_count, feature_patient_count, patient_count, patient_ratio):
     """
     key_column이 A1에 있다는 가정으로 실행
     """
-    wb = load_workbook(excel_path)
-    ws = wb[sheetname]
-
-    for row in ws.iter_rows(min_row=2, max_col=ws.max_column): # 첫 행은 헤더로 가정, 데이터는 두 번째 행부터 시작
-        if row[0].value == key_value:
-            feature_count_cell_address = 'G' + str(row[0].row)  # G열 같은 행의 셀 주소 생성
-            row_count_cell_address = 'H' + str(row[0].row)  # H열 같은 행의 셀 주소 생성
-            feature_patient_count_cell_address = 'I' + str(row[0].row)  # I열 같은 행의 셀 주소 생성
-            patient_count_cell_address = 'J' + str(row[0].row)  # J열 같은 행의 셀 주소 생성
-            patient_ratio_cell_address = 'K' + str(row[0].row)  # J열 같은 행의 셀 주소 생성
-
-            ws[feature_count_cell_address] = feature_count  # 새로운 값 할당
-            ws[row_count_cell_address] = row_count  # 새로운 값 할당
-            ws[feature_patient_count_cell_address] = feature_patient_count  # 새로운 값 할당
-            ws[patient_count_cell_address] = patient_count  # 새로운 값 할당
-            ws[patient_ratio_cell_address] = patient_ratio  # 새로운 값 할당
-            break
-    
-    wb.save(excel_path)
-                    
+    with get_result_writer(excel_path) as writer:
+        writer.write_row(sheetname, key_value, {"G": feature_count, "H": row_count, "I": feature_patient_count,
+                                                "J": patient_count, "K": patient_ratio})
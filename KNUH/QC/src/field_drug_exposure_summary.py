@@ -2,8 +2,6 @@
 drug_exposure테이블의 field별 기초 통계 정보 구하기
 """
 
-import pandas as pd
-import numpy as np
 import os, sys
 # 상위 디렉토리 (my_project 폴더)를 sys.path에 추가
 current_dir = os.path.dirname(__file__)  # 현재 파일의 디렉토리
@@ -11,62 +9,15 @@ parent_dir = os.path.dirname(current_dir)  # 현재 디렉토리의 부모 디
 project_dir = os.path.dirname(parent_dir)  # QC의 부모 디렉토리 (my_project)
 sys.path.insert(0, project_dir)
 from QC.src.excel_util import write_df_to_excel
+from QC.src.field_profiler import profile_table
 
 def drug_exposure_field_summary(cdm_path, excel_path, sheetname):
     table_name = "drug_exposure"
     id = 7
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
+    datetime_columns = ["drug_exposure_start_date", "drug_exposure_start_datetime", "drug_exposure_end_date", "drug_exposure_end_datetime"]
 
-    cdm["drug_exposure_start_date"] = pd.to_datetime(cdm["drug_exposure_start_date"])
-    cdm["drug_exposure_start_datetime"] = pd.to_datetime(cdm["drug_exposure_start_datetime"])
-    cdm["drug_exposure_end_date"] = pd.to_datetime(cdm["drug_exposure_end_date"])
-    cdm["drug_exposure_end_datetime"] = pd.to_datetime(cdm["drug_exposure_end_datetime"])
-    
-    # dataframe.describe에는 numeric데이터에 대해서는 고유값(unique)수가 제공되지 않아 직접 계산
-    # dataframe.describe에는 datetime데이터에 대해서는 고유값(unique)수와 최빈값(top), 최빈값수(freq)가 제공되지 않아 직접 계산
-    manual_summary_list = []
-    for col in cdm.columns:
-        value_counts = cdm[col].value_counts(dropna=True)  # NaN 값은 무시
-        if not value_counts.empty:
-            mode_value = value_counts.index[0]  # 최빈값
-            mode_count = value_counts.iloc[0]  # 최빈값의 등장 횟수
-        else:
-            mode_value = np.nan
-            mode_count = 0
+    # chunk 단위로 한 번 읽으며 컬럼별 통계 계산(고유값 수, 최빈값, 분위수는 근사값)
+    profile = profile_table(cdm_path, table_name, datetime_columns)
 
-        mode_value = cdm[col].mode()[0] if not cdm[col].mode().empty else np.nan
-        manual_summary_list.append([col, cdm[col].nunique(), mode_value, mode_count])
-
-    manual_summary = pd.DataFrame(manual_summary_list, columns = ("column_name", "manual_unique", "manual_top", "manual_freq"))
-
-    summary = cdm.describe(include="all", datetime_is_numeric=True).T
-    summary.index.name = "column_name"
-
-    null_count = cdm.isnull().sum()
-    null_count = null_count.rename("null_count")
-    null_count.index.name = "column_name"
-    null_count = null_count.reset_index()
-
-    null_ratio = cdm.isnull().mean()
-    null_ratio = null_ratio.rename("null_ratio")
-    null_ratio.index.name = "column_name"
-    null_ratio = null_ratio.reset_index()
-
-    result = pd.merge(summary, null_count, on="column_name", how="outer")
-    result = pd.merge(result, null_ratio, on="column_name", how="outer")
-    result = pd.merge(result, manual_summary, on="column_name", how="outer")
-
-    result["id"] = f"field_{str(id).zfill(4)}"
-    result["table_name"] = table_name
-    result["unique"] = np.select([result["unique"].isnull()], [result["manual_unique"]], default=result["unique"])
-    result["top"] = np.select([result["top"].isnull()], [result["manual_top"]], default=result["top"])
-    result["freq"] = np.select([result["freq"].isnull()], [result["manual_freq"]], default=result["freq"])
-
-    result = result[["id", "table_name", "column_name", "count", "unique",
-                "top", "freq", "mean", "std", "min", "25%", "50%", "75%", "max", "null_count", "null_ratio"]]
-    
-    df = pd.DataFrame(result)    
+    df = profile.to_frame(id)
     write_df_to_excel(excel_path, sheetname, df)
-
-
-
@@ -0,0 +1,334 @@
+"""
+CDM 테이블의 field별 기초 통계 정보를 chunk 단위로 한 번 읽으며 구하기
+고유값 수는 HyperLogLog, 최빈값은 Misra-Gries, 분위수는 compactor 방식의 근사값이며(고유값 수, 최빈값은 값의 종류가 적으면 정확한 값)
+모든 통계는 합칠 수 있으므로(merge) chunk별, 병원별 결과를 합쳐 같은 통계를 구할 수 있음
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import pickle
+
+# chunk 단위로 읽을 행 수
+FIELD_CHUNKSIZE = 1000000
+# HyperLogLog register 수 = 2 ** HLL_PRECISION (상대오차 약 1.04 / sqrt(2 ** HLL_PRECISION))
+HLL_PRECISION = 14
+# 최빈값 계산을 위해 유지할 값의 수
+TOPK_SIZE = 100
+# 값의 종류가 이 수 이하이면 모든 값의 빈도를 그대로 유지하여 정확한 최빈값을 계산
+TOPK_EXACT_SIZE = 100000
+# 분위수 계산을 위해 level별로 유지할 값의 수
+QUANTILE_SIZE = 2048
+
+RESULT_COLUMNS = ["id", "table_name", "column_name", "count", "unique",
+                  "top", "freq", "mean", "std", "min", "25%", "50%", "75%", "max", "null_count", "null_ratio"]
+
+
+class HyperLogLog:
+    """
+    고유값 수 근사 계산
+    고유값이 register 수 이하인 동안은 hash 값을 모두 유지하여 정확한 고유값 수를 반환
+    """
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        self.keep_hashes(hashes)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # 나머지 bit(2 ** 53 미만이므로 float 변환 시 손실 없음)에서 첫 1 bit의 위치
+        remainder = (hashes & np.uint64((1 << (64 - self.precision)) - 1)).astype(np.float64)
+        _, bit_length = np.frexp(remainder)
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+        maxima = pd.Series(rank).groupby(index).max()
+        index = maxima.index.to_numpy()
+        self.registers[index] = np.maximum(self.registers[index], maxima.to_numpy())
+
+    def keep_hashes(self, hashes):
+        if self.hashes is None or hashes is None:
+            self.hashes = None
+            return
+        self.hashes = np.union1d(self.hashes, hashes)
+        if len(self.hashes) > len(self.registers):
+            self.hashes = None
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        self.keep_hashes(other.hashes)
+
+    def estimate(self):
+        if self.hashes is not None:
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class TopK:
+    """
+    Misra-Gries 방식의 최빈값 근사 계산
+    값의 종류가 exact_size 이하인 동안은 모든 값의 빈도를 유지하고, 넘으면 size개로 줄임
+    줄인 뒤 유지하는 값의 빈도는 실제 빈도보다 최대 (전체 건수 / (size + 1))만큼 작을 수 있음
+    빈도는 값이 처음 나온 순서로 유지하여 빈도가 같은 값 중 value_counts와 같은 값을 최빈값으로 반환
+    """
+    def __init__(self, size=TOPK_SIZE, exact_size=TOPK_EXACT_SIZE):
+        self.size = size
+        self.exact_size = exact_size
+        self.counts = pd.Series(dtype=np.int64)
+
+    def update(self, values):
+        self.merge_counts(values.value_counts(dropna=True, sort=False))
+
+    def merge(self, other):
+        self.merge_counts(other.counts)
+
+    def merge_counts(self, counts):
+        counts = pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+        if len(counts) > self.exact_size:
+            threshold = counts.nlargest(self.size + 1).iloc[-1]
+            counts = counts[counts > threshold] - threshold
+        self.counts = counts.astype(np.int64)
+
+    def top(self, convert=None):
+        """
+        빈도가 가장 큰 값과 빈도
+        빈도가 같은 값이 여러 개이면 value_counts와 같은 값을 반환하며,
+        convert가 있으면 mode와 같이 convert로 변환한 값이 가장 작은 값을 반환(숫자, 날짜 컬럼)
+        """
+        if self.counts.empty:
+            return np.nan, 0
+        if convert is None:
+            counts = self.counts.sort_values(ascending=False)
+            return counts.index[0], int(counts.iloc[0])
+        freq = self.counts.max()
+        candidates = pd.Series(self.counts.index[self.counts == freq])
+        keys = convert(candidates) if convert else candidates
+        position = keys.sort_values(kind="stable", na_position="last").index[0]
+        return candidates[position], int(freq)
+
+
+class QuantileSketch:
+    """
+    compactor 방식의 분위수 근사 계산
+    level i의 값은 2 ** i건을 대표하며, level별 값이 size개를 넘으면 정렬하여 하나 건너 하나씩 다음 level로 올림
+    """
+    def __init__(self, size=QUANTILE_SIZE):
+        self.size = size
+        self.levels = [np.empty(0)]
+        self.compactions = 0
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self.compress()
+
+    def merge(self, other):
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.compress()
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.size:
+                values = np.sort(values)
+                even = len(values) - len(values) % 2
+                # 올리는 위치를 번갈아 선택하여 한쪽으로 치우치지 않도록 함
+                offset = self.compactions % 2
+                self.compactions += 1
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], values[offset:even:2]])
+                self.levels[level] = values[even:]
+            level += 1
+
+    def quantile(self, q):
+        values = np.concatenate(self.levels)
+        if len(values) == 0:
+            return np.nan
+        weights = np.concatenate([np.full(len(level_values), 2 ** level) for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return values[order][min(position, len(values) - 1)]
+
+
+class FieldSketch:
+    """
+    컬럼 하나의 통계
+    숫자로 변환되는 컬럼과 날짜 컬럼은 평균, 표준편차, 최소/최대, 분위수를 계산하며, 날짜는 ns 단위 숫자로 계산
+    """
+    def __init__(self, is_datetime=False):
+        self.is_datetime = is_datetime
+        self.is_numeric = True
+        self.count = 0
+        self.null_count = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.hll = HyperLogLog()
+        self.topk = TopK()
+        self.quantiles = QuantileSketch()
+
+    def update(self, values):
+        """
+        문자열로 읽은 chunk의 컬럼 값 반영
+        """
+        not_null = values.dropna()
+        self.count += len(not_null)
+        self.null_count += len(values) - len(not_null)
+        self.hll.update(not_null)
+        self.topk.update(not_null)
+
+        if self.is_datetime:
+            parsed = pd.to_datetime(not_null, errors="coerce").dropna()
+            numbers = parsed.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+        elif self.is_numeric:
+            parsed = pd.to_numeric(not_null, errors="coerce")
+            # 숫자가 아닌 값이 있으면 문자 컬럼으로 보고 숫자 통계는 계산하지 않음
+            if parsed.isnull().any():
+                self.is_numeric = False
+                self.quantiles = None
+                return
+            numbers = parsed.to_numpy(dtype=np.float64)
+        else:
+            return
+
+        if len(numbers) == 0:
+            return
+        mean = numbers.mean()
+        self.merge_moments(len(numbers), mean, ((numbers - mean) ** 2).sum(), numbers.min(), numbers.max())
+        self.quantiles.update(numbers)
+
+    def merge_moments(self, n, mean, m2, minimum, maximum):
+        """
+        평균, 분산을 Chan의 병렬 알고리즘으로 합침
+        """
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+        self.min = np.nanmin([self.min, minimum])
+        self.max = np.nanmax([self.max, maximum])
+
+    def merge(self, other):
+        self.count += other.count
+        self.null_count += other.null_count
+        self.hll.merge(other.hll)
+        self.topk.merge(other.topk)
+        if self.is_datetime or (self.is_numeric and other.is_numeric):
+            self.merge_moments(other.n, other.mean, other.m2, other.min, other.max)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.is_numeric = False
+            self.quantiles = None
+
+    def has_statistics(self):
+        return (self.is_datetime or self.is_numeric) and self.n > 0
+
+    def to_value(self, number):
+        if self.is_datetime:
+            return pd.Timestamp(int(number))
+        return number
+
+    def summary(self):
+        if self.is_datetime:
+            top, freq = self.topk.top(lambda values: pd.to_datetime(values, errors="coerce"))
+            top = pd.to_datetime(top, errors="coerce")
+        elif self.is_numeric:
+            top, freq = self.topk.top(pd.to_numeric)
+            top = pd.to_numeric(top)
+        else:
+            top, freq = self.topk.top()
+        # 근사값이 건수보다 클 수 있으므로 건수 이하로 제한
+        result = {"count": self.count, "unique": min(self.hll.estimate(), self.count), "top": top, "freq": freq,
+                  "mean": np.nan, "std": np.nan, "min": np.nan, "25%": np.nan, "50%": np.nan, "75%": np.nan, "max": np.nan,
+                  "null_count": self.null_count,
+                  "null_ratio": self.null_count / (self.count + self.null_count) if self.count + self.null_count else np.nan}
+        if self.has_statistics():
+            result["mean"] = self.to_value(self.mean)
+            if not self.is_datetime and self.n > 1:
+                result["std"] = np.sqrt(self.m2 / (self.n - 1))
+            result["min"] = self.to_value(self.min)
+            result["max"] = self.to_value(self.max)
+            for name, q in (("25%", 0.25), ("50%", 0.5), ("75%", 0.75)):
+                result[name] = self.to_value(self.quantiles.quantile(q))
+        return result
+
+
+class TableProfile:
+    """
+    테이블의 컬럼별 통계
+    """
+    def __init__(self, table_name, datetime_columns=()):
+        self.table_name = table_name
+        self.datetime_columns = set(datetime_columns)
+        self.fields = {}
+
+    def update(self, chunk):
+        for column in chunk.columns:
+            if column not in self.fields:
+                self.fields[column] = FieldSketch(column in self.datetime_columns)
+            self.fields[column].update(chunk[column])
+
+    def merge(self, other):
+        for column, field in other.fields.items():
+            if column in self.fields:
+                self.fields[column].merge(field)
+            else:
+                self.fields[column] = field
+
+    def to_frame(self, id):
+        rows = []
+        for column, field in self.fields.items():
+            row = {"id": f"field_{str(id).zfill(4)}", "table_name": self.table_name, "column_name": column}
+            row.update(field.summary())
+            rows.append(row)
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            pickle.dump(self, file)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+
+def profile_table(cdm_path, table_name, datetime_columns=(), chunksize=FIELD_CHUNKSIZE):
+    """
+    CDM 테이블을 chunksize 행씩 문자열로 읽어 컬럼별 통계를 구하고, CDM 경로의 sketch/테이블명.pkl에 저장
+    """
+    profile = TableProfile(table_name, datetime_columns)
+    for chunk in pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str, chunksize=chunksize):
+        profile.update(chunk)
+    profile.save(os.path.join(cdm_path, "sketch", table_name + ".pkl"))
+    return profile
+
+
+def merge_profiles(paths):
+    """
+    profile_table로 저장한 통계(병원별 등)를 합침
+    """
+    profiles = [TableProfile.load(path) for path in paths]
+    merged = profiles[0]
+    for profile in profiles[1:]:
+        merged.merge(profile)
+    return merged
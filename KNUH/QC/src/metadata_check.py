@@ -1,8 +1,6 @@
 import pandas as pd
 import numpy as np
 import os, sys
-from datetime import datetime
-import inspect
 # 상위 디렉토리 (my_project 폴더)를 sys.path에 추가
 current_dir = os.path.dirname(__file__)  # 현재 파일의 디렉토리
 parent_dir = os.path.dirname(current_dir)  # 현재 디렉토리의 부모 디렉토리 (QC)
@@ -10,614 +8,91 @@ project_dir = os.path.dirname(parent_dir)  # QC의 부모 디렉토리 (my_proje
 sys.path.insert(0, project_dir)
 from QC.src.excel_util import find_excel_row_and_write_metadata_count
 
-def META_0001(config, cdm_path, excel_path, sheetname):
-    """
-    WBC Count 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["wbc_count"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0002(config, cdm_path, excel_path, sheetname):
-    """
-    hemogrobin(Hb) 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["hb"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0003(config, cdm_path, excel_path, sheetname):
-    """
-    Hematocrit(Hct) 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["hematocrit"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0004(config, cdm_path, excel_path, sheetname):
-    """
-    platelet_count 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["platelet_count"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0005(config, cdm_path, excel_path, sheetname):
-    """
-    lymphocyte_count 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["lymphocyte_count"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-
-def META_0006(config, cdm_path, excel_path, sheetname):
-    """
-    monocyte_count 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["monocyte_count"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-
-def META_0007(config, cdm_path, excel_path, sheetname):
-    """
-    neurophil_count 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["neurophil_count"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0008(config, cdm_path, excel_path, sheetname):
-    """
-    sodium 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["sodium"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0009(config, cdm_path, excel_path, sheetname):
-    """
-    potassium 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["potassium"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0010(config, cdm_path, excel_path, sheetname):
-    """
-    ast 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["ast"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0011(config, cdm_path, excel_path, sheetname):
-    """
-    alt 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["alt"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0012(config, cdm_path, excel_path, sheetname):
-    """
-    total_bilirubin 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["total_bilirubin"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0013(config, cdm_path, excel_path, sheetname):
-    """
-    total_protein 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["total_protein"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0014(config, cdm_path, excel_path, sheetname):
-    """
-    albumin 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["albumin"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0015(config, cdm_path, excel_path, sheetname):
-    """
-    bun 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["bun"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0016(config, cdm_path, excel_path, sheetname):
-    """
-    creatinine 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["creatinine"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0017(config, cdm_path, excel_path, sheetname):
-    """
-    egfr 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["egfr"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0018(config, cdm_path, excel_path, sheetname):
-    """
-    crp 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["crp"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0019(config, cdm_path, excel_path, sheetname):
-    """
-    troponin_i 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["troponin_i"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0020(config, cdm_path, excel_path, sheetname):
-    """
-    ck_mb 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["ck_mb"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0021(config, cdm_path, excel_path, sheetname):
-    """
-    ph 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["ph"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0022(config, cdm_path, excel_path, sheetname):
-    """
-    paco2 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["paco2"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0023(config, cdm_path, excel_path, sheetname):
-    """
-    pao2 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["pao2"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0024(config, cdm_path, excel_path, sheetname):
-    """
-    arterial_ph 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_source_value"
-    code_list = config["metadata"]["arterial_ph"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), dtype=str)
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0025(config, cdm_path, excel_path, sheetname):
-    """
-    체온 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["temperature"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-
-def META_0026(config, cdm_path, excel_path, sheetname):
-    """
-    sbp 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["sbp"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0027(config, cdm_path, excel_path, sheetname):
-    """
-    dbp 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["dbp"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-
-def META_0028(config, cdm_path, excel_path, sheetname):
-    """
-    Heart rate 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["heartrate"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0029(config, cdm_path, excel_path, sheetname):
-    """
-    respiratory_rate 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["respiratory_rate"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0030(config, cdm_path, excel_path, sheetname):
-    """
-    bmi 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["bmi"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0031(config, cdm_path, excel_path, sheetname):
-    """
-    height 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["height"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
-
-def META_0032(config, cdm_path, excel_path, sheetname):
-    """
-    weight 데이터 수 확인
-    """
-    table_name = "measurement"
-    column_name = "measurement_concept_id" # vs는 concept_id로 조회
-    code_list = config["metadata"]["weight"]
-    id = inspect.currentframe().f_code.co_name
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
-    feature = cdm[cdm[column_name].isin(code_list)]
-
-    feature_count = len(feature)
-    row_count = len(cdm)
-    feature_patient_count = feature["person_id"].nunique()
-    patient_count = cdm["person_id"].nunique()
-    patient_ratio = feature_patient_count / patient_count
-
-    find_excel_row_and_write_metadata_count(excel_path, sheetname, id, feature_count, row_count, feature_patient_count, patient_count, patient_ratio)
+# METADATA 진단 규칙
+# table의 column 값이 config.yaml의 metadata.feature에 정의된 코드인 행 수와 환자 수를 확인
+META_RULES = [
+    {"id": "META_0001", "table": "measurement", "column": "measurement_source_value", "feature": "wbc_count", "description": "WBC Count 데이터 수 확인"},
+    {"id": "META_0002", "table": "measurement", "column": "measurement_source_value", "feature": "hb", "description": "hemogrobin(Hb) 데이터 수 확인"},
+    {"id": "META_0003", "table": "measurement", "column": "measurement_source_value", "feature": "hematocrit", "description": "Hematocrit(Hct) 데이터 수 확인"},
+    {"id": "META_0004", "table": "measurement", "column": "measurement_source_value", "feature": "platelet_count", "description": "platelet_count 데이터 수 확인"},
+    {"id": "META_0005", "table": "measurement", "column": "measurement_source_value", "feature": "lymphocyte_count", "description": "lymphocyte_count 데이터 수 확인"},
+    {"id": "META_0006", "table": "measurement", "column": "measurement_source_value", "feature": "monocyte_count", "description": "monocyte_count 데이터 수 확인"},
+    {"id": "META_0007", "table": "measurement", "column": "measurement_source_value", "feature": "neurophil_count", "description": "neurophil_count 데이터 수 확인"},
+    {"id": "META_0008", "table": "measurement", "column": "measurement_source_value", "feature": "sodium", "description": "sodium 데이터 수 확인"},
+    {"id": "META_0009", "table": "measurement", "column": "measurement_source_value", "feature": "potassium", "description": "potassium 데이터 수 확인"},
+    {"id": "META_0010", "table": "measurement", "column": "measurement_source_value", "feature": "ast", "description": "ast 데이터 수 확인"},
+    {"id": "META_0011", "table": "measurement", "column": "measurement_source_value", "feature": "alt", "description": "alt 데이터 수 확인"},
+    {"id": "META_0012", "table": "measurement", "column": "measurement_source_value", "feature": "total_bilirubin", "description": "total_bilirubin 데이터 수 확인"},
+    {"id": "META_0013", "table": "measurement", "column": "measurement_source_value", "feature": "total_protein", "description": "total_protein 데이터 수 확인"},
+    {"id": "META_0014", "table": "measurement", "column": "measurement_source_value", "feature": "albumin", "description": "albumin 데이터 수 확인"},
+    {"id": "META_0015", "table": "measurement", "column": "measurement_source_value", "feature": "bun", "description": "bun 데이터 수 확인"},
+    {"id": "META_0016", "table": "measurement", "column": "measurement_source_value", "feature": "creatinine", "description": "creatinine 데이터 수 확인"},
+    {"id": "META_0017", "table": "measurement", "column": "measurement_source_value", "feature": "egfr", "description": "egfr 데이터 수 확인"},
+    {"id": "META_0018", "table": "measurement", "column": "measurement_source_value", "feature": "crp", "description": "crp 데이터 수 확인"},
+    {"id": "META_0019", "table": "measurement", "column": "measurement_source_value", "feature": "troponin_i", "description": "troponin_i 데이터 수 확인"},
+    {"id": "META_0020", "table": "measurement", "column": "measurement_source_value", "feature": "ck_mb", "description": "ck_mb 데이터 수 확인"},
+    {"id": "META_0021", "table": "measurement", "column": "measurement_source_value", "feature": "ph", "description": "ph 데이터 수 확인"},
+    {"id": "META_0022", "table": "measurement", "column": "measurement_source_value", "feature": "paco2", "description": "paco2 데이터 수 확인"},
+    {"id": "META_0023", "table": "measurement", "column": "measurement_source_value", "feature": "pao2", "description": "pao2 데이터 수 확인"},
+    {"id": "META_0024", "table": "measurement", "column": "measurement_source_value", "feature": "arterial_ph", "description": "arterial_ph 데이터 수 확인"},
+    # vs는 concept_id로 조회
+    {"id": "META_0025", "table": "measurement", "column": "measurement_concept_id", "feature": "temperature", "description": "체온 데이터 수 확인"},
+    {"id": "META_0026", "table": "measurement", "column": "measurement_concept_id", "feature": "sbp", "description": "sbp 데이터 수 확인"},
+    {"id": "META_0027", "table": "measurement", "column": "measurement_concept_id", "feature": "dbp", "description": "dbp 데이터 수 확인"},
+    {"id": "META_0028", "table": "measurement", "column": "measurement_concept_id", "feature": "heartrate", "description": "Heart rate 데이터 수 확인"},
+    {"id": "META_0029", "table": "measurement", "column": "measurement_concept_id", "feature": "respiratory_rate", "description": "respiratory_rate 데이터 수 확인"},
+    {"id": "META_0030", "table": "measurement", "column": "measurement_concept_id", "feature": "bmi", "description": "bmi 데이터 수 확인"},
+    {"id": "META_0031", "table": "measurement", "column": "measurement_concept_id", "feature": "height", "description": "height 데이터 수 확인"},
+    {"id": "META_0032", "table": "measurement", "column": "measurement_concept_id", "feature": "weight", "description": "weight 데이터 수 확인"}
+]
+
+
+def get_code_map(config, rules, column_name):
+    """
+    config.yaml의 metadata 코드 목록을 뒤집어 코드 -> 규칙 id 표 생성
+    concept_id 컬럼은 숫자로, 나머지 컬럼(source_value 등)은 YAML에 숫자로 적은 코드도 문자열로 비교
+    한 feature에 같은 코드가 여러 번 적혀 있어도 한 번만 세도록 중복 제거
+    """
+    codes = []
+    for rule in rules:
+        for code in config["metadata"][rule["feature"]]:
+            codes.append((code, rule["id"]))
+    code_map = pd.DataFrame(codes, columns=[column_name, "id"])
+    is_numeric = column_name.endswith("concept_id")
+    code_map[column_name] = code_map[column_name].astype(float if is_numeric else str)
+    return code_map.drop_duplicates(), is_numeric
+
+
+def run_metadata_checks(config, cdm_path, excel_path, sheetname, rules=META_RULES):
+    """
+    규칙을 테이블별로 묶어 테이블마다 필요한 컬럼만 한 번 읽고, 모든 feature의 행 수와 환자 수를 한 번의 groupby로 계산
+    """
+    rules_by_table = {}
+    for rule in rules:
+        rules_by_table.setdefault(rule["table"], []).append(rule)
+
+    for table_name, table_rules in rules_by_table.items():
+        columns = list(dict.fromkeys(["person_id"] + [rule["column"] for rule in table_rules]))
+        cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"), usecols=columns, dtype=str)
+
+        row_count = len(cdm)
+        patient_count = cdm["person_id"].nunique()
+
+        matched = []
+        for column_name in dict.fromkeys(rule["column"] for rule in table_rules):
+            code_map, is_numeric = get_code_map(config, [rule for rule in table_rules if rule["column"] == column_name], column_name)
+            values = cdm[["person_id", column_name]]
+            if is_numeric:
+                values = values.assign(**{column_name: pd.to_numeric(values[column_name], errors="coerce")})
+            # 하나의 코드가 여러 feature에 정의된 경우 feature마다 행이 생성됨
+            matched.append(pd.merge(values, code_map, on=column_name, how="inner")[["id", "person_id"]])
+
+        matched = pd.concat(matched, ignore_index=True)
+        counts = matched.groupby("id").agg(feature_count=("id", "size"), feature_patient_count=("person_id", "nunique"))
+
+        for rule in table_rules:
+            feature_count = int(counts["feature_count"].get(rule["id"], 0))
+            feature_patient_count = int(counts["feature_patient_count"].get(rule["id"], 0))
+            patient_ratio = feature_patient_count / patient_count if patient_count else 0
+            find_excel_row_and_write_metadata_count(excel_path, sheetname, rule["id"], feature_count, row_count,
+                                                    feature_patient_count, patient_count, patient_ratio)
@@ -0,0 +1,117 @@
+"""
+QC 작업을 프로세스 풀에서 동시에 실행하기
+"""
+
+import os, sys
+import logging
+from concurrent.futures import ProcessPoolExecutor
+# 상위 디렉토리 (my_project 폴더)를 sys.path에 추가
+current_dir = os.path.dirname(__file__)  # 현재 파일의 디렉토리
+parent_dir = os.path.dirname(current_dir)  # 현재 디렉토리의 부모 디렉토리 (QC)
+project_dir = os.path.dirname(parent_dir)  # QC의 부모 디렉토리 (my_project)
+sys.path.insert(0, project_dir)
+from QC.src import (field_care_site_summary, field_provider_summary, field_person_summary,
+                    field_visit_occurrence_summary, #field_visit_detail_summary,
+                    field_condition_occurrence_summary, field_drug_exposure_summary,
+                    field_measurement_summary, field_procedure_occurrence_summary,
+                    field_observation_period_summary, field_local_edi_summary, field_drug_edi_summary,
+                    field_measurement_edi_summary, field_procedure_edi_summary
+                    )
+from QC.src.dq_check import DQ_RULES, run_dq_checks, read_references
+from QC.src.excel_util import qc_result_writer, collect_qc_results, get_sheet_row_count
+
+# field 품질 진단 작업 정의
+# 결과는 정의한 순서대로 sheet에 추가되며, table은 실행 순서를 정할 때 사용하는 CDM 테이블명
+FIELD_TASKS = [
+    {"name": "field_care_site", "table": "care_site", "function": field_care_site_summary.care_site_field_summary},
+    {"name": "field_provider", "table": "provider", "function": field_provider_summary.provider_field_summary},
+    {"name": "field_person", "table": "person", "function": field_person_summary.person_field_summary},
+    {"name": "field_visit_occurrence", "table": "visit_occurrence", "function": field_visit_occurrence_summary.visit_occurrence_field_summary},
+    # {"name": "field_visit_detail", "table": "visit_detail", "function": field_visit_detail_summary.visit_detail_field_summary},
+    {"name": "field_condition_occurrence", "table": "condition_occurrence", "function": field_condition_occurrence_summary.condition_occurrence_field_summary},
+    {"name": "field_drug_exposure", "table": "drug_exposure", "function": field_drug_exposure_summary.drug_exposure_field_summary},
+    {"name": "field_measurement", "table": "measurement", "function": field_measurement_summary.measurement_field_summary},
+    {"name": "field_procedure_occurrence", "table": "procedure_occurrence", "function": field_procedure_occurrence_summary.procedure_occurrence_field_summary},
+    {"name": "field_observation_period", "table": "observation_period", "function": field_observation_period_summary.observation_period_field_summary},
+    {"name": "field_local_edi", "table": "local_edi", "function": field_local_edi_summary.local_edi_field_summary},
+    {"name": "field_drug_edi", "table": "drug_edi", "function": field_drug_edi_summary.drug_edi_field_summary},
+    {"name": "field_measurement_edi", "table": "measurement_edi", "function": field_measurement_edi_summary.measurement_edi_field_summary},
+    {"name": "field_procedure_edi", "table": "procedure_edi", "function": field_procedure_edi_summary.procedure_edi_field_summary},
+]
+
+
+def get_qc_tasks(cdm_path, excel_path, sheetname_field, sheetname_dq):
+    """
+    field 진단은 함수별로, DQ 진단은 테이블별 규칙 묶음으로 작업 목록 생성
+    """
+    tasks = []
+    for task in FIELD_TASKS:
+        tasks.append({"name": task["name"], "table": task["table"], "function": task["function"],
+                      "args": (cdm_path, excel_path, sheetname_field)})
+
+    length = get_sheet_row_count(excel_path, sheetname_dq) - 1
+    dq_rules = DQ_RULES[:length]
+    # foreign_key 규칙의 참조 테이블은 여기서 한 번만 읽어 모든 DQ 작업에 전달
+    references = read_references(cdm_path, dq_rules)
+    rules_by_table = {}
+    for rule in dq_rules:
+        rules_by_table.setdefault(rule["table"], []).append(rule)
+    for table_name, rules in rules_by_table.items():
+        tasks.append({"name": f"dq_{table_name}", "table": table_name, "function": run_dq_checks,
+                      "args": (cdm_path, excel_path, sheetname_dq, rules, references)})
+
+    return tasks
+
+
+def run_qc_task(function, args, excel_path):
+    """
+    QC 작업 하나를 실행하고 workbook에 쓰지 않은 결과 기록을 반환합니다. 프로세스 풀에서 호출되므로 모듈 함수로 정의합니다.
+    """
+    with collect_qc_results(excel_path) as collector:
+        function(*args)
+    return collector.operations
+
+
+def table_size(cdm_path, table_name):
+    path = os.path.join(cdm_path, table_name + ".csv")
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def run_qc(cdm_path, excel_path, sheetname_field, sheetname_dq, results_path=None, max_workers=1):
+    """
+    QC 작업을 실행하고 결과를 품질진단지표.xlsx에 한 번 저장합니다.
+    max_workers가 2 이상이면 큰 테이블의 작업부터 프로세스 풀에서 동시에 실행하며,
+    workbook은 이 프로세스에서만 수정하도록 각 작업의 결과 기록을 받아 작업 정의 순서대로 반영합니다.
+    실패한 작업이 있어도 나머지 작업의 결과는 저장한 뒤 오류를 발생시킵니다.
+    """
+    failed = []
+
+    with qc_result_writer(excel_path, results_path) as writer:
+        tasks = get_qc_tasks(cdm_path, excel_path, sheetname_field, sheetname_dq)
+        if max_workers <= 1:
+            results = {}
+            for task in tasks:
+                try:
+                    results[task["name"]] = run_qc_task(task["function"], task["args"], excel_path)
+                except Exception as e:
+                    failed.append(task["name"])
+                    logging.error(f"{task['name']} QC 작업 실행 중 오류: {e}", exc_info = True)
+        else:
+            # 가장 큰 테이블의 작업이 마지막에 시작되지 않도록 CSV 파일 크기가 큰 작업부터 실행
+            schedule = sorted(tasks, key=lambda task: table_size(cdm_path, task["table"]), reverse=True)
+            with ProcessPoolExecutor(max_workers = max_workers) as executor:
+                futures = {task["name"]: executor.submit(run_qc_task, task["function"], task["args"], excel_path) for task in schedule}
+                results = {}
+                for name, future in futures.items():
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        failed.append(name)
+                        logging.error(f"{name} QC 작업 실행 중 오류: {e}", exc_info = True)
+
+        for task in tasks:
+            if task["name"] in results:
+                writer.replay(results[task["name"]])
+
+    if failed:
+        raise RuntimeError(f"실행하지 못한 QC 작업: {failed}")
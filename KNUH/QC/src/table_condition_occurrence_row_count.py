@@ -19,17 +19,25 @@ def condition_occurrence_row_count(config, cdm_path, source_path, excel_path, co
     condition_start_datetime = config[table_name]["columns"]["condition_start_datetime"]
     cdm_date = "condition_start_datetime"
 
-    source = ConditionOccurrenceTransformer(config_path).process_source()
-    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
+    # 전체 변환 시 기록한 원천 데이터의 연월별 row수, 환자수 사용, 기록이 없으면 원천 데이터를 다시 처리
+    transformer = ConditionOccurrenceTransformer(config_path)
+    summary_source = transformer.read_lineage("process_source")
+    if summary_source is not None:
+        summary_source = summary_source.rename(columns = {"rows": "total_count", "patients": "unique_patients"})
+    else:
+        # 증분 변환 설정이어도 전체 원천 데이터와 비교
+        transformer.incremental = False
+        source = transformer.process_source()
+        source['year_month'] = source[condition_start_datetime].dt.to_period('M')
+        summary_source = source.groupby("year_month").agg(
+            total_count=(patno, "count"),
+            unique_patients=(patno, "nunique")
+        ).reset_index()
 
-    source['year_month'] = source[condition_start_datetime].dt.to_period('M')
+    cdm = pd.read_csv(os.path.join(cdm_path, table_name + ".csv"))
     cdm[cdm_date] = pd.to_datetime(cdm[cdm_date])
     cdm['year_month'] = cdm[cdm_date].dt.to_period('M')
 
-    summary_source = source.groupby("year_month").agg(
-        total_count=(patno, "count"),
-        unique_patients=(patno, "nunique")
-    ).reset_index()
     summary_cdm = cdm.groupby("year_month").agg(
         total_count_cdm=("person_id", "count"),
         unique_patients_cdm=("person_id", "nunique")
@@ -0,0 +1,258 @@
+import pandas as pd
+import numpy as np
+import logging
+from collections import namedtuple
+
+# CDM 테이블 컬럼 정의
+# dtype: "id"(고정 id, Int64), "int"(concept_id 등 정수, Int64), "float", "str", "category"(반복되는 이름, 구분값),
+#        "date", "datetime", "time"(변환하지 않음)
+# nullable이 False인 컬럼은 저장 시 결측값이 있으면 경고를 기록하고, format은 CSV에서 읽고 쓸 때 사용하는 날짜 형식
+Column = namedtuple("Column", ["name", "dtype", "nullable", "format"], defaults = [True, None])
+
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def date_column(name, nullable = True):
+    return Column(name, "date", nullable, DATE_FORMAT)
+
+
+def datetime_column(name, nullable = True):
+    return Column(name, "datetime", nullable, DATETIME_FORMAT)
+
+
+CDM_SCHEMA = {
+    "care_site": [
+        Column("care_site_id", "id", False), Column("care_site_name", "category"), Column("place_of_service_concept_id", "int"),
+        Column("location_id", "id"), Column("care_site_source_value", "str"), Column("place_of_service_source_value", "str")
+    ],
+    "provider": [
+        Column("provider_id", "id", False), Column("provider_name", "category"), Column("npi", "str"), Column("dea", "str"),
+        Column("specialty_concept_id", "int"), Column("specialty_concept_id_name", "category"), Column("care_site_id", "id"),
+        Column("care_site_id_name", "category"), Column("year_of_birth", "int"), Column("gender_concept_id", "int"),
+        Column("provider_source_value", "str"), Column("specialty_source_value", "str"), Column("specialty_source_value_name", "category"),
+        Column("specialty_source_concept_id", "int"), Column("gender_source_value", "str"), Column("gender_source_concept_id", "int")
+    ],
+    "person": [
+        Column("person_id", "id", False), Column("gender_concept_id", "int"), Column("year_of_birth", "int"), Column("month_of_birth", "str"),
+        Column("day_of_birth", "str"), datetime_column("birth_datetime"), datetime_column("death_datetime"), Column("race_concept_id", "int"),
+        Column("ethnicity_concept_id", "int"), Column("location_id", "id"), Column("provider_id", "id"), Column("care_site_id", "id"),
+        Column("person_source_value", "str", False), Column("환자명", "category"), Column("gender_source_value", "str"),
+        Column("gender_source_concept_id", "int"), Column("race_source_value", "str"), Column("race_source_concept_id", "int"),
+        Column("ethnicity_source_value", "str"), Column("ethnicity_source_concept_id", "int"),
+        Column("혈액형(ABO)", "category"), Column("혈액형(RH)", "category")
+    ],
+    "visit_occurrence": [
+        Column("visit_occurrence_id", "id", False), Column("person_id", "id", False), Column("환자명", "category"),
+        Column("visit_concept_id", "int"), date_column("visit_start_date", False), datetime_column("visit_start_datetime"),
+        date_column("visit_end_date"), datetime_column("visit_end_datetime"), Column("visit_type_concept_id", "int"),
+        Column("visit_type_concept_id_name", "category"), Column("provider_id", "id"), Column("care_site_id", "id"),
+        Column("visit_source_value", "category"), Column("visit_source_concept_id", "int"), Column("admitted_from_concept_id", "int"),
+        Column("admitted_from_source_value", "str"), Column("discharge_to_concept_id", "int"), Column("discharge_to_source_value", "str"),
+        Column("preceding_visit_occurrence_id", "id"), Column("visit_source_key", "str"), Column("진료과", "str"), Column("진료과명", "category")
+    ],
+    "visit_detail": [
+        Column("visit_detail_id", "id", False), Column("person_id", "id", False), Column("환자명", "category"),
+        Column("visit_detail_concept_id", "int"), date_column("visit_detail_start_date", False), datetime_column("visit_detail_start_datetime"),
+        date_column("visit_detail_end_date"), datetime_column("visit_detail_end_datetime"), Column("visit_detail_type_concept_id", "int"),
+        Column("visit_detail_type_concept_id_name", "category"), Column("provider_id", "id"), Column("care_site_id", "id"),
+        Column("visit_detail_source_value", "str"), Column("visit_detail_source_concept_id", "int"), Column("admitted_from_concept_id", "int"),
+        Column("admitted_from_source_value", "str"), Column("discharge_to_source_value", "str"), Column("discharge_to_concept_id", "int"),
+        Column("preceding_visit_detail_id", "id"), Column("visit_detail_parent_id", "id"), Column("visit_occurrence_id", "id", False),
+        Column("진료과", "str"), Column("진료과명", "category"), Column("병동번호", "str"), Column("병동명", "category")
+    ],
+    "condition_occurrence": [
+        Column("condition_occurrence_id", "id", False), Column("person_id", "id", False), Column("condition_concept_id", "int"),
+        date_column("condition_start_date", False), datetime_column("condition_start_datetime"), date_column("condition_end_date"), datetime_column("condition_end_datetime"),
+        Column("condition_type_concept_id", "int"), Column("condition_type_concept_id_name", "category"), Column("condition_status_concept_id", "int"),
+        Column("stop_reason", "str"), Column("provider_id", "id"), Column("주치의명", "category"), Column("visit_occurrence_id", "id"),
+        Column("visit_detail_id", "id"), Column("condition_source_value", "str"), Column("진단명", "category"),
+        Column("condition_source_concept_id", "int"), Column("condition_status_source_value", "str"), Column("visit_source_key", "str"),
+        Column("환자구분", "category"), Column("진료과", "str"), Column("진료과명", "category"), Column("상병구분", "category")
+    ],
+    "drug_exposure": [
+        Column("drug_exposure_id", "id", False), Column("person_id", "id", False), Column("환자명", "category"), Column("drug_concept_id", "int"),
+        date_column("drug_exposure_start_date", False), datetime_column("drug_exposure_start_datetime"), date_column("drug_exposure_end_date"),
+        datetime_column("drug_exposure_end_datetime"), date_column("verbatim_end_date"), Column("drug_type_concept_id", "int"),
+        Column("drug_type_concept_id_name", "category"), Column("stop_reason", "str"), Column("refills", "int"), Column("quantity", "float"),
+        Column("days_supply", "int"), Column("sig", "str"), Column("route_concept_id", "int"), Column("lot_number", "str"),
+        Column("provider_id", "id"), Column("visit_occurrence_id", "id"), Column("visit_detail_id", "id"), Column("drug_source_value", "str"),
+        Column("drug_source_value_name", "category"), Column("drug_source_concept_id", "int"), Column("EDI코드", "str"),
+        Column("route_source_value", "str"), Column("dose_unit_source_value", "category"), Column("vocabulary_id", "category"),
+        Column("visit_source_key", "str"), Column("환자구분", "category"), Column("진료과", "str"), Column("진료과명", "category"),
+        Column("진료일시", "str"), Column("나이", "str"), Column("투여량", "str"), Column("함량단위", "category"), Column("횟수", "str"),
+        Column("일수", "str"), Column("용법코드", "str"), Column("처방순번", "str"), Column("ATC코드", "category"),
+        Column("ATC 코드명", "category"), Column("dcyn", "category")
+    ],
+    "measurement": [
+        Column("measurement_id", "id", False), Column("person_id", "id", False), Column("환자명", "category"),
+        Column("measurement_concept_id", "int"), date_column("measurement_date", False), datetime_column("measurement_datetime"),
+        Column("measurement_time", "time"), Column("measurement_type_concept_id", "int"),
+        Column("measurement_type_concept_id_name", "category"), Column("operator_concept_id", "int"),
+        Column("operator_concept_id_name", "category"), Column("value_as_number", "float"), Column("value_as_concept_id", "int"),
+        Column("value_as_concept_id_name", "category"), Column("unit_concept_id", "int"), Column("unit_concept_id_name", "category"),
+        Column("range_low", "float"), Column("range_high", "float"), Column("provider_id", "id"), Column("provider_name", "category"),
+        Column("visit_occurrence_id", "id"), Column("visit_detail_id", "id"), Column("measurement_source_value", "str"),
+        Column("measurement_source_value_name", "category"), Column("measurement_source_concept_id", "int"), Column("EDI코드", "str"),
+        Column("unit_source_value", "category"), Column("value_source_value", "str"), Column("vocabulary_id", "category"),
+        Column("visit_source_key", "str"), Column("처방코드", "str"), Column("처방명", "category"), Column("환자구분", "category"),
+        Column("진료과", "str"), Column("진료과명", "category"), Column("처방일", "str"), Column("진료일시", "str"),
+        Column("접수일시", "str"), Column("실시일시", "str"), Column("판독일시", "str"), Column("보고일시", "str"),
+        Column("처방순번", "str"), Column("정상치(상)", "str"), Column("정상치(하)", "str"), Column("결과내역", "str")
+    ],
+    "procedure_occurrence": [
+        Column("procedure_occurrence_id", "id", False), Column("person_id", "id", False), Column("환자명", "category"),
+        Column("procedure_concept_id", "int"), date_column("procedure_date", False), datetime_column("procedure_datetime"),
+        Column("procedure_date_type", "category"), Column("procedure_type_concept_id", "int"),
+        Column("procedure_type_concept_id_name", "category"), Column("modifier_concept_id", "int"), Column("quantity", "float"),
+        Column("provider_id", "id"), Column("처방의명", "category"), Column("visit_occurrence_id", "id"), Column("visit_detail_id", "id"),
+        Column("procedure_source_value", "str"), Column("procedure_source_value_name", "category"),
+        Column("procedure_source_concept_id", "int"), Column("EDI코드", "str"), Column("modifier_source_value", "str"),
+        Column("vocabulary_id", "category"), Column("visit_source_key", "str"), Column("처방코드", "str"), Column("처방명", "category"),
+        Column("환자구분", "category"), Column("진료과", "str"), Column("진료과명", "category"), Column("나이", "str"),
+        Column("처방일", "str"), Column("수술일", "str"), Column("진료일시", "str"), Column("접수일시", "str"), Column("실시일시", "str"),
+        Column("판독일시", "str"), Column("보고일시", "str"), Column("결과내역", "str"), Column("결론 및 진단", "str"), Column("결과단위", "str")
+    ],
+    "observation_period": [
+        Column("observation_period_id", "id", False), Column("person_id", "id", False),
+        date_column("observation_period_start_date", False), date_column("observation_period_end_date", False), Column("period_type_concept_id", "int")
+    ],
+    "concept_etc": [
+        Column("concept_id", "int", False), Column("concept_name", "category")
+    ]
+}
+
+# 변환 작업(테이블)별로 사용하는 CDM 테이블 컬럼 정의
+TABLE_SCHEMA = {
+    "measurement_diag": "measurement", "measurement_pth": "measurement", "measurement_vs": "measurement",
+    "measurement_ni": "measurement", "merge_measurement": "measurement",
+    "procedure_pacs": "procedure_occurrence", "procedure_baseorder": "procedure_occurrence",
+    "procedure_bldorder": "procedure_occurrence", "merge_procedure": "procedure_occurrence"
+}
+
+
+def get_schema(table):
+    """
+    테이블(변환 작업명 또는 CDM 테이블명)의 컬럼 정의를 반환합니다. 정의가 없으면 None을 반환합니다.
+    """
+    return CDM_SCHEMA.get(TABLE_SCHEMA.get(table, table))
+
+
+def schema_columns(table):
+    """
+    테이블의 컬럼명을 정의된 순서대로 반환합니다.
+    """
+    return [column.name for column in get_schema(table)]
+
+
+def build_frame(table, values, index):
+    """
+    values(컬럼명: 값)로 테이블 컬럼 순서의 DataFrame을 만듭니다. values에 없는 컬럼은 결측값으로 채웁니다.
+    """
+    columns = schema_columns(table)
+    unknown = [name for name in values if name not in columns]
+    if unknown:
+        raise ValueError(f"{table} 테이블에 정의되지 않은 컬럼입니다: {unknown}")
+    return pd.DataFrame({name: values.get(name) for name in columns}, index = index)
+
+
+def to_nullable_int(values):
+    """
+    id Series를 Int64 Series로 반환합니다.
+    63비트 고정 id가 float를 거치며 값이 바뀌지 않도록 결측값을 제외한 값을 int64로 직접 변환합니다.
+    """
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype("Int64")
+    converted = values.dropna().astype(str).str.replace(r"\.0$", "", regex = True).astype(np.int64)
+    return pd.Series(converted, dtype = "Int64").reindex(values.index)
+
+
+def to_datetime(values, format = None):
+    """
+    문자열 Series를 format으로 datetime으로 변환하며, 형식이 다른 값이 있으면 형식을 추론하여 변환합니다.
+    변환할 수 없는 값은 결측값(NaT)이 됩니다.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        return pd.to_datetime(values, format = format, cache = True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, errors = "coerce", cache = True)
+
+
+def convert_column(values, column):
+    """
+    컬럼 정의의 dtype으로 Series를 변환합니다.
+    """
+    if column.dtype in ("id", "int"):
+        return to_nullable_int(values)
+    if column.dtype == "float":
+        return pd.to_numeric(values).astype(float)
+    if column.dtype in ("date", "datetime"):
+        return to_datetime(values, column.format)
+    if column.dtype == "category":
+        return values.astype("category")
+    return values
+
+
+def apply_schema(df, table, strict = True):
+    """
+    df에 있는 컬럼을 테이블 컬럼 정의의 타입으로 변환한 복사본을 반환합니다.
+    strict가 False이면 category, str 컬럼은 그대로 두고, 변환할 수 없는 컬럼은 경고를 기록한 뒤 그대로 둡니다(저장 시 사용).
+    datetime 값이 들어 있는 str 컬럼(처방일 등)은 CSV로 저장할 때와 같은 문자열로 바꾸어 CSV, parquet 저장 결과를 맞춥니다.
+    """
+    schema = get_schema(table)
+    if schema is None:
+        return df
+
+    df = df.copy()
+    for column in schema:
+        if column.name in df.columns and column.dtype == "str" and pd.api.types.is_datetime64_any_dtype(df[column.name]):
+            df[column.name] = df[column.name].astype(str).where(df[column.name].notna())
+        if column.name not in df.columns or column.dtype in ("str", "time"):
+            continue
+        if not strict and column.dtype == "category":
+            continue
+        try:
+            df[column.name] = convert_column(df[column.name], column)
+        except (ValueError, TypeError) as e:
+            if strict:
+                raise
+            logging.warning(f"{table} 테이블 {column.name} 컬럼을 {column.dtype} 타입으로 변환할 수 없습니다: {e}")
+    return df
+
+
+def format_dates(df, table):
+    """
+    date, datetime 컬럼을 컬럼 정의의 format(date는 DATE_FORMAT, datetime은 DATETIME_FORMAT) 문자열로 바꾼 복사본을 반환합니다.
+    CSV로 저장할 때 값에 따라 시각이 빠지는 등 형식이 달라지지 않도록 사용하며, 결측값은 그대로 유지합니다.
+    """
+    schema = get_schema(table)
+    if schema is None:
+        return df
+
+    df = df.copy()
+    for column in schema:
+        if column.dtype in ("date", "datetime") and column.name in df.columns and pd.api.types.is_datetime64_any_dtype(df[column.name]):
+            df[column.name] = df[column.name].dt.strftime(column.format)
+    return df
+
+
+def validate_schema(df, table):
+    """
+    결측값이 없어야 하는 컬럼이 없거나 결측값이 있으면 경고를 기록하고, 정의되지 않은 컬럼명을 반환합니다.
+    """
+    schema = get_schema(table)
+    if schema is None:
+        return []
+
+    for column in schema:
+        if column.nullable:
+            continue
+        if column.name not in df.columns:
+            logging.warning(f"{table} 테이블에 {column.name} 컬럼이 없습니다.")
+        elif df[column.name].isna().any():
+            logging.warning(f"{table} 테이블 {column.name} 컬럼에 결측값이 {df[column.name].isna().sum()}건 있습니다.")
+
+    names = {column.name for column in schema}
+    return [name for name in df.columns if name not in names]
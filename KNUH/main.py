@@ -1,4 +1,5 @@
 from DataTransformer import *
+from pipeline import run_pipeline
 import logging
 
 
@@ -7,68 +8,14 @@ if __name__ == "__main__":
 
     start_time = datetime.now()
     try : 
-        care_site = CareSiteTransformer(config)    
-        care_site.transform()
+        # 로그 설정 및 최종 CSV 파일 생성용
+        transformer = DataTransformer(config)
 
-        provider = ProviderTransformer(config)    
-        provider.transform()
+        # 테이블 간 선행 관계에 따라 변환 실행(config.yaml의 pipeline 항목 참고)
+        run_pipeline(config)
 
-        person = PersonTransformer(config)    
-        person.transform()
-
-        visit_occurrence = VisitOccurrenceTransformer(config)    
-        visit_occurrence.transform()
-
-        visit_detail = VisitDetailTransformer(config)    
-        visit_detail.transform()
-
-        local_kcd = LocalKCDTransformer(config)    
-        local_kcd.transform()
-
-        condition_occurrence = ConditionOccurrenceTransformer(config)    
-        condition_occurrence.transform()
-
-        drug_edi = DrugEDITransformer(config)
-        drug_edi.transform()
-
-        drug_exposure = DrugexposureTransformer(config)    
-        drug_exposure.transform()
-
-        measurement_edi = MeasurementEDITransformer(config)    
-        measurement_edi.transform()
-
-        procedure_edi = ProcedureEDITransformer(config)
-        procedure_edi.transform()
-
-        measurement_diag = MeasurementDiagTransformer(config)
-        measurement_diag.transform()
-
-        measurement_pth = MeasurementpthTransformer(config)
-        measurement_pth.transform()
-
-        measurement_vs = MeasurementVSTransformer(config)
-        measurement_vs.transform()
-
-        measurement_ni = MeasurementNITransformer(config)
-        measurement_ni.transform()
-
-        merge_measurement = MergeMeasurementTransformer(config)
-        merge_measurement.transform()
-
-        procedure_pacs = ProcedurePACSTransformer(config)
-        procedure_pacs.transform()
-
-        ## procedure_baseorder = ProcedureBaseOrderTransformer(config)
-        ## procedure_baseorder.transform()
-
-        ## procedure_bldorder = ProcedureBldOrderTransformer(config)
-        ## procedure_bldorder.transform()
-
-        merge_procedure = MergeProcedureTransformer(config)
-        merge_procedure.transform()
-
-        observation_period = ObservationPeriodTransformer(config)
-        observation_period.transform()
+        # intermediate_format이 parquet인 경우 최종 CSV 파일 생성
+        transformer.publish_csv()
         
         # with open('main_qc.py', 'r', encoding="utf-8") as file:
         #     exec(file.read())
@@ -4,16 +4,11 @@ from QC.src import (table_measurement_diag_row_count, table_person_row_count, ta
                     table_condition_occurrence_row_count, table_drug_exposure_row_count,
                     table_measurement_vs_row_count,
                     #table_procedure_order_row_count, table_procedure_stexmrst_row_count,
-                    field_care_site_summary, field_provider_summary, field_person_summary,
-                    field_visit_occurrence_summary, #field_visit_detail_summary,
-                    field_condition_occurrence_summary, field_drug_exposure_summary,
-                    field_measurement_summary, field_procedure_occurrence_summary,
-                    field_observation_period_summary, field_local_edi_summary, field_drug_edi_summary,
-                    field_measurement_edi_summary, field_procedure_edi_summary
                     )
 from QC.src.dq_check import *
 from QC.src.metadata_check import *
 from QC.src.excel_util import get_sheet_row_count
+from QC.src.qc_runner import run_qc
 
 def load_config(config_path):
     with open(config_path, 'r', encoding="utf-8") as file:
@@ -29,6 +24,8 @@ if __name__ == "__main__":
     sheetname_field = config["sheet_field_summary"]
     sheetname_dq = config["sheet_dq"]
     sheetname_meta = config["sheet_meta"]
+    results_path = config.get("qc_results_path")
+    qc_max_workers = config.get("qc_max_workers", 1)
 
     ### table 품질 진단 ###
     # table_person_row_count.person_row_count(config, cdm_path, source_path, excel_path)
@@ -42,32 +39,10 @@ if __name__ == "__main__":
     # table_procedure_order_row_count.procedure_order_row_count(config, cdm_path, source_path, excel_path, config_path, sheetname)
     # table_procedure_stexmrst_row_count.procedure_stexmrst_row_count(config, cdm_path, source_path, excel_path, config_path, sheetname)
 
-    ### field 품질 진단 ###
-    field_care_site_summary.care_site_field_summary(cdm_path, excel_path, sheetname_field)
-    field_provider_summary.provider_field_summary(cdm_path, excel_path, sheetname_field)
-    field_person_summary.person_field_summary(cdm_path, excel_path, sheetname_field)
-    field_visit_occurrence_summary.visit_occurrence_field_summary(cdm_path, excel_path, sheetname_field)
-    # field_visit_detail_summary.visit_detail_field_summary(cdm_path, excel_path, sheetname_field)
-    field_condition_occurrence_summary.condition_occurrence_field_summary(cdm_path, excel_path, sheetname_field)
-    field_drug_exposure_summary.drug_exposure_field_summary(cdm_path, excel_path, sheetname_field)
-    field_measurement_summary.measurement_field_summary(cdm_path, excel_path, sheetname_field)
-    field_procedure_occurrence_summary.procedure_occurrence_field_summary(cdm_path, excel_path, sheetname_field)
-    field_observation_period_summary.observation_period_field_summary(cdm_path, excel_path, sheetname_field)
-    field_local_edi_summary.local_edi_field_summary(cdm_path, excel_path, sheetname_field)
-    field_drug_edi_summary.drug_edi_field_summary(cdm_path, excel_path, sheetname_field)
-    field_measurement_edi_summary.measurement_edi_field_summary(cdm_path, excel_path, sheetname_field)
-    field_procedure_edi_summary.procedure_edi_field_summary(cdm_path, excel_path, sheetname_field)
-
-    ### DQ 진단 ###
-    length = get_sheet_row_count(excel_path, sheetname_dq) - 1
-    for i in range(length):
-        func_name = f"DQ_{str(i+1).zfill(4)}"
-        func = globals()[func_name]
-        func(cdm_path, excel_path, sheetname_dq)
+    ### field, DQ 품질 진단 ###
+    # field 진단과 테이블별 DQ 진단을 qc_max_workers개 프로세스에서 동시에 실행하고, 결과는 품질진단지표.xlsx에 한 번 저장
+    run_qc(cdm_path, excel_path, sheetname_field, sheetname_dq, results_path, qc_max_workers)
 
     ### METADATA 진단 ###
     # length = get_sheet_row_count(excel_path, sheetname_meta) - 1
-    # for i in range(length):
-    #     func_name = f"META_{str(i+1).zfill(4)}"
-    #     func = globals()[func_name]
-    #     func(config, cdm_path, excel_path, sheetname_meta)
\ No newline at end of file
+    # run_metadata_checks(config, cdm_path, excel_path, sheetname_meta, META_RULES[:length])
\ No newline at end of file
@@ -0,0 +1,1067 @@
+"""
+config.yaml의 원천 파일명, 컬럼명과 synthetic 설정으로 KNUH EMR 원천 데이터 형식의 합성 데이터를 생성합니다.
+실제 환자 데이터 없이 변환(main.py)과 QC를 환자 수별(1만, 100만, 1000만 명 등)로 실행해 보기 위해 사용하며,
+환자를 batch_patients명씩 나누어 생성하고 파일에 이어 쓰므로 메모리 사용량은 전체 환자 수가 아니라 batch 크기에 비례합니다.
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import yaml
+
+SECONDS_PER_DAY = 86400
+# 코드 마스터의 첫 이력 시작일과 마지막 이력 종료일(변환 코드에서 종료일이 없을 때 사용하는 값과 같음)
+MASTER_START_DATE = "20000101"
+OPEN_END_DATE = "20991231"
+# 결과 보고일 등 data_range 이후의 날짜를 표현하기 위한 여유 일수
+CALENDAR_MARGIN_DAYS = 60
+# concept_id 2,000,000,000 이상은 OMOP CDM에서 기관 자체 concept에 사용하는 범위
+LOCAL_CONCEPT_ID = 2000000000
+PID_LENGTH = 8
+
+# 방문일 가중치: 감염병 유행 시기(여름~가을)와 평일(월~일)에 외래 방문이 많도록 설정
+SEASON_PEAK_DAY = 220
+SEASONAL_AMPLITUDE = 0.4
+WEEKDAY_WEIGHTS = [1.2, 1.0, 1.0, 1.0, 1.0, 0.5, 0.05]
+# 외래 진료 시각(시), 외래 진료 후 처방, 검사가 발생하는 기간(초)
+OUTPATIENT_HOUR = 11
+OUTPATIENT_HOUR_SD = 2.2
+OUTPATIENT_EVENT_SECONDS = 4 * 3600
+# 재입원 횟수 평균, 재원일수 중앙값(일)과 로그정규분포의 sigma, 최대 재원일수, 응급 입원 비율
+READMISSION_MEAN = 0.4
+LOS_MEDIAN = 5
+LOS_SIGMA = 0.8
+LOS_MAX = 90
+EMERGENCY_RATE = 0.2
+# 입원 시 재원일수 1일당 처방, 검사 건수 증가 비율
+INPATIENT_DAILY_FACTOR = 0.5
+# 입원당 전과, 전실 횟수 평균
+TRANSFER_MEAN = 0.4
+# 사망, 외국인, Rh- 비율
+DEATH_RATE = 0.01
+FOREIGNER_RATE = 0.01
+RH_NEGATIVE_RATE = 0.003
+# 확진이 아닌(rule out) 진단, 취소된 처방, 결과가 미확정인 검사, 판독문이 추가된 영상검사, 값이 없는 간호기록 비율
+RULE_OUT_RATE = 0.1
+CANCEL_RATE = 0.03
+UNCONFIRMED_RESULT_RATE = 0.03
+ADDENDUM_RATE = 0.05
+MISSING_RATE = 0.05
+# 의사 1명당 환자 수, 의사 수 범위
+PATIENTS_PER_DOCTOR = 200
+MIN_DOCTORS = 50
+MAX_DOCTORS = 5000
+# 환자 주소(우편번호 앞 3자리): 병원 지역, 인접 지역 비율과 인접 범위
+ZIP_MIN = 10
+ZIP_MAX = 639
+LOCAL_ZIP_RATE = 0.55
+NEAR_ZIP_RATE = 0.35
+NEAR_ZIP_RANGE = 10
+# 코드 이력이 바뀔 때 EDI 코드도 바뀌는 비율
+EDI_CHANGE_RATE = 0.5
+
+# 참조 파일(vocabulary 등)은 이미 있으면 덮어쓰지 않음
+REFERENCE_KEYS = ["location_data", "concept_unit", "concept_etc", "concept_kcd", "unit_concept_synonym"]
+
+SURNAMES = list("김이박최정강조윤장임한오서신권황안송류홍")
+GIVEN_SYLLABLES = list("민서준지현수영은도하예윤성재우진혜경정호")
+
+# 진료과 코드, 이름(앞쪽일수록 많이 사용)
+DEPARTMENTS = [
+    ("IMI", "감염내과"), ("IMG", "소화기내과"), ("IMC", "순환기내과"), ("IMP", "호흡기내과"), ("FM", "가정의학과"),
+    ("ER", "응급의학과"), ("IME", "내분비대사내과"), ("IMN", "신장내과"), ("GS", "외과"), ("OS", "정형외과"),
+    ("NR", "신경과"), ("PED", "소아청소년과"), ("OBGY", "산부인과"), ("DER", "피부과"), ("URO", "비뇨의학과"),
+    ("ENT", "이비인후과"), ("OPH", "안과"), ("PSY", "정신건강의학과"), ("RAD", "영상의학과"), ("LAB", "진단검사의학과"),
+    ("PATH", "병리과"), ("CTC", "임상시험센터")
+]
+WARDS = ["71W", "72W", "81W", "82W", "91W", "MICU"]
+INPATH_CODES = ["1", "2", "3"]
+DSCHTYPE_CODES = ["1", "2", "3", "4"]
+
+# 진단코드(KCD7, '.' 제외), 영문명, 한글명(앞쪽일수록 많이 사용)
+KCD_CODES = [
+    ("J069", "Acute upper respiratory infection, unspecified", "상세불명의 급성 상기도감염"),
+    ("I10", "Essential (primary) hypertension", "본태성(원발성) 고혈압"),
+    ("E119", "Type 2 diabetes mellitus without complications", "합병증을 동반하지 않은 2형 당뇨병"),
+    ("R509", "Fever, unspecified", "상세불명의 열"),
+    ("J189", "Pneumonia, unspecified", "상세불명의 폐렴"),
+    ("K297", "Gastritis, unspecified", "상세불명의 위염"),
+    ("E785", "Hyperlipidaemia, unspecified", "상세불명의 고지질혈증"),
+    ("M545", "Low back pain", "요통"),
+    ("N390", "Urinary tract infection, site not specified", "부위가 명시되지 않은 요로감염"),
+    ("A099", "Gastroenteritis and colitis of unspecified origin", "상세불명 기원의 위장염 및 결장염"),
+    ("B349", "Viral infection, unspecified", "상세불명의 바이러스감염"),
+    ("J209", "Acute bronchitis, unspecified", "상세불명의 급성 기관지염"),
+    ("K219", "Gastro-oesophageal reflux disease without oesophagitis", "식도염을 동반하지 않은 위-식도역류병"),
+    ("D696", "Thrombocytopenia, unspecified", "상세불명의 혈소판감소증"),
+    ("A419", "Sepsis, unspecified", "상세불명의 패혈증"),
+    ("N189", "Chronic kidney disease, unspecified", "상세불명의 만성 신장병"),
+    ("I259", "Chronic ischaemic heart disease, unspecified", "상세불명의 만성 허혈심장병"),
+    ("J449", "Chronic obstructive pulmonary disease, unspecified", "상세불명의 만성 폐쇄성 폐질환"),
+    ("A753", "Typhus fever due to Rickettsia tsutsugamushi", "쯔쯔가무시병"),
+    ("A9380", "Severe fever with thrombocytopenia syndrome", "중증열성혈소판감소증후군"),
+    ("A310", "Pulmonary mycobacterial infection", "폐 마이코박테리아 감염"),
+    ("U071", "COVID-19, virus identified", "코로나바이러스감염-19, 바이러스가 확인된 경우"),
+    ("R51", "Headache", "두통"),
+    ("R05", "Cough", "기침"),
+    ("J304", "Allergic rhinitis, unspecified", "상세불명의 알레르기비염"),
+    ("L309", "Dermatitis, unspecified", "상세불명의 피부염"),
+    ("G439", "Migraine, unspecified", "상세불명의 편두통"),
+    ("K590", "Constipation", "변비"),
+    ("F329", "Depressive episode, unspecified", "상세불명의 우울에피소드"),
+    ("Z000", "General medical examination", "일반 의학적 검사")
+]
+
+# 약품 성분명, ATC코드, ATC 코드명, 투여경로, 수량 단위, 함량(앞쪽일수록 많이 사용)
+DRUGS = [
+    ("Acetaminophen", "N02BE01", "paracetamol", "PO", "T", ["500mg", "650mg"]),
+    ("Normal saline", "B05BB01", "electrolytes", "IV", "B", ["1L", "100mL"]),
+    ("Pantoprazole", "A02BC02", "pantoprazole", "PO", "T", ["40mg"]),
+    ("Doxycycline", "J01AA02", "doxycycline", "PO", "C", ["100mg"]),
+    ("Ceftriaxone", "J01DD04", "ceftriaxone", "IV", "V", ["1g", "2g"]),
+    ("Amlodipine", "C08CA01", "amlodipine", "PO", "T", ["5mg", "10mg"]),
+    ("Metformin", "A10BA02", "metformin", "PO", "T", ["500mg", "1000mg"]),
+    ("Atorvastatin", "C10AA05", "atorvastatin", "PO", "T", ["10mg", "20mg"]),
+    ("Tramadol", "N02AX02", "tramadol", "PO", "C", ["50mg"]),
+    ("Azithromycin", "J01FA10", "azithromycin", "PO", "T", ["250mg"]),
+    ("Levofloxacin", "J01MA12", "levofloxacin", "IV", "V", ["500mg"]),
+    ("Piperacillin/tazobactam", "J01CR05", "piperacillin and beta-lactamase inhibitor", "IV", "V", ["4.5g"]),
+    ("Dexamethasone", "H02AB02", "dexamethasone", "IV", "A", ["5mg"]),
+    ("Furosemide", "C03CA01", "furosemide", "IV", "A", ["20mg"]),
+    ("Ondansetron", "A04AA01", "ondansetron", "IV", "A", ["4mg"]),
+    ("Enoxaparin", "B01AB05", "enoxaparin", "SC", "S", ["40mg"]),
+    ("Insulin glargine", "A10AE04", "insulin glargine", "SC", "U", ["100IU/mL"]),
+    ("Vancomycin", "J01XA01", "vancomycin", "IV", "V", ["1g"]),
+    ("Rifampicin", "J04AB02", "rifampicin", "PO", "C", ["300mg"]),
+    ("Isoniazid", "J04AC01", "isoniazid", "PO", "T", ["100mg"])
+]
+DRUG_QUANTITIES = ["1", "1", "1", "2", "0.5"]
+DRUG_TIMES = ["1", "2", "3"]
+DRUG_DAYS = ["1", "3", "5", "7", "14", "30"]
+
+# 진단검사 묶음 코드, 이름, 검체코드와 세부 검사(앞쪽일수록 많이 사용)
+# 수치 결과는 중앙값(median), 로그정규분포의 sigma로 생성하고, detection_limit보다 작은 값은 "<값"으로 기록
+# 정성 결과는 values 중 weights 비율로 생성
+LAB_PANELS = [
+    {"code": "L2001", "name": "CBC", "spccd": "B01", "items": [
+        {"code": "L200101", "name": "WBC", "unit": "10^3/uL", "low": 4.0, "high": 10.0, "median": 6.5, "sigma": 0.35, "decimals": 1},
+        {"code": "L200102", "name": "Hemoglobin", "unit": "g/dL", "low": 12.0, "high": 16.0, "median": 13.5, "sigma": 0.12, "decimals": 1},
+        {"code": "L200103", "name": "Hematocrit", "unit": "%", "low": 36.0, "high": 48.0, "median": 41.0, "sigma": 0.1, "decimals": 1},
+        {"code": "L200104", "name": "Platelet", "unit": "10^3/uL", "low": 150, "high": 400, "median": 230, "sigma": 0.35, "decimals": 0}]},
+    {"code": "L3001", "name": "Routine chemistry", "spccd": "S01", "items": [
+        {"code": "L300101", "name": "AST", "unit": "U/L", "low": 0, "high": 40, "median": 28, "sigma": 0.5, "decimals": 0},
+        {"code": "L300102", "name": "ALT", "unit": "U/L", "low": 0, "high": 40, "median": 25, "sigma": 0.6, "decimals": 0},
+        {"code": "L300103", "name": "BUN", "unit": "mg/dL", "low": 8, "high": 23, "median": 15, "sigma": 0.35, "decimals": 1},
+        {"code": "L300104", "name": "Creatinine", "unit": "mg/dL", "low": 0.6, "high": 1.2, "median": 0.9, "sigma": 0.3, "decimals": 2},
+        {"code": "L300105", "name": "Glucose", "unit": "mg/dL", "low": 70, "high": 110, "median": 105, "sigma": 0.25, "decimals": 0},
+        {"code": "L300106", "name": "LDH", "unit": "U/L", "low": 100, "high": 250, "median": 220, "sigma": 0.4, "decimals": 0}]},
+    {"code": "L3002", "name": "Electrolyte", "spccd": "S01", "items": [
+        {"code": "L300201", "name": "Sodium", "unit": "mmol/L", "low": 135, "high": 145, "median": 139, "sigma": 0.02, "decimals": 0},
+        {"code": "L300202", "name": "Potassium", "unit": "mmol/L", "low": 3.5, "high": 5.1, "median": 4.2, "sigma": 0.1, "decimals": 1},
+        {"code": "L300203", "name": "Chloride", "unit": "mmol/L", "low": 98, "high": 107, "median": 102, "sigma": 0.03, "decimals": 0}]},
+    {"code": "L3003", "name": "CRP", "spccd": "S01", "items": [
+        {"code": "L300301", "name": "CRP", "unit": "mg/dL", "low": 0, "high": 0.5, "median": 0.4, "sigma": 1.2, "decimals": 2,
+         "detection_limit": 0.03}]},
+    {"code": "L3004", "name": "Coagulation", "spccd": "P01", "items": [
+        {"code": "L300401", "name": "PT(INR)", "unit": "INR", "low": 0.8, "high": 1.2, "median": 1.0, "sigma": 0.12, "decimals": 2},
+        {"code": "L300402", "name": "aPTT", "unit": "sec", "low": 25, "high": 40, "median": 32, "sigma": 0.15, "decimals": 1}]},
+    {"code": "L5001", "name": "Urinalysis", "spccd": "U01", "items": [
+        {"code": "L500101", "name": "Urine protein", "values": ["Negative", "+", "++", "+++"], "weights": [0.8, 0.12, 0.06, 0.02]},
+        {"code": "L500102", "name": "Urine glucose", "values": ["Negative", "+", "++", "++++"], "weights": [0.88, 0.06, 0.04, 0.02]}]},
+    {"code": "L5002", "name": "SFTS virus RT-PCR", "spccd": "B02", "items": [
+        {"code": "L500201", "name": "SFTS virus RT-PCR", "values": ["Negative", "Positive"], "weights": [0.7, 0.3]}]}
+]
+
+# 원천 단위, unit concept_id, UCUM 코드, 단위명
+UNITS = [
+    ("10^3/uL", 8848, "10*3/uL", "thousand per microliter"),
+    ("g/dL", 8713, "g/dL", "gram per deciliter"),
+    ("%", 8554, "%", "percent"),
+    ("U/L", 8645, "U/L", "unit per liter"),
+    ("mg/dL", 8840, "mg/dL", "milligram per deciliter"),
+    ("mmol/L", 8753, "mmol/L", "millimole per liter"),
+    ("INR", 8523, "{ratio}", "ratio"),
+    ("sec", 8555, "s", "second")
+]
+
+# 영상검사, 병리검사 처방코드, 영문명, 한글명(앞쪽일수록 많이 사용)
+IMAGING_CODES = [
+    ("RG0101", "Chest PA", "흉부 단순촬영 PA"),
+    ("RG0102", "Chest AP (portable)", "흉부 이동형 단순촬영"),
+    ("RG0201", "Abdomen supine", "복부 단순촬영"),
+    ("RC0101", "CT Chest (contrast)", "흉부 CT 조영"),
+    ("RC0201", "CT Abdomen-Pelvis (contrast)", "복부골반 CT 조영"),
+    ("RU0101", "US Abdomen", "복부 초음파"),
+    ("RC0301", "CT Brain (non-contrast)", "뇌 CT 비조영"),
+    ("RM0101", "MRI Brain", "뇌 MRI")
+]
+PATHOLOGY_CODES = [
+    ("PS0101", "Biopsy, bone marrow", "골수 생검"),
+    ("PS0201", "Biopsy, skin", "피부 생검"),
+    ("PS0301", "Cytology, body fluid", "체액 세포검사")
+]
+IMAGING_CONCLUSIONS = ["No active lesion in chest.", "Pneumonia in both lower lobes.", "Mild hepatosplenomegaly.",
+                       "No significant interval change.", "Small amount of pleural effusion."]
+IMAGING_READTEXTS = ["특이 소견 없음.", "양측 하엽에 경결이 보임.", "경도의 간비종대 소견.", "이전 검사와 비교하여 변화 없음.", "소량의 흉수가 있음."]
+PATHOLOGY_RESULTS = ["Hypocellular marrow with hemophagocytosis.", "Normocellular marrow.",
+                     "Perivascular lymphocytic infiltration.", "Negative for malignant cells.", "Reactive mesothelial cells."]
+
+# 임상관찰기록 항목명, 평균, 표준편차, 소수점 자리수, 최소, 최대
+VITAL_ITEMS = [
+    ("체온", 36.8, 0.5, 1, 34.0, 41.5),
+    ("맥박", 82, 14, 0, 35, 180),
+    ("호흡수", 18, 3, 0, 8, 40),
+    ("수축기혈압", 124, 17, 0, 70, 220),
+    ("이완기혈압", 77, 11, 0, 35, 130),
+    ("산소포화도", 97.5, 1.8, 0, 75, 100)
+]
+# 간호정보조사 항목(measurement_ni 컬럼 설정 이름)별 평균, 표준편차, 소수점 자리수, 최소, 최대
+NURSING_ITEMS = {
+    "height": (164, 9, 1, 120, 200),
+    "weight": (64, 12, 1, 30, 150),
+    "sbp": (125, 18, 0, 70, 220),
+    "dbp": (78, 11, 0, 35, 130),
+    "pulse": (82, 14, 0, 35, 180),
+    "breth": (18, 3, 0, 8, 40),
+    "bdtp": (36.8, 0.5, 1, 34.0, 41.5),
+    "spo2": (97.5, 1.8, 0, 75, 100)
+}
+
+# 참조 concept: concept_id, concept_name, domain_id, vocabulary_id, concept_class_id
+CONCEPT_ETC = [
+    (44818518, "Visit derived from EHR record", "Type Concept", "Visit Type", "Visit Type"),
+    (44818519, "Clinical Study visit", "Type Concept", "Visit Type", "Visit Type"),
+    (44818702, "Lab result", "Type Concept", "Meas Type", "Meas Type"),
+    (38000177, "Prescription written", "Type Concept", "Drug Type", "Drug Type"),
+    (38000275, "EHR order list entry", "Type Concept", "Procedure Type", "Procedure Type"),
+    (4172704, ">", "Meas Value Operator", "SNOMED", "Qualifier Value"),
+    (4171755, ">=", "Meas Value Operator", "SNOMED", "Qualifier Value"),
+    (4172703, "=", "Meas Value Operator", "SNOMED", "Qualifier Value"),
+    (4171754, "<=", "Meas Value Operator", "SNOMED", "Qualifier Value"),
+    (4171756, "<", "Meas Value Operator", "SNOMED", "Qualifier Value"),
+    (4123508, "Positive +", "Meas Value", "SNOMED", "Qualifier Value"),
+    (4126673, "Positive ++", "Meas Value", "SNOMED", "Qualifier Value"),
+    (4125547, "Positive +++", "Meas Value", "SNOMED", "Qualifier Value"),
+    (4126674, "Positive ++++", "Meas Value", "SNOMED", "Qualifier Value"),
+    (9189, "Negative", "Meas Value", "LOINC", "Answer"),
+    (9191, "Positive", "Meas Value", "LOINC", "Answer")
+]
+CONCEPT_COLUMNS = ["concept_id", "concept_name", "domain_id", "vocabulary_id", "concept_class_id",
+                   "standard_concept", "concept_code", "valid_start_date", "valid_end_date", "invalid_reason"]
+
+
+def load_config(config_path):
+    """
+    YAML 설정 파일을 로드합니다.
+    """
+    with open(config_path, 'r', encoding="utf-8") as file:
+        return yaml.safe_load(file)
+
+
+def cumcount(groups):
+    """
+    같은 값끼리 모여 있는(정렬된) 배열에서 값별 순번(0부터)
+    """
+    starts = np.r_[0, np.flatnonzero(np.diff(groups)) + 1] if len(groups) else np.zeros(0, dtype=np.int64)
+    counts = np.diff(np.r_[starts, len(groups)])
+    return np.arange(len(groups)) - np.repeat(starts, counts)
+
+
+def format_numbers(values, decimals):
+    """
+    숫자 배열을 소수점 decimals자리 문자열로 변환
+    """
+    if decimals == 0:
+        return np.round(values).astype(np.int64).astype(str)
+    return np.char.mod(f"%.{decimals}f", values)
+
+
+class SyntheticSourceGenerator:
+    """
+    KNUH 원천 데이터 형식의 합성 데이터 생성
+    코드 마스터(부서, 진단용어, 약제, 검사, 수가, 처방)와 참조 파일을 먼저 만든 뒤 환자를 batch 단위로 생성합니다.
+    """
+    def __init__(self, config_path):
+        self.config = load_config(config_path)
+        self.settings = self.config.get("synthetic") or {}
+
+        self.output_path = self.settings.get("output_path")
+        if not self.output_path:
+            raise ValueError("config.yaml의 synthetic.output_path에 합성 데이터를 저장할 경로를 입력해주세요.")
+        self.patients = int(self.settings.get("patients", 10000))
+        self.batch_patients = int(self.settings.get("batch_patients", 100000))
+        self.seed = self.settings.get("seed", 0)
+        self.outpatient_visits = self.settings.get("outpatient_visits", 8)
+        self.visit_dispersion = self.settings.get("visit_dispersion", 0.5)
+        self.admission_rate = self.settings.get("admission_rate", 0.15)
+        self.condition_rate = self.settings.get("condition_rate", 0.9)
+        self.code_versions = int(self.settings.get("code_versions", 3))
+        self.code_skew = self.settings.get("code_skew", 1.1)
+        self.diagnoses_per_visit = self.settings.get("diagnoses_per_visit", 1.5)
+        self.drugs_per_visit = self.settings.get("drugs_per_visit", 2)
+        self.labs_per_visit = self.settings.get("labs_per_visit", 1.5)
+        self.imaging_rate = self.settings.get("imaging_rate", 0.1)
+        self.pathology_rate = self.settings.get("pathology_rate", 0.02)
+        self.vitals_per_day = int(self.settings.get("vitals_per_day", 3))
+
+        self.encoding = self.config["source_encoding"]
+        self.cdm_encoding = self.config["cdm_encoding"]
+        self.hospital = self.config["hospital"]
+        self.hospital_code = self.config["hospital_code"]
+        self.person_source_value = self.config["person_source_value"]
+        self.visit_no = self.config["visit_no"]
+        self.frstrgstdt = self.config["frstrgstdt"]
+        self.target_zip = self.config["target_zip"]
+        self.diag_condition = self.config.get("diag_condition")
+
+        self.rng = np.random.default_rng(self.seed)
+        self.zipf_cache = {}
+        self.counters = {}
+        self.row_counts = {}
+        self.edi_concepts = {}
+
+        # 날짜, 시각 문자열은 미리 만든 배열에서 index로 조회
+        self.calendar_start = pd.Timestamp(MASTER_START_DATE)
+        self.start_date = pd.Timestamp(self.settings.get("start_date", "2015-01-01"))
+        self.end_date = pd.Timestamp(self.config["data_range"])
+        calendar = pd.date_range(self.calendar_start, self.end_date + pd.Timedelta(days = CALENDAR_MARGIN_DAYS))
+        self.day_ymd = calendar.strftime("%Y%m%d").to_numpy(dtype = str)
+        self.day_iso = calendar.strftime("%Y-%m-%d").to_numpy(dtype = str)
+        self.time_hms = np.array([f"{s // 3600:02d}{s // 60 % 60:02d}{s % 60:02d}" for s in range(SECONDS_PER_DAY)])
+        self.time_iso = np.array([f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(SECONDS_PER_DAY)])
+        self.max_time = len(calendar) * SECONDS_PER_DAY - 1
+        self.first_day = (self.start_date - self.calendar_start).days
+        self.last_day = (self.end_date - self.calendar_start).days
+
+        window = calendar[self.first_day:self.last_day + 1]
+        season = 1 + SEASONAL_AMPLITUDE * np.cos(2 * np.pi * (window.dayofyear.to_numpy() - SEASON_PEAK_DAY) / 365.25)
+        outpatient = season * np.array(WEEKDAY_WEIGHTS)[window.dayofweek.to_numpy()]
+        self.outpatient_day_p = outpatient / outpatient.sum()
+        self.admission_day_p = season / season.sum()
+
+    def zipf_choice(self, count, size):
+        """
+        앞쪽 항목일수록 많이 선택되도록 순위의 code_skew 제곱에 반비례하는 확률로 0 ~ count-1 중 선택
+        """
+        if count not in self.zipf_cache:
+            weights = 1 / np.arange(1, count + 1) ** self.code_skew
+            self.zipf_cache[count] = weights / weights.sum()
+        return self.rng.choice(count, size, p = self.zipf_cache[count])
+
+    def next_ids(self, name, size):
+        """
+        batch가 바뀌어도 겹치지 않는 일련번호(처방번호, 바코드번호 등)
+        """
+        start = self.counters.get(name, 1)
+        self.counters[name] = start + size
+        return np.arange(start, start + size).astype(str)
+
+    def ymd(self, t):
+        return self.day_ymd[np.minimum(t, self.max_time) // SECONDS_PER_DAY]
+
+    def hms(self, t):
+        return self.time_hms[np.minimum(t, self.max_time) % SECONDS_PER_DAY]
+
+    def iso(self, t):
+        t = np.minimum(t, self.max_time)
+        return np.char.add(np.char.add(self.day_iso[t // SECONDS_PER_DAY], " "), self.time_iso[t % SECONDS_PER_DAY])
+
+    def make_names(self, size):
+        surname = np.array(SURNAMES)[self.zipf_choice(len(SURNAMES), size)]
+        return np.char.add(np.char.add(surname, self.rng.choice(GIVEN_SYLLABLES, size)), self.rng.choice(GIVEN_SYLLABLES, size))
+
+    def missing(self, values):
+        return np.where(self.rng.random(len(values)) < MISSING_RATE, "", values)
+
+    def normal_values(self, size, mean, sd, decimals, minimum, maximum):
+        return format_numbers(np.clip(self.rng.normal(mean, sd, size), minimum, maximum), decimals)
+
+    def check_output_path(self):
+        """
+        합성 데이터가 아닌 원천 데이터를 덮어쓰지 않도록, 참조 파일 외의 CSV 파일이 있는데 synthetic.json이 없는 경로에는 생성하지 않습니다.
+        """
+        os.makedirs(self.output_path, exist_ok = True)
+        references = {self.config[key] + ".csv" for key in REFERENCE_KEYS}
+        references.update({self.config["drug_edi"]["data"]["concept_data"] + ".csv", self.config["drug_edi"]["data"]["edi_atc"] + ".csv"})
+        source_files = [name for name in os.listdir(self.output_path) if name.endswith(".csv") and name not in references]
+        if source_files and not os.path.exists(os.path.join(self.output_path, "synthetic.json")):
+            raise ValueError(f"{self.output_path}에 합성 데이터가 아닌 CSV 파일이 있습니다. synthetic.output_path에 다른 경로를 입력해주세요.")
+
+    def write_marker(self, elapsed_seconds = None):
+        """
+        생성 설정과 파일별 row수를 output_path의 synthetic.json에 기록
+        """
+        marker = {"settings": self.settings, "data_range": self.config["data_range"], "diag_condition": self.diag_condition,
+                  "row_counts": self.row_counts, "elapsed_seconds": elapsed_seconds}
+        with open(os.path.join(self.output_path, "synthetic.json"), "w", encoding = "utf-8") as file:
+            json.dump(marker, file, ensure_ascii = False, indent = 2)
+
+    def write(self, file_name, df):
+        """
+        output_path에 file_name.csv로 저장. 실행 중 처음 쓰는 파일은 새로 만들고 이후 batch는 이어 씀
+        """
+        path = os.path.join(self.output_path, file_name + ".csv")
+        first = file_name not in self.row_counts
+        df.to_csv(path, mode = "w" if first else "a", header = first, index = False, encoding = self.encoding)
+        self.row_counts[file_name] = self.row_counts.get(file_name, 0) + len(df)
+
+    def write_reference(self, file_name, df):
+        """
+        참조 파일 저장. 실제 vocabulary 파일을 사용할 수 있도록 이미 있는 파일은 덮어쓰지 않음
+        """
+        path = os.path.join(self.output_path, file_name + ".csv")
+        if os.path.exists(path):
+            logging.info(f"{file_name}.csv 파일이 이미 있으므로 생성하지 않습니다.")
+            return
+        df.to_csv(path, index = False, encoding = self.cdm_encoding)
+
+    def make_versions(self, codes):
+        """
+        코드별로 1 ~ code_versions개의 사용기간 이력 생성
+        첫 이력은 MASTER_START_DATE부터, 다음 이력은 start_date ~ data_range 사이의 변경일부터 시작하며
+        이전 이력은 변경일 전날 종료, 마지막 이력의 종료일은 OPEN_END_DATE
+        """
+        span = (self.end_date - self.start_date).days
+        rows = []
+        for code in codes:
+            count = int(self.rng.integers(1, self.code_versions + 1))
+            changes = np.sort(self.rng.choice(np.arange(1, span), count - 1, replace = False))
+            starts = [self.calendar_start] + [self.start_date + pd.Timedelta(days = int(change)) for change in changes]
+            for version, start in enumerate(starts):
+                is_last = version == len(starts) - 1
+                end = OPEN_END_DATE if is_last else (starts[version + 1] - pd.Timedelta(days = 1)).strftime("%Y%m%d")
+                rows.append((code, version, start.strftime("%Y%m%d"), end, is_last))
+        return pd.DataFrame(rows, columns = ["code", "version", "fromdate", "todate", "is_last"])
+
+    def new_edi(self, prefix, digits, name, domain, vocabulary):
+        """
+        겹치지 않는 EDI 코드를 만들고 concept 파일에 추가할 정보 기록
+        """
+        while True:
+            code = prefix + str(self.rng.integers(0, 10 ** digits)).zfill(digits)
+            if code not in self.edi_concepts:
+                self.edi_concepts[code] = (name, domain, vocabulary)
+                return code
+
+    def assign_edi(self, versions, names, prefix, digits, domain, vocabulary):
+        """
+        코드 이력별 EDI 코드. 이력이 바뀔 때 EDI_CHANGE_RATE 비율로 새 EDI 코드 부여
+        """
+        edi = []
+        for code, version in zip(versions["code"], versions["version"]):
+            if version == 0 or self.rng.random() < EDI_CHANGE_RATE:
+                current = self.new_edi(prefix, digits, names[code], domain, vocabulary)
+            edi.append(current)
+        return edi
+
+    def make_masters(self):
+        """
+        코드 마스터와 참조 파일 생성
+        """
+        # 부서코드마스터(care_site): 진료과명이 바뀐 이력 포함
+        care_site = self.config["care_site"]["columns"]
+        versions = self.make_versions([code for code, _ in DEPARTMENTS])
+        name = versions["code"].map(dict(DEPARTMENTS))
+        self.write(self.config["care_site"]["data"]["source_data"], pd.DataFrame({
+            care_site["care_site_source_value"]: versions["code"],
+            care_site["care_site_name"]: name.where(versions["is_last"], name + "(구)"),
+            care_site["place_of_service_source_value"]: self.hospital_code,
+            self.config["care_site_fromdate"]: versions["fromdate"],
+            self.config["care_site_todate"]: versions["todate"]}))
+
+        # 사원정보마스터(provider): 진료과마다 의사가 1명 이상 있도록 배정
+        doctors = int(np.clip(self.patients // PATIENTS_PER_DOCTOR, MIN_DOCTORS, MAX_DOCTORS))
+        doctor_dept = np.r_[np.arange(len(DEPARTMENTS)), self.zipf_choice(len(DEPARTMENTS), doctors - len(DEPARTMENTS))]
+        self.doctor_ids = np.arange(100001, 100001 + doctors).astype(str)
+        self.doctor_dept = np.array([code for code, _ in DEPARTMENTS])[doctor_dept]
+        self.nurse_ids = np.arange(300001, 300001 + doctors).astype(str)
+        provider = self.config["provider"]["columns"]
+        self.write(self.config["provider"]["data"]["source_data"], pd.DataFrame({
+            provider["provider_name"]: self.make_names(2 * doctors),
+            provider["provider_source_value"]: np.r_[self.doctor_ids, self.nurse_ids],
+            provider["specialty_source_value"]: np.repeat(["01", "03"], doctors),
+            provider["gender_source_value"]: self.rng.choice(["M", "F"], 2 * doctors),
+            provider["care_site_source_value"]: np.r_[self.doctor_dept, self.rng.choice(WARDS, doctors)]}))
+
+        # 진단용어(local_kcd): 대상 상병(diag_condition)은 무작위 진단에서 제외하고 대상 환자에게만 부여
+        kcd_codes = list(KCD_CODES)
+        if self.diag_condition and self.diag_condition not in [code for code, _, _ in kcd_codes]:
+            kcd_codes.append((self.diag_condition, self.diag_condition, self.diag_condition))
+        self.kcd_codes = np.array([code for code, _, _ in kcd_codes
+                                   if not (self.diag_condition and code.startswith(self.diag_condition))])
+        local_kcd = self.config["local_kcd"]["columns"]
+        versions = self.make_versions([code for code, _, _ in kcd_codes])
+        self.write(self.config["local_kcd"]["data"]["source"], pd.DataFrame({
+            local_kcd["diagcode"]: versions["code"],
+            local_kcd["fromdate"]: versions["fromdate"],
+            local_kcd["todate"]: versions["todate"],
+            local_kcd["engname"]: versions["code"].map({code: eng for code, eng, _ in kcd_codes}),
+            local_kcd["korname"]: versions["code"].map({code: kor for code, _, kor in kcd_codes}),
+            self.hospital: self.hospital_code}))
+        self.write_reference(self.config["concept_kcd"], pd.DataFrame({
+            "concept_id": LOCAL_CONCEPT_ID + np.arange(len(kcd_codes)),
+            "concept_name": [eng for _, eng, _ in kcd_codes],
+            "domain_id": "Condition", "vocabulary_id": "KCD7", "concept_class_id": "KCD7 code", "standard_concept": "",
+            "concept_code": [code[:3] + "." + code[3:] if len(code) > 3 else code for code, _, _ in kcd_codes],
+            "valid_start_date": "2000-01-01", "valid_end_date": "2099-12-31", "invalid_reason": ""}, columns = CONCEPT_COLUMNS))
+
+        # 약제마스터(drug_edi): 이력이 바뀔 때 EDI 코드가 바뀔 수 있음
+        drug_edi = self.config["drug_edi"]["columns"]
+        drug_names, drug_atc = {}, {}
+        for ingredient, atc, atc_name, route, unit, strengths in DRUGS:
+            for strength in strengths:
+                code = f"DR{len(drug_names) + 1:05d}"
+                drug_names[code] = f"{ingredient} {strength}"
+                drug_atc[code] = (atc, atc_name, route, unit)
+        self.drug_codes = np.array(list(drug_names))
+        self.drug_routes = np.array([drug_atc[code][2] for code in self.drug_codes])
+        self.drug_units = np.array([drug_atc[code][3] for code in self.drug_codes])
+        versions = self.make_versions(self.drug_codes)
+        versions["edi"] = self.assign_edi(versions, drug_names, "6", 8, "Drug", "KDC")
+        self.write(self.config["drug_edi"]["data"]["order_data"], pd.DataFrame({
+            drug_edi["ordercode"]: versions["code"],
+            drug_edi["edicode"]: versions["edi"],
+            drug_edi["fromdate"]: versions["fromdate"],
+            drug_edi["todate"]: versions["todate"],
+            self.config["drug_exposure"]["columns"]["drug_source_value_name"]: versions["code"].map(drug_names)}))
+        atc = versions.drop_duplicates("edi")
+        self.write_reference(self.config["drug_edi"]["data"]["edi_atc"], pd.DataFrame({
+            drug_edi["standard_code"]: "880" + atc["edi"] + "0",
+            drug_edi["atccode"]: atc["code"].map(lambda code: drug_atc[code][0]),
+            drug_edi["atcname"]: atc["code"].map(lambda code: drug_atc[code][1]),
+            drug_edi["edi_fromdate"]: atc["fromdate"],
+            drug_edi["edi_todate"]: ""}))
+
+        # 검체검사 마스터: 묶음 코드와 세부 검사 코드(검사결과의 TESTCD)
+        measurement_edi = self.config["measurement_edi"]["columns"]
+        spccd = self.config["measurement_diag"]["columns"]["spccd"]
+        self.lab_items = []
+        lab_rows = []
+        self.panel_item_start, self.panel_item_count = [], []
+        for panel in LAB_PANELS:
+            lab_rows.append((panel["code"], panel["name"], panel["spccd"]))
+            self.panel_item_start.append(len(self.lab_items))
+            self.panel_item_count.append(len(panel["items"]))
+            for item in panel["items"]:
+                lab_rows.append((item["code"], item["name"], panel["spccd"]))
+                self.lab_items.append(item)
+        self.panel_item_start = np.array(self.panel_item_start)
+        self.panel_item_count = np.array(self.panel_item_count)
+        self.panel_codes = np.array([panel["code"] for panel in LAB_PANELS])
+        self.panel_names = np.array([panel["name"] for panel in LAB_PANELS])
+        self.panel_spccd = np.array([panel["spccd"] for panel in LAB_PANELS])
+        self.panel_unit = np.array([panel["items"][0].get("unit", "") for panel in LAB_PANELS])
+        self.write(self.config["measurement_edi"]["data"]["order_data"], pd.DataFrame({
+            measurement_edi["ordercode"]: [code for code, _, _ in lab_rows],
+            measurement_edi["tclsnm"]: [name for _, name, _ in lab_rows],
+            spccd: [spc for _, _, spc in lab_rows],
+            measurement_edi["order_fromdate"]: MASTER_START_DATE,
+            measurement_edi["order_todate"]: OPEN_END_DATE,
+            self.hospital: self.hospital_code}))
+
+        # 수가마스터: 검사, 영상, 병리 코드의 EDI 코드 이력
+        # 처방마스터: 영상, 병리 코드. 처방코드의 사용기간이 수가코드 사용기간에 포함되도록 같은 이력 사용
+        self.imaging_codes = np.array([code for code, _, _ in IMAGING_CODES])
+        self.imaging_names = np.array([name for _, name, _ in IMAGING_CODES])
+        self.pathology_codes = np.array([code for code, _, _ in PATHOLOGY_CODES])
+        self.pathology_names = np.array([name for _, name, _ in PATHOLOGY_CODES])
+        lab_names = {code: name for code, name, _ in lab_rows}
+        procedure_names = {code: name for code, name, _ in IMAGING_CODES + PATHOLOGY_CODES}
+        korean_names = {code: kor for code, _, kor in IMAGING_CODES + PATHOLOGY_CODES}
+        lab_versions = self.make_versions(list(lab_names))
+        lab_versions["edi"] = self.assign_edi(lab_versions, lab_names, "D", 4, "Measurement", "EDI")
+        imaging_versions = self.make_versions(self.imaging_codes)
+        imaging_versions["edi"] = self.assign_edi(imaging_versions, procedure_names, "G", 4, "Procedure", "EDI")
+        pathology_versions = self.make_versions(self.pathology_codes)
+        pathology_versions["edi"] = self.assign_edi(pathology_versions, procedure_names, "C", 4, "Procedure", "EDI")
+        procedure_versions = pd.concat([imaging_versions, pathology_versions], ignore_index = True)
+        suga_versions = pd.concat([lab_versions, procedure_versions], ignore_index = True)
+        names = {**lab_names, **procedure_names}
+        procedure_edi = self.config["procedure_edi"]["columns"]
+        self.write(self.config["measurement_edi"]["data"]["edi_data"], pd.DataFrame({
+            measurement_edi["sugacode"]: suga_versions["code"],
+            self.hospital: self.hospital_code,
+            measurement_edi["edicode"]: suga_versions["edi"],
+            measurement_edi["fromdd"]: suga_versions["fromdate"],
+            measurement_edi["todd"]: suga_versions["todate"],
+            measurement_edi["ordnm"]: suga_versions["code"].map(names),
+            self.config["local_edi"]["columns"]["engnm"]: suga_versions["code"].map(names)}))
+        self.write(self.config["procedure_edi"]["data"]["order_data"], pd.DataFrame({
+            procedure_edi["ordercode"]: procedure_versions["code"],
+            self.hospital: self.hospital_code,
+            procedure_edi["fromdd"]: procedure_versions["fromdate"],
+            procedure_edi["todd"]: procedure_versions["todate"],
+            "PRCPNM": procedure_versions["code"].map(procedure_names),
+            "PRCPHNGNM": procedure_versions["code"].map(korean_names)}))
+
+        # EDI, KDC concept
+        edi_codes = list(self.edi_concepts)
+        self.write_reference(self.config["drug_edi"]["data"]["concept_data"], pd.DataFrame({
+            "concept_id": LOCAL_CONCEPT_ID + 100000 + np.arange(len(edi_codes)),
+            "concept_name": [self.edi_concepts[code][0] for code in edi_codes],
+            "domain_id": [self.edi_concepts[code][1] for code in edi_codes],
+            "vocabulary_id": [self.edi_concepts[code][2] for code in edi_codes],
+            "concept_class_id": [self.edi_concepts[code][1] for code in edi_codes],
+            "standard_concept": "",
+            "concept_code": edi_codes,
+            "valid_start_date": "2000-01-01", "valid_end_date": "2099-12-31", "invalid_reason": ""}, columns = CONCEPT_COLUMNS))
+
+        # 단위, 단위 동의어, type concept 등 참조 파일
+        self.write_reference(self.config["concept_unit"], pd.DataFrame({
+            "concept_id": [concept_id for _, concept_id, _, _ in UNITS],
+            "concept_name": [name for _, _, _, name in UNITS],
+            "domain_id": "Unit", "vocabulary_id": "UCUM", "concept_class_id": "Unit", "standard_concept": "S",
+            "concept_code": [ucum for _, _, ucum, _ in UNITS],
+            "valid_start_date": "1970-01-01", "valid_end_date": "2099-12-31", "invalid_reason": ""}, columns = CONCEPT_COLUMNS))
+        # measurement 변환에서 동의어로 찾은 단위의 concept_name(concept_name_synonym)도 사용
+        self.write_reference(self.config["unit_concept_synonym"], pd.DataFrame(
+            [(concept_id, unit, name) for unit, concept_id, ucum, name in UNITS if unit != ucum],
+            columns = ["concept_id", "concept_synonym_name", "concept_name"]))
+        self.write_reference(self.config["concept_etc"], pd.DataFrame({
+            "concept_id": [row[0] for row in CONCEPT_ETC],
+            "concept_name": [row[1] for row in CONCEPT_ETC],
+            "domain_id": [row[2] for row in CONCEPT_ETC],
+            "vocabulary_id": [row[3] for row in CONCEPT_ETC],
+            "concept_class_id": [row[4] for row in CONCEPT_ETC],
+            "standard_concept": "S", "concept_code": "",
+            "valid_start_date": "1970-01-01", "valid_end_date": "2099-12-31", "invalid_reason": ""}, columns = CONCEPT_COLUMNS))
+
+        # location: 우편번호 앞 3자리별 1행
+        self.zip_codes = np.array([str(code).zfill(3) for code in range(ZIP_MIN, ZIP_MAX + 1)])
+        if self.target_zip not in self.zip_codes:
+            self.zip_codes = np.r_[self.zip_codes, [self.target_zip]]
+        self.write_reference(self.config["location_data"], pd.DataFrame({
+            "LOCATION_ID": np.arange(1, len(self.zip_codes) + 1),
+            "ZIP": self.zip_codes,
+            self.config["care_site"]["columns"]["location_source_value"]: self.zip_codes}))
+
+    def make_visits(self, size):
+        """
+        환자별 외래(음이항분포로 일부 환자에게 방문이 몰림), 입원 방문 생성
+        환자, 방문 시점 순으로 정렬하고 환자별 순번을 수진번호(CRETNO)로 사용
+        """
+        r = self.visit_dispersion
+        outpatient_count = np.maximum(self.rng.negative_binomial(r, r / (r + self.outpatient_visits), size), 1)
+        admission_count = self.rng.binomial(1, self.admission_rate, size) * (1 + self.rng.poisson(READMISSION_MEAN, size))
+        n_outpatient, n_admission = int(outpatient_count.sum()), int(admission_count.sum())
+
+        patient = np.r_[np.repeat(np.arange(size), outpatient_count), np.repeat(np.arange(size), admission_count)]
+        inpatient = np.r_[np.zeros(n_outpatient, dtype = bool), np.ones(n_admission, dtype = bool)]
+        day = np.r_[self.rng.choice(len(self.outpatient_day_p), n_outpatient, p = self.outpatient_day_p),
+                    self.rng.choice(len(self.admission_day_p), n_admission, p = self.admission_day_p)] + self.first_day
+        second = np.r_[np.clip(self.rng.normal(OUTPATIENT_HOUR * 3600, OUTPATIENT_HOUR_SD * 3600, n_outpatient), 8 * 3600, 18 * 3600 - 1),
+                       self.rng.integers(0, SECONDS_PER_DAY, n_admission)].astype(np.int64)
+        time = day.astype(np.int64) * SECONDS_PER_DAY + second
+
+        # 재원일수는 로그정규분포, 퇴원일은 data_range 이후가 되지 않도록 조정
+        los = np.clip(np.round(self.rng.lognormal(np.log(LOS_MEDIAN), LOS_SIGMA, len(day))), 1, LOS_MAX).astype(np.int64)
+        los = np.where(inpatient, np.minimum(day + los, self.last_day) - day, 0)
+        discharge = (day + los).astype(np.int64) * SECONDS_PER_DAY + self.rng.integers(9 * 3600, 16 * 3600, len(day))
+        end = np.where(inpatient, np.maximum(discharge, time + 3600), time + OUTPATIENT_EVENT_SECONDS)
+
+        order = np.lexsort((time, patient))
+        visit = {"patient": patient[order], "inpatient": inpatient[order], "day": day[order], "time": time[order],
+                 "end": end[order], "los": los[order]}
+        visit["cretno"] = (cumcount(visit["patient"]) + 1).astype(str)
+        visit["doctor"] = self.zipf_choice(len(self.doctor_ids), len(order))
+        visit["dept"] = self.doctor_dept[visit["doctor"]]
+        return visit
+
+    def expand(self, visit, rate):
+        """
+        방문별 발생 건수를 평균 rate(입원은 재원일수에 비례하여 증가)인 포아송 분포로 정하고 건별 방문 index 반환
+        """
+        counts = self.rng.poisson(rate * (1 + visit["los"] * INPATIENT_DAILY_FACTOR))
+        return np.repeat(np.arange(len(counts)), counts)
+
+    def event_time(self, visit, index):
+        """
+        방문 중 발생 시점. 외래는 진료 후 OUTPATIENT_EVENT_SECONDS 이내, 입원은 재원 기간 중 임의 시점
+        """
+        start = visit["time"][index]
+        return start + (self.rng.random(len(index)) * (visit["end"][index] - start)).astype(np.int64)
+
+    def make_orders(self, visit, pid, index, order_time, code, name, order_class):
+        """
+        검사처방(02) 행 생성. CANCEL_RATE 비율은 취소된 처방(PRCPHISTCD가 O가 아님)
+        """
+        columns = self.config["measurement_diag"]["columns"]
+        count = len(index)
+        return pd.DataFrame({
+            self.hospital: self.hospital_code,
+            columns["orddate"]: self.ymd(order_time),
+            self.person_source_value: pid[visit["patient"][index]],
+            "PRCPHISTNO": "1",
+            columns["orddd"]: self.day_ymd[visit["day"][index]],
+            self.visit_no: visit["cretno"][index],
+            "PRCPCLSCD": order_class,
+            "LASTUPDTDT": self.iso(order_time),
+            columns["provider"]: self.doctor_ids[visit["doctor"][index]],
+            "PRCPNM": name,
+            "PRCPCD": code,
+            "PRCPHISTCD": np.where(self.rng.random(count) < CANCEL_RATE, "X", "O"),
+            "PRCPNO": self.next_ids("PRCPNO", count),
+            columns["meddept"]: visit["dept"][index],
+            self.frstrgstdt: self.iso(order_time)})
+
+    def make_executions(self, orders, order_time, unit):
+        """
+        처방상세(28) 행 생성
+        """
+        columns = self.config["measurement_diag"]["columns"]
+        exec_time = order_time + self.rng.integers(600, 7200, len(order_time))
+        return pd.DataFrame({
+            self.hospital: self.hospital_code,
+            columns["orddate"]: orders[columns["orddate"]].to_numpy(),
+            "PRCPNO": orders["PRCPNO"].to_numpy(),
+            "PRCPHISTNO": orders["PRCPHISTNO"].to_numpy(),
+            "EXECPRCPUNIQNO": self.next_ids("EXECPRCPUNIQNO", len(order_time)),
+            columns["orddd"]: orders[columns["orddd"]].to_numpy(),
+            "EXECDD": self.ymd(exec_time),
+            "EXECTM": self.hms(exec_time),
+            columns["unit_source_value"]: unit}), exec_time
+
+    def lab_values(self, item, size):
+        """
+        검사결과 값. 수치 결과는 로그정규분포로 생성하여 참고치를 벗어난 값이 한쪽으로 치우치도록 함
+        """
+        if "values" in item:
+            weights = np.array(item["weights"])
+            return self.rng.choice(item["values"], size, p = weights / weights.sum())
+        values = self.rng.lognormal(np.log(item["median"]), item["sigma"], size)
+        text = format_numbers(values, item["decimals"])
+        if "detection_limit" in item:
+            text = np.where(values < item["detection_limit"], "<" + str(item["detection_limit"]), text)
+        return text
+
+    def make_lab(self, visit, pid):
+        """
+        진단검사 처방(02), 처방상세(28), 검체 접수(25), 검사결과(11)
+        """
+        columns = self.config["measurement_diag"]["columns"]
+        index = self.expand(visit, self.labs_per_visit)
+        panel = self.zipf_choice(len(LAB_PANELS), len(index))
+        order_time = self.event_time(visit, index)
+        orders = self.make_orders(visit, pid, index, order_time, self.panel_codes[panel], self.panel_names[panel], "L")
+
+        done = orders["PRCPHISTCD"].to_numpy() == "O"
+        panel = panel[done]
+        executions, exec_time = self.make_executions(orders[done], order_time[done], self.panel_unit[panel])
+
+        barcode = self.next_ids("BCNO", len(panel))
+        specimens = pd.DataFrame({
+            self.hospital: self.hospital_code,
+            columns["orddate"]: executions[columns["orddate"]].to_numpy(),
+            "EXECPRCPUNIQNO": executions["EXECPRCPUNIQNO"].to_numpy(),
+            "BCNO": barcode,
+            columns["ordcode"]: self.panel_codes[panel],
+            columns["spccd"]: self.panel_spccd[panel],
+            columns["orddd"]: executions[columns["orddd"]].to_numpy()})
+
+        # 묶음 검사별 세부 검사 결과
+        row = np.repeat(np.arange(len(panel)), self.panel_item_count[panel])
+        item = self.panel_item_start[panel][row] + cumcount(row)
+        values = np.empty(len(item), dtype = object)
+        for number in np.unique(item):
+            mask = item == number
+            values[mask] = self.lab_values(self.lab_items[number], int(mask.sum()))
+        accept_time = exec_time[row] + self.rng.integers(300, 3600, len(row))
+        report_time = accept_time + self.rng.integers(1800, 6 * 3600, len(row))
+        low = np.array([format_numbers(np.array([lab_item["low"]]), lab_item["decimals"])[0] if "low" in lab_item else "" for lab_item in self.lab_items])
+        high = np.array([format_numbers(np.array([lab_item["high"]]), lab_item["decimals"])[0] if "high" in lab_item else "" for lab_item in self.lab_items])
+        results = pd.DataFrame({
+            self.hospital: self.hospital_code,
+            "BCNO": barcode[row],
+            columns["ordcode"]: self.panel_codes[panel][row],
+            columns["spccd"]: self.panel_spccd[panel][row],
+            "RSLTFLAG": "O",
+            columns["measurement_source_value"]: np.array([lab_item["code"] for lab_item in self.lab_items])[item],
+            columns["measurement_date"]: self.iso(accept_time),
+            columns["range_low"]: low[item],
+            columns["range_high"]: high[item],
+            columns["value_source_value"]: values,
+            "RSLTSTAT": np.where(self.rng.random(len(row)) < UNCONFIRMED_RESULT_RATE, "3", self.rng.choice(["4", "5"], len(row), p = [0.1, 0.9])),
+            "LASTREPTDT": self.iso(report_time),
+            self.frstrgstdt: self.iso(accept_time),
+            columns["unit_source_value"]: np.array([lab_item.get("unit", "") for lab_item in self.lab_items])[item]})
+        return orders, executions, specimens, results
+
+    def make_imaging(self, visit, pid):
+        """
+        영상검사 처방(02), 처방상세(28), 영상검사결과(09). ADDENDUM_RATE 비율은 판독문이 한 번 더 기록됨
+        """
+        index = self.expand(visit, self.imaging_rate)
+        code = self.zipf_choice(len(self.imaging_codes), len(index))
+        order_time = self.event_time(visit, index)
+        orders = self.make_orders(visit, pid, index, order_time, self.imaging_codes[code], self.imaging_names[code], "R")
+
+        done = orders["PRCPHISTCD"].to_numpy() == "O"
+        executions, exec_time = self.make_executions(orders[done], order_time[done], "")
+
+        report = np.r_[np.arange(len(exec_time)), np.flatnonzero(self.rng.random(len(exec_time)) < ADDENDUM_RATE)]
+        confirm_time = exec_time[report] + self.rng.integers(1800, 2 * SECONDS_PER_DAY, len(report))
+        procedure_pacs = self.config["procedure_pacs"]["columns"]
+        reports = pd.DataFrame({
+            "PATID": orders[self.person_source_value].to_numpy()[done][report],
+            "HISORDERID": np.char.add(executions["PRCPDD"].to_numpy().astype(str), executions["EXECPRCPUNIQNO"].to_numpy().astype(str))[report],
+            "QUEUEID": self.next_ids("QUEUEID", len(report)),
+            "CONFDATE": self.ymd(confirm_time),
+            "CONFTIME": self.hms(confirm_time),
+            procedure_pacs["conclusion"]: self.rng.choice(IMAGING_CONCLUSIONS, len(report)),
+            procedure_pacs["readtext"]: self.rng.choice(IMAGING_READTEXTS, len(report))})
+        return orders, executions, reports
+
+    def make_pathology(self, visit, pid):
+        """
+        병리검사 처방(02), 병리접수(26), 병리검사결과(03), 병리검사결과내용(04)
+        """
+        columns = self.config["measurement_pth"]["columns"]
+        index = self.expand(visit, self.pathology_rate)
+        code = self.zipf_choice(len(self.pathology_codes), len(index))
+        order_time = self.event_time(visit, index)
+        orders = self.make_orders(visit, pid, index, order_time, self.pathology_codes[code], self.pathology_names[code], "P")
+
+        done = orders["PRCPHISTCD"].to_numpy() == "O"
+        count = int(done.sum())
+        accept_time = order_time[done] + self.rng.integers(3600, SECONDS_PER_DAY, count)
+        gross_time = accept_time + self.rng.integers(3600, SECONDS_PER_DAY, count)
+        read_time = accept_time + self.rng.integers(2 * SECONDS_PER_DAY, 7 * SECONDS_PER_DAY, count)
+        ptno = np.char.add("S", np.char.zfill(self.next_ids("PTNO", count), 9))
+        status = self.rng.choice(["4", "3", "1"], count, p = [0.9, 0.08, 0.02])
+        accepts = pd.DataFrame({
+            self.hospital: self.hospital_code,
+            "PTNO": ptno,
+            columns["orddate"]: orders[columns["orddate"]].to_numpy()[done],
+            "PRCPNO": orders["PRCPNO"].to_numpy()[done],
+            "ACPTSTATCD": status,
+            columns["measurement_source_value"]: self.pathology_codes[code][done],
+            "SPCCD": "T01",
+            "READDD": self.ymd(read_time),
+            "READTM": self.hms(read_time),
+            "ACPTDD": self.ymd(accept_time),
+            "ACPTTM": self.hms(accept_time)})
+
+        # 접수 상태가 1(접수 전)이면 결과 없음
+        reported = status != "1"
+        keys = pd.DataFrame({
+            self.hospital: self.hospital_code,
+            self.person_source_value: orders[self.person_source_value].to_numpy()[done][reported],
+            "PTNO": ptno[reported],
+            "RSLTRGSTDD": self.ymd(read_time[reported]),
+            "RSLTRGSTNO": self.next_ids("RSLTRGSTNO", int(reported.sum())),
+            "RSLTRGSTHISTNO": "1"})
+        results = keys.assign(RSLTRGSTTM = self.hms(read_time[reported]), DELFLAGCD = "0", HISTNO = "1",
+                              GROSTESTRECDD = self.ymd(gross_time[reported]), GROSTESTRECTM = self.hms(gross_time[reported]))
+        contents = keys.assign(**{columns["value_source_value"]: self.rng.choice(PATHOLOGY_RESULTS, len(keys))})
+        return orders, accepts, results, contents
+
+    def make_batch(self, first, size):
+        """
+        환자 first ~ first + size - 1번의 원천 데이터 생성 후 파일에 이어 씀
+        """
+        pid = np.char.zfill(np.arange(first + 1, first + size + 1).astype(str), PID_LENGTH)
+        visit = self.make_visits(size)
+        starts = np.searchsorted(visit["patient"], np.arange(size))
+        counts = np.bincount(visit["patient"], minlength = size)
+
+        # 환자기본정보: 사망 환자의 사망일은 마지막 방문 이후
+        person = self.config["person"]["columns"]
+        age = self.rng.beta(2.2, 1.8, size) * 90 + 1
+        birth = (self.start_date - pd.to_timedelta(age * 365.25, unit = "D")).strftime("%Y%m%d").to_numpy(dtype = str)
+        last_day = visit["end"][starts + counts - 1] // SECONDS_PER_DAY
+        death_day = np.minimum(last_day + self.rng.integers(0, 30, size), self.last_day)
+        zip_choice = self.rng.random(size)
+        near_zip = np.clip(int(self.target_zip) + self.rng.integers(-NEAR_ZIP_RANGE, NEAR_ZIP_RANGE + 1, size), ZIP_MIN, ZIP_MAX)
+        self.write(self.config["person"]["data"]["source_data"], pd.DataFrame({
+            self.person_source_value: pid,
+            person["gender_source_value"]: self.rng.choice(["M", "F"], size),
+            person["death_datetime"]: np.where(self.rng.random(size) < DEATH_RATE, self.day_ymd[death_day], ""),
+            person["birth_datetime"]: birth,
+            person["race_source_value"]: np.where(self.rng.random(size) < FOREIGNER_RATE, "Y", "N"),
+            person["person_name"]: self.make_names(size),
+            person["location_source_value"]: np.where(zip_choice < LOCAL_ZIP_RATE, self.target_zip,
+                                                      np.where(zip_choice < LOCAL_ZIP_RATE + NEAR_ZIP_RATE,
+                                                               np.char.zfill(near_zip.astype(str), 3), self.rng.choice(self.zip_codes, size))),
+            person["abotyp"]: self.rng.choice(["A", "B", "O", "AB"], size, p = [0.34, 0.27, 0.28, 0.11]),
+            person["rhtyp"]: np.where(self.rng.random(size) < RH_NEGATIVE_RATE, "-", "+")}))
+
+        # 외래수진이력, 입원수진이력
+        columns = self.config["visit_occurrence"]["columns"]
+        registered = self.iso(visit["time"])
+        outpatient = np.flatnonzero(~visit["inpatient"])
+        self.write(self.config["visit_occurrence"]["data"]["source_data"], pd.DataFrame({
+            self.person_source_value: pid[visit["patient"][outpatient]],
+            columns["meddate"]: self.day_ymd[visit["day"][outpatient]],
+            columns["medtime"]: self.time_hms[visit["time"][outpatient] % SECONDS_PER_DAY],
+            self.visit_no: visit["cretno"][outpatient],
+            self.hospital: self.hospital_code,
+            self.frstrgstdt: registered[outpatient],
+            columns["meddept"]: visit["dept"][outpatient],
+            columns["orddr"]: self.doctor_ids[visit["doctor"][outpatient]],
+            columns["visit_source_value"]: "O",
+            columns["admitted_from_source_value"]: self.rng.choice(INPATH_CODES, len(outpatient)),
+            columns["discharge_to_source_value"]: self.rng.choice(DSCHTYPE_CODES, len(outpatient)),
+            "LASTUPDTDT": registered[outpatient]}))
+
+        admission = np.flatnonzero(visit["inpatient"])
+        self.write(self.config["visit_occurrence"]["data"]["source_data2"], pd.DataFrame({
+            self.person_source_value: pid[visit["patient"][admission]],
+            columns["admdate"]: self.day_ymd[visit["day"][admission]],
+            columns["admtime"]: self.time_hms[visit["time"][admission] % SECONDS_PER_DAY],
+            columns["dschdate"]: self.ymd(visit["end"][admission]),
+            columns["dschtime"]: self.hms(visit["end"][admission]),
+            self.visit_no: visit["cretno"][admission],
+            self.hospital: self.hospital_code,
+            self.frstrgstdt: registered[admission],
+            columns["meddept"]: visit["dept"][admission],
+            columns["chadr"]: self.doctor_ids[visit["doctor"][admission]],
+            columns["visit_source_value"]: np.where(self.rng.random(len(admission)) < EMERGENCY_RATE, "E", "I"),
+            columns["admitted_from_source_value"]: self.rng.choice(INPATH_CODES, len(admission)),
+            columns["discharge_to_source_value"]: self.rng.choice(DSCHTYPE_CODES, len(admission)),
+            "LASTUPDTDT": registered[admission]}))
+
+        # 전과전실: 입원 기간을 전과, 전실 횟수만큼 나눈 구간. 첫 구간은 입원 진료과
+        detail = self.config["visit_detail"]["columns"]
+        segments = 1 + np.minimum(self.rng.poisson(TRANSFER_MEAN, len(admission)), visit["los"][admission])
+        stay = np.repeat(admission, segments)
+        segment = cumcount(stay)
+        duration = visit["end"][stay] - visit["time"][stay]
+        segment_start = visit["time"][stay] + duration * segment // segments[np.repeat(np.arange(len(admission)), segments)]
+        segment_end = visit["time"][stay] + duration * (segment + 1) // segments[np.repeat(np.arange(len(admission)), segments)]
+        ward = self.rng.choice(WARDS, len(stay))
+        transfer_doctor = np.where(segment == 0, visit["doctor"][stay], self.zipf_choice(len(self.doctor_ids), len(stay)))
+        self.write(self.config["visit_detail"]["data"]["source_data"], pd.DataFrame({
+            self.person_source_value: pid[visit["patient"][stay]],
+            detail["admdate"]: self.day_ymd[visit["day"][stay]],
+            self.visit_no: visit["cretno"][stay],
+            self.hospital: self.hospital_code,
+            self.frstrgstdt: self.iso(segment_start),
+            detail["visit_detail_start_datetime"]: self.iso(segment_start),
+            detail["visit_detail_end_datetime"]: self.iso(segment_end),
+            detail["visit_detail_source_value"]: np.char.add(np.char.replace(ward, "W", ""), np.char.zfill(self.rng.integers(1, 30, len(stay)).astype(str), 2)),
+            detail["meddept"]: self.doctor_dept[transfer_doctor],
+            detail["provider"]: self.doctor_ids[transfer_doctor],
+            detail["wardno"]: ward}))
+
+        # 진단정보: 대상 상병 환자는 방문 중 한 번 대상 상병(확진) 진단
+        condition = self.config["condition_occurrence"]["columns"]
+        index = np.repeat(np.arange(len(visit["day"])), 1 + self.rng.poisson(max(self.diagnoses_per_visit - 1, 0), len(visit["day"])))
+        code = self.kcd_codes[self.zipf_choice(len(self.kcd_codes), len(index))]
+        kind = np.where(self.rng.random(len(index)) < RULE_OUT_RATE, "R", "C")
+        if self.diag_condition:
+            patients = np.flatnonzero(self.rng.random(size) < self.condition_rate)
+            condition_visit = starts[patients] + (self.rng.random(len(patients)) * counts[patients]).astype(np.int64)
+            index = np.r_[index, condition_visit]
+            code = np.r_[code, np.full(len(condition_visit), self.diag_condition)]
+            kind = np.r_[kind, np.full(len(condition_visit), "C")]
+        order = np.argsort(index, kind = "stable")
+        index, code, kind = index[order], code[order], kind[order]
+        number = cumcount(index)
+        diag_time = self.event_time(visit, index)
+        self.write(self.config["condition_occurrence"]["data"]["source_data"], pd.DataFrame({
+            self.person_source_value: pid[visit["patient"][index]],
+            condition["condition_start_datetime"]: self.ymd(diag_time),
+            condition["orddd"]: self.day_ymd[visit["day"][index]],
+            self.frstrgstdt: self.iso(diag_time),
+            self.visit_no: visit["cretno"][index],
+            self.hospital: self.hospital_code,
+            condition["condition_source_value"]: code,
+            condition["meddept"]: visit["dept"][index],
+            condition["provider"]: self.doctor_ids[visit["doctor"][index]],
+            condition["diagfg"]: np.where(number == 0, "M", "S"),
+            condition["ruleout"]: kind,
+            condition["patfg"]: np.where(visit["inpatient"][index], "I", "O"),
+            "DIAGHISTNO": "1",
+            "DIAGNO": (number + 1).astype(str),
+            "LASTUPDTDT": self.iso(diag_time)}))
+
+        # 약처방정보
+        drug = self.config["drug_exposure"]["columns"]
+        index = self.expand(visit, self.drugs_per_visit)
+        code = self.zipf_choice(len(self.drug_codes), len(index))
+        drug_time = self.event_time(visit, index)
+        inpatient = visit["inpatient"][index]
+        self.write(self.config["drug_exposure"]["data"]["source_data"], pd.DataFrame({
+            self.person_source_value: pid[visit["patient"][index]],
+            drug["drug_source_value"]: self.drug_codes[code],
+            drug["drug_exposure_start_datetime"]: self.ymd(drug_time),
+            drug["meddept"]: visit["dept"][index],
+            drug["days_supply"]: np.where(inpatient, "1", self.rng.choice(DRUG_DAYS, len(index))),
+            drug["qty"]: self.rng.choice(DRUG_QUANTITIES, len(index)),
+            drug["cnt"]: self.rng.choice(DRUG_TIMES, len(index)),
+            drug["provider"]: self.doctor_ids[visit["doctor"][index]],
+            drug["dose_unit_source_value"]: self.drug_units[code],
+            self.hospital: self.hospital_code,
+            drug["route_source_value"]: self.drug_routes[code],
+            drug["orddd"]: self.day_ymd[visit["day"][index]],
+            self.visit_no: visit["cretno"][index],
+            "PRCPNO": self.next_ids("PRCPNO", len(index)),
+            self.frstrgstdt: self.iso(drug_time),
+            "LASTUPDTDT": self.iso(drug_time)}))
+
+        # 검사처방, 처방상세는 진단검사, 영상검사, 병리검사를 한 파일에 저장
+        lab_orders, lab_executions, specimens, results = self.make_lab(visit, pid)
+        imaging_orders, imaging_executions, reports = self.make_imaging(visit, pid)
+        pathology_orders, accepts, pathology_results, contents = self.make_pathology(visit, pid)
+        measurement_diag = self.config["measurement_diag"]["data"]
+        measurement_pth = self.config["measurement_pth"]["data"]
+        self.write(measurement_diag["source_data1"], pd.concat([lab_orders, imaging_orders, pathology_orders], ignore_index = True))
+        self.write(measurement_diag["source_data2"], pd.concat([lab_executions, imaging_executions], ignore_index = True))
+        self.write(measurement_diag["source_data3"], specimens)
+        self.write(measurement_diag["source_data4"], results)
+        self.write(self.config["procedure_pacs"]["data"]["source_data3"], reports)
+        self.write(measurement_pth["source_data1"], pathology_results)
+        self.write(measurement_pth["source_data2"], contents)
+        self.write(measurement_pth["source_data3"], accepts)
+
+        # 간호정보조사: 입원마다 1건
+        nursing = self.config["measurement_ni"]["columns"]
+        nursing_data = {
+            self.person_source_value: pid[visit["patient"][admission]],
+            nursing["admtime"]: self.day_ymd[visit["day"][admission]],
+            nursing["provider"]: self.nurse_ids[self.zipf_choice(len(self.nurse_ids), len(admission))]}
+        for name, (mean, sd, decimals, minimum, maximum) in NURSING_ITEMS.items():
+            nursing_data[nursing[name]] = self.missing(self.normal_values(len(admission), mean, sd, decimals, minimum, maximum))
+        nursing_data[self.hospital] = self.hospital_code
+        self.write(self.config["measurement_ni"]["data"]["source_data"], pd.DataFrame(nursing_data))
+
+        # 임상관찰기록: 입원 기간 중 하루 vitals_per_day번, 항목별 1행
+        vital = self.config["measurement_vs"]["columns"]
+        record = np.repeat(admission, (visit["los"][admission] + 1) * self.vitals_per_day)
+        record_time = self.event_time(visit, record)
+        row = np.repeat(np.arange(len(record)), len(VITAL_ITEMS))
+        item = np.tile(np.arange(len(VITAL_ITEMS)), len(record))
+        values = np.empty(len(row), dtype = object)
+        for number, (_, mean, sd, decimals, minimum, maximum) in enumerate(VITAL_ITEMS):
+            mask = item == number
+            values[mask] = self.normal_values(int(mask.sum()), mean, sd, decimals, minimum, maximum)
+        self.write(self.config["measurement_vs"]["data"]["source_data"], pd.DataFrame({
+            self.person_source_value: pid[visit["patient"][record]][row],
+            vital["orddd"]: self.day_ymd[visit["day"][record]][row],
+            vital["measurement_date"]: self.iso(record_time)[row],
+            vital["value_source_value"]: values,
+            vital["measurement_source_value"]: np.array([name for name, *_ in VITAL_ITEMS])[item]}))
+
+    def run(self):
+        start_time = datetime.now()
+        self.check_output_path()
+        self.write_marker()
+
+        self.make_masters()
+        logging.info("코드 마스터, 참조 파일 생성 완료")
+
+        for first in range(0, self.patients, self.batch_patients):
+            size = min(self.batch_patients, self.patients - first)
+            self.make_batch(first, size)
+            logging.info(f"환자 {first + size}/{self.patients}명 생성 완료, elapsed_time: {datetime.now() - start_time}")
+
+        self.write_marker((datetime.now() - start_time).total_seconds())
+        logging.info(f"합성 데이터 생성 완료: {self.output_path}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level = logging.INFO, format = '%(asctime)s - %(levelname)s - %(message)s')
+    SyntheticSourceGenerator("./config.yaml").run()
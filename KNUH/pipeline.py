@@ -0,0 +1,295 @@
+from DataTransformer import *
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import hashlib
+import json
+import DataTransformer as data_transformer
+import cdm_schema
+
+# CDM 테이블 변환 작업 정의
+# 작업명은 config.yaml의 테이블 항목명과 같으며, inputs에는 변환에 사용하는 CDM 테이블(output_filename)을 입력
+VISIT_INPUTS = ["care_site", "provider", "person", "visit_occurrence", "visit_detail"]
+
+TASKS = {
+    "care_site": {"transformer": CareSiteTransformer, "inputs": []},
+    "provider": {"transformer": ProviderTransformer, "inputs": ["care_site"]},
+    "person": {"transformer": PersonTransformer, "inputs": []},
+    "visit_occurrence": {"transformer": VisitOccurrenceTransformer, "inputs": ["care_site", "provider", "person"]},
+    "visit_detail": {"transformer": VisitDetailTransformer, "inputs": ["care_site", "provider", "person", "visit_occurrence"]},
+    "local_kcd": {"transformer": LocalKCDTransformer, "inputs": []},
+    "condition_occurrence": {"transformer": ConditionOccurrenceTransformer, "inputs": VISIT_INPUTS + ["local_kcd"]},
+    "drug_edi": {"transformer": DrugEDITransformer, "inputs": []},
+    "drug_exposure": {"transformer": DrugexposureTransformer, "inputs": VISIT_INPUTS + ["drug_edi"]},
+    "measurement_edi": {"transformer": MeasurementEDITransformer, "inputs": []},
+    "procedure_edi": {"transformer": ProcedureEDITransformer, "inputs": []},
+    "measurement_diag": {"transformer": MeasurementDiagTransformer, "inputs": VISIT_INPUTS + ["measurement_edi"]},
+    "measurement_pth": {"transformer": MeasurementpthTransformer, "inputs": VISIT_INPUTS + ["procedure_edi"]},
+    "measurement_vs": {"transformer": MeasurementVSTransformer, "inputs": VISIT_INPUTS},
+    "measurement_ni": {"transformer": MeasurementNITransformer, "inputs": VISIT_INPUTS},
+    "merge_measurement": {"transformer": MergeMeasurementTransformer, "inputs": ["measurement_diag", "measurement_pth", "measurement_vs", "measurement_ni"]},
+    "procedure_pacs": {"transformer": ProcedurePACSTransformer, "inputs": VISIT_INPUTS + ["procedure_edi"]},
+    # "procedure_baseorder": {"transformer": ProcedureBaseOrderTransformer, "inputs": VISIT_INPUTS + ["procedure_edi"]},
+    # "procedure_bldorder": {"transformer": ProcedureBldOrderTransformer, "inputs": VISIT_INPUTS + ["procedure_edi"]},
+    "merge_procedure": {"transformer": MergeProcedureTransformer, "inputs": ["procedure_pacs"]},
+    "observation_period": {"transformer": ObservationPeriodTransformer, "inputs": ["visit_occurrence", "condition_occurrence", "drug_exposure", "measurement", "procedure_occurrence"]},
+}
+
+
+def get_dependencies(config, tasks):
+    """
+    작업별 inputs를 생성하는 작업(output_filename 기준)을 찾아 작업별 선행 작업 집합을 반환합니다.
+    """
+    producers = {config[name]["data"]["output_filename"]: name for name in tasks}
+    dependencies = {}
+    for name, task in tasks.items():
+        missing = [table for table in task["inputs"] if table not in producers]
+        if missing:
+            raise ValueError(f"{name} 작업의 입력 테이블을 생성하는 작업이 없습니다: {missing}")
+        dependencies[name] = {producers[table] for table in task["inputs"]}
+    return dependencies
+
+
+def get_execution_order(dependencies):
+    """
+    선행 작업이 먼저 오도록 정렬한 작업 목록을 반환합니다. 같은 단계에서는 TASKS에 정의된 순서를 따릅니다.
+    """
+    order = []
+    remaining = list(dependencies)
+    while remaining:
+        ready = [name for name in remaining if dependencies[name] <= set(order)]
+        if not ready:
+            raise ValueError(f"작업 간 순환 참조가 있습니다: {remaining}")
+        order.extend(ready)
+        remaining = [name for name in remaining if name not in ready]
+    return order
+
+
+class RunManifest:
+    """
+    작업별 완료 여부, 입력 파일 지문(크기, 수정시각, 해시), 출력 파일, 변환 코드 해시를 기록하는 실행 기록(run_manifest.json)입니다.
+    입력 파일, 출력 파일, 설정, 변환 코드가 모두 이전 실행과 같은 작업은 다시 실행하지 않아도 되는지 판단합니다.
+    """
+    filename = "run_manifest.json"
+    # 변환 결과에 영향을 주는 코드 파일
+    code_files = [data_transformer.__file__, cdm_schema.__file__, __file__]
+
+    def __init__(self, transformer, config, tasks):
+        self.transformer = transformer
+        self.config = config
+        self.tasks = tasks
+        self.path = os.path.join(transformer.get_cdm_dir(), self.filename)
+        self.extension = ".parquet" if transformer.intermediate_format == "parquet" else ".csv"
+        self.code_hash = self.get_code_hash()
+
+        if os.path.isfile(self.path):
+            with open(self.path, 'r', encoding="utf-8") as file:
+                self.records = json.load(file)
+        else:
+            self.records = {}
+
+    def get_files(self, name):
+        """
+        작업의 입력 파일 목록과 출력 파일 경로를 반환합니다.
+        입력 파일은 선행 작업이 생성한 CDM 파일과, 테이블 설정(data) 및 공통 설정 값 중 원천 경로에 있는 파일입니다.
+        """
+        cdm_dir = self.transformer.get_cdm_dir()
+        inputs = [os.path.join(cdm_dir, table + self.extension) for table in self.tasks[name]["inputs"]]
+
+        data = self.config[name]["data"]
+        candidates = [value for key, value in data.items() if key != "output_filename"]
+        candidates += [value for value in self.config.values() if isinstance(value, str)]
+        for value in candidates:
+            if not isinstance(value, str) or not value:
+                continue
+            source_file = os.path.join(self.config["source_path"], value + ".csv")
+            if os.path.isfile(source_file):
+                inputs.append(source_file)
+
+        output = os.path.join(cdm_dir, data["output_filename"] + self.extension)
+        return sorted(set(inputs)), output
+
+    def get_config_hash(self, name):
+        """
+        공통 설정과 테이블 설정의 해시를 반환합니다. 설정이 바뀐 작업은 다시 실행합니다.
+        """
+        settings = {key: value for key, value in self.config.items() if not isinstance(value, dict)}
+        settings[name] = self.config[name]
+        return hashlib.sha256(json.dumps(settings, sort_keys = True, ensure_ascii = False, default = str).encode("utf-8")).hexdigest()
+
+    def get_code_hash(self):
+        """
+        변환 코드 파일의 해시를 반환합니다. 코드가 바뀌면 모든 작업을 다시 실행합니다.
+        """
+        sha256 = hashlib.sha256()
+        for path in self.code_files:
+            with open(path, 'rb') as file:
+                sha256.update(file.read())
+        return sha256.hexdigest()
+
+    @staticmethod
+    def get_fingerprint(path, previous = None):
+        """
+        파일의 크기, 수정시각, sha256 해시를 반환합니다.
+        이전 지문과 크기, 수정시각이 같으면 해시를 다시 계산하지 않습니다.
+        """
+        stat = os.stat(path)
+        if previous and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+            return previous
+
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256.hexdigest()}
+
+    def is_unchanged(self, path, previous):
+        if not os.path.isfile(path):
+            return False
+        fingerprint = self.get_fingerprint(path, previous)
+        return fingerprint["size"] == previous["size"] and fingerprint["sha256"] == previous["sha256"]
+
+    def is_completed(self, name):
+        """
+        이전 실행에서 완료되었고 이후 설정, 변환 코드, 입력 파일, 출력 파일이 바뀌지 않았으면 True를 반환합니다.
+        """
+        record = self.records.get(name)
+        if not record or record["status"] != "completed":
+            return False
+        if record.get("code") != self.code_hash:
+            return False
+
+        inputs, output = self.get_files(name)
+        if record["config"] != self.get_config_hash(name) or sorted(record["inputs"]) != inputs or record["output"]["path"] != output:
+            return False
+
+        files = list(record["inputs"].items()) + [(output, record["output"]["fingerprint"])]
+        return all(self.is_unchanged(path, previous) for path, previous in files)
+
+    def mark_completed(self, name):
+        inputs, output = self.get_files(name)
+        self.records[name] = {
+            "status": "completed",
+            "config": self.get_config_hash(name),
+            "code": self.code_hash,
+            "inputs": {path: self.get_fingerprint(path) for path in inputs if os.path.isfile(path)},
+            "output": {"path": output, "fingerprint": self.get_fingerprint(output)},
+            "finished_at": datetime.now().isoformat()
+        }
+        self.save()
+
+    def mark_failed(self, name):
+        self.records[name] = {"status": "failed", "finished_at": datetime.now().isoformat()}
+        self.save()
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding="utf-8") as file:
+            json.dump(self.records, file, ensure_ascii = False, indent = 2)
+        os.replace(temp_path, self.path)
+
+
+def run_task(name, config_path):
+    """
+    작업 하나를 실행합니다. 프로세스 풀에서 호출되므로 모듈 함수로 정의합니다.
+    """
+    transformer = TASKS[name]["transformer"](config_path)
+    transformer.transform()
+
+
+def run_pipeline(config_path, tasks = TASKS):
+    """
+    작업 간 선행 관계에 따라 CDM 테이블 변환을 실행합니다.
+    config.yaml의 pipeline.max_workers가 1이면 한 프로세스에서 순서대로 실행하고,
+    2 이상이면 선행 작업이 끝난 작업들을 프로세스 풀에서 동시에 실행합니다.
+    동시에 실행 중인 작업의 예상 메모리(task_memory_mb) 합계가 memory_budget_mb를 넘지 않도록 작업을 시작하며,
+    실패한 작업에 의존하는 작업은 실행하지 않습니다.
+    작업 결과는 CDM 경로의 run_manifest.json에 기록되며, pipeline.resume이 true이면
+    이전 실행 이후 설정, 변환 코드, 입력 파일, 출력 파일이 바뀌지 않은 작업은 건너뛰고 바뀌었거나 실패한 작업부터 다시 실행합니다.
+    """
+    with open(config_path, 'r', encoding="utf-8") as file:
+        config = yaml.safe_load(file)
+
+    settings = config.get("pipeline", {})
+    max_workers = settings.get("max_workers", 1)
+    memory_budget = settings.get("memory_budget_mb", 16384)
+    task_memory = settings.get("task_memory_mb", {})
+    default_task_memory = settings.get("default_task_memory_mb", 2048)
+    resume = settings.get("resume", False)
+
+    dependencies = get_dependencies(config, tasks)
+    order = get_execution_order(dependencies)
+    logging.info(f"실행 순서: {order}")
+
+    manifest = RunManifest(DataTransformer(config_path), config, tasks)
+
+    # 작업별로 한 번만 확인(대기 중인 작업의 입력 파일 해시를 반복 계산하지 않도록)
+    checked = {}
+
+    def is_completed(name):
+        if name not in checked:
+            checked[name] = resume and manifest.is_completed(name)
+            if checked[name]:
+                logging.info(f"{name} 작업은 이전 실행 이후 변경 사항이 없어 건너뜁니다.")
+        return checked[name]
+
+    if max_workers <= 1:
+        for name in order:
+            if is_completed(name):
+                continue
+            try:
+                run_task(name, config_path)
+            except Exception:
+                manifest.mark_failed(name)
+                raise
+            manifest.mark_completed(name)
+        return
+
+    def memory_of(name):
+        return task_memory.get(name, default_task_memory)
+
+    pending = list(order)
+    running = {}
+    done = set()
+    failed = set()
+
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        while pending or running:
+            for name in list(pending):
+                if dependencies[name] & failed:
+                    pending.remove(name)
+                    failed.add(name)
+                    logging.error(f"{name} 작업은 선행 작업 실패로 실행하지 않습니다.")
+                    continue
+                if not dependencies[name] <= done:
+                    continue
+                if is_completed(name):
+                    pending.remove(name)
+                    done.add(name)
+                    continue
+                if len(running) >= max_workers:
+                    continue
+                # 실행 중인 작업이 있을 때는 메모리 한도 안에서만 새 작업 시작
+                used_memory = sum(memory_of(running_name) for running_name in running.values())
+                if running and used_memory + memory_of(name) > memory_budget:
+                    continue
+                running[executor.submit(run_task, name, config_path)] = name
+                pending.remove(name)
+                logging.info(f"{name} 작업 시작")
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when = FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    future.result()
+                    manifest.mark_completed(name)
+                    done.add(name)
+                    logging.info(f"{name} 작업 완료")
+                except Exception as e:
+                    manifest.mark_failed(name)
+                    failed.add(name)
+                    logging.error(f"{name} 작업 실행 중 오류: {e}", exc_info = True)
+
+    if failed:
+        raise RuntimeError(f"실행하지 못한 작업: {sorted(failed)}")
@@ -0,0 +1,49 @@
+"""
+테스트 공통 fixture
+"""
+
+import os, sys
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DataTransformer import DataTransformer
+from make_synthetic_data import SyntheticSourceGenerator
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    원천, CDM 경로를 임시 폴더로 바꾼 설정 파일을 만들고 경로를 반환하는 함수
+    overrides의 값이 dict이면 같은 항목의 설정에 덮어씀
+    """
+    def make(name = "config.yaml", cdm = "cdm", **overrides):
+        with open(CONFIG_PATH, "r", encoding = "utf-8") as file:
+            config = yaml.safe_load(file)
+        config["source_path"] = str(tmp_path / "emr")
+        config["CDM_path"] = str(tmp_path / cdm)
+        for key, value in overrides.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key] = {**config[key], **value}
+            else:
+                config[key] = value
+        config_path = tmp_path / name
+        with open(config_path, "w", encoding = "utf-8") as file:
+            yaml.safe_dump(config, file, allow_unicode = True)
+        return str(config_path)
+    return make
+
+
+@pytest.fixture
+def synthetic_config(tmp_path, monkeypatch, make_config):
+    """
+    환자 20명의 합성 원천 데이터를 만든 설정 파일 경로 반환
+    """
+    monkeypatch.chdir(tmp_path)
+    config_path = make_config(synthetic = {"output_path": str(tmp_path / "emr"), "patients": 20, "batch_patients": 20})
+    SyntheticSourceGenerator(config_path).run()
+    DataTransformer.clear_dimension_cache()
+    yield config_path
+    DataTransformer.clear_dimension_cache()
@@ -0,0 +1,254 @@
+"""
+DataTransformer 공통 메소드 테스트
+"""
+
+import os, sys
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DataTransformer import DataTransformer, parse_numeric_value, parse_datetime
+
+
+@pytest.fixture
+def transformer(tmp_path, monkeypatch, make_config):
+    """
+    원천, CDM 경로를 임시 폴더로 바꾼 설정으로 DataTransformer 생성
+    """
+    monkeypatch.chdir(tmp_path)
+    return DataTransformer(make_config())
+
+
+def test_merge_valid_period_uses_earlier_overlapping_version(transformer):
+    # v1(2000~2099)과 v2(2010~2012)가 겹칠 때 2015년 데이터는 v1, 2011년 데이터는 가장 최근에 시작된 v2와 병합
+    mapping = pd.DataFrame({
+        "code": ["A", "A", "B"],
+        "version": ["v1", "v2", "b1"],
+        "FROMDATE": pd.to_datetime(["2000-01-01", "2010-01-01", "2000-01-01"]),
+        "TODATE": pd.to_datetime(["2099-12-31", "2012-12-31", "2005-12-31"]),
+    })
+    source = pd.DataFrame({
+        "code": ["A", "A", "B", "C"],
+        "event_date": pd.to_datetime(["2015-06-01", "2011-06-01", "2015-06-01", "2015-06-01"]),
+    })
+
+    result = transformer.merge_valid_period(source, mapping, "code", "code", "event_date")
+
+    # B는 사용기간에 해당하는 버전이 없으므로 제외, 매핑 테이블에 없는 C는 유지
+    assert result["code"].tolist() == ["A", "A", "C"]
+    assert result["version"].tolist()[:2] == ["v1", "v2"]
+    assert pd.isna(result["version"].iloc[2])
+
+
+def test_merge_valid_period_fills_missing_todate(transformer):
+    # 종료일이 없는 v1은 2099-12-31까지 사용하는 것으로 보고 v2 종료 이후 데이터와 병합
+    mapping = pd.DataFrame({
+        "code": ["A", "A"],
+        "version": ["v1", "v2"],
+        "FROMDATE": pd.to_datetime(["2000-01-01", "2010-01-01"]),
+        "TODATE": pd.to_datetime([None, "2012-12-31"]),
+    })
+    source = pd.DataFrame({"code": ["A"], "event_date": pd.to_datetime(["2015-06-01"])})
+
+    result = transformer.merge_valid_period(source, mapping, "code", "code", "event_date")
+
+    assert result["version"].tolist() == ["v1"]
+
+
+def test_merge_visit_detail_uses_enclosing_stay(transformer):
+    # 입원 기간(1) 중 짧은 전실 기간(2)이 끝난 뒤의 데이터는 입원 기간(1)의 visit_detail_id 부여
+    visit_detail = pd.DataFrame({
+        "visit_detail_id": pd.array([1, 2, 3], dtype = "Int64"),
+        "visit_occurrence_id": pd.array([10, 10, 20], dtype = "Int64"),
+        "visit_detail_start_datetime": pd.to_datetime(["2023-01-01", "2023-01-03", "2023-02-01"]),
+        "visit_detail_end_datetime": pd.to_datetime(["2023-01-10", "2023-01-04", "2023-02-02"]),
+    })
+    source = pd.DataFrame({
+        "visit_occurrence_id": pd.array([10, 10, 20, 30], dtype = "Int64"),
+        "event_datetime": pd.to_datetime(["2023-01-06", "2023-01-03 12:00", "2023-02-05", "2023-03-01"]),
+    })
+
+    result = transformer.merge_visit_detail(source, visit_detail, "event_datetime")
+
+    # visit_detail 기간에 포함되지 않는 20번 방문 데이터는 제외, visit_detail이 없는 30번 방문 데이터는 유지
+    assert result["visit_occurrence_id"].tolist() == [10, 10, 30]
+    assert result["visit_detail_id"].tolist()[:2] == [1, 2]
+    assert pd.isna(result["visit_detail_id"].iloc[2])
+
+
+def write_lineage_file(transformer, run_mode):
+    transformer.table = "condition_occurrence"
+    transformer.output_filename = "condition_occurrence"
+    transformer.run_mode = run_mode
+    transformer.lineage = {("process_source", "2023-01"): {"rows": 3, "patients": 2, "persons": set()}}
+    transformer.write_lineage()
+
+
+def test_read_lineage_uses_full_run_only(transformer):
+    write_lineage_file(transformer, "full")
+    assert transformer.read_lineage()["rows"].tolist() == [3]
+
+    # 증분 변환의 lineage는 변경분의 row수이므로 사용하지 않음
+    write_lineage_file(transformer, "incremental")
+    assert transformer.read_lineage() is None
+
+
+def test_read_lineage_ignores_lineage_older_than_cdm(transformer):
+    write_lineage_file(transformer, "full")
+    lineage_path = os.path.join(transformer.get_cdm_dir(), "lineage", "condition_occurrence.csv")
+    cdm_file = transformer.get_cdm_file("condition_occurrence")
+    with open(cdm_file, "w") as file:
+        file.write("condition_occurrence_id\n")
+    os.utime(lineage_path, (1, 1))
+
+    assert transformer.read_lineage() is None
+
+
+def test_filter_incremental_keeps_rows_at_watermark(transformer):
+    transformer.table = "condition_occurrence"
+    transformer.output_filename = "condition_occurrence"
+    transformer.incremental = True
+    with open(os.path.join(transformer.get_cdm_dir(), "watermark.json"), "w", encoding = "utf-8") as file:
+        file.write('{"condition_occurrence": "2023-01-01 10:00:00"}')
+    with open(transformer.get_cdm_file("condition_occurrence"), "w") as file:
+        file.write("condition_occurrence_id\n")
+    source = pd.DataFrame({"FSTRGSTDT": ["2023-01-01 09:59:59", "2023-01-01 10:00:00", "2023-01-02 00:00:00"]})
+
+    result = transformer.filter_incremental(source)
+
+    assert result["FSTRGSTDT"].tolist() == ["2023-01-01 10:00:00", "2023-01-02 00:00:00"]
+
+
+def test_merge_valid_period_keeps_missing_int64_keys(transformer):
+    # Int64 키의 결측값은 매핑 테이블에 없는 코드와 같이 사용기간 조건 없이 유지
+    mapping = pd.DataFrame({
+        "visit_occurrence_id": pd.array([10, None], dtype = "Int64"),
+        "visit_detail_id": pd.array([1, 2], dtype = "Int64"),
+        "start": pd.to_datetime(["2023-01-01", "2023-01-01"]),
+        "end": pd.to_datetime(["2023-01-10", "2023-01-10"]),
+    })
+    source = pd.DataFrame({
+        "visit_occurrence_id": pd.array([10, None], dtype = "Int64"),
+        "event_datetime": pd.to_datetime(["2023-01-05", "2023-01-05"]),
+    })
+
+    result = transformer.merge_valid_period(source, mapping, "visit_occurrence_id", "visit_occurrence_id", "event_datetime",
+                                            fromdate = "start", todate = "end")
+
+    assert len(result) == 2
+    assert result["visit_detail_id"].iloc[0] == 1
+    assert pd.isna(result["visit_occurrence_id"].iloc[1]) and pd.isna(result["visit_detail_id"].iloc[1])
+
+
+def test_read_csv_raises_on_missing_columns(transformer):
+    os.makedirs(transformer.config["source_path"], exist_ok = True)
+    pd.DataFrame({"PTNO": ["1", "2"], "ORDDD": ["20230101", "20230102"]}).to_csv(
+        os.path.join(transformer.config["source_path"], "source.csv"), index = False, encoding = transformer.source_encoding)
+
+    # usecols나 filters의 컬럼이 파일에 없으면 오류
+    with pytest.raises(ValueError, match = "PRCPNO"):
+        transformer.read_csv("source", usecols = ["PTNO", "PRCPNO"])
+    with pytest.raises(ValueError, match = "ORDDATE"):
+        transformer.read_csv("source", usecols = ["PTNO"], filters = [("ORDDATE", "<=", "2023-01-01")])
+
+    # optional_columns는 파일에 있는 컬럼만 읽음
+    result = transformer.read_csv("source", dtype = str, usecols = ["PTNO"], optional_columns = ["ORDDD", "LASTUPDTDT"],
+                                  filters = [("ORDDD", "<=", "2023-01-01")])
+    assert result.columns.tolist() == ["PTNO", "ORDDD"]
+    assert result["PTNO"].tolist() == ["1"]
+
+
+def test_parse_numeric_value_maps_operator_only_values():
+    # "="처럼 비교 연산자만 있는 결과값은 숫자가 아니어도 해당 연산자의 concept으로 변환
+    result = parse_numeric_value(pd.Series(["=", ">", "<0.5", "pos"]))
+
+    assert result["operator_concept_id"].tolist() == [4172703, 4172704, 4171756, 0]
+    assert result["value_as_number"].iloc[2] == 0.5
+    assert result["value_text"].tolist()[3] == "pos"
+
+
+def test_read_dimension_cache_is_keyed_by_path(tmp_path, monkeypatch, make_config):
+    monkeypatch.chdir(tmp_path)
+    DataTransformer.clear_dimension_cache()
+    first = DataTransformer(make_config("first.yaml", "cdm1"))
+    second = DataTransformer(make_config("second.yaml", "cdm2"))
+    for transformer, person_id in ((first, "1"), (second, "2")):
+        pd.DataFrame({"person_id": [person_id], "person_source_value": ["P"], "환자명": ["홍길동"]}).to_csv(
+            transformer.get_cdm_file(transformer.person_data), index = False, encoding = transformer.cdm_encoding)
+
+    # 파일명이 같아도 경로가 다른 설정은 캐시를 공유하지 않음
+    assert first.read_dimension("person")["person_id"].tolist() == [1]
+    assert second.read_dimension("person")["person_id"].tolist() == [2]
+
+    # 파일이 다시 저장되면 캐시 대신 새로 읽음
+    pd.DataFrame({"person_id": ["3"], "person_source_value": ["P"], "환자명": ["홍길동"]}).to_csv(
+        first.get_cdm_file(first.person_data), index = False, encoding = first.cdm_encoding)
+    os.utime(first.get_cdm_file(first.person_data), ns = (1, 1))
+    assert first.read_dimension("person")["person_id"].tolist() == [3]
+    DataTransformer.clear_dimension_cache()
+
+
+@pytest.mark.parametrize("intermediate_format", ["csv", "parquet"])
+def test_write_csv_formats_dates_by_schema(tmp_path, monkeypatch, make_config, intermediate_format):
+    # datetime 컬럼은 시각이 모두 0시여도 DATETIME_FORMAT, date 컬럼은 DATE_FORMAT으로 저장하고 str 컬럼(처방일)은 CSV 저장 문자열과 같게 유지
+    if intermediate_format == "parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    transformer = DataTransformer(make_config(cdm = f"cdm_{intermediate_format}", intermediate_format = intermediate_format))
+    transformer.table = "measurement"
+    cdm = pd.DataFrame({
+        "measurement_id": [1, 2],
+        "person_id": [10, 11],
+        "measurement_date": pd.to_datetime(["2023-01-02", "2023-01-03"]),
+        "measurement_datetime": pd.to_datetime(["2023-01-02", None]),
+        "처방일": pd.to_datetime(["2023-01-02", "2023-01-03"]),
+    })
+    transformer.write_csv(cdm, transformer.cdm_path, "measurement")
+    transformer.publish_csv()
+
+    written = pd.read_csv(os.path.join(transformer.get_cdm_dir(), "measurement.csv"), dtype = str)
+    assert written["measurement_date"].tolist() == ["2023-01-02", "2023-01-03"]
+    assert written["measurement_datetime"].tolist()[0] == "2023-01-02 00:00:00"
+    assert pd.isna(written["measurement_datetime"].tolist()[1])
+    assert written["처방일"].tolist() == ["2023-01-02", "2023-01-03"]
+
+
+@pytest.mark.parametrize("format", ["%Y%m%d", "%Y%m%d%H%M", "%Y%m%d%H%M%S"])
+def test_parse_datetime_compact_formats_match_to_datetime(format):
+    # 존재하지 않는 날짜, 자릿수가 다른 값, 숫자가 아닌 값, 결측값은 NaT
+    width = len(pd.Timestamp("2019-03-08 10:45:30").strftime(format))
+    values = pd.Series(["20190308104530", "20191231235959", "20190230101010", "20200229000000", "2019O308104530", None])
+    values = pd.concat([values.str[:width], pd.Series([" 20190308104530"[:width + 1] + " ", "2019030"])], ignore_index = True)
+    expected = pd.to_datetime(values.str.strip(), format = format, errors = "coerce")
+    expected = expected.where(values.str.strip().str.len() == width)
+
+    pd.testing.assert_series_equal(parse_datetime(values, format), expected, check_names = False)
+
+
+def test_parse_datetime_reads_float_values_and_keeps_datetime_input():
+    values = pd.Series([201903081045.0, None, 201913081045.0])
+    result = parse_datetime(values, "%Y%m%d%H%M")
+    assert result.tolist()[0] == pd.Timestamp("2019-03-08 10:45")
+    assert result.iloc[1:].isna().all()
+
+    dates = pd.Series(pd.to_datetime(["2019-03-08"]))
+    assert parse_datetime(dates) is dates
+
+
+def test_parse_datetime_converts_korean_am_pm():
+    values = pd.Series(["2019-03-08 오후 01:45", "2019-03-08 오전 12:05", "2019-13-08 오전 01:00"])
+    result = parse_datetime(values, "%Y-%m-%d %p %I:%M")
+    assert result.tolist()[:2] == [pd.Timestamp("2019-03-08 13:45"), pd.Timestamp("2019-03-08 00:05")]
+    assert pd.isna(result.iloc[2])
+
+
+def test_make_stable_id_does_not_depend_on_row_order_and_rejects_duplicate_keys(transformer):
+    transformer.table = "drug_exposure"
+    keys = pd.DataFrame({"person": ["1", "1", "2"], "code": ["A", "B", "A"]})
+    ids = transformer.make_stable_id(keys)
+    reversed_ids = transformer.make_stable_id(keys.iloc[::-1])
+    assert ids.tolist() == reversed_ids.iloc[::-1].tolist()
+
+    # 자연키가 같은 행은 행 순서로 구분하지 않고 오류
+    with pytest.raises(ValueError, match = "자연키가 같은 행"):
+        transformer.make_stable_id(pd.concat([keys, keys.iloc[:1]]))
@@ -0,0 +1,66 @@
+"""
+QC DQ 진단 규칙(dq_check) 테스트
+"""
+
+import os, sys
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from QC.src import dq_check
+from QC.src.dq_check import evaluate_rules, outer_merge_counts, run_dq_checks
+
+
+def test_evaluate_rules_counts_each_check():
+    cdm = pd.DataFrame({
+        "person_id": ["1", "2", "2", " ", None],
+        "month_of_birth": ["01", "13", "0", "12", None],
+        "start_date": ["2020-01-02", "2020-01-01", "2020-01-05", None, "2020-01-01"],
+        "end_date": ["2020-01-01", "2020-01-01", "2020-01-06", "2020-01-01", None],
+    })
+    rules = [
+        {"id": "null", "check": "null", "column": "person_id"},
+        {"id": "null_ratio", "check": "null", "column": "person_id", "ratio": "null"},
+        {"id": "duplicate", "check": "duplicate", "column": "person_id"},
+        {"id": "range", "check": "range", "column": "month_of_birth", "min": 1, "max": 12},
+        {"id": "date_order", "check": "date_order", "column": "start_date", "compare_column": "end_date", "parse_dates": True},
+    ]
+    results = evaluate_rules(cdm, rules, {})
+
+    # NULL 1건과 공백 1건, ratio가 "null"이면 NULL인 행 수로만 비율 계산
+    assert results["null"] == (2, 5, 0.4)
+    assert results["null_ratio"] == (2, 5, 0.2)
+    assert results["duplicate"][0] == 2
+    assert results["range"][0] == 2
+    assert results["date_order"][0] == 1
+
+
+def test_outer_merge_counts_matches_outer_merge():
+    cdm = pd.Series(["1", "1", "2", "5", None, " "], name = "person_id")
+    reference = pd.Series(["1", "2", "2", "3", None], name = "person_id")
+
+    merged = pd.merge(cdm.to_frame(), reference.to_frame(), on = "person_id", how = "outer")
+    missing = merged["person_id"].isnull() | merged["person_id"].astype(str).str.strip().eq("")
+    assert outer_merge_counts(cdm, reference.value_counts(dropna = False)) == (int(missing.sum()), len(merged))
+
+
+def test_run_dq_checks_reads_each_table_once_and_writes_every_rule(tmp_path, monkeypatch):
+    pd.DataFrame({"person_id": ["1", "2"], "person_source_value": ["A", "A"]}).to_csv(tmp_path / "person.csv", index = False)
+    pd.DataFrame({"visit_occurrence_id": ["1", "2", None], "person_id": ["1", "3", "2"]}).to_csv(tmp_path / "visit_occurrence.csv", index = False)
+    rules = [
+        {"id": "DQ_A", "table": "person", "check": "duplicate", "column": "person_source_value"},
+        {"id": "DQ_B", "table": "visit_occurrence", "check": "null", "column": "visit_occurrence_id"},
+        {"id": "DQ_C", "table": "visit_occurrence", "check": "foreign_key", "column": "person_id", "reference_table": "person"},
+    ]
+
+    reads = []
+    read_table = dq_check.read_table
+    monkeypatch.setattr(dq_check, "read_table", lambda path, table, columns: reads.append(table) or read_table(path, table, columns))
+    written = {}
+    monkeypatch.setattr(dq_check, "find_excel_row_and_write_error_ratio",
+                        lambda excel_path, sheetname, id, error_count, row_count, error_ratio: written.__setitem__(id, (error_count, row_count)))
+
+    run_dq_checks(str(tmp_path), "dq.xlsx", "DQ", rules)
+
+    # 참조 테이블(person) 1번, 진단 테이블별 1번
+    assert sorted(reads) == ["person", "person", "visit_occurrence"]
+    assert written == {"DQ_A": (2, 2), "DQ_B": (1, 3), "DQ_C": (0, 3)}
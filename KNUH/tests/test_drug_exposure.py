@@ -0,0 +1,115 @@
+"""
+합성 원천 데이터로 drug_exposure 변환 테스트
+"""
+
+import os, sys
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DataTransformer import DrugexposureTransformer
+from pipeline import TASKS, run_task
+
+
+def run_inputs(config_path, table):
+    """
+    table 변환에 사용하는 CDM 테이블을 작업 정의 순서대로 변환
+    """
+    for name in TASKS:
+        if name in TASKS[table]["inputs"]:
+            run_task(name, config_path)
+
+
+def read_output(transformer):
+    return pd.read_csv(transformer.get_cdm_file(transformer.output_filename), dtype = str).sort_values("drug_exposure_id").reset_index(drop = True)
+
+
+def test_chunked_run_with_single_row_last_chunk_matches_full_run(synthetic_config, make_config):
+    run_inputs(synthetic_config, "drug_exposure")
+    transformer = DrugexposureTransformer(synthetic_config)
+    transformer.transform()
+    full = read_output(transformer)
+
+    # 변환되는 첫 행을 마지막으로 옮겨 마지막 chunk가 변환 대상 1행만 갖도록 함
+    source_path = os.path.join(transformer.config["source_path"], transformer.source_data + ".csv")
+    source = pd.read_csv(source_path, dtype = str, encoding = transformer.source_encoding)
+    source = pd.concat([source.iloc[1:], source.iloc[:1]])
+    source.to_csv(source_path, index = False, encoding = transformer.source_encoding)
+
+    chunked = DrugexposureTransformer(make_config("chunk.yaml", drug_exposure = {"chunksize": len(source) - 1}))
+    chunked.transform()
+
+    pd.testing.assert_frame_equal(read_output(chunked), full)
+
+
+def test_incremental_rerun_without_new_data_keeps_table(synthetic_config, make_config):
+    run_inputs(synthetic_config, "drug_exposure")
+    config_path = make_config("incremental.yaml", incremental = True)
+    first = DrugexposureTransformer(config_path)
+    first.transform()
+    output = first.get_cdm_file(first.output_filename)
+    written = read_output(first)
+    os.utime(output, ns = (1, 1))
+
+    # 마지막 변환 시점과 같은 시점의 행만 다시 읽히며, 이미 저장된 행이므로 테이블을 다시 저장하지 않음
+    second = DrugexposureTransformer(config_path)
+    second.transform()
+
+    assert os.stat(output).st_mtime_ns == 1
+    pd.testing.assert_frame_equal(read_output(second), written)
+
+    # 마지막 변환 시점 이후 등록된 행은 추가
+    source_path = os.path.join(first.config["source_path"], first.source_data + ".csv")
+    source = pd.read_csv(source_path, dtype = str, encoding = first.source_encoding)
+    added = source[source["LASTUPDTDT"] == source["LASTUPDTDT"].max()].head(1).copy()
+    added["PRCPNO"] = "NEW"
+    added[["FSTRGSTDT", "LASTUPDTDT"]] = str(pd.to_datetime(added["LASTUPDTDT"].iloc[0]) + pd.Timedelta(seconds = 1))
+    pd.concat([source, added]).to_csv(source_path, index = False, encoding = first.source_encoding)
+
+    third = DrugexposureTransformer(config_path)
+    third.transform()
+
+    assert len(read_output(third)) == len(written) + 1
+
+
+def test_chunked_run_keeps_rows_sharing_key_prefix_across_chunks(synthetic_config, make_config, caplog):
+    run_inputs(synthetic_config, "drug_exposure")
+    transformer = DrugexposureTransformer(synthetic_config)
+    source_path = os.path.join(transformer.config["source_path"], transformer.source_data + ".csv")
+    source = pd.read_csv(source_path, dtype = str, encoding = transformer.source_encoding)
+    transformer.transform()
+    rows = len(read_output(transformer))
+
+    # 처방번호만 다른 행과 완전히 같은 행을 마지막 chunk에 추가
+    # 처방번호만 다른 행은 별도 행으로 남고 완전히 같은 행은 전체 변환처럼 한 번만 저장
+    changed = source.iloc[:1].copy()
+    changed["PRCPNO"] = changed["PRCPNO"] + "_2"
+    source = pd.concat([source, changed, source.iloc[:1]])
+    source.to_csv(source_path, index = False, encoding = transformer.source_encoding)
+
+    full = DrugexposureTransformer(synthetic_config)
+    full.transform()
+    expected = read_output(full)
+    assert len(expected) == rows + 1
+
+    chunked = DrugexposureTransformer(make_config("chunk.yaml", drug_exposure = {"chunksize": len(source) - 2}))
+    chunked.transform()
+
+    pd.testing.assert_frame_equal(read_output(chunked), expected)
+    assert "중복으로 제외" in caplog.text
+
+
+def test_lineage_records_row_count_of_each_step(synthetic_config):
+    run_inputs(synthetic_config, "drug_exposure")
+    transformer = DrugexposureTransformer(synthetic_config)
+    transformer.transform()
+
+    source_path = os.path.join(transformer.config["source_path"], transformer.source_data + ".csv")
+    source = pd.read_csv(source_path, dtype = str, encoding = transformer.source_encoding)
+    lineage = pd.read_csv(os.path.join(transformer.get_cdm_dir(), "lineage", "drug_exposure.csv"))
+    rows = lineage[lineage["year_month"].isna()].set_index("step")["rows"]
+
+    assert rows["원천 데이터"] == len(source)
+    assert rows["CDM 데이터"] == len(read_output(transformer))
+    assert {"person 테이블과 결합 후 원천 데이터", "local_edi 테이블의 날짜 조건 적용 후 원천 데이터",
+            "care_site 테이블과 결합 후 원천 데이터", "provider 테이블과 결합 후 원천 데이터",
+            "visit_occurrence 테이블과 결합 후 원천 데이터"} <= set(rows.index)
@@ -0,0 +1,65 @@
+"""
+QC field 통계(field_profiler) 테스트
+"""
+
+import os, sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from QC.src.field_profiler import HyperLogLog, TopK, TableProfile
+
+
+def make_table(rows = 5000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "person_id": rng.integers(1, 300, rows).astype(str),
+        "code": rng.choice(["A01", "B02", "C03", None], rows),
+        "visit_date": pd.Series(pd.date_range("2020-01-01", periods = 400).strftime("%Y-%m-%d")).sample(rows, replace = True, random_state = 0).to_numpy(),
+        "row_key": np.arange(rows).astype(str),
+    })
+
+
+def test_hyperloglog_is_exact_for_small_cardinality_and_estimates_large():
+    small = HyperLogLog()
+    small.update(pd.Series([str(i) for i in range(131)]))
+    assert small.estimate() == 131
+
+    large = HyperLogLog(precision = 10)
+    values = pd.Series(np.arange(50000).astype(str))
+    large.update(values)
+    assert large.hashes is None
+    assert abs(large.estimate() - 50000) / 50000 < 0.1
+
+
+def test_topk_returns_value_counts_top_when_all_values_are_distinct():
+    values = pd.Series(["b", "a", "c"] + [str(i) for i in range(200)])
+    topk = TopK()
+    topk.update(values.iloc[:100])
+    topk.update(values.iloc[100:])
+    counts = values.value_counts()
+    assert topk.top() == (counts.index[0], 1)
+
+
+def test_chunk_merge_matches_single_pass():
+    table = make_table()
+    single = TableProfile("visit", ["visit_date"])
+    single.update(table)
+
+    merged = TableProfile("visit", ["visit_date"])
+    for start in range(0, len(table), 1200):
+        part = TableProfile("visit", ["visit_date"])
+        part.update(table.iloc[start:start + 1200])
+        merged.merge(part)
+
+    exact = ["count", "unique", "top", "freq", "min", "max", "null_count", "null_ratio"]
+    expected = single.to_frame(1).set_index("column_name")
+    result = merged.to_frame(1).set_index("column_name")
+    pd.testing.assert_frame_equal(result[exact], expected[exact])
+    assert np.allclose(result.loc["person_id", "mean"], expected.loc["person_id", "mean"])
+
+    assert expected.loc["person_id", "unique"] == table["person_id"].nunique()
+    assert expected.loc["row_key", "unique"] == len(table)
+    assert expected.loc["person_id", "top"] == pd.to_numeric(table["person_id"]).mode()[0]
+    assert expected.loc["visit_date", "top"] == pd.to_datetime(table["visit_date"]).mode()[0]
+    assert isinstance(expected.loc["visit_date", "top"], pd.Timestamp)
@@ -0,0 +1,142 @@
+"""
+변환 작업 실행(pipeline) 테스트
+"""
+
+import os, sys
+import pandas as pd
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pipeline
+from DataTransformer import DataTransformer
+from pipeline import run_pipeline, RunManifest
+
+
+def make_task(name, inputs, fail = False):
+    """
+    실행 기록(CDM 경로의 runs.log)을 남기고 출력 파일을 만드는 작업 정의
+    프로세스 풀에서도 실행 순서를 확인할 수 있도록 기록은 파일에 추가
+    """
+    class RecordingTransformer(DataTransformer):
+        def transform(self):
+            os.makedirs(self.get_cdm_dir(), exist_ok = True)
+            with open(os.path.join(self.get_cdm_dir(), "runs.log"), "a", encoding = "utf-8") as file:
+                file.write(name + "\n")
+            if fail:
+                raise ValueError(f"{name} 실패")
+            with open(self.get_cdm_file(name), "w", encoding = "utf-8") as file:
+                file.write(name)
+
+    return {"transformer": RecordingTransformer, "inputs": inputs}
+
+
+def read_runs(config_path):
+    path = os.path.join(DataTransformer(config_path).get_cdm_dir(), "runs.log")
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r", encoding = "utf-8") as file:
+        runs = file.read().split()
+    os.remove(path)
+    return runs
+
+
+@pytest.fixture
+def recording_tasks(tmp_path, monkeypatch):
+    """
+    care_site -> provider, person 순서의 작업을 TASKS로 사용(run_task는 TASKS에서 작업을 찾음)
+    """
+    monkeypatch.chdir(tmp_path)
+    tasks = {
+        "care_site": make_task("care_site", []),
+        "provider": make_task("provider", ["care_site"]),
+        "person": make_task("person", []),
+    }
+    monkeypatch.setattr(pipeline, "TASKS", tasks)
+    return tasks
+
+
+def test_pipeline_runs_end_to_end_on_synthetic_data(synthetic_config):
+    run_pipeline(synthetic_config)
+
+    transformer = DataTransformer(synthetic_config)
+    for name in ("measurement_diag", "measurement", "procedure_occurrence", "observation_period"):
+        table = pd.read_csv(transformer.get_cdm_file(name), dtype = str)
+        assert len(table) > 0, name
+
+
+def test_resume_skips_unchanged_tasks_and_reruns_changed_ones(recording_tasks, make_config):
+    config_path = make_config(pipeline = {"resume": True})
+    run_pipeline(config_path, recording_tasks)
+    assert read_runs(config_path) == ["care_site", "person", "provider"]
+
+    run_pipeline(config_path, recording_tasks)
+    assert read_runs(config_path) == []
+
+    # 테이블 설정이 바뀐 작업만 다시 실행(출력 파일이 같으므로 provider는 건너뜀)
+    config_path = make_config(pipeline = {"resume": True}, care_site = {"chunksize": 10})
+    run_pipeline(config_path, recording_tasks)
+    assert read_runs(config_path) == ["care_site"]
+
+    # 출력 파일이 바뀐 작업은 다시 실행
+    with open(DataTransformer(config_path).get_cdm_file("provider"), "w", encoding = "utf-8") as file:
+        file.write("changed")
+    run_pipeline(config_path, recording_tasks)
+    assert read_runs(config_path) == ["provider"]
+
+
+def test_resume_reruns_all_tasks_after_code_change(recording_tasks, make_config, monkeypatch):
+    config_path = make_config(pipeline = {"resume": True})
+    run_pipeline(config_path, recording_tasks)
+    read_runs(config_path)
+
+    monkeypatch.setattr(RunManifest, "get_code_hash", lambda self: "changed")
+    run_pipeline(config_path, recording_tasks)
+    assert read_runs(config_path) == ["care_site", "person", "provider"]
+
+
+def test_pipeline_reruns_all_tasks_by_default(recording_tasks, make_config):
+    config_path = make_config()
+    run_pipeline(config_path, recording_tasks)
+    run_pipeline(config_path, recording_tasks)
+    assert read_runs(config_path) == ["care_site", "person", "provider"] * 2
+
+
+def test_execution_order_runs_dependencies_first(make_config, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open(make_config(), "r", encoding = "utf-8") as file:
+        config = yaml.safe_load(file)
+    dependencies = pipeline.get_dependencies(config, pipeline.TASKS)
+    order = pipeline.get_execution_order(dependencies)
+
+    assert sorted(order) == sorted(pipeline.TASKS)
+    for name in order:
+        assert all(order.index(dependency) < order.index(name) for dependency in dependencies[name]), name
+    assert order.index("merge_measurement") < order.index("observation_period")
+
+
+def test_execution_order_rejects_cycles_and_missing_inputs():
+    with pytest.raises(ValueError):
+        pipeline.get_execution_order({"a": {"b"}, "b": {"a"}})
+
+    config = {"a": {"data": {"output_filename": "a"}}}
+    with pytest.raises(ValueError):
+        pipeline.get_dependencies(config, {"a": {"inputs": ["b"]}})
+
+
+def test_parallel_run_skips_tasks_depending_on_failed_task(recording_tasks, make_config):
+    recording_tasks["care_site"] = make_task("care_site", [], fail = True)
+    config_path = make_config(pipeline = {"max_workers": 2})
+
+    with pytest.raises(RuntimeError, match = "provider"):
+        run_pipeline(config_path, recording_tasks)
+    assert sorted(read_runs(config_path)) == ["care_site", "person"]
+
+
+def test_parallel_run_matches_sequential_order_constraints(recording_tasks, make_config):
+    config_path = make_config(pipeline = {"max_workers": 2})
+    run_pipeline(config_path, recording_tasks)
+
+    runs = read_runs(config_path)
+    assert sorted(runs) == ["care_site", "person", "provider"]
+    assert runs.index("care_site") < runs.index("provider")
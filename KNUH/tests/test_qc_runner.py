@@ -0,0 +1,91 @@
+"""
+QC 작업 실행(qc_runner) 테스트
+"""
+
+import os, sys
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from QC.src import qc_runner, field_person_summary, field_visit_occurrence_summary
+from QC.src.qc_runner import run_qc
+
+DQ_RULES = [
+    {"id": "DQ_A", "table": "person", "check": "duplicate", "column": "person_source_value"},
+    {"id": "DQ_B", "table": "visit_occurrence", "check": "null", "column": "visit_occurrence_id"},
+    {"id": "DQ_C", "table": "visit_occurrence", "check": "foreign_key", "column": "person_id", "reference_table": "person"},
+]
+
+
+def failing_summary(cdm_path, excel_path, sheetname):
+    raise ValueError("field 진단 실패")
+
+
+@pytest.fixture
+def qc_inputs(tmp_path, monkeypatch):
+    """
+    person, visit_occurrence CDM과 field, DQ sheet만 있는 품질진단지표 파일
+    visit_occurrence 파일이 더 커서 프로세스 풀에서는 먼저 실행됨
+    """
+    cdm_path = tmp_path / "cdm"
+    cdm_path.mkdir()
+    pd.DataFrame({"person_id": ["1", "2", "3"], "person_source_value": ["A", "A", "B"],
+                  "birth_datetime": ["2000-01-01 00:00:00"] * 3}).to_csv(cdm_path / "person.csv", index = False)
+    pd.DataFrame({"visit_occurrence_id": [str(i) if i % 10 else None for i in range(100)],
+                  "person_id": [str(i % 4 + 1) for i in range(100)],
+                  "visit_start_date": ["2020-01-01"] * 100}).to_csv(cdm_path / "visit_occurrence.csv", index = False)
+
+    monkeypatch.setattr(qc_runner, "DQ_RULES", DQ_RULES)
+    monkeypatch.setattr(qc_runner, "FIELD_TASKS", [
+        {"name": "field_person", "table": "person", "function": field_person_summary.person_field_summary},
+        {"name": "field_visit_occurrence", "table": "visit_occurrence", "function": field_visit_occurrence_summary.visit_occurrence_field_summary},
+    ])
+
+    def make_workbook(name):
+        wb = Workbook()
+        wb.active.title = "field"
+        wb["field"].append(["id", "table_name", "column_name"])
+        dq = wb.create_sheet("dq")
+        dq.append(["id", "table", "column", "D", "E", "F", "error_count", "row_count", "error_ratio"])
+        for rule in DQ_RULES:
+            dq.append([rule["id"]])
+        path = tmp_path / name
+        wb.save(path)
+        return str(path)
+
+    return str(cdm_path), make_workbook
+
+
+def read_sheets(excel_path):
+    wb = load_workbook(excel_path)
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only = True)] for ws in wb}
+
+
+def test_parallel_qc_writes_same_workbook_as_sequential(qc_inputs):
+    cdm_path, make_workbook = qc_inputs
+    sequential = make_workbook("sequential.xlsx")
+    parallel = make_workbook("parallel.xlsx")
+
+    run_qc(cdm_path, sequential, "field", "dq", max_workers = 1)
+    run_qc(cdm_path, parallel, "field", "dq", max_workers = 2)
+
+    sheets = read_sheets(parallel)
+    assert sheets == read_sheets(sequential)
+    # field 결과는 작업 정의 순서대로 추가
+    tables = [row[1] for row in sheets["field"][1:]]
+    assert tables == ["person"] * 3 + ["visit_occurrence"] * 3
+    assert [row[6:9] for row in sheets["dq"][1:]] == [[2, 3, 2 / 3], [10, 100, 0.1], [0, 100, 0]]
+
+
+def test_failed_qc_task_keeps_other_results(qc_inputs):
+    cdm_path, make_workbook = qc_inputs
+    qc_runner.FIELD_TASKS[0] = {"name": "field_person", "table": "person", "function": failing_summary}
+    excel_path = make_workbook("qc.xlsx")
+
+    with pytest.raises(RuntimeError, match = "field_person"):
+        run_qc(cdm_path, excel_path, "field", "dq", max_workers = 2)
+
+    sheets = read_sheets(excel_path)
+    assert [row[1] for row in sheets["field"][1:]] == ["visit_occurrence"] * 3
+    assert sheets["dq"][1][6:9] == [2, 3, 2 / 3]